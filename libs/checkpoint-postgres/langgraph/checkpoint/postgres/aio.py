@@ -1,6 +1,7 @@
 import asyncio
+import weakref
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Iterator, List, Optional, Union
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence, Union
 
 from langchain_core.runnables import RunnableConfig
 from psycopg import AsyncConnection, AsyncCursor, AsyncPipeline
@@ -14,10 +15,18 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointPage,
     CheckpointTuple,
+    _check_page_size,
+    _checkpoint_page,
     get_checkpoint_id,
 )
-from langgraph.checkpoint.postgres.base import BasePostgresSaver
+from langgraph.checkpoint.postgres.base import (
+    COPY_CHECKPOINT_BLOB_CONTENTS_TYPES,
+    COPY_CHECKPOINT_BLOBS_TYPES,
+    COPY_CHECKPOINT_WRITES_TYPES,
+    BasePostgresSaver,
+)
 from langgraph.checkpoint.serde.base import SerializerProtocol
 
 
@@ -35,6 +44,29 @@ async def _get_connection(
 
 
 class AsyncPostgresSaver(BasePostgresSaver):
+    """Asynchronous checkpoint saver that stores checkpoints in a Postgres database.
+
+    Args:
+        conn (Union[AsyncConnection, AsyncConnectionPool]): The Postgres connection or pool.
+        pipe (Optional[AsyncPipeline]): The pipeline to use with a single connection.
+        serde (Optional[SerializerProtocol]): The serializer to use.
+        use_copy (bool): Whether to write blobs and writes with binary COPY
+            into temporary staging tables, merged into the checkpoint tables
+            in the same transaction. This is faster than `executemany` for
+            large checkpoints and batches of writes. Can't be used with a
+            pipeline. Defaults to False.
+        shallow (bool): Whether to keep only the latest checkpoint of each
+            thread and namespace, overwritten in place. Blob versions and
+            writes no longer referenced by it are deleted when a new
+            checkpoint is saved, so past checkpoints can't be listed or
+            resumed from. Defaults to False.
+        dedupe_blobs (bool): Whether to store each distinct channel value once
+            per thread and namespace, keyed by the hash of its serialized
+            bytes, with channel versions referencing the hash. Saves space
+            when channels are set to values they had before. Checkpoints
+            saved in either mode can be read in both. Defaults to False.
+    """
+
     lock: asyncio.Lock
 
     def __init__(
@@ -42,17 +74,28 @@ class AsyncPostgresSaver(BasePostgresSaver):
         conn: Union[AsyncConnection, AsyncConnectionPool],
         pipe: Optional[AsyncPipeline] = None,
         serde: Optional[SerializerProtocol] = None,
+        *,
+        use_copy: bool = False,
+        shallow: bool = False,
+        dedupe_blobs: bool = False,
     ) -> None:
         super().__init__(serde=serde)
         if isinstance(conn, AsyncConnectionPool) and pipe is not None:
             raise ValueError(
                 "Pipeline should be used only with a single AsyncConnection, not AsyncConnectionPool."
             )
+        if use_copy and pipe is not None:
+            raise ValueError("COPY can't be used in pipeline mode.")
 
         self.conn = conn
         self.pipe = pipe
+        self.use_copy = use_copy
+        self.shallow = shallow
+        self.dedupe_blobs = dedupe_blobs
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_running_loop()
+        # connections on which the staging tables used by COPY were created
+        self._staging_conns: weakref.WeakSet[AsyncConnection] = weakref.WeakSet()
 
     @classmethod
     @asynccontextmanager
@@ -62,12 +105,18 @@ class AsyncPostgresSaver(BasePostgresSaver):
         *,
         pipeline: bool = False,
         serde: Optional[SerializerProtocol] = None,
+        use_copy: bool = False,
+        shallow: bool = False,
+        dedupe_blobs: bool = False,
     ) -> AsyncIterator["AsyncPostgresSaver"]:
         """Create a new PostgresSaver instance from a connection string.
 
         Args:
             conn_string (str): The Postgres connection info string.
             pipeline (bool): whether to use AsyncPipeline
+            use_copy (bool): whether to write with binary COPY
+            shallow (bool): whether to keep only the latest checkpoint
+            dedupe_blobs (bool): whether to store blobs once per content hash
 
         Returns:
             AsyncPostgresSaver: A new AsyncPostgresSaver instance.
@@ -77,9 +126,22 @@ class AsyncPostgresSaver(BasePostgresSaver):
         ) as conn:
             if pipeline:
                 async with conn.pipeline() as pipe:
-                    yield AsyncPostgresSaver(conn=conn, pipe=pipe, serde=serde)
+                    yield AsyncPostgresSaver(
+                        conn=conn,
+                        pipe=pipe,
+                        serde=serde,
+                        use_copy=use_copy,
+                        shallow=shallow,
+                        dedupe_blobs=dedupe_blobs,
+                    )
             else:
-                yield AsyncPostgresSaver(conn=conn, serde=serde)
+                yield AsyncPostgresSaver(
+                    conn=conn,
+                    serde=serde,
+                    use_copy=use_copy,
+                    shallow=shallow,
+                    dedupe_blobs=dedupe_blobs,
+                )
 
     async def setup(self) -> None:
         """Set up the checkpoint database asynchronously.
@@ -112,6 +174,7 @@ class AsyncPostgresSaver(BasePostgresSaver):
         filter: Optional[dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        values: bool = True,
     ) -> AsyncIterator[CheckpointTuple]:
         """List checkpoints from the database asynchronously.
 
@@ -123,44 +186,70 @@ class AsyncPostgresSaver(BasePostgresSaver):
             filter (Optional[Dict[str, Any]]): Additional filtering criteria for metadata.
             before (Optional[RunnableConfig]): If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
             limit (Optional[int]): Maximum number of checkpoints to return.
+            values (bool): Whether to load the channel values and pending writes of
+                the checkpoints, which are otherwise empty and None, without
+                reading the blob and write tables. Defaults to True.
 
         Yields:
             AsyncIterator[CheckpointTuple]: An asynchronous iterator of matching checkpoint tuples.
         """
         where, args = self._search_where(config, filter, before)
-        query = self.SELECT_SQL + where + " ORDER BY checkpoint_id DESC"
+        query = (
+            (self.SELECT_SQL if values else self.SELECT_CHECKPOINTS_SQL)
+            + where
+            + " ORDER BY checkpoint_id DESC"
+        )
         if limit:
             query += f" LIMIT {limit}"
         # if we change this to use .stream() we need to make sure to close the cursor
         async with self._cursor() as cur:
             await cur.execute(query, args, binary=True)
-            async for value in cur:
-                yield CheckpointTuple(
-                    {
-                        "configurable": {
-                            "thread_id": value["thread_id"],
-                            "checkpoint_ns": value["checkpoint_ns"],
-                            "checkpoint_id": value["checkpoint_id"],
-                        }
-                    },
-                    await asyncio.to_thread(
-                        self._load_checkpoint,
-                        value["checkpoint"],
-                        value["channel_values"],
-                        value["pending_sends"],
-                    ),
-                    self._load_metadata(value["metadata"]),
-                    {
-                        "configurable": {
-                            "thread_id": value["thread_id"],
-                            "checkpoint_ns": value["checkpoint_ns"],
-                            "checkpoint_id": value["parent_checkpoint_id"],
-                        }
-                    }
-                    if value["parent_checkpoint_id"]
-                    else None,
-                    await asyncio.to_thread(self._load_writes, value["pending_writes"]),
-                )
+            # segments are read with another cursor, keeping the rows not
+            # fetched yet
+            async with cur.connection.cursor(
+                binary=True, row_factory=dict_row
+            ) as segments_cur:
+                while rows := await cur.fetchmany(self.list_batch_size):
+                    for checkpoint_tuple in await self._load_rows(segments_cur, rows):
+                        yield checkpoint_tuple
+
+    async def alist_page(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        page_size: int = 100,
+        values: bool = True,
+    ) -> CheckpointPage:
+        """Asynchronously list one page of the checkpoints that match the given
+        criteria.
+
+        Args:
+            config (Optional[RunnableConfig]): Base configuration for filtering checkpoints.
+            filter (Optional[Dict[str, Any]]): Additional filtering criteria.
+            before (Optional[RunnableConfig]): List checkpoints created before this
+                configuration, ie. the `next_page` of the previous page.
+            page_size (int): Maximum number of checkpoints in the page, at least 1.
+                Defaults to 100.
+            values (bool): Whether to load the channel values and pending writes
+                of the checkpoints. Defaults to True.
+
+        Returns:
+            CheckpointPage: The checkpoints of the page, and the config to get the next one.
+        """
+        _check_page_size(page_size)
+        checkpoints = [
+            c
+            async for c in self.alist(
+                config,
+                filter=filter,
+                before=before,
+                limit=page_size + 1,
+                values=values,
+            )
+        ]
+        return _checkpoint_page(checkpoints, page_size)
 
     async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database asynchronously.
@@ -187,39 +276,10 @@ class AsyncPostgresSaver(BasePostgresSaver):
             where = "WHERE thread_id = %s AND checkpoint_ns = %s ORDER BY checkpoint_id DESC LIMIT 1"
 
         async with self._cursor() as cur:
-            await cur.execute(
-                self.SELECT_SQL + where,
-                args,
-                binary=True,
-            )
-
-            async for value in cur:
-                return CheckpointTuple(
-                    {
-                        "configurable": {
-                            "thread_id": thread_id,
-                            "checkpoint_ns": checkpoint_ns,
-                            "checkpoint_id": value["checkpoint_id"],
-                        }
-                    },
-                    await asyncio.to_thread(
-                        self._load_checkpoint,
-                        value["checkpoint"],
-                        value["channel_values"],
-                        value["pending_sends"],
-                    ),
-                    self._load_metadata(value["metadata"]),
-                    {
-                        "configurable": {
-                            "thread_id": thread_id,
-                            "checkpoint_ns": checkpoint_ns,
-                            "checkpoint_id": value["parent_checkpoint_id"],
-                        }
-                    }
-                    if value["parent_checkpoint_id"]
-                    else None,
-                    await asyncio.to_thread(self._load_writes, value["pending_writes"]),
-                )
+            await cur.execute(self.SELECT_SQL + where, args, binary=True)
+            for checkpoint_tuple in await self._load_rows(cur, await cur.fetchall()):
+                return checkpoint_tuple
+        return None
 
     async def aput(
         self,
@@ -258,17 +318,47 @@ class AsyncPostgresSaver(BasePostgresSaver):
             }
         }
 
+        values = copy.pop("channel_values")
+        stored_segments: set[tuple[str, str]] = set()
+        if args := self._stored_segments_args(
+            thread_id, checkpoint_ns, values, new_versions
+        ):
+            async with self._cursor() as cur:
+                await cur.execute(self.SELECT_STORED_SEGMENTS_SQL, args)
+                stored_segments = {
+                    (r["channel"], r["version"]) for r in await cur.fetchall()
+                }
+        blobs, contents = await asyncio.to_thread(
+            self._dump_blobs,
+            thread_id,
+            checkpoint_ns,
+            values,
+            new_versions,
+            stored_segments,
+        )
         async with self._cursor(pipeline=True) as cur:
-            await cur.executemany(
-                self.UPSERT_CHECKPOINT_BLOBS_SQL,
-                await asyncio.to_thread(
-                    self._dump_blobs,
-                    thread_id,
-                    checkpoint_ns,
-                    copy.pop("channel_values"),
-                    new_versions,
-                ),
-            )
+            # blob contents are saved before the channel versions referencing them
+            if self.use_copy:
+                await self._copy_and_merge(
+                    cur,
+                    self.COPY_CHECKPOINT_BLOB_CONTENTS_SQL,
+                    COPY_CHECKPOINT_BLOB_CONTENTS_TYPES,
+                    self.MERGE_CHECKPOINT_BLOB_CONTENTS_SQL,
+                    contents,
+                )
+                await self._copy_and_merge(
+                    cur,
+                    self.COPY_CHECKPOINT_BLOBS_SQL,
+                    COPY_CHECKPOINT_BLOBS_TYPES,
+                    self.MERGE_CHECKPOINT_BLOBS_SQL,
+                    blobs,
+                )
+            else:
+                if contents:
+                    await cur.executemany(
+                        self.UPSERT_CHECKPOINT_BLOB_CONTENTS_SQL, contents
+                    )
+                await cur.executemany(self.UPSERT_CHECKPOINT_BLOBS_SQL, blobs)
             await cur.execute(
                 self.UPSERT_CHECKPOINTS_SQL,
                 (
@@ -280,6 +370,11 @@ class AsyncPostgresSaver(BasePostgresSaver):
                     self._dump_metadata(metadata),
                 ),
             )
+            if self.shallow:
+                for query, args in self._delete_previous_args(
+                    thread_id, checkpoint_ns, checkpoint, checkpoint_id
+                ):
+                    await cur.execute(query, args)
         return next_config
 
     async def aput_writes(
@@ -297,11 +392,7 @@ class AsyncPostgresSaver(BasePostgresSaver):
             writes (Sequence[Tuple[str, Any]]): List of writes to store, each as (channel, value) pair.
             task_id (str): Identifier for the task creating the writes.
         """
-        query = (
-            self.UPSERT_CHECKPOINT_WRITES_SQL
-            if all(w[0] in WRITES_IDX_MAP for w in writes)
-            else self.INSERT_CHECKPOINT_WRITES_SQL
-        )
+        upsert = all(w[0] in WRITES_IDX_MAP for w in writes)
         params = await asyncio.to_thread(
             self._dump_writes,
             config["configurable"]["thread_id"],
@@ -311,12 +402,101 @@ class AsyncPostgresSaver(BasePostgresSaver):
             writes,
         )
         async with self._cursor(pipeline=True) as cur:
-            await cur.executemany(query, params)
+            if self.use_copy:
+                await self._copy_and_merge(
+                    cur,
+                    self.COPY_CHECKPOINT_WRITES_SQL,
+                    COPY_CHECKPOINT_WRITES_TYPES,
+                    self.MERGE_UPSERT_CHECKPOINT_WRITES_SQL
+                    if upsert
+                    else self.MERGE_INSERT_CHECKPOINT_WRITES_SQL,
+                    self._unique_upserts(params) if upsert else params,
+                )
+            else:
+                await cur.executemany(
+                    self.UPSERT_CHECKPOINT_WRITES_SQL
+                    if upsert
+                    else self.INSERT_CHECKPOINT_WRITES_SQL,
+                    params,
+                )
+
+    async def aput_writes_many(
+        self,
+        writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks in one pipeline asynchronously.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `aput_writes`.
+        """
+        upserts, inserts = await asyncio.to_thread(self._dump_writes_many, writes)
+        async with self._cursor(pipeline=True) as cur:
+            if self.use_copy:
+                await self._copy_and_merge(
+                    cur,
+                    self.COPY_CHECKPOINT_WRITES_SQL,
+                    COPY_CHECKPOINT_WRITES_TYPES,
+                    self.MERGE_UPSERT_CHECKPOINT_WRITES_SQL,
+                    self._unique_upserts(upserts),
+                )
+                await self._copy_and_merge(
+                    cur,
+                    self.COPY_CHECKPOINT_WRITES_SQL,
+                    COPY_CHECKPOINT_WRITES_TYPES,
+                    self.MERGE_INSERT_CHECKPOINT_WRITES_SQL,
+                    inserts,
+                )
+            else:
+                if upserts:
+                    await cur.executemany(self.UPSERT_CHECKPOINT_WRITES_SQL, upserts)
+                if inserts:
+                    await cur.executemany(self.INSERT_CHECKPOINT_WRITES_SQL, inserts)
+
+    async def _load_rows(
+        self, cur: AsyncCursor, rows: List[dict[str, Any]]
+    ) -> List[CheckpointTuple]:
+        """Load the checkpoint tuples of rows of SELECT_SQL, and the segments
+        of their segment logs, or of rows of SELECT_CHECKPOINTS_SQL."""
+        segments = None
+        if rows and "channel_values" in rows[0]:
+            if args := self._segments_args(rows):
+                await cur.execute(self.SELECT_SEGMENTS_SQL, args, binary=True)
+                segments = self._load_segments(await cur.fetchall())
+        return await asyncio.to_thread(self._load_tuples, rows, segments)
+
+    async def _copy_and_merge(
+        self,
+        cur: AsyncCursor,
+        copy_sql: str,
+        types: Sequence[str],
+        merge_sql: str,
+        rows: Sequence[tuple],
+    ) -> None:
+        if not rows:
+            return
+        async with cur.copy(copy_sql) as copy:
+            copy.set_types(types)
+            for row in rows:
+                await copy.write_row(row)
+        await cur.execute(merge_sql)
 
     @asynccontextmanager
     async def _cursor(self, *, pipeline: bool = False) -> AsyncIterator[AsyncCursor]:
         async with _get_connection(self.conn) as conn:
-            if self.pipe:
+            if self.use_copy and pipeline:
+                # COPY can't run in pipeline mode, so the statements are
+                # instead grouped in a single transaction
+                async with self.lock, conn.cursor(
+                    binary=True, row_factory=dict_row
+                ) as cur:
+                    if conn not in self._staging_conns:
+                        for query in self.CREATE_STAGING_TABLES_SQL:
+                            await cur.execute(query)
+                        self._staging_conns.add(conn)
+                    async with conn.transaction():
+                        yield cur
+            elif self.pipe:
                 # a connection in pipeline mode can be used concurrently
                 # in multiple threads/coroutines, but only one cursor can be
                 # used at a time
@@ -346,6 +526,7 @@ class AsyncPostgresSaver(BasePostgresSaver):
         filter: Optional[dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        values: bool = True,
     ) -> Iterator[CheckpointTuple]:
         """List checkpoints from the database.
 
@@ -357,11 +538,15 @@ class AsyncPostgresSaver(BasePostgresSaver):
             filter (Optional[Dict[str, Any]]): Additional filtering criteria for metadata.
             before (Optional[RunnableConfig]): If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
             limit (Optional[int]): Maximum number of checkpoints to return.
+            values (bool): Whether to load the channel values and pending writes of
+                the checkpoints. Defaults to True.
 
         Yields:
             Iterator[CheckpointTuple]: An iterator of matching checkpoint tuples.
         """
-        aiter_ = self.alist(config, filter=filter, before=before, limit=limit)
+        aiter_ = self.alist(
+            config, filter=filter, before=before, limit=limit, values=values
+        )
         while True:
             try:
                 yield asyncio.run_coroutine_threadsafe(
@@ -431,3 +616,17 @@ class AsyncPostgresSaver(BasePostgresSaver):
         return asyncio.run_coroutine_threadsafe(
             self.aput_writes(config, writes, task_id), self.loop
         ).result()
+
+    def put_writes_many(
+        self,
+        writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks in one pipeline.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `put_writes`.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aput_writes_many(writes), self.loop
+        ).result()
@@ -1,5 +1,7 @@
+import json
 import random
-from typing import Any, List, Optional, Tuple
+from hashlib import blake2b
+from typing import Any, Collection, List, Optional, Sequence, Tuple
 
 from langchain_core.runnables import RunnableConfig
 from psycopg.types.json import Jsonb
@@ -8,6 +10,8 @@ from langgraph.checkpoint.base import (
     WRITES_IDX_MAP,
     BaseCheckpointSaver,
     Checkpoint,
+    CheckpointTuple,
+    SegmentLog,
     get_checkpoint_id,
 )
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
@@ -15,6 +19,9 @@ from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
 
 MetadataInput = Optional[dict[str, Any]]
 
+# size in bytes of the hash of deduped blobs, which are only deduped if larger
+BLOB_HASH_SIZE = 16
+
 """
 To add a new migration, add a new string to the MIGRATIONS list.
 The position of the migration in the list is the version number.
@@ -54,6 +61,21 @@ MIGRATIONS = [
     PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
 );""",
     "ALTER TABLE checkpoint_blobs ALTER COLUMN blob DROP not null;",
+    # serves the metadata @> filter of searches, for all metadata keys
+    "CREATE INDEX IF NOT EXISTS checkpoints_metadata_idx ON checkpoints USING gin (metadata jsonb_path_ops);",
+    # with dedupe_blobs, blobs are stored once per thread and namespace, keyed
+    # by their content hash, and channel versions hold the hash instead
+    """CREATE TABLE IF NOT EXISTS checkpoint_blob_contents (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    hash BYTEA NOT NULL,
+    blob BYTEA NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, hash)
+);""",
+    "ALTER TABLE checkpoint_blobs ADD COLUMN IF NOT EXISTS hash BYTEA;",
+    # serves searches across threads, newest first, which otherwise sort the
+    # whole table; searches within a thread use the primary key
+    "CREATE INDEX IF NOT EXISTS checkpoints_checkpoint_id_idx ON checkpoints (checkpoint_id);",
 ]
 
 SELECT_SQL = f"""
@@ -63,15 +85,19 @@ select
     checkpoint_ns,
     checkpoint_id,
     parent_checkpoint_id,
-    metadata,
+    metadata::text as metadata,
     (
-        select array_agg(array[bl.channel::bytea, bl.type::bytea, bl.blob])
+        select array_agg(array[bl.channel::bytea, bl.type::bytea, coalesce(bl.blob, bc.blob)])
         from jsonb_each_text(checkpoint -> 'channel_versions')
         inner join checkpoint_blobs bl
             on bl.thread_id = checkpoints.thread_id
             and bl.checkpoint_ns = checkpoints.checkpoint_ns
             and bl.channel = jsonb_each_text.key
             and bl.version = jsonb_each_text.value
+        left join checkpoint_blob_contents bc
+            on bc.thread_id = bl.thread_id
+            and bc.checkpoint_ns = bl.checkpoint_ns
+            and bc.hash = bl.hash
     ) as channel_values,
     (
         select
@@ -91,12 +117,55 @@ select
     ) as pending_sends
 from checkpoints """
 
+# Used to list checkpoints without their channel values and writes
+SELECT_CHECKPOINTS_SQL = """
+select
+    thread_id,
+    checkpoint,
+    checkpoint_ns,
+    checkpoint_id,
+    parent_checkpoint_id,
+    metadata::text as metadata
+from checkpoints """
+
+# Used to load the segments of the segment logs of checkpoints read with
+# SELECT_SQL, which only has their list of segment IDs, once per segment
+SELECT_SEGMENTS_SQL = """
+select seg.thread_id, seg.checkpoint_ns, seg.channel, seg.version, seg.type, coalesce(seg.blob, sc.blob) as blob
+from unnest(%s::text[], %s::text[], %s::text[], %s::text[]) as s(thread_id, checkpoint_ns, channel, segment_id)
+inner join checkpoint_blobs seg
+    on seg.thread_id = s.thread_id
+    and seg.checkpoint_ns = s.checkpoint_ns
+    and seg.channel = s.channel
+    and seg.version = s.segment_id
+left join checkpoint_blob_contents sc
+    on sc.thread_id = seg.thread_id
+    and sc.checkpoint_ns = seg.checkpoint_ns
+    and sc.hash = seg.hash
+"""
+
+# Used before storing a checkpoint to find the segments of its segment logs
+# already stored, eg. with previous versions of the channel, so that they are
+# neither serialized nor sent again
+SELECT_STORED_SEGMENTS_SQL = """
+select channel, version from checkpoint_blobs
+where thread_id = %s
+    and checkpoint_ns = %s
+    and (channel, version) in (select * from unnest(%s::text[], %s::text[]))
+"""
+
 UPSERT_CHECKPOINT_BLOBS_SQL = """
-    INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob)
-    VALUES (%s, %s, %s, %s, %s, %s)
+    INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob, hash)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
     ON CONFLICT (thread_id, checkpoint_ns, channel, version) DO NOTHING
 """
 
+UPSERT_CHECKPOINT_BLOB_CONTENTS_SQL = """
+    INSERT INTO checkpoint_blob_contents (thread_id, checkpoint_ns, hash, blob)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (thread_id, checkpoint_ns, hash) DO NOTHING
+"""
+
 UPSERT_CHECKPOINTS_SQL = """
     INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint, metadata)
     VALUES (%s, %s, %s, %s, %s, %s)
@@ -121,21 +190,221 @@ INSERT_CHECKPOINT_WRITES_SQL = """
     ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) DO NOTHING
 """
 
+# Used in shallow mode, to delete what the latest checkpoint no longer references
+DELETE_PREVIOUS_CHECKPOINTS_SQL = """
+    DELETE FROM checkpoints
+    WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id <> %s
+"""
+
+DELETE_PREVIOUS_CHECKPOINT_WRITES_SQL = """
+    DELETE FROM checkpoint_writes
+    WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id <> ALL(%s)
+"""
+
+DELETE_PREVIOUS_CHECKPOINT_BLOBS_SQL = """
+    DELETE FROM checkpoint_blobs
+    WHERE thread_id = %s AND checkpoint_ns = %s
+        AND (channel, version) NOT IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+"""
+
+DELETE_PREVIOUS_CHECKPOINT_BLOB_CONTENTS_SQL = """
+    DELETE FROM checkpoint_blob_contents bc
+    WHERE thread_id = %s AND checkpoint_ns = %s
+        AND NOT EXISTS (
+            SELECT 1 FROM checkpoint_blobs bl
+            WHERE bl.thread_id = bc.thread_id
+                AND bl.checkpoint_ns = bc.checkpoint_ns
+                AND bl.hash = bc.hash
+        )
+"""
+
+# Used when writing with COPY: rows are copied into session-local staging
+# tables, then moved into the real tables by a single INSERT ... SELECT
+CREATE_STAGING_TABLES_SQL = [
+    "CREATE TEMP TABLE IF NOT EXISTS checkpoint_blobs_staging (LIKE checkpoint_blobs)",
+    "CREATE TEMP TABLE IF NOT EXISTS checkpoint_writes_staging (LIKE checkpoint_writes)",
+    "CREATE TEMP TABLE IF NOT EXISTS checkpoint_blob_contents_staging (LIKE checkpoint_blob_contents)",
+]
+
+COPY_CHECKPOINT_BLOBS_SQL = """
+    COPY checkpoint_blobs_staging (thread_id, checkpoint_ns, channel, version, type, blob, hash)
+    FROM STDIN (FORMAT BINARY)
+"""
+
+COPY_CHECKPOINT_BLOBS_TYPES = ["text", "text", "text", "text", "text", "bytea", "bytea"]
+
+MERGE_CHECKPOINT_BLOBS_SQL = """
+    WITH staged AS (DELETE FROM checkpoint_blobs_staging RETURNING *)
+    INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob, hash)
+    SELECT thread_id, checkpoint_ns, channel, version, type, blob, hash FROM staged
+    ON CONFLICT (thread_id, checkpoint_ns, channel, version) DO NOTHING
+"""
+
+COPY_CHECKPOINT_BLOB_CONTENTS_SQL = """
+    COPY checkpoint_blob_contents_staging (thread_id, checkpoint_ns, hash, blob)
+    FROM STDIN (FORMAT BINARY)
+"""
+
+COPY_CHECKPOINT_BLOB_CONTENTS_TYPES = ["text", "text", "bytea", "bytea"]
+
+MERGE_CHECKPOINT_BLOB_CONTENTS_SQL = """
+    WITH staged AS (DELETE FROM checkpoint_blob_contents_staging RETURNING *)
+    INSERT INTO checkpoint_blob_contents (thread_id, checkpoint_ns, hash, blob)
+    SELECT DISTINCT ON (thread_id, checkpoint_ns, hash) thread_id, checkpoint_ns, hash, blob FROM staged
+    ON CONFLICT (thread_id, checkpoint_ns, hash) DO NOTHING
+"""
+
+COPY_CHECKPOINT_WRITES_SQL = """
+    COPY checkpoint_writes_staging (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob)
+    FROM STDIN (FORMAT BINARY)
+"""
+
+COPY_CHECKPOINT_WRITES_TYPES = [
+    "text",
+    "text",
+    "text",
+    "text",
+    "int4",
+    "text",
+    "text",
+    "bytea",
+]
+
+MERGE_UPSERT_CHECKPOINT_WRITES_SQL = """
+    WITH staged AS (DELETE FROM checkpoint_writes_staging RETURNING *)
+    INSERT INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob)
+    SELECT thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob FROM staged
+    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) DO UPDATE SET
+        channel = EXCLUDED.channel,
+        type = EXCLUDED.type,
+        blob = EXCLUDED.blob;
+"""
+
+MERGE_INSERT_CHECKPOINT_WRITES_SQL = """
+    WITH staged AS (DELETE FROM checkpoint_writes_staging RETURNING *)
+    INSERT INTO checkpoint_writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob)
+    SELECT thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob FROM staged
+    ON CONFLICT (thread_id, checkpoint_ns, checkpoint_id, task_id, idx) DO NOTHING
+"""
+
 
 class BasePostgresSaver(BaseCheckpointSaver):
     SELECT_SQL = SELECT_SQL
+    SELECT_CHECKPOINTS_SQL = SELECT_CHECKPOINTS_SQL
+    SELECT_SEGMENTS_SQL = SELECT_SEGMENTS_SQL
+    SELECT_STORED_SEGMENTS_SQL = SELECT_STORED_SEGMENTS_SQL
     MIGRATIONS = MIGRATIONS
     UPSERT_CHECKPOINT_BLOBS_SQL = UPSERT_CHECKPOINT_BLOBS_SQL
+    UPSERT_CHECKPOINT_BLOB_CONTENTS_SQL = UPSERT_CHECKPOINT_BLOB_CONTENTS_SQL
     UPSERT_CHECKPOINTS_SQL = UPSERT_CHECKPOINTS_SQL
     UPSERT_CHECKPOINT_WRITES_SQL = UPSERT_CHECKPOINT_WRITES_SQL
     INSERT_CHECKPOINT_WRITES_SQL = INSERT_CHECKPOINT_WRITES_SQL
+    DELETE_PREVIOUS_CHECKPOINTS_SQL = DELETE_PREVIOUS_CHECKPOINTS_SQL
+    DELETE_PREVIOUS_CHECKPOINT_WRITES_SQL = DELETE_PREVIOUS_CHECKPOINT_WRITES_SQL
+    DELETE_PREVIOUS_CHECKPOINT_BLOBS_SQL = DELETE_PREVIOUS_CHECKPOINT_BLOBS_SQL
+    DELETE_PREVIOUS_CHECKPOINT_BLOB_CONTENTS_SQL = (
+        DELETE_PREVIOUS_CHECKPOINT_BLOB_CONTENTS_SQL
+    )
+    CREATE_STAGING_TABLES_SQL = CREATE_STAGING_TABLES_SQL
+    COPY_CHECKPOINT_BLOBS_SQL = COPY_CHECKPOINT_BLOBS_SQL
+    MERGE_CHECKPOINT_BLOBS_SQL = MERGE_CHECKPOINT_BLOBS_SQL
+    COPY_CHECKPOINT_BLOB_CONTENTS_SQL = COPY_CHECKPOINT_BLOB_CONTENTS_SQL
+    MERGE_CHECKPOINT_BLOB_CONTENTS_SQL = MERGE_CHECKPOINT_BLOB_CONTENTS_SQL
+    COPY_CHECKPOINT_WRITES_SQL = COPY_CHECKPOINT_WRITES_SQL
+    MERGE_UPSERT_CHECKPOINT_WRITES_SQL = MERGE_UPSERT_CHECKPOINT_WRITES_SQL
+    MERGE_INSERT_CHECKPOINT_WRITES_SQL = MERGE_INSERT_CHECKPOINT_WRITES_SQL
 
     jsonplus_serde = JsonPlusSerializer()
 
+    dedupe_blobs = False
+
+    # number of checkpoints `list` loads at a time, yielding them once loaded
+    list_batch_size = 100
+
+    def _segments_args(
+        self, rows: Sequence[dict[str, Any]]
+    ) -> Optional[list[list[str]]]:
+        """Return the arguments of SELECT_SEGMENTS_SQL loading the segments of
+        the segment logs of rows of SELECT_SQL, or None if they have none."""
+        segments: set[tuple[str, str, str, str]] = set()
+        for row in rows:
+            for k, t, v in row["channel_values"] or ():
+                if t == b"segments":
+                    for segment_id in json.loads(v):
+                        segments.add(
+                            (
+                                row["thread_id"],
+                                row["checkpoint_ns"],
+                                k.decode(),
+                                segment_id,
+                            )
+                        )
+        return [list(c) for c in zip(*segments)] if segments else None
+
+    def _load_segments(
+        self, rows: Sequence[dict[str, Any]]
+    ) -> dict[tuple[str, str, str, str], tuple[str, bytes]]:
+        return {
+            (r["thread_id"], r["checkpoint_ns"], r["channel"], r["version"]): (
+                r["type"],
+                r["blob"],
+            )
+            for r in rows
+        }
+
+    def _load_tuple(
+        self,
+        row: dict[str, Any],
+        segments: Optional[dict[tuple[str, str, str, str], tuple[str, bytes]]] = None,
+    ) -> CheckpointTuple:
+        """Return the checkpoint tuple of a row of SELECT_SQL, or of a row of
+        SELECT_CHECKPOINTS_SQL, with empty channel values and no pending writes."""
+        thread_id, checkpoint_ns = row["thread_id"], row["checkpoint_ns"]
+        if "channel_values" in row:
+            checkpoint = self._load_checkpoint(
+                row["checkpoint"],
+                self._load_blobs(
+                    thread_id, checkpoint_ns, row["channel_values"], segments or {}
+                ),
+                row["pending_sends"],
+            )
+            pending_writes = self._load_writes(row["pending_writes"])
+        else:
+            checkpoint = self._load_checkpoint(row["checkpoint"], {}, [])
+            pending_writes = None
+        return CheckpointTuple(
+            {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": row["checkpoint_id"],
+                }
+            },
+            checkpoint,
+            self._load_metadata(row["metadata"]),
+            {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": row["parent_checkpoint_id"],
+                }
+            }
+            if row["parent_checkpoint_id"]
+            else None,
+            pending_writes,
+        )
+
+    def _load_tuples(
+        self,
+        rows: Sequence[dict[str, Any]],
+        segments: Optional[dict[tuple[str, str, str, str], tuple[str, bytes]]] = None,
+    ) -> list[CheckpointTuple]:
+        return [self._load_tuple(row, segments) for row in rows]
+
     def _load_checkpoint(
         self,
         checkpoint: dict[str, Any],
-        channel_values: list[tuple[bytes, bytes, bytes]],
+        channel_values: dict[str, Any],
         pending_sends: list[tuple[bytes, bytes]],
     ) -> Checkpoint:
         return {
@@ -143,22 +412,60 @@ class BasePostgresSaver(BaseCheckpointSaver):
             "pending_sends": [
                 self.serde.loads_typed((c.decode(), b)) for c, b in pending_sends or []
             ],
-            "channel_values": self._load_blobs(channel_values),
+            "channel_values": channel_values,
         }
 
     def _dump_checkpoint(self, checkpoint: Checkpoint) -> dict[str, Any]:
         return {**checkpoint, "pending_sends": []}
 
     def _load_blobs(
-        self, blob_values: list[tuple[bytes, bytes, bytes]]
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        blob_values: list[tuple[bytes, bytes, bytes]],
+        segments: dict[tuple[str, str, str, str], tuple[str, bytes]],
     ) -> dict[str, Any]:
         if not blob_values:
             return {}
-        return {
-            k.decode(): self.serde.loads_typed((t.decode(), v))
-            for k, t, v in blob_values
-            if t.decode() != "empty"
-        }
+        values: dict[str, Any] = {}
+        for k, t, v in blob_values:
+            k, t = k.decode(), t.decode()
+            if t == "segments":
+                # segment logs are stored as the list of their segment IDs
+                values[k] = SegmentLog(
+                    [
+                        (
+                            s,
+                            self.serde.loads_typed(
+                                segments[(thread_id, checkpoint_ns, k, s)]
+                            ),
+                        )
+                        for s in json.loads(v)
+                    ]
+                )
+            elif t != "empty":
+                values[k] = self.serde.loads_typed((t, v))
+        return values
+
+    def _stored_segments_args(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        values: dict[str, Any],
+        versions: dict[str, str],
+    ) -> Optional[tuple[str, str, list[str], list[str]]]:
+        """Return the arguments of SELECT_STORED_SEGMENTS_SQL finding the stored
+        segments of the segment logs to save, or None if there are none."""
+        segments = [
+            (k, segment_id)
+            for k in versions
+            if isinstance(values.get(k), SegmentLog)
+            for segment_id, _ in values[k].segments
+        ]
+        if not segments:
+            return None
+        channels, segment_ids = zip(*segments)
+        return thread_id, checkpoint_ns, list(channels), list(segment_ids)
 
     def _dump_blobs(
         self,
@@ -166,24 +473,100 @@ class BasePostgresSaver(BaseCheckpointSaver):
         checkpoint_ns: str,
         values: dict[str, Any],
         versions: dict[str, str],
-    ) -> list[tuple[str, str, str, str, str, bytes]]:
+        stored_segments: Collection[tuple[str, str]] = (),
+    ) -> tuple[
+        list[tuple[str, str, str, str, str, Optional[bytes], Optional[bytes]]],
+        list[tuple[str, str, bytes, bytes]],
+    ]:
+        """Return the rows of the channel versions, and of the blob contents
+        they reference by hash, if blobs are deduped. Segments in
+        `stored_segments`, as (channel, segment ID), are skipped."""
         if not versions:
-            return []
+            return [], []
 
-        return [
+        blobs: list[
+            tuple[str, str, str, str, str, Optional[bytes], Optional[bytes]]
+        ] = []
+        contents: dict[bytes, tuple[str, str, bytes, bytes]] = {}
+
+        def add(k: str, ver: str, type_: str, blob: Optional[bytes]) -> None:
+            if self.dedupe_blobs and blob is not None and len(blob) > BLOB_HASH_SIZE:
+                hash = blake2b(blob, digest_size=BLOB_HASH_SIZE).digest()
+                contents[hash] = (thread_id, checkpoint_ns, hash, blob)
+                blobs.append((thread_id, checkpoint_ns, k, ver, type_, None, hash))
+            else:
+                blobs.append((thread_id, checkpoint_ns, k, ver, type_, blob, None))
+
+        for k, ver in versions.items():
+            if k not in values:
+                add(k, ver, "empty", None)
+            elif isinstance(values[k], SegmentLog):
+                segment_ids = [s for s, _ in values[k].segments]
+                for segment_id, items in values[k].segments:
+                    if (k, segment_id) not in stored_segments:
+                        add(k, segment_id, *self.serde.dumps_typed(items))
+                # the list of segment IDs is read by SELECT_SQL, so kept inline
+                blobs.append(
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        k,
+                        ver,
+                        "segments",
+                        json.dumps(segment_ids).encode(),
+                        None,
+                    )
+                )
+            else:
+                add(k, ver, *self.serde.dumps_typed(values[k]))
+        return blobs, list(contents.values())
+
+    def _delete_previous_args(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint: Checkpoint,
+        parent_checkpoint_id: Optional[str],
+    ) -> list[tuple[str, tuple]]:
+        """Return the statements deleting, in shallow mode, the checkpoints
+        replaced by `checkpoint` and the writes and blobs only they referenced."""
+        channels: list[str] = []
+        versions: list[str] = []
+        for k, v in checkpoint["channel_versions"].items():
+            channels.append(k)
+            versions.append(v)
+            if isinstance(value := checkpoint["channel_values"].get(k), SegmentLog):
+                for segment_id, _ in value.segments:
+                    channels.append(k)
+                    versions.append(segment_id)
+        statements = [
             (
-                thread_id,
-                checkpoint_ns,
-                k,
-                ver,
-                *(
-                    self.serde.dumps_typed(values[k])
-                    if k in values
-                    else ("empty", None)
+                self.DELETE_PREVIOUS_CHECKPOINTS_SQL,
+                (thread_id, checkpoint_ns, checkpoint["id"]),
+            ),
+            # writes of the parent checkpoint hold the pending sends of this one
+            (
+                self.DELETE_PREVIOUS_CHECKPOINT_WRITES_SQL,
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    [checkpoint["id"], parent_checkpoint_id or ""],
                 ),
-            )
-            for k, ver in versions.items()
+            ),
+            (
+                self.DELETE_PREVIOUS_CHECKPOINT_BLOBS_SQL,
+                (thread_id, checkpoint_ns, channels, versions),
+            ),
         ]
+        if self.dedupe_blobs:
+            # blob contents no longer referenced by any channel version
+            statements.append(
+                (
+                    self.DELETE_PREVIOUS_CHECKPOINT_BLOB_CONTENTS_SQL,
+                    (thread_id, checkpoint_ns),
+                )
+            )
+        return statements
 
     def _load_writes(
         self, writes: list[tuple[bytes, bytes, bytes, bytes]]
@@ -222,8 +605,41 @@ class BasePostgresSaver(BaseCheckpointSaver):
             for idx, (channel, value) in enumerate(writes)
         ]
 
-    def _load_metadata(self, metadata: dict[str, Any]) -> dict[str, Any]:
-        return self.jsonplus_serde.loads(self.jsonplus_serde.dumps(metadata))
+    def _dump_writes_many(
+        self,
+        writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+    ) -> tuple[
+        list[tuple[str, str, str, int, str, str, bytes]],
+        list[tuple[str, str, str, int, str, str, bytes]],
+    ]:
+        upserts: list[tuple[str, str, str, int, str, str, bytes]] = []
+        inserts: list[tuple[str, str, str, int, str, str, bytes]] = []
+        for config, task_writes, task_id in writes:
+            params = self._dump_writes(
+                config["configurable"]["thread_id"],
+                config["configurable"]["checkpoint_ns"],
+                config["configurable"]["checkpoint_id"],
+                task_id,
+                task_writes,
+            )
+            if all(w[0] in WRITES_IDX_MAP for w in task_writes):
+                upserts.extend(params)
+            else:
+                inserts.extend(params)
+        return upserts, inserts
+
+    def _unique_upserts(
+        self, upserts: list[tuple[str, str, str, int, str, str, bytes]]
+    ) -> list[tuple[str, str, str, int, str, str, bytes]]:
+        """Keep only the last of the writes with the same primary key, as a
+        single INSERT ... ON CONFLICT DO UPDATE can't update a row twice."""
+        if len(upserts) < 2:
+            return upserts
+        return list({w[:5]: w for w in upserts}.values())
+
+    def _load_metadata(self, metadata: str) -> dict[str, Any]:
+        # read as text, to be parsed once, with the reviver of the serializer
+        return self.jsonplus_serde.loads(metadata.encode())
 
     def _dump_metadata(self, metadata) -> str:
         serialized_metadata_type, serialized_metadata = self.jsonplus_serde.dumps_typed(
@@ -21,5 +21,6 @@ async def clear_test_db(conn):
         await conn.execute("DELETE FROM checkpoints")
         await conn.execute("DELETE FROM checkpoint_blobs")
         await conn.execute("DELETE FROM checkpoint_writes")
+        await conn.execute("DELETE FROM checkpoint_blob_contents")
     except UndefinedTable:
         pass
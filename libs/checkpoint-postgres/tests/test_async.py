@@ -5,10 +5,12 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import (
     Checkpoint,
     CheckpointMetadata,
+    SegmentLog,
     create_checkpoint,
     empty_checkpoint,
 )
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.checkpoint.serde.types import TASKS
 
 
 class TestAsyncPostgresSaver:
@@ -99,3 +101,199 @@ class TestAsyncPostgresSaver:
             } == {"", "inner"}
 
             # TODO: test before and limit params
+
+    async def test_copy(self):
+        async with AsyncPostgresSaver.from_conn_string(
+            DEFAULT_URI, use_copy=True
+        ) as saver:
+            chkpnt: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"foo": "bar", "baz": 1},
+                "channel_versions": {"foo": "1", "baz": "1"},
+            }
+            config = await saver.aput(
+                self.config_2, chkpnt, self.metadata_2, {"foo": "1", "baz": "1"}
+            )
+            await saver.aput_writes(config, [("foo", "a"), ("baz", 2)], "task-1")
+            await saver.aput_writes_many(
+                [
+                    (config, [("foo", "b")], "task-2"),
+                    (config, [("__error__", "error")], "task-3"),
+                    (config, [("__error__", "error 2")], "task-3"),
+                ]
+            )
+            # the insert path doesn't overwrite existing writes
+            await saver.aput_writes(config, [("foo", "c")], "task-2")
+
+            saved = await saver.aget_tuple(config)
+            assert saved.checkpoint["channel_values"] == {"foo": "bar", "baz": 1}
+            assert saved.metadata == self.metadata_2
+            assert saved.pending_writes == [
+                ("task-1", "foo", "a"),
+                ("task-1", "baz", 2),
+                ("task-2", "foo", "b"),
+                ("task-3", "__error__", "error 2"),
+            ]
+
+    async def test_shallow(self):
+        async with AsyncPostgresSaver.from_conn_string(
+            DEFAULT_URI, shallow=True
+        ) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-4", "checkpoint_ns": ""}
+            }
+            chkpnt_1: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"static": "big", "log": SegmentLog([("a", [1])])},
+                "channel_versions": {"static": "1", "log": "1"},
+            }
+            config_1 = await saver.aput(
+                config, chkpnt_1, self.metadata_1, {"static": "1", "log": "1"}
+            )
+            await saver.aput_writes(config_1, [("__pregel_tasks", "send")], "task-1")
+            chkpnt_2: Checkpoint = {
+                **create_checkpoint(chkpnt_1, None, 1),
+                "channel_values": {
+                    "static": "big",
+                    "log": SegmentLog([("a", [1]), ("b", [2])]),
+                },
+                "channel_versions": {"static": "1", "log": "2"},
+            }
+            config_2 = await saver.aput(
+                config_1, chkpnt_2, self.metadata_2, {"log": "2"}
+            )
+            await saver.aput_writes(config_2, [("log", 3)], "task-2")
+            chkpnt_3: Checkpoint = {
+                **create_checkpoint(chkpnt_2, None, 2),
+                "channel_values": {"static": "big", "log": SegmentLog([("c", [1, 2])])},
+                "channel_versions": {"static": "1", "log": "3"},
+            }
+            config_3 = await saver.aput(
+                config_2, chkpnt_3, self.metadata_2, {"log": "3"}
+            )
+
+            # only the latest checkpoint is kept
+            assert [t.config async for t in saver.alist(config)] == [config_3]
+            assert await saver.aget_tuple(config_1) is None
+            # along with the writes of its parent, which hold its pending sends
+            async with saver._cursor() as cur:
+                await cur.execute(
+                    "SELECT checkpoint_id, task_id FROM checkpoint_writes"
+                )
+                assert await cur.fetchall() == [
+                    {"checkpoint_id": chkpnt_2["id"], "task_id": "task-2"}
+                ]
+                # versions and segments it no longer references are deleted
+                await cur.execute(
+                    "SELECT channel, version FROM checkpoint_blobs "
+                    "ORDER BY channel, version"
+                )
+                assert await cur.fetchall() == [
+                    {"channel": "log", "version": "3"},
+                    {"channel": "log", "version": "c"},
+                    {"channel": "static", "version": "1"},
+                ]
+            assert (await saver.aget(config))["channel_values"] == {
+                "static": "big",
+                "log": SegmentLog([("c", [1, 2])]),
+            }
+
+    @pytest.mark.parametrize("use_copy", [False, True])
+    async def test_dedupe_blobs(self, use_copy: bool):
+        async with AsyncPostgresSaver.from_conn_string(
+            DEFAULT_URI, use_copy=use_copy, dedupe_blobs=True
+        ) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt: Checkpoint = empty_checkpoint()
+            configs = []
+            # the channel flips between two values, and the log grows by
+            # segments with the same items
+            for v in range(1, 5):
+                value = "a" * 100 if v % 2 else "b" * 100
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {
+                        "flip": value,
+                        "small": v,
+                        "log": SegmentLog([(f"s{i}", ["x" * 100]) for i in range(v)]),
+                    },
+                    "channel_versions": {
+                        "flip": str(v),
+                        "small": str(v),
+                        "log": str(v),
+                    },
+                }
+                config = await saver.aput(
+                    config,
+                    chkpnt,
+                    self.metadata_2,
+                    {"flip": str(v), "small": str(v), "log": str(v)},
+                )
+                configs.append((config, chkpnt["channel_values"]))
+
+            for config, values in configs:
+                saved = await saver.aget_tuple(config)
+                assert saved.checkpoint["channel_values"] == values
+            async with saver._cursor() as cur:
+                # each distinct value is stored once
+                await cur.execute("SELECT count(*) FROM checkpoint_blob_contents")
+                assert (await cur.fetchone())["count"] == 3
+                # small values and the lists of segments are kept inline
+                await cur.execute(
+                    "SELECT channel, count(hash) FROM checkpoint_blobs "
+                    "GROUP BY channel ORDER BY channel"
+                )
+                assert await cur.fetchall() == [
+                    {"channel": "flip", "count": 4},
+                    {"channel": "log", "count": 4},
+                    {"channel": "small", "count": 0},
+                ]
+
+    async def test_alist_values(self):
+        async with AsyncPostgresSaver.from_conn_string(DEFAULT_URI) as saver:
+            thread: RunnableConfig = {
+                "configurable": {"thread_id": "thread-7", "checkpoint_ns": ""}
+            }
+            config = thread
+            chkpnt: Checkpoint = empty_checkpoint()
+            for v in range(1, 4):
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {
+                        "value": v,
+                        "log": SegmentLog([(f"s{i}", [i]) for i in range(v)]),
+                    },
+                    "channel_versions": {"value": str(v), "log": str(v)},
+                }
+                config = await saver.aput(
+                    config, chkpnt, {"step": v}, {"value": str(v), "log": str(v)}
+                )
+                await saver.aput_writes(config, [(TASKS, v), ("value", v + 1)], "task")
+
+            listed = [t async for t in saver.alist(thread)]
+            assert [t.metadata["step"] for t in listed] == [3, 2, 1]
+            assert listed == [await saver.aget_tuple(t.config) for t in listed]
+            assert listed[0].checkpoint["pending_sends"] == [2]
+
+            loaded: list[int] = []
+            load_tuples = saver._load_tuples
+            saver._load_tuples = lambda rows, segments: (
+                loaded.append(len(rows)) or load_tuples(rows, segments)
+            )
+            saver.list_batch_size = 2
+            listing = saver.alist(thread)
+            assert await listing.__anext__() == listed[0]
+            assert loaded == [2]
+            assert [t async for t in listing] == listed[1:]
+            assert loaded == [2, 1]
+
+            page = await saver.alist_page(thread, page_size=2, values=False)
+            assert [t.config for t in page.checkpoints] == [
+                t.config for t in listed[:2]
+            ]
+            assert page.next_page == listed[1].config
+            for t in page.checkpoints:
+                assert t.checkpoint["channel_values"] == {}
+                assert t.pending_writes is None
@@ -5,10 +5,13 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import (
     Checkpoint,
     CheckpointMetadata,
+    SegmentLog,
     create_checkpoint,
     empty_checkpoint,
 )
 from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.types import TASKS
 
 
 class TestPostgresSaver:
@@ -99,3 +102,331 @@ class TestPostgresSaver:
             } == {"", "inner"}
 
             # TODO: test before and limit params
+
+    def test_search_uses_metadata_index(self):
+        with PostgresSaver.from_conn_string(DEFAULT_URI) as saver:
+            saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+            saver.put(self.config_2, self.chkpnt_2, self.metadata_2, {})
+
+            where, args = saver._search_where(None, {"source": "loop", "step": 1})
+            with saver._cursor() as cur:
+                # the table is too small for the planner to pick the index
+                cur.execute("SET enable_seqscan = off")
+                plan = cur.execute(
+                    f"EXPLAIN SELECT checkpoint_id FROM checkpoints {where}", args
+                ).fetchall()
+                cur.execute("RESET enable_seqscan")
+            assert any(
+                "checkpoints_metadata_idx" in row["QUERY PLAN"] for row in plan
+            ), plan
+            assert [
+                t.metadata
+                for t in saver.list(None, filter={"source": "loop", "step": 1})
+            ] == [self.metadata_2]
+
+    def test_copy(self):
+        with PostgresSaver.from_conn_string(DEFAULT_URI, use_copy=True) as saver:
+            chkpnt: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"foo": "bar", "baz": 1},
+                "channel_versions": {"foo": "1", "baz": "1"},
+            }
+            config = saver.put(
+                self.config_2, chkpnt, self.metadata_2, {"foo": "1", "baz": "1"}
+            )
+            saver.put_writes(config, [("foo", "a"), ("baz", 2)], "task-1")
+            saver.put_writes_many(
+                [
+                    (config, [("foo", "b")], "task-2"),
+                    (config, [("__error__", "error")], "task-3"),
+                    (config, [("__error__", "error 2")], "task-3"),
+                ]
+            )
+            # the insert path doesn't overwrite existing writes
+            saver.put_writes(config, [("foo", "c")], "task-2")
+
+            saved = saver.get_tuple(config)
+            assert saved.checkpoint["channel_values"] == {"foo": "bar", "baz": 1}
+            assert saved.metadata == self.metadata_2
+            assert saved.pending_writes == [
+                ("task-1", "foo", "a"),
+                ("task-1", "baz", 2),
+                ("task-2", "foo", "b"),
+                ("task-3", "__error__", "error 2"),
+            ]
+
+    def test_shallow(self):
+        with PostgresSaver.from_conn_string(DEFAULT_URI, shallow=True) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-4", "checkpoint_ns": ""}
+            }
+            chkpnt_1: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"static": "big", "log": SegmentLog([("a", [1])])},
+                "channel_versions": {"static": "1", "log": "1"},
+            }
+            config_1 = saver.put(
+                config, chkpnt_1, self.metadata_1, {"static": "1", "log": "1"}
+            )
+            saver.put_writes(config_1, [("__pregel_tasks", "send")], "task-1")
+            chkpnt_2: Checkpoint = {
+                **create_checkpoint(chkpnt_1, None, 1),
+                "channel_values": {
+                    "static": "big",
+                    "log": SegmentLog([("a", [1]), ("b", [2])]),
+                },
+                "channel_versions": {"static": "1", "log": "2"},
+            }
+            config_2 = saver.put(config_1, chkpnt_2, self.metadata_2, {"log": "2"})
+            saver.put_writes(config_2, [("log", 3)], "task-2")
+            chkpnt_3: Checkpoint = {
+                **create_checkpoint(chkpnt_2, None, 2),
+                "channel_values": {"static": "big", "log": SegmentLog([("c", [1, 2])])},
+                "channel_versions": {"static": "1", "log": "3"},
+            }
+            config_3 = saver.put(config_2, chkpnt_3, self.metadata_2, {"log": "3"})
+
+            # only the latest checkpoint is kept
+            assert [t.config for t in saver.list(config)] == [config_3]
+            assert saver.get_tuple(config_1) is None
+            # along with the writes of its parent, which hold its pending sends
+            with saver._cursor() as cur:
+                cur.execute("SELECT checkpoint_id, task_id FROM checkpoint_writes")
+                assert cur.fetchall() == [
+                    {"checkpoint_id": chkpnt_2["id"], "task_id": "task-2"}
+                ]
+                # versions and segments it no longer references are deleted
+                cur.execute(
+                    "SELECT channel, version FROM checkpoint_blobs "
+                    "ORDER BY channel, version"
+                )
+                assert cur.fetchall() == [
+                    {"channel": "log", "version": "3"},
+                    {"channel": "log", "version": "c"},
+                    {"channel": "static", "version": "1"},
+                ]
+            assert saver.get(config)["channel_values"] == {
+                "static": "big",
+                "log": SegmentLog([("c", [1, 2])]),
+            }
+
+    @pytest.mark.parametrize("use_copy", [False, True])
+    def test_segments(self, use_copy: bool):
+        with PostgresSaver.from_conn_string(DEFAULT_URI, use_copy=use_copy) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt_1: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"log": SegmentLog([("a", [1])])},
+                "channel_versions": {"log": "1"},
+            }
+            config_1 = saver.put(config, chkpnt_1, self.metadata_1, {"log": "1"})
+            # more than one segment appended since the previous checkpoint
+            log = SegmentLog([("a", [1]), ("b", [2]), ("c", [3])])
+            chkpnt_2: Checkpoint = {
+                **create_checkpoint(chkpnt_1, None, 1),
+                "channel_values": {"log": log},
+                "channel_versions": {"log": "2"},
+            }
+            saver.put(config_1, chkpnt_2, self.metadata_2, {"log": "2"})
+            assert saver.get(config)["channel_values"] == {"log": log}
+            # a checkpoint put in a thread that never stored its segments
+            other: RunnableConfig = {
+                "configurable": {"thread_id": "thread-6", "checkpoint_ns": ""}
+            }
+            saver.put(other, chkpnt_2, self.metadata_2, {"log": "2"})
+            assert saver.get(other)["channel_values"] == {"log": log}
+
+    @pytest.mark.parametrize("use_copy", [False, True])
+    def test_segments_serialized_once(self, use_copy: bool):
+        class CountingSerializer(JsonPlusSerializer):
+            calls = 0
+
+            def dumps_typed(self, obj):
+                self.calls += 1
+                return super().dumps_typed(obj)
+
+        serde = CountingSerializer()
+        with PostgresSaver.from_conn_string(DEFAULT_URI, use_copy=use_copy) as saver:
+            saver.serde = serde
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt: Checkpoint = empty_checkpoint()
+            segments = []
+            dumps = []
+            for v in range(1, 11):
+                segments.append((f"segment-{v}", [v]))
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {"log": SegmentLog(segments)},
+                    "channel_versions": {"log": str(v)},
+                }
+                before = serde.calls
+                config = saver.put(config, chkpnt, self.metadata_1, {"log": str(v)})
+                dumps.append(serde.calls - before)
+            # only the new segment, however long the log
+            assert dumps == [1] * 10
+            assert saver.get(config)["channel_values"] == {"log": SegmentLog(segments)}
+
+    @pytest.mark.parametrize("use_copy", [False, True])
+    def test_dedupe_blobs(self, use_copy: bool):
+        with PostgresSaver.from_conn_string(
+            DEFAULT_URI, use_copy=use_copy, dedupe_blobs=True
+        ) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt: Checkpoint = empty_checkpoint()
+            configs = []
+            # the channel flips between two values, and the log grows by
+            # segments with the same items
+            for v in range(1, 5):
+                value = "a" * 100 if v % 2 else "b" * 100
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {
+                        "flip": value,
+                        "small": v,
+                        "log": SegmentLog([(f"s{i}", ["x" * 100]) for i in range(v)]),
+                    },
+                    "channel_versions": {
+                        "flip": str(v),
+                        "small": str(v),
+                        "log": str(v),
+                    },
+                }
+                config = saver.put(
+                    config,
+                    chkpnt,
+                    self.metadata_2,
+                    {"flip": str(v), "small": str(v), "log": str(v)},
+                )
+                configs.append((config, chkpnt["channel_values"]))
+
+            for config, values in configs:
+                assert saver.get_tuple(config).checkpoint["channel_values"] == values
+            with saver._cursor() as cur:
+                # each distinct value is stored once
+                cur.execute("SELECT count(*) FROM checkpoint_blob_contents")
+                assert cur.fetchone()["count"] == 3
+                # small values and the lists of segments are kept inline
+                cur.execute(
+                    "SELECT channel, count(hash) FROM checkpoint_blobs "
+                    "GROUP BY channel ORDER BY channel"
+                )
+                assert cur.fetchall() == [
+                    {"channel": "flip", "count": 4},
+                    {"channel": "log", "count": 4},
+                    {"channel": "small", "count": 0},
+                ]
+
+    def test_dedupe_blobs_shallow(self):
+        with PostgresSaver.from_conn_string(
+            DEFAULT_URI, shallow=True, dedupe_blobs=True
+        ) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-6", "checkpoint_ns": ""}
+            }
+            chkpnt: Checkpoint = empty_checkpoint()
+            for v, value in enumerate(["a" * 100, "b" * 100, "a" * 100, "c" * 100]):
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {"flip": value},
+                    "channel_versions": {"flip": str(v)},
+                }
+                config = saver.put(config, chkpnt, self.metadata_2, {"flip": str(v)})
+
+            assert saver.get(config)["channel_values"] == {"flip": "c" * 100}
+            # contents no longer referenced are deleted
+            with saver._cursor() as cur:
+                cur.execute("SELECT count(*) FROM checkpoint_blob_contents")
+                assert cur.fetchone()["count"] == 1
+
+    def test_list_values(self):
+        with PostgresSaver.from_conn_string(DEFAULT_URI) as saver:
+            thread: RunnableConfig = {
+                "configurable": {"thread_id": "thread-7", "checkpoint_ns": ""}
+            }
+            config = thread
+            chkpnt: Checkpoint = empty_checkpoint()
+            for v in range(1, 4):
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {
+                        "value": v,
+                        "log": SegmentLog([(f"s{i}", [i]) for i in range(v)]),
+                    },
+                    "channel_versions": {"value": str(v), "log": str(v)},
+                }
+                config = saver.put(
+                    config, chkpnt, {"step": v}, {"value": str(v), "log": str(v)}
+                )
+                saver.put_writes(config, [(TASKS, v), ("value", v + 1)], "task")
+
+            # the segments shared by the listed checkpoints are loaded once
+            listed = list(saver.list(thread))
+            assert [t.metadata["step"] for t in listed] == [3, 2, 1]
+            assert listed == [saver.get_tuple(t.config) for t in listed]
+            assert listed[0].checkpoint["channel_values"] == {
+                "value": 3,
+                "log": SegmentLog([("s0", [0]), ("s1", [1]), ("s2", [2])]),
+            }
+            assert listed[0].checkpoint["pending_sends"] == [2]
+            assert listed[0].pending_writes == [
+                ("task", TASKS, 3),
+                ("task", "value", 4),
+            ]
+
+            # checkpoints are loaded in batches, each yielded once loaded
+            loaded: list[int] = []
+            load_tuples = saver._load_tuples
+            saver._load_tuples = lambda rows, segments: (
+                loaded.append(len(rows)) or load_tuples(rows, segments)
+            )
+            saver.list_batch_size = 2
+            listing = saver.list(thread)
+            assert next(listing) == listed[0]
+            assert loaded == [2]
+            assert list(listing) == listed[1:]
+            assert loaded == [2, 1]
+
+            # without values, the blob and write tables aren't read
+            page = saver.list_page(thread, page_size=2, values=False)
+            assert [t.config for t in page.checkpoints] == [
+                t.config for t in listed[:2]
+            ]
+            assert [t.metadata for t in page.checkpoints] == [
+                t.metadata for t in listed[:2]
+            ]
+            assert page.next_page == listed[1].config
+            for t in page.checkpoints:
+                assert t.checkpoint["channel_values"] == {}
+                assert t.checkpoint["pending_sends"] == []
+                assert t.pending_writes is None
+
+    def test_list_across_threads_uses_index(self):
+        with PostgresSaver.from_conn_string(DEFAULT_URI) as saver:
+            saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+            saver.put(self.config_2, self.chkpnt_2, self.metadata_2, {})
+
+            with saver._cursor() as cur:
+                # the table is too small for the planner to pick the index
+                cur.execute("SET enable_seqscan = off")
+                plan = cur.execute(
+                    "EXPLAIN SELECT checkpoint_id FROM checkpoints "
+                    "ORDER BY checkpoint_id DESC LIMIT 1"
+                ).fetchall()
+                cur.execute("RESET enable_seqscan")
+            assert any(
+                "checkpoints_checkpoint_id_idx" in row["QUERY PLAN"] for row in plan
+            ), plan
+            assert [t.metadata for t in saver.list(None, limit=1)] == [self.metadata_2]
+
+    def test_copy_with_pipeline(self):
+        with pytest.raises(ValueError):
+            with PostgresSaver.from_conn_string(
+                DEFAULT_URI, pipeline=True, use_copy=True
+            ):
+                pass
@@ -2,23 +2,42 @@ import random
 import sqlite3
 import threading
 from contextlib import closing, contextmanager
-from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.checkpoint.base import (
+    DEFAULT_INDEXED_METADATA,
     WRITES_IDX_MAP,
     BaseCheckpointSaver,
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
     CheckpointTuple,
+    SegmentLog,
     SerializerProtocol,
     get_checkpoint_id,
 )
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.serde.types import ChannelProtocol
-from langgraph.checkpoint.sqlite.utils import search_where
+from langgraph.checkpoint.sqlite.utils import (
+    dump_writes_many,
+    metadata_indexes,
+    referenced_segments,
+    search_where,
+    select_segments,
+    split_segments,
+    unreferenced_segments,
+)
 
 _AIO_ERROR_MSG = (
     "The SqliteSaver does not support async methods. "
@@ -40,10 +59,14 @@ class SqliteSaver(BaseCheckpointSaver):
         scale to multiple threads.
         For a similar sqlite saver with `async` support,
         consider using [AsyncSqliteSaver][asyncsqlitesaver].
+        For many threads writing to a database file, consider using
+        `BatchedSqliteSaver` from `langgraph.checkpoint.sqlite.batch`.
 
     Args:
         conn (sqlite3.Connection): The SQLite database connection.
         serde (Optional[SerializerProtocol]): The serializer to use for serializing and deserializing checkpoints. Defaults to JsonPlusSerializerCompat.
+        shallow (bool): Whether to keep only the latest checkpoint of each thread and namespace, deleting the writes and segments no longer referenced by it. Defaults to False.
+        indexed_metadata (Sequence[str]): Metadata keys to index, in addition to "source" and "step", so that searches filtering on them don't scan all checkpoints. Keys must be identifiers. Defaults to ().
 
     Examples:
 
@@ -68,25 +91,42 @@ class SqliteSaver(BaseCheckpointSaver):
     conn: sqlite3.Connection
     is_setup: bool
 
+    # number of checkpoints `list` loads at a time, yielding them once loaded
+    list_batch_size = 100
+
     def __init__(
         self,
         conn: sqlite3.Connection,
         *,
         serde: Optional[SerializerProtocol] = None,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
     ) -> None:
         super().__init__(serde=serde)
         self.jsonplus_serde = JsonPlusSerializer()
         self.conn = conn
+        self.shallow = shallow
+        self.indexed_metadata = tuple(
+            dict.fromkeys((*DEFAULT_INDEXED_METADATA, *indexed_metadata))
+        )
         self.is_setup = False
         self.lock = threading.Lock()
 
     @classmethod
     @contextmanager
-    def from_conn_string(cls, conn_string: str) -> Iterator["SqliteSaver"]:
+    def from_conn_string(
+        cls,
+        conn_string: str,
+        *,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
+    ) -> Iterator["SqliteSaver"]:
         """Create a new SqliteSaver instance from a connection string.
 
         Args:
             conn_string (str): The SQLite connection string.
+            shallow (bool): Whether to keep only the latest checkpoint.
+            indexed_metadata (Sequence[str]): Metadata keys to index.
 
         Yields:
             SqliteSaver: A new SqliteSaver instance.
@@ -110,7 +150,7 @@ class SqliteSaver(BaseCheckpointSaver):
                 check_same_thread=False,
             )
         ) as conn:
-            yield SqliteSaver(conn)
+            yield SqliteSaver(conn, shallow=shallow, indexed_metadata=indexed_metadata)
 
     def setup(self) -> None:
         """Set up the checkpoint database.
@@ -146,7 +186,17 @@ class SqliteSaver(BaseCheckpointSaver):
                 value BLOB,
                 PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
             );
+            CREATE TABLE IF NOT EXISTS segments (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                channel TEXT NOT NULL,
+                segment_id TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, channel, segment_id)
+            );
             """
+            + metadata_indexes(self.indexed_metadata)
         )
 
         self.is_setup = True
@@ -244,6 +294,9 @@ class SqliteSaver(BaseCheckpointSaver):
                             "checkpoint_id": checkpoint_id,
                         }
                     }
+                # deserialize the checkpoint
+                loaded = self.serde.loads_typed((type, checkpoint))
+                self._load_segments(cur, [(thread_id, checkpoint_ns, loaded)])
                 # find any pending writes
                 cur.execute(
                     "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
@@ -253,10 +306,10 @@ class SqliteSaver(BaseCheckpointSaver):
                         str(config["configurable"]["checkpoint_id"]),
                     ),
                 )
-                # deserialize the checkpoint and metadata
+                # deserialize the metadata
                 return CheckpointTuple(
                     config,
-                    self.serde.loads_typed((type, checkpoint)),
+                    loaded,
                     self.jsonplus_serde.loads(metadata) if metadata is not None else {},
                     (
                         {
@@ -321,47 +374,56 @@ class SqliteSaver(BaseCheckpointSaver):
         ORDER BY checkpoint_id DESC"""
         if limit:
             query += f" LIMIT {limit}"
-        with self.cursor(transaction=False) as cur, closing(self.conn.cursor()) as wcur:
+        with self.cursor(transaction=False) as cur, closing(
+            cur.connection.cursor()
+        ) as wcur:
             cur.execute(query, param_values)
-            for (
-                thread_id,
-                checkpoint_ns,
-                checkpoint_id,
-                parent_checkpoint_id,
-                type,
-                checkpoint,
-                metadata,
-            ) in cur:
-                wcur.execute(
-                    "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
-                    (thread_id, checkpoint_ns, checkpoint_id),
-                )
-                yield CheckpointTuple(
+            while rows := cur.fetchmany(self.list_batch_size):
+                yield from self._load_rows(wcur, rows)
+
+    def _load_rows(
+        self, cur: sqlite3.Cursor, rows: Sequence[Tuple[Any, ...]]
+    ) -> Iterator[CheckpointTuple]:
+        """Load the checkpoint tuples of rows of the checkpoints table, loading
+        the segments of their segment logs at once."""
+        checkpoints = [
+            (thread_id, checkpoint_ns, self.serde.loads_typed((type, checkpoint)))
+            for thread_id, checkpoint_ns, _, _, type, checkpoint, _ in rows
+        ]
+        self._load_segments(cur, checkpoints)
+        for row, (_, _, loaded) in zip(rows, checkpoints):
+            thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id = row[:4]
+            metadata = row[6]
+            cur.execute(
+                "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            yield CheckpointTuple(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": checkpoint_id,
+                    }
+                },
+                loaded,
+                self.jsonplus_serde.loads(metadata) if metadata is not None else {},
+                (
                     {
                         "configurable": {
                             "thread_id": thread_id,
                             "checkpoint_ns": checkpoint_ns,
-                            "checkpoint_id": checkpoint_id,
+                            "checkpoint_id": parent_checkpoint_id,
                         }
-                    },
-                    self.serde.loads_typed((type, checkpoint)),
-                    self.jsonplus_serde.loads(metadata) if metadata is not None else {},
-                    (
-                        {
-                            "configurable": {
-                                "thread_id": thread_id,
-                                "checkpoint_ns": checkpoint_ns,
-                                "checkpoint_id": parent_checkpoint_id,
-                            }
-                        }
-                        if parent_checkpoint_id
-                        else None
-                    ),
-                    [
-                        (task_id, channel, self.serde.loads_typed((type, value)))
-                        for task_id, channel, type, value in wcur
-                    ],
-                )
+                    }
+                    if parent_checkpoint_id
+                    else None
+                ),
+                [
+                    (task_id, channel, self.serde.loads_typed((type, value)))
+                    for task_id, channel, type, value in cur
+                ],
+            )
 
     def put(
         self,
@@ -394,11 +456,82 @@ class SqliteSaver(BaseCheckpointSaver):
             >>> print(saved_config)
             {'configurable': {'thread_id': '1', 'checkpoint_ns': '', 'checkpoint_id': '1ef4f797-8335-6428-8001-8a1503f9b875'}}
         """
+        store = self._prepare_put(config, checkpoint, metadata)
+        with self.cursor() as cur:
+            return store(cur)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        """Store intermediate writes linked to a checkpoint.
+
+        This method saves intermediate writes associated with a checkpoint to the SQLite database.
+
+        Args:
+            config (RunnableConfig): Configuration of the related checkpoint.
+            writes (Sequence[Tuple[str, Any]]): List of writes to store, each as (channel, value) pair.
+            task_id (str): Identifier for the task creating the writes.
+        """
+        store = self._prepare_put_writes(config, writes, task_id)
+        with self.cursor() as cur:
+            store(cur)
+
+    def put_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks in one transaction.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `put_writes`.
+        """
+        store = self._prepare_put_writes_many(writes)
+        with self.cursor() as cur:
+            store(cur)
+
+    def _prepare_put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> Callable[[sqlite3.Cursor], RunnableConfig]:
+        """Serialize a checkpoint, returning the function that stores it with a
+        cursor and returns its config."""
         thread_id = config["configurable"]["thread_id"]
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
-        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        checkpoint_wo_segments, segments = split_segments(checkpoint)
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint_wo_segments)
         serialized_metadata = self.jsonplus_serde.dumps(metadata)
-        with self.cursor() as cur:
+
+        def store(cur: sqlite3.Cursor) -> RunnableConfig:
+            # segments already stored, eg. with previous versions of the
+            # channel, are neither serialized nor stored again
+            stored = set()
+            for query, params in select_segments(
+                (str(thread_id), checkpoint_ns, channel, segment_id)
+                for channel, segment_id, _ in segments
+            ):
+                cur.execute(query, params)
+                stored.update(cur.fetchall())
+            cur.executemany(
+                "INSERT OR IGNORE INTO segments (thread_id, checkpoint_ns, channel, segment_id, type, value) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(thread_id),
+                        checkpoint_ns,
+                        channel,
+                        segment_id,
+                        *self.serde.dumps_typed(items),
+                    )
+                    for channel, segment_id, items in segments
+                    if (str(thread_id), checkpoint_ns, channel, segment_id)
+                    not in stored
+                ],
+            )
             cur.execute(
                 "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)",
                 (
@@ -411,50 +544,126 @@ class SqliteSaver(BaseCheckpointSaver):
                     serialized_metadata,
                 ),
             )
-        return {
-            "configurable": {
-                "thread_id": thread_id,
-                "checkpoint_ns": checkpoint_ns,
-                "checkpoint_id": checkpoint["id"],
+            if self.shallow:
+                cur.execute(
+                    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id != ?",
+                    (str(thread_id), checkpoint_ns, checkpoint["id"]),
+                )
+                # writes of the parent checkpoint hold the pending sends of this one
+                cur.execute(
+                    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (?, ?)",
+                    (
+                        str(thread_id),
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id") or "",
+                    ),
+                )
+                cur.execute(
+                    "SELECT channel, segment_id FROM segments WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (str(thread_id), checkpoint_ns),
+                )
+                if unreferenced := unreferenced_segments(
+                    cur.fetchall(), checkpoint_wo_segments
+                ):
+                    cur.executemany(
+                        "DELETE FROM segments WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND segment_id = ?",
+                        [(str(thread_id), checkpoint_ns, *k) for k in unreferenced],
+                    )
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint["id"],
+                }
             }
-        }
 
-    def put_writes(
+        return store
+
+    def _prepare_put_writes(
         self,
         config: RunnableConfig,
         writes: Sequence[Tuple[str, Any]],
         task_id: str,
-    ) -> None:
-        """Store intermediate writes linked to a checkpoint.
-
-        This method saves intermediate writes associated with a checkpoint to the SQLite database.
-
-        Args:
-            config (RunnableConfig): Configuration of the related checkpoint.
-            writes (Sequence[Tuple[str, Any]]): List of writes to store, each as (channel, value) pair.
-            task_id (str): Identifier for the task creating the writes.
-        """
+    ) -> Callable[[sqlite3.Cursor], None]:
+        """Serialize the writes of a task, returning the function that stores
+        them with a cursor."""
         query = (
             "INSERT OR REPLACE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
             if all(w[0] in WRITES_IDX_MAP for w in writes)
             else "INSERT OR IGNORE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
         )
-        with self.cursor() as cur:
-            cur.executemany(
-                query,
-                [
-                    (
-                        str(config["configurable"]["thread_id"]),
-                        str(config["configurable"]["checkpoint_ns"]),
-                        str(config["configurable"]["checkpoint_id"]),
-                        task_id,
-                        WRITES_IDX_MAP.get(channel, idx),
-                        channel,
-                        *self.serde.dumps_typed(value),
-                    )
-                    for idx, (channel, value) in enumerate(writes)
-                ],
+        rows = [
+            (
+                str(config["configurable"]["thread_id"]),
+                str(config["configurable"]["checkpoint_ns"]),
+                str(config["configurable"]["checkpoint_id"]),
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
             )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+
+        def store(cur: sqlite3.Cursor) -> None:
+            cur.executemany(query, rows)
+
+        return store
+
+    def _prepare_put_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> Callable[[sqlite3.Cursor], None]:
+        """Serialize the writes of several tasks, returning the function that
+        stores them with a cursor."""
+        replace, ignore = dump_writes_many(self.serde, writes)
+
+        def store(cur: sqlite3.Cursor) -> None:
+            if replace:
+                cur.executemany(
+                    "INSERT OR REPLACE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    replace,
+                )
+            if ignore:
+                cur.executemany(
+                    "INSERT OR IGNORE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ignore,
+                )
+
+        return store
+
+    def _load_segments(
+        self,
+        cur: sqlite3.Cursor,
+        checkpoints: Sequence[Tuple[str, str, Checkpoint]],
+    ) -> None:
+        """Replace the segment IDs of checkpoints loaded from the checkpoints
+        table, as (thread ID, checkpoint namespace, checkpoint), with their
+        segment logs, selecting only the segments they reference."""
+        refs = [
+            ref
+            for thread_id, checkpoint_ns, checkpoint in checkpoints
+            for ref in referenced_segments(thread_id, checkpoint_ns, checkpoint)
+        ]
+        stored: Dict[Tuple[str, str, str, str], Tuple[str, bytes]] = {}
+        for query, params in select_segments(refs, values=True):
+            cur.execute(query, params)
+            for thread_id, checkpoint_ns, channel, segment_id, type, value in cur:
+                stored[(thread_id, checkpoint_ns, channel, segment_id)] = (type, value)
+        for thread_id, checkpoint_ns, checkpoint in checkpoints:
+            for channel, segment_ids in checkpoint.pop("channel_segments", {}).items():
+                checkpoint["channel_values"][channel] = SegmentLog(
+                    [
+                        (
+                            s,
+                            self.serde.loads_typed(
+                                stored[(thread_id, checkpoint_ns, channel, s)]
+                            ),
+                        )
+                        for s in segment_ids
+                    ]
+                )
 
     async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database asynchronously.
@@ -17,18 +17,28 @@ import aiosqlite
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.checkpoint.base import (
+    DEFAULT_INDEXED_METADATA,
     WRITES_IDX_MAP,
     BaseCheckpointSaver,
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
     CheckpointTuple,
+    SegmentLog,
     SerializerProtocol,
     get_checkpoint_id,
 )
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.serde.types import ChannelProtocol
-from langgraph.checkpoint.sqlite.utils import search_where
+from langgraph.checkpoint.sqlite.utils import (
+    dump_writes_many,
+    metadata_indexes,
+    referenced_segments,
+    search_where,
+    select_segments,
+    split_segments,
+    unreferenced_segments,
+)
 
 T = TypeVar("T", bound=callable)
 
@@ -43,6 +53,8 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
     Attributes:
         conn (aiosqlite.Connection): The asynchronous SQLite database connection.
         serde (SerializerProtocol): The serializer used for encoding/decoding checkpoints.
+        shallow (bool): Whether only the latest checkpoint of each thread and namespace is kept.
+        indexed_metadata (Sequence[str]): Metadata keys indexed for searches, in addition to "source" and "step".
 
     Tip:
         Requires the [aiosqlite](https://pypi.org/project/aiosqlite/) package.
@@ -110,15 +122,24 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
     lock: asyncio.Lock
     is_setup: bool
 
+    # number of checkpoints `alist` loads at a time, yielding them once loaded
+    list_batch_size = 100
+
     def __init__(
         self,
         conn: aiosqlite.Connection,
         *,
         serde: Optional[SerializerProtocol] = None,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
     ):
         super().__init__(serde=serde)
         self.jsonplus_serde = JsonPlusSerializer()
         self.conn = conn
+        self.shallow = shallow
+        self.indexed_metadata = tuple(
+            dict.fromkeys((*DEFAULT_INDEXED_METADATA, *indexed_metadata))
+        )
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_running_loop()
         self.is_setup = False
@@ -126,18 +147,26 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
     @classmethod
     @asynccontextmanager
     async def from_conn_string(
-        cls, conn_string: str
+        cls,
+        conn_string: str,
+        *,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
     ) -> AsyncIterator["AsyncSqliteSaver"]:
         """Create a new AsyncSqliteSaver instance from a connection string.
 
         Args:
             conn_string (str): The SQLite connection string.
+            shallow (bool): Whether to keep only the latest checkpoint.
+            indexed_metadata (Sequence[str]): Metadata keys to index.
 
         Yields:
             AsyncSqliteSaver: A new AsyncSqliteSaver instance.
         """
         async with aiosqlite.connect(conn_string) as conn:
-            yield AsyncSqliteSaver(conn)
+            yield AsyncSqliteSaver(
+                conn, shallow=shallow, indexed_metadata=indexed_metadata
+            )
 
     def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database.
@@ -220,6 +249,14 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
             self.aput_writes(config, writes, task_id), self.loop
         ).result()
 
+    def put_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        return asyncio.run_coroutine_threadsafe(
+            self.aput_writes_many(writes), self.loop
+        ).result()
+
     async def setup(self) -> None:
         """Set up the checkpoint database asynchronously.
 
@@ -256,7 +293,17 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
                     value BLOB,
                     PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
                 );
+                CREATE TABLE IF NOT EXISTS segments (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    channel TEXT NOT NULL,
+                    segment_id TEXT NOT NULL,
+                    type TEXT,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, channel, segment_id)
+                );
                 """
+                + metadata_indexes(self.indexed_metadata)
             ):
                 await self.conn.commit()
 
@@ -312,6 +359,9 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
                             "checkpoint_id": checkpoint_id,
                         }
                     }
+                # deserialize the checkpoint
+                loaded = self.serde.loads_typed((type, checkpoint))
+                await self._aload_segments(cur, [(thread_id, checkpoint_ns, loaded)])
                 # find any pending writes
                 await cur.execute(
                     "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
@@ -321,10 +371,10 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
                         str(config["configurable"]["checkpoint_id"]),
                     ),
                 )
-                # deserialize the checkpoint and metadata
+                # deserialize the metadata
                 return CheckpointTuple(
                     config,
-                    self.serde.loads_typed((type, checkpoint)),
+                    loaded,
                     self.jsonplus_serde.loads(metadata) if metadata is not None else {},
                     (
                         {
@@ -376,45 +426,53 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
         async with self.lock, self.conn.execute(
             query, params
         ) as cur, self.conn.cursor() as wcur:
-            async for (
-                thread_id,
-                checkpoint_ns,
-                checkpoint_id,
-                parent_checkpoint_id,
-                type,
-                checkpoint,
-                metadata,
-            ) in cur:
-                await wcur.execute(
-                    "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
-                    (thread_id, checkpoint_ns, checkpoint_id),
-                )
-                yield CheckpointTuple(
+            while rows := await cur.fetchmany(self.list_batch_size):
+                async for checkpoint_tuple in self._aload_rows(wcur, rows):
+                    yield checkpoint_tuple
+
+    async def _aload_rows(
+        self, cur: aiosqlite.Cursor, rows: Sequence[Tuple[Any, ...]]
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Load the checkpoint tuples of rows of the checkpoints table, loading
+        the segments of their segment logs at once."""
+        checkpoints = [
+            (thread_id, checkpoint_ns, self.serde.loads_typed((type, checkpoint)))
+            for thread_id, checkpoint_ns, _, _, type, checkpoint, _ in rows
+        ]
+        await self._aload_segments(cur, checkpoints)
+        for row, (_, _, loaded) in zip(rows, checkpoints):
+            thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id = row[:4]
+            metadata = row[6]
+            await cur.execute(
+                "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            yield CheckpointTuple(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": checkpoint_id,
+                    }
+                },
+                loaded,
+                self.jsonplus_serde.loads(metadata) if metadata is not None else {},
+                (
                     {
                         "configurable": {
                             "thread_id": thread_id,
                             "checkpoint_ns": checkpoint_ns,
-                            "checkpoint_id": checkpoint_id,
-                        }
-                    },
-                    self.serde.loads_typed((type, checkpoint)),
-                    self.jsonplus_serde.loads(metadata) if metadata is not None else {},
-                    (
-                        {
-                            "configurable": {
-                                "thread_id": thread_id,
-                                "checkpoint_ns": checkpoint_ns,
-                                "checkpoint_id": parent_checkpoint_id,
-                            }
+                            "checkpoint_id": parent_checkpoint_id,
                         }
-                        if parent_checkpoint_id
-                        else None
-                    ),
-                    [
-                        (task_id, channel, self.serde.loads_typed((type, value)))
-                        async for task_id, channel, type, value in wcur
-                    ],
-                )
+                    }
+                    if parent_checkpoint_id
+                    else None
+                ),
+                [
+                    (task_id, channel, self.serde.loads_typed((type, value)))
+                    async for task_id, channel, type, value in cur
+                ],
+            )
 
     async def aput(
         self,
@@ -440,20 +498,72 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
         await self.setup()
         thread_id = config["configurable"]["thread_id"]
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
-        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        checkpoint_wo_segments, segments = split_segments(checkpoint)
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint_wo_segments)
         serialized_metadata = self.jsonplus_serde.dumps(metadata)
-        async with self.lock, self.conn.execute(
-            "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (
-                str(config["configurable"]["thread_id"]),
-                checkpoint_ns,
-                checkpoint["id"],
-                config["configurable"].get("checkpoint_id"),
-                type_,
-                serialized_checkpoint,
-                serialized_metadata,
-            ),
-        ):
+        async with self.lock, self.conn.cursor() as cur:
+            # segments already stored, eg. with previous versions of the
+            # channel, are neither serialized nor stored again
+            stored = set()
+            for query, params in select_segments(
+                (str(thread_id), checkpoint_ns, channel, segment_id)
+                for channel, segment_id, _ in segments
+            ):
+                await cur.execute(query, params)
+                stored.update(await cur.fetchall())
+            await cur.executemany(
+                "INSERT OR IGNORE INTO segments (thread_id, checkpoint_ns, channel, segment_id, type, value) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(thread_id),
+                        checkpoint_ns,
+                        channel,
+                        segment_id,
+                        *self.serde.dumps_typed(items),
+                    )
+                    for channel, segment_id, items in segments
+                    if (str(thread_id), checkpoint_ns, channel, segment_id)
+                    not in stored
+                ],
+            )
+            await cur.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(config["configurable"]["thread_id"]),
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    serialized_checkpoint,
+                    serialized_metadata,
+                ),
+            )
+            if self.shallow:
+                await cur.execute(
+                    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id != ?",
+                    (str(thread_id), checkpoint_ns, checkpoint["id"]),
+                )
+                # writes of the parent checkpoint hold the pending sends of this one
+                await cur.execute(
+                    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (?, ?)",
+                    (
+                        str(thread_id),
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id") or "",
+                    ),
+                )
+                await cur.execute(
+                    "SELECT channel, segment_id FROM segments WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (str(thread_id), checkpoint_ns),
+                )
+                if unreferenced := unreferenced_segments(
+                    await cur.fetchall(), checkpoint_wo_segments
+                ):
+                    await cur.executemany(
+                        "DELETE FROM segments WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND segment_id = ?",
+                        [(str(thread_id), checkpoint_ns, *k) for k in unreferenced],
+                    )
             await self.conn.commit()
         return {
             "configurable": {
@@ -501,6 +611,62 @@ class AsyncSqliteSaver(BaseCheckpointSaver):
                 ],
             )
 
+    async def aput_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks asynchronously.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `aput_writes`.
+        """
+        replace, ignore = dump_writes_many(self.serde, writes)
+        await self.setup()
+        async with self.lock, self.conn.cursor() as cur:
+            if replace:
+                await cur.executemany(
+                    "INSERT OR REPLACE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    replace,
+                )
+            if ignore:
+                await cur.executemany(
+                    "INSERT OR IGNORE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ignore,
+                )
+
+    async def _aload_segments(
+        self,
+        cur: aiosqlite.Cursor,
+        checkpoints: Sequence[Tuple[str, str, Checkpoint]],
+    ) -> None:
+        """Replace the segment IDs of checkpoints loaded from the checkpoints
+        table, as (thread ID, checkpoint namespace, checkpoint), with their
+        segment logs, selecting only the segments they reference."""
+        refs = [
+            ref
+            for thread_id, checkpoint_ns, checkpoint in checkpoints
+            for ref in referenced_segments(thread_id, checkpoint_ns, checkpoint)
+        ]
+        stored: Dict[Tuple[str, str, str, str], Tuple[str, bytes]] = {}
+        for query, params in select_segments(refs, values=True):
+            await cur.execute(query, params)
+            async for thread_id, checkpoint_ns, channel, segment_id, type, value in cur:
+                stored[(thread_id, checkpoint_ns, channel, segment_id)] = (type, value)
+        for thread_id, checkpoint_ns, checkpoint in checkpoints:
+            for channel, segment_ids in checkpoint.pop("channel_segments", {}).items():
+                checkpoint["channel_values"][channel] = SegmentLog(
+                    [
+                        (
+                            s,
+                            self.serde.loads_typed(
+                                stored[(thread_id, checkpoint_ns, channel, s)]
+                            ),
+                        )
+                        for s in segment_ids
+                    ]
+                )
+
     def get_next_version(self, current: Optional[str], channel: ChannelProtocol) -> str:
         """Generate the next version ID for a channel.
 
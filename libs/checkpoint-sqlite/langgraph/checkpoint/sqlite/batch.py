@@ -0,0 +1,409 @@
+import asyncio
+import concurrent.futures
+import pathlib
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from langchain_core.runnables import RunnableConfig
+
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+)
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+T = TypeVar("T")
+
+
+class BatchedSqliteSaver(SqliteSaver):
+    """A checkpoint saver that stores checkpoints in a SQLite database file, for
+    use by many threads and event loops of one process at once.
+
+    All writes are made by a single background thread, which stores the writes
+    queued while it was committing in one transaction, so that concurrent
+    callers share the cost of a commit. Callers wait until their write is
+    committed. An error in one write doesn't affect the others of the same
+    transaction.
+
+    Reads use a pool of read-only connections, which in WAL mode neither wait
+    for writes nor for each other.
+
+    Args:
+        conn_string (str): Path of the SQLite database file.
+        serde (Optional[SerializerProtocol]): The serializer to use for serializing and deserializing checkpoints. Defaults to JsonPlusSerializerCompat.
+        shallow (bool): Whether to keep only the latest checkpoint of each thread and namespace. Defaults to False.
+        indexed_metadata (Sequence[str]): Metadata keys to index, in addition to "source" and "step". Defaults to ().
+        max_batch_size (int): Maximum number of writes stored in one transaction. Defaults to 100.
+        max_readers (int): Maximum number of read-only connections. Defaults to 4.
+
+    Examples:
+
+        >>> from langgraph.checkpoint.sqlite.batch import BatchedSqliteSaver
+        >>> with BatchedSqliteSaver.from_conn_string("checkpoints.sqlite") as saver:
+        ...     graph = builder.compile(checkpointer=saver)
+        ...     with ThreadPoolExecutor() as executor:
+        ...         for i in range(50):
+        ...             executor.submit(graph.invoke, 3, {"configurable": {"thread_id": str(i)}})
+    """  # noqa
+
+    def __init__(
+        self,
+        conn_string: str,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
+        max_batch_size: int = 100,
+        max_readers: int = 4,
+    ) -> None:
+        if conn_string == ":memory:":
+            raise ValueError(
+                "BatchedSqliteSaver needs the path of a database file, "
+                "shared by its connections"
+            )
+        super().__init__(
+            sqlite3.connect(
+                conn_string,
+                check_same_thread=False,
+                # transactions are managed by the writer thread
+                isolation_level=None,
+            ),
+            serde=serde,
+            shallow=shallow,
+            indexed_metadata=indexed_metadata,
+        )
+        self.setup()
+        self.uri = pathlib.Path(conn_string).resolve().as_uri() + "?mode=ro"
+        self.max_batch_size = max_batch_size
+        self.max_readers = max_readers
+        self.readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self.n_readers = 0
+        self.queue: queue.SimpleQueue[
+            Optional[Tuple[Callable[[sqlite3.Cursor], Any], concurrent.futures.Future]]
+        ] = queue.SimpleQueue()
+        self.closed = False
+        self.writer = threading.Thread(
+            target=self._write_loop, name="BatchedSqliteSaver", daemon=True
+        )
+        self.writer.start()
+
+    @classmethod
+    @contextmanager
+    def from_conn_string(
+        cls,
+        conn_string: str,
+        *,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
+        max_batch_size: int = 100,
+        max_readers: int = 4,
+    ) -> Iterator["BatchedSqliteSaver"]:
+        """Create a new BatchedSqliteSaver instance, closed on exit.
+
+        Args:
+            conn_string (str): Path of the SQLite database file.
+            shallow (bool): Whether to keep only the latest checkpoint.
+            indexed_metadata (Sequence[str]): Metadata keys to index.
+            max_batch_size (int): Maximum number of writes stored in one transaction.
+            max_readers (int): Maximum number of read-only connections.
+
+        Yields:
+            BatchedSqliteSaver: A new BatchedSqliteSaver instance.
+        """
+        saver = cls(
+            conn_string,
+            shallow=shallow,
+            indexed_metadata=indexed_metadata,
+            max_batch_size=max_batch_size,
+            max_readers=max_readers,
+        )
+        try:
+            yield saver
+        finally:
+            saver.close()
+
+    def close(self) -> None:
+        """Wait for the queued writes to be committed, then close the
+        connections."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.queue.put(None)
+        self.writer.join()
+        self.conn.close()
+        while True:
+            try:
+                self.readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        """Get a cursor on one of the read-only connections.
+
+        Args:
+            transaction (bool): Unused, writes are made by the writer thread.
+
+        Yields:
+            sqlite3.Cursor: A cursor for the SQLite database.
+        """
+        conn = self._acquire_reader()
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            self.readers.put(conn)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint to the database, waiting until it is committed.
+
+        Args:
+            config (RunnableConfig): The config to associate with the checkpoint.
+            checkpoint (Checkpoint): The checkpoint to save.
+            metadata (CheckpointMetadata): Additional metadata to save with the checkpoint.
+            new_versions (ChannelVersions): New channel versions as of this write.
+
+        Returns:
+            RunnableConfig: Updated configuration after storing the checkpoint.
+        """
+        return self._submit(self._prepare_put(config, checkpoint, metadata)).result()
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        """Store intermediate writes linked to a checkpoint, waiting until they
+        are committed.
+
+        Args:
+            config (RunnableConfig): Configuration of the related checkpoint.
+            writes (Sequence[Tuple[str, Any]]): List of writes to store, each as (channel, value) pair.
+            task_id (str): Identifier for the task creating the writes.
+        """
+        self._submit(self._prepare_put_writes(config, writes, task_id)).result()
+
+    def put_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks in one transaction,
+        waiting until they are committed.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `put_writes`.
+        """
+        self._submit(self._prepare_put_writes_many(writes)).result()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple from the database asynchronously, reading it
+        in a worker thread.
+
+        Args:
+            config (RunnableConfig): The config to use for retrieving the checkpoint.
+
+        Returns:
+            Optional[CheckpointTuple]: The retrieved checkpoint tuple, or None if no matching checkpoint was found.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.get_tuple, config
+        )
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints from the database asynchronously, reading them in
+        worker threads.
+
+        Args:
+            config (RunnableConfig): The config to use for listing the checkpoints.
+            filter (Optional[Dict[str, Any]]): Additional filtering criteria for metadata. Defaults to None.
+            before (Optional[RunnableConfig]): If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit (Optional[int]): The maximum number of checkpoints to return. Defaults to None.
+
+        Yields:
+            AsyncIterator[CheckpointTuple]: An asynchronous iterator of checkpoint tuples.
+        """
+        loop = asyncio.get_running_loop()
+        iter_ = self.list(config, filter=filter, before=before, limit=limit)
+        try:
+            while (
+                item := await loop.run_in_executor(None, next, iter_, None)
+            ) is not None:
+                yield item
+        finally:
+            # return the connection to the pool
+            iter_.close()
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint to the database asynchronously, waiting until it
+        is committed without blocking the event loop.
+
+        Args:
+            config (RunnableConfig): The config to associate with the checkpoint.
+            checkpoint (Checkpoint): The checkpoint to save.
+            metadata (CheckpointMetadata): Additional metadata to save with the checkpoint.
+            new_versions (ChannelVersions): New channel versions as of this write.
+
+        Returns:
+            RunnableConfig: Updated configuration after storing the checkpoint.
+        """
+        # shielded, so that cancelling the caller doesn't cancel the write
+        return await asyncio.shield(
+            asyncio.wrap_future(
+                self._submit(self._prepare_put(config, checkpoint, metadata))
+            )
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: List[Tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        """Store intermediate writes linked to a checkpoint asynchronously,
+        waiting until they are committed without blocking the event loop.
+
+        Args:
+            config (RunnableConfig): Configuration of the related checkpoint.
+            writes (List[Tuple[str, Any]]): List of writes to store, each as (channel, value) pair.
+            task_id (str): Identifier for the task creating the writes.
+        """
+        await asyncio.shield(
+            asyncio.wrap_future(
+                self._submit(self._prepare_put_writes(config, writes, task_id))
+            )
+        )
+
+    async def aput_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks in one transaction
+        asynchronously, waiting until they are committed without blocking the
+        event loop.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `aput_writes`.
+        """
+        await asyncio.shield(
+            asyncio.wrap_future(self._submit(self._prepare_put_writes_many(writes)))
+        )
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self.readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.n_readers < self.max_readers:
+                self.n_readers += 1
+                return sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        # all connections are in use, wait for one to be returned
+        return self.readers.get()
+
+    def _submit(
+        self, fn: Callable[[sqlite3.Cursor], T]
+    ) -> "concurrent.futures.Future[T]":
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("BatchedSqliteSaver is closed")
+            self.queue.put((fn, fut))
+        return fut
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            # store the writes queued since the last commit with this one
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(
+        self,
+        batch: List[Tuple[Callable[[sqlite3.Cursor], Any], concurrent.futures.Future]],
+    ) -> None:
+        # claim the futures, skipping the writes cancelled while queued
+        batch = [(fn, fut) for fn, fut in batch if fut.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes: List[Tuple[Any, Optional[BaseException]]] = []
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            for fn, _ in batch:
+                # a failed write is rolled back alone
+                cur.execute("SAVEPOINT write")
+                try:
+                    outcomes.append((fn(cur), None))
+                except Exception as exc:
+                    cur.execute("ROLLBACK TO write")
+                    outcomes.append((None, exc))
+                cur.execute("RELEASE write")
+            cur.execute("COMMIT")
+        except Exception as exc:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            for _, fut in batch:
+                fut.set_exception(exc)
+            return
+        finally:
+            cur.close()
+        for (_, fut), (result, exc) in zip(batch, outcomes):
+            if exc is None:
+                fut.set_result(result)
+            else:
+                fut.set_exception(exc)
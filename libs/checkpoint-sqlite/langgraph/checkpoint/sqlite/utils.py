@@ -1,9 +1,40 @@
 import json
-from typing import Any, Dict, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
 from langchain_core.runnables import RunnableConfig
 
-from langgraph.checkpoint.base import get_checkpoint_id
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    Checkpoint,
+    SegmentLog,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+
+def _metadata_expression(key: str) -> str:
+    """Return the expression extracting a metadata key, shared by the search
+    predicates and the indexes, which SQLite only uses for the same expression."""
+    return f"json_extract(CAST(metadata AS TEXT), '$.{key}')"
+
+
+def metadata_indexes(keys: Sequence[str]) -> str:
+    """Return the statements creating an index on each of the metadata keys.
+
+    The indexes are ordered by checkpoint ID, so that searches filtering on
+    one key with equality get their results in order, newest first.
+    """
+    statements = []
+    for key in keys:
+        if not key.isidentifier():
+            raise ValueError(
+                f"Metadata key {key!r} can't be indexed, not an identifier"
+            )
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS checkpoints_metadata_{key} "
+            f"ON checkpoints ({_metadata_expression(key)}, checkpoint_id);"
+        )
+    return "\n".join(statements)
 
 
 def _metadata_predicate(
@@ -42,9 +73,7 @@ def _metadata_predicate(
     # process metadata query
     for query_key, query_value in metadata_filter.items():
         operator, param_value = _where_value(query_value)
-        predicates.append(
-            f"json_extract(CAST(metadata AS TEXT), '$.{query_key}') {operator}"
-        )
+        predicates.append(f"{_metadata_expression(query_key)} {operator}")
         param_values.append(param_value)
 
     return (predicates, param_values)
@@ -91,3 +120,134 @@ def search_where(
         param_values.append(get_checkpoint_id(before))
 
     return ("WHERE " + " AND ".join(wheres) if wheres else "", param_values)
+
+
+def split_segments(
+    checkpoint: Checkpoint,
+) -> Tuple[Checkpoint, Sequence[Tuple[str, str, Sequence[Any]]]]:
+    """Replace the segment logs in a checkpoint with the IDs of their segments.
+
+    This method returns a tuple of the checkpoint to serialize and the segments
+    to store, as (channel, segment ID, items). All segments of each log are
+    returned, as more than one may have been appended since the previous
+    checkpoint, or it may have been stored in another thread or namespace, so
+    savers look up the stored ones with select_segments() to only serialize and
+    store the others.
+    """
+    logs = {
+        k: v
+        for k, v in checkpoint["channel_values"].items()
+        if isinstance(v, SegmentLog)
+    }
+    if not logs:
+        return checkpoint, []
+    return (
+        {
+            **checkpoint,
+            "channel_values": {
+                k: v for k, v in checkpoint["channel_values"].items() if k not in logs
+            },
+            "channel_segments": {
+                k: [segment_id for segment_id, _ in v.segments] for k, v in logs.items()
+            },
+        },
+        [(k, *segment) for k, v in logs.items() for segment in v.segments],
+    )
+
+
+# maximum number of segment IDs bound to one query, so that queries stay below
+# the limit of SQLite on the number of parameters (999 before SQLite 3.32)
+SEGMENT_IDS_PER_QUERY = 500
+
+
+def select_segments(
+    segments: Iterable[Tuple[str, str, str, str]],
+    *,
+    values: bool = False,
+) -> Iterator[Tuple[str, Tuple[Any, ...]]]:
+    """Return the queries selecting some of the stored segments.
+
+    This method takes the (thread ID, checkpoint namespace, channel, segment ID)
+    of the segments to select, and returns (query, params) tuples, each
+    selecting the thread ID, checkpoint namespace, channel and segment ID of
+    up to SEGMENT_IDS_PER_QUERY of the stored ones, followed by their type and
+    value if `values` is True.
+    """
+    columns = "thread_id, checkpoint_ns, channel, segment_id"
+    if values:
+        columns += ", type, value"
+    grouped: Dict[Tuple[str, str, str], Dict[str, None]] = {}
+    for thread_id, checkpoint_ns, channel, segment_id in segments:
+        grouped.setdefault((thread_id, checkpoint_ns, channel), {})[segment_id] = None
+    for key, segment_ids in grouped.items():
+        ids = list(segment_ids)
+        for i in range(0, len(ids), SEGMENT_IDS_PER_QUERY):
+            chunk = ids[i : i + SEGMENT_IDS_PER_QUERY]
+            yield (
+                f"SELECT {columns} FROM segments WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND segment_id IN ({', '.join('?' * len(chunk))})",
+                (*key, *chunk),
+            )
+
+
+def referenced_segments(
+    thread_id: str,
+    checkpoint_ns: str,
+    checkpoint: Checkpoint,
+) -> Sequence[Tuple[str, str, str, str]]:
+    """Return the segments referenced by a checkpoint as loaded from the
+    checkpoints table, as (thread ID, checkpoint namespace, channel, segment ID)."""
+    return [
+        (thread_id, checkpoint_ns, channel, segment_id)
+        for channel, segment_ids in checkpoint.get("channel_segments", {}).items()
+        for segment_id in segment_ids
+    ]
+
+
+def unreferenced_segments(
+    stored: Sequence[Tuple[str, str]],
+    checkpoint: Checkpoint,
+) -> Sequence[Tuple[str, str]]:
+    """Return the stored segments not referenced by a checkpoint.
+
+    This method takes the (channel, segment ID) of the stored segments and a
+    checkpoint as returned by split_segments(), and returns those of the
+    stored segments that none of its segment logs contains.
+    """
+    referenced = {
+        (channel, segment_id)
+        for channel, segment_ids in checkpoint.get("channel_segments", {}).items()
+        for segment_id in segment_ids
+    }
+    return [tuple(k) for k in stored if tuple(k) not in referenced]
+
+
+def dump_writes_many(
+    serde: SerializerProtocol,
+    writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+) -> Tuple[Sequence[Tuple[Any, ...]], Sequence[Tuple[Any, ...]]]:
+    """Return rows of the writes table for a batch of task writes.
+
+    This method returns a tuple of rows to insert or replace, for tasks that
+    only wrote special channels, and rows to insert or ignore, for all others.
+    This mirrors the choice of query made by put_writes() for a single task.
+    """
+    replace: list[Tuple[Any, ...]] = []
+    ignore: list[Tuple[Any, ...]] = []
+    for config, task_writes, task_id in writes:
+        rows = [
+            (
+                str(config["configurable"]["thread_id"]),
+                str(config["configurable"]["checkpoint_ns"]),
+                str(config["configurable"]["checkpoint_id"]),
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *serde.dumps_typed(value),
+            )
+            for idx, (channel, value) in enumerate(task_writes)
+        ]
+        if all(w[0] in WRITES_IDX_MAP for w in task_writes):
+            replace.extend(rows)
+        else:
+            ignore.extend(rows)
+    return replace, ignore
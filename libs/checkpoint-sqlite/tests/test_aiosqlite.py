@@ -4,9 +4,11 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import (
     Checkpoint,
     CheckpointMetadata,
+    SegmentLog,
     create_checkpoint,
     empty_checkpoint,
 )
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
 
@@ -96,3 +98,84 @@ class TestAsyncSqliteSaver:
             } == {"", "inner"}
 
             # TODO: test before and limit params
+
+    async def test_shallow(self):
+        async with AsyncSqliteSaver.from_conn_string(":memory:", shallow=True) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-4", "checkpoint_ns": ""}
+            }
+            chkpnt_1: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"log": SegmentLog([("a", [1])])},
+                "channel_versions": {"log": 1},
+            }
+            config_1 = await saver.aput(config, chkpnt_1, self.metadata_1, {"log": 1})
+            await saver.aput_writes(config_1, [("__pregel_tasks", "send")], "task-1")
+            chkpnt_2: Checkpoint = {
+                **create_checkpoint(chkpnt_1, None, 1),
+                "channel_values": {"log": SegmentLog([("a", [1]), ("b", [2])])},
+                "channel_versions": {"log": 2},
+            }
+            config_2 = await saver.aput(config_1, chkpnt_2, self.metadata_2, {"log": 2})
+            await saver.aput_writes(config_2, [("log", 3)], "task-2")
+            chkpnt_3: Checkpoint = {
+                **create_checkpoint(chkpnt_2, None, 2),
+                "channel_values": {"log": SegmentLog([("c", [1, 2])])},
+                "channel_versions": {"log": 3},
+            }
+            config_3 = await saver.aput(config_2, chkpnt_3, self.metadata_2, {"log": 3})
+
+            # only the latest checkpoint is kept
+            assert [t.config async for t in saver.alist(config)] == [config_3]
+            assert await saver.aget_tuple(config_1) is None
+            # along with the writes of its parent, which hold its pending sends
+            async with saver.conn.execute(
+                "SELECT checkpoint_id, task_id FROM writes"
+            ) as cur:
+                assert await cur.fetchall() == [(chkpnt_2["id"], "task-2")]
+            # segments it no longer references are deleted
+            async with saver.conn.execute(
+                "SELECT channel, segment_id FROM segments"
+            ) as cur:
+                assert await cur.fetchall() == [("log", "c")]
+            assert (await saver.aget(config))["channel_values"] == {
+                "log": SegmentLog([("c", [1, 2])])
+            }
+
+    async def test_segments_serialized_once(self):
+        class CountingSerializer(JsonPlusSerializer):
+            calls = 0
+
+            def dumps_typed(self, obj):
+                self.calls += 1
+                return super().dumps_typed(obj)
+
+        serde = CountingSerializer()
+        async with AsyncSqliteSaver.from_conn_string(":memory:") as saver:
+            saver.serde = serde
+            saver.list_batch_size = 3
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt: Checkpoint = empty_checkpoint()
+            segments = []
+            dumps = []
+            for v in range(1, 11):
+                segments.append((str(v), [v]))
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {"log": SegmentLog(segments)},
+                    "channel_versions": {"log": v},
+                }
+                before = serde.calls
+                await saver.aput(config, chkpnt, self.metadata_1, {"log": v})
+                dumps.append(serde.calls - before)
+            # the checkpoint and the new segment, however long the log
+            assert dumps == [2] * 10
+            assert [
+                c.checkpoint["channel_values"]["log"].segments
+                async for c in saver.alist(config)
+            ] == [
+                tuple((str(s), [s]) for s in range(1, v + 1))
+                for v in range(10, 0, -1)
+            ]
@@ -0,0 +1,121 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.runnables import RunnableConfig
+
+from langgraph.checkpoint.base import (
+    CheckpointMetadata,
+    create_checkpoint,
+    empty_checkpoint,
+)
+from langgraph.checkpoint.sqlite.batch import BatchedSqliteSaver
+
+
+class TestBatchedSqliteSaver:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.path = str(tmp_path / "checkpoints.sqlite")
+        self.metadata: CheckpointMetadata = {"source": "input", "step": 1}
+
+    def config(self, thread_id: str) -> RunnableConfig:
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+    def test_concurrent_puts(self):
+        with BatchedSqliteSaver.from_conn_string(self.path) as saver:
+
+            def run(i: int) -> None:
+                config = self.config(str(i))
+                for step in range(5):
+                    checkpoint = create_checkpoint(empty_checkpoint(), None, step)
+                    config = saver.put(config, checkpoint, self.metadata, {})
+                    saver.put_writes(config, [("foo", i)], "task")
+
+            with ThreadPoolExecutor(max_workers=20) as executor:
+                list(executor.map(run, range(20)))
+
+            assert len(list(saver.list(None))) == 100
+            for i in range(20):
+                saved = saver.get_tuple(self.config(str(i)))
+                assert saved.pending_writes == [("task", "foo", i)]
+
+        # writes are committed to the database file
+        with sqlite3.connect(self.path) as conn:
+            assert conn.execute("SELECT count(*) FROM checkpoints").fetchone() == (100,)
+
+    def test_failed_write(self):
+        with BatchedSqliteSaver.from_conn_string(self.path) as saver:
+            config = saver.put(self.config("1"), empty_checkpoint(), {}, {})
+
+            def fail(cur: sqlite3.Cursor) -> None:
+                cur.execute(
+                    "INSERT INTO checkpoints (thread_id, checkpoint_id) VALUES ('2', '1')"
+                )
+                raise ValueError("failed")
+
+            failed = saver._submit(fail)
+            stored = saver._submit(
+                saver._prepare_put_writes(config, [("foo", 1)], "task")
+            )
+            with pytest.raises(ValueError, match="failed"):
+                failed.result()
+            # the other writes of the transaction are committed
+            stored.result()
+            assert saver.get_tuple(config).pending_writes == [("task", "foo", 1)]
+            # while the failed one is rolled back
+            assert saver.get_tuple(self.config("2")) is None
+
+    async def test_async(self):
+        with BatchedSqliteSaver.from_conn_string(self.path) as saver:
+            config = await saver.aput(self.config("1"), empty_checkpoint(), {}, {})
+            await saver.aput_writes(config, [("foo", 1)], "task")
+
+            saved = await saver.aget_tuple(self.config("1"))
+            assert saved.config == config
+            assert saved.pending_writes == [("task", "foo", 1)]
+            assert [t.config async for t in saver.alist(None)] == [config]
+
+    async def test_async_cancelled(self):
+        with BatchedSqliteSaver.from_conn_string(self.path) as saver:
+            # hold the writer thread so that the writes below stay queued
+            started, release = threading.Event(), threading.Event()
+
+            def block(cur: sqlite3.Cursor) -> None:
+                started.set()
+                release.wait()
+
+            blocked = saver._submit(block)
+            started.wait()
+            task = asyncio.create_task(
+                saver.aput(self.config("1"), empty_checkpoint(), {}, {})
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            # a queued write cancelled directly is skipped
+            skipped = saver._submit(
+                saver._prepare_put(self.config("2"), empty_checkpoint(), {})
+            )
+            assert skipped.cancel()
+            release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            blocked.result()
+
+            # the writer thread is still alive, and later writes are committed
+            config = await saver.aput(self.config("3"), empty_checkpoint(), {}, {})
+            assert (await saver.aget_tuple(config)).config == config
+            # the cancelled aput was still committed, the cancelled future wasn't
+            assert await saver.aget_tuple(self.config("1")) is not None
+            assert await saver.aget_tuple(self.config("2")) is None
+
+    def test_memory_database(self):
+        with pytest.raises(ValueError, match="database file"):
+            BatchedSqliteSaver(":memory:")
+
+    def test_closed(self):
+        saver = BatchedSqliteSaver(self.path)
+        saver.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            saver.put(self.config("1"), empty_checkpoint(), {}, {})
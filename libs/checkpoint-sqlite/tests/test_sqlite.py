@@ -4,9 +4,11 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import (
     Checkpoint,
     CheckpointMetadata,
+    SegmentLog,
     create_checkpoint,
     empty_checkpoint,
 )
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.checkpoint.sqlite.utils import _metadata_predicate, search_where
 
@@ -151,3 +153,143 @@ class TestSqliteSaver:
             with pytest.raises(NotImplementedError, match="AsyncSqliteSaver"):
                 async for _ in saver.alist(self.config_1):
                     pass
+
+    def test_shallow(self):
+        with SqliteSaver.from_conn_string(":memory:", shallow=True) as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-4", "checkpoint_ns": ""}
+            }
+            chkpnt_1: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"log": SegmentLog([("a", [1])])},
+                "channel_versions": {"log": 1},
+            }
+            config_1 = saver.put(config, chkpnt_1, self.metadata_1, {"log": 1})
+            saver.put_writes(config_1, [("__pregel_tasks", "send")], "task-1")
+            chkpnt_2: Checkpoint = {
+                **create_checkpoint(chkpnt_1, None, 1),
+                "channel_values": {"log": SegmentLog([("a", [1]), ("b", [2])])},
+                "channel_versions": {"log": 2},
+            }
+            config_2 = saver.put(config_1, chkpnt_2, self.metadata_2, {"log": 2})
+            saver.put_writes(config_2, [("log", 3)], "task-2")
+            chkpnt_3: Checkpoint = {
+                **create_checkpoint(chkpnt_2, None, 2),
+                "channel_values": {"log": SegmentLog([("c", [1, 2])])},
+                "channel_versions": {"log": 3},
+            }
+            config_3 = saver.put(config_2, chkpnt_3, self.metadata_2, {"log": 3})
+
+            # only the latest checkpoint is kept
+            assert [t.config for t in saver.list(config)] == [config_3]
+            assert saver.get_tuple(config_1) is None
+            # along with the writes of its parent, which hold its pending sends
+            assert saver.conn.execute(
+                "SELECT checkpoint_id, task_id FROM writes"
+            ).fetchall() == [(chkpnt_2["id"], "task-2")]
+            # segments it no longer references are deleted
+            assert saver.conn.execute(
+                "SELECT channel, segment_id FROM segments"
+            ).fetchall() == [("log", "c")]
+            assert saver.get(config)["channel_values"] == {
+                "log": SegmentLog([("c", [1, 2])])
+            }
+
+    def test_segments(self):
+        with SqliteSaver.from_conn_string(":memory:") as saver:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt_1: Checkpoint = {
+                **empty_checkpoint(),
+                "channel_values": {"log": SegmentLog([("a", [1])])},
+                "channel_versions": {"log": 1},
+            }
+            config_1 = saver.put(config, chkpnt_1, self.metadata_1, {"log": 1})
+            # more than one segment appended since the previous checkpoint
+            log = SegmentLog([("a", [1]), ("b", [2]), ("c", [3])])
+            chkpnt_2: Checkpoint = {
+                **create_checkpoint(chkpnt_1, None, 1),
+                "channel_values": {"log": log},
+                "channel_versions": {"log": 2},
+            }
+            saver.put(config_1, chkpnt_2, self.metadata_2, {"log": 2})
+            assert saver.get(config)["channel_values"] == {"log": log}
+            # a checkpoint put in a thread that never stored its segments
+            other: RunnableConfig = {
+                "configurable": {"thread_id": "thread-6", "checkpoint_ns": ""}
+            }
+            saver.put(other, chkpnt_2, self.metadata_2, {"log": 2})
+            assert saver.get(other)["channel_values"] == {"log": log}
+
+    def test_segments_serialized_once(self):
+        class CountingSerializer(JsonPlusSerializer):
+            calls = 0
+
+            def dumps_typed(self, obj):
+                self.calls += 1
+                return super().dumps_typed(obj)
+
+        serde = CountingSerializer()
+        with SqliteSaver.from_conn_string(":memory:") as saver:
+            saver.serde = serde
+            saver.list_batch_size = 3
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+            }
+            chkpnt: Checkpoint = empty_checkpoint()
+            segments = []
+            dumps = []
+            for v in range(1, 11):
+                segments.append((str(v), [v]))
+                chkpnt = {
+                    **create_checkpoint(chkpnt, None, v),
+                    "channel_values": {"log": SegmentLog(segments)},
+                    "channel_versions": {"log": v},
+                }
+                before = serde.calls
+                config = saver.put(config, chkpnt, self.metadata_1, {"log": v})
+                dumps.append(serde.calls - before)
+            # the checkpoint and the new segment, however long the log
+            assert dumps == [2] * 10
+            # a new log replacing the segments stored so far
+            chkpnt = {
+                **create_checkpoint(chkpnt, None, 11),
+                "channel_values": {"log": SegmentLog([("11", [11])])},
+                "channel_versions": {"log": 11},
+            }
+            saver.put(config, chkpnt, self.metadata_1, {"log": 11})
+            assert [
+                c.checkpoint["channel_values"]["log"].segments
+                for c in saver.list(
+                    {"configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}}
+                )
+            ] == [(("11", [11]),)] + [
+                tuple((str(s), [s]) for s in range(1, v + 1))
+                for v in range(10, 0, -1)
+            ]
+
+    def test_search_indexed_metadata(self):
+        with SqliteSaver.from_conn_string(
+            ":memory:", indexed_metadata=["score"]
+        ) as saver:
+            saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+            saver.put(self.config_2, self.chkpnt_2, self.metadata_2, {})
+            saver.put(self.config_3, self.chkpnt_3, self.metadata_3, {})
+
+            for filter, index in (
+                ({"source": "loop"}, "checkpoints_metadata_source"),
+                ({"step": 1}, "checkpoints_metadata_step"),
+                ({"score": 1}, "checkpoints_metadata_score"),
+            ):
+                where, params = search_where(None, filter)
+                plan = saver.conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT checkpoint_id FROM checkpoints {where} ORDER BY checkpoint_id DESC",
+                    params,
+                ).fetchall()
+                # searches use the index instead of scanning all checkpoints
+                assert any(index in row[-1] for row in plan), plan
+                assert len(list(saver.list(None, filter=filter))) == 1
+
+            with pytest.raises(ValueError, match="not an identifier"):
+                SqliteSaver(saver.conn, indexed_metadata=["a' OR 1"]).setup()
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import (
     Any,
@@ -9,6 +10,7 @@ from typing import (
     Mapping,
     NamedTuple,
     Optional,
+    Sequence,
     Tuple,
     TypedDict,
     TypeVar,
@@ -59,6 +61,11 @@ class CheckpointMetadata(TypedDict, total=False):
     """
 
 
+DEFAULT_INDEXED_METADATA = ("source", "step")
+"""Metadata keys always indexed by the checkpoint savers that index metadata
+for filtered searches, in addition to the keys they're configured with."""
+
+
 class TaskInfo(TypedDict):
     status: Literal["scheduled", "success", "error"]
 
@@ -164,6 +171,37 @@ class CheckpointTuple(NamedTuple):
     pending_writes: Optional[List[PendingWrite]] = None
 
 
+class CheckpointPage(NamedTuple):
+    """A page of checkpoints, as returned by `list_page`."""
+
+    checkpoints: List[CheckpointTuple]
+    """The checkpoints of the page, newest first."""
+    next_page: Optional[RunnableConfig]
+    """The config to pass as `before` to get the next page, or None if this is
+    the last page."""
+
+
+@dataclass(frozen=True)
+class SegmentLog:
+    """Channel snapshot made of a log of appended segments.
+
+    Each segment is a `(segment_id, items)` pair, and is never modified once
+    created, so checkpointers can store the channel value as the list of its
+    segment IDs, and each segment only once. When saving a snapshot,
+    they look up which of its segments are already stored, and only persist
+    the ones that aren't, which may be more than the last one (eg. after the
+    channel was replaced, or if a previous snapshot wasn't saved).
+    """
+
+    segments: Sequence[tuple[str, Sequence[Any]]]
+
+    def __post_init__(self) -> None:
+        # deserializers may turn the (segment_id, items) pairs into lists
+        object.__setattr__(
+            self, "segments", tuple((s, items) for s, items in self.segments)
+        )
+
+
 CheckpointThreadId = ConfigurableFieldSpec(
     id="thread_id",
     annotation=str,
@@ -274,6 +312,43 @@ class BaseCheckpointSaver:
         """
         raise NotImplementedError
 
+    def list_page(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        page_size: int = 100,
+        values: bool = True,
+    ) -> CheckpointPage:
+        """List one page of the checkpoints that match the given criteria.
+
+        The checkpoints of the page are read at once, so the next page can be
+        requested later without holding on to the database. Pages are
+        consecutive for checkpoints listed in order of checkpoint ID, ie. those
+        of one thread and namespace.
+
+        Args:
+            config (Optional[RunnableConfig]): Base configuration for filtering checkpoints.
+            filter (Optional[Dict[str, Any]]): Additional filtering criteria.
+            before (Optional[RunnableConfig]): List checkpoints created before this
+                configuration, ie. the `next_page` of the previous page.
+            page_size (int): Maximum number of checkpoints in the page, at least 1.
+                Defaults to 100.
+            values (bool): Whether the channel values and pending writes of the
+                checkpoints are needed. If not, savers may leave them out.
+                Defaults to True.
+
+        Returns:
+            CheckpointPage: The checkpoints of the page, and the config to get the next one.
+        """
+        _check_page_size(page_size)
+        # read one more checkpoint to know if there is a next page
+        checkpoints = list(
+            self.list(config, filter=filter, before=before, limit=page_size + 1)
+        )
+        return _checkpoint_page(checkpoints, page_size)
+
     def put(
         self,
         config: RunnableConfig,
@@ -315,6 +390,22 @@ class BaseCheckpointSaver:
         """
         raise NotImplementedError
 
+    def put_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks in one call.
+
+        The default implementation calls `put_writes` once per task. Override it
+        to store the whole batch in fewer round trips.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `put_writes`.
+        """
+        for config, task_writes, task_id in writes:
+            self.put_writes(config, task_writes, task_id)
+
     async def aget(self, config: RunnableConfig) -> Optional[Checkpoint]:
         """Asynchronously fetch a checkpoint using the given configuration.
 
@@ -366,6 +457,41 @@ class BaseCheckpointSaver:
         raise NotImplementedError
         yield
 
+    async def alist_page(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        page_size: int = 100,
+        values: bool = True,
+    ) -> CheckpointPage:
+        """Asynchronously list one page of the checkpoints that match the given
+        criteria.
+
+        Args:
+            config (Optional[RunnableConfig]): Base configuration for filtering checkpoints.
+            filter (Optional[Dict[str, Any]]): Additional filtering criteria.
+            before (Optional[RunnableConfig]): List checkpoints created before this
+                configuration, ie. the `next_page` of the previous page.
+            page_size (int): Maximum number of checkpoints in the page, at least 1.
+                Defaults to 100.
+            values (bool): Whether the channel values and pending writes of the
+                checkpoints are needed. If not, savers may leave them out.
+                Defaults to True.
+
+        Returns:
+            CheckpointPage: The checkpoints of the page, and the config to get the next one.
+        """
+        _check_page_size(page_size)
+        checkpoints = [
+            c
+            async for c in self.alist(
+                config, filter=filter, before=before, limit=page_size + 1
+            )
+        ]
+        return _checkpoint_page(checkpoints, page_size)
+
     async def aput(
         self,
         config: RunnableConfig,
@@ -407,6 +533,22 @@ class BaseCheckpointSaver:
         """
         raise NotImplementedError
 
+    async def aput_writes_many(
+        self,
+        writes: Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Asynchronously store intermediate writes of several tasks in one call.
+
+        The default implementation calls `aput_writes` once per task. Override it
+        to store the whole batch in fewer round trips.
+
+        Args:
+            writes (Sequence[Tuple[RunnableConfig, Sequence[Tuple[str, Any]], str]]): List of
+                (config, writes, task_id) tuples, as accepted by `aput_writes`.
+        """
+        for config, task_writes, task_id in writes:
+            await self.aput_writes(config, task_writes, task_id)
+
     def get_next_version(self, current: Optional[V], channel: ChannelProtocol) -> V:
         """Generate the next version ID for a channel.
 
@@ -430,6 +572,20 @@ class EmptyChannelError(Exception):
     pass
 
 
+def _check_page_size(page_size: int) -> None:
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+
+
+def _checkpoint_page(
+    checkpoints: List[CheckpointTuple], page_size: int
+) -> CheckpointPage:
+    if len(checkpoints) > page_size:
+        del checkpoints[page_size:]
+        return CheckpointPage(checkpoints, checkpoints[-1].config)
+    return CheckpointPage(checkpoints, None)
+
+
 def get_checkpoint_id(config: RunnableConfig) -> Optional[str]:
     """Get checkpoint ID in a backwards-compatible manner (fallback on thread_ts)."""
     return config["configurable"].get(
@@ -1,20 +1,34 @@
 import asyncio
+import json
 import random
 from collections import defaultdict
 from contextlib import AbstractAsyncContextManager, AbstractContextManager
 from functools import partial
 from types import TracebackType
-from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.checkpoint.base import (
+    DEFAULT_INDEXED_METADATA,
     WRITES_IDX_MAP,
     BaseCheckpointSaver,
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
     CheckpointTuple,
+    SegmentLog,
     SerializerProtocol,
     get_checkpoint_id,
 )
@@ -27,6 +41,11 @@ class MemorySaver(
     """An in-memory checkpoint saver.
 
     This checkpoint saver stores checkpoints in memory using a defaultdict.
+    Channel values are stored separately from checkpoints, once per
+    (channel, version), so each checkpoint only serializes the channels
+    that were updated since the previous one. Segments of channels checkpointed
+    as a `SegmentLog` are stored once each, and referenced by ID from every
+    version of the channel that contains them.
 
     Note:
         Since checkpoints are saved in memory, they will be lost when the program exits.
@@ -34,6 +53,13 @@ class MemorySaver(
 
     Args:
         serde (Optional[SerializerProtocol]): The serializer to use for serializing and deserializing checkpoints. Defaults to None.
+        shallow (bool): Whether to keep only the latest checkpoint of each thread
+            and namespace. Channel values and writes no longer referenced by it
+            are deleted when a new checkpoint is saved, so past checkpoints
+            can't be listed or resumed from. Defaults to False.
+        indexed_metadata (Sequence[str]): Metadata keys to index, in addition to
+            "source" and "step". Searches filtering on indexed keys only load the
+            checkpoints matching their values. Defaults to ().
 
     Examples:
 
@@ -58,15 +84,30 @@ class MemorySaver(
     writes: defaultdict[
         tuple[str, str, str], dict[tuple[str, int], tuple[str, str, bytes]]
     ]
+    # (thread ID, checkpoint NS, channel, version or segment ID) -> serialized value
+    blobs: dict[tuple[str, str, str, Union[str, int, float]], tuple[str, bytes]]
+    # (metadata key, indexed value) -> (thread ID, checkpoint NS, checkpoint ID)
+    metadata_index: defaultdict[tuple[str, Hashable], set[tuple[str, str, str]]]
+    # metadata key -> checkpoints whose value for the key can't be indexed
+    metadata_unindexed: defaultdict[str, set[tuple[str, str, str]]]
 
     def __init__(
         self,
         *,
         serde: Optional[SerializerProtocol] = None,
+        shallow: bool = False,
+        indexed_metadata: Sequence[str] = (),
     ) -> None:
         super().__init__(serde=serde)
+        self.shallow = shallow
+        self.indexed_metadata = tuple(
+            dict.fromkeys((*DEFAULT_INDEXED_METADATA, *indexed_metadata))
+        )
         self.storage = defaultdict(lambda: defaultdict(dict))
         self.writes = defaultdict(dict)
+        self.blobs = {}
+        self.metadata_index = defaultdict(set)
+        self.metadata_unindexed = defaultdict(set)
 
     def __enter__(self) -> "MemorySaver":
         return self
@@ -122,10 +163,9 @@ class MemorySaver(
                     sends = []
                 return CheckpointTuple(
                     config=config,
-                    checkpoint={
-                        **self.serde.loads_typed(checkpoint),
-                        "pending_sends": [self.serde.loads_typed(s) for s in sends],
-                    },
+                    checkpoint=self._load_checkpoint(
+                        thread_id, checkpoint_ns, checkpoint, sends
+                    ),
                     metadata=self.serde.loads_typed(metadata),
                     pending_writes=[
                         (id, c, self.serde.loads_typed(v)) for id, c, v in writes
@@ -163,10 +203,9 @@ class MemorySaver(
                             "checkpoint_id": checkpoint_id,
                         }
                     },
-                    checkpoint={
-                        **self.serde.loads_typed(checkpoint),
-                        "pending_sends": [self.serde.loads_typed(s) for s in sends],
-                    },
+                    checkpoint=self._load_checkpoint(
+                        thread_id, checkpoint_ns, checkpoint, sends
+                    ),
                     metadata=self.serde.loads_typed(metadata),
                     pending_writes=[
                         (id, c, self.serde.loads_typed(v)) for id, c, v in writes
@@ -182,6 +221,48 @@ class MemorySaver(
                     else None,
                 )
 
+    def _load_checkpoint(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint: tuple[str, bytes],
+        sends: List[tuple[str, bytes]],
+    ) -> Checkpoint:
+        loaded: Checkpoint = self.serde.loads_typed(checkpoint)
+        return {
+            **loaded,
+            "pending_sends": [self.serde.loads_typed(s) for s in sends],
+            "channel_values": self._load_blobs(
+                thread_id, checkpoint_ns, loaded["channel_versions"]
+            ),
+        }
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values: dict[str, Any] = {}
+        for k, v in versions.items():
+            kk = (thread_id, checkpoint_ns, k, v)
+            if kk in self.blobs:
+                vv = self.blobs[kk]
+                if vv[0] == "segments":
+                    channel_values[k] = SegmentLog(
+                        [
+                            (
+                                segment_id,
+                                self.serde.loads_typed(
+                                    self.blobs[
+                                        (thread_id, checkpoint_ns, k, segment_id)
+                                    ]
+                                ),
+                            )
+                            for segment_id in json.loads(vv[1])
+                        ]
+                    )
+                elif vv[0] != "empty":
+                    channel_values[k] = self.serde.loads_typed(vv)
+        return channel_values
+
     def list(
         self,
         config: Optional[RunnableConfig],
@@ -204,11 +285,90 @@ class MemorySaver(
         Yields:
             Iterator[CheckpointTuple]: An iterator of matching checkpoint tuples.
         """
+        keys = self._search_index(config, filter) if filter else None
+        if keys is None:
+            keys = self._scan(config)
+        config_checkpoint_id = get_checkpoint_id(config) if config else None
+        for thread_id, checkpoint_ns, checkpoint_id in keys:
+            # filter by checkpoint ID from config
+            if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                continue
+
+            # filter by checkpoint ID from `before` config
+            if (
+                before
+                and (before_checkpoint_id := get_checkpoint_id(before))
+                and checkpoint_id >= before_checkpoint_id
+            ):
+                continue
+
+            if (
+                saved := self.storage[thread_id][checkpoint_ns].get(checkpoint_id)
+            ) is None:
+                # deleted since the search started
+                continue
+            checkpoint, metadata_b, parent_checkpoint_id = saved
+
+            # filter by metadata
+            metadata = self.serde.loads_typed(metadata_b)
+            if filter and not all(
+                query_value == metadata.get(query_key)
+                for query_key, query_value in filter.items()
+            ):
+                continue
+
+            # limit search results
+            if limit is not None and limit <= 0:
+                break
+            elif limit is not None:
+                limit -= 1
+
+            writes = self.writes[(thread_id, checkpoint_ns, checkpoint_id)].values()
+
+            if parent_checkpoint_id:
+                sends = [
+                    w[2]
+                    for w in self.writes[
+                        (thread_id, checkpoint_ns, parent_checkpoint_id)
+                    ].values()
+                    if w[1] == TASKS
+                ]
+            else:
+                sends = []
+
+            yield CheckpointTuple(
+                config={
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": checkpoint_id,
+                    }
+                },
+                checkpoint=self._load_checkpoint(
+                    thread_id, checkpoint_ns, checkpoint, sends
+                ),
+                metadata=metadata,
+                parent_config={
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None,
+                pending_writes=[
+                    (id, c, self.serde.loads_typed(v)) for id, c, v in writes
+                ],
+            )
+
+    def _scan(self, config: Optional[RunnableConfig]) -> Iterator[tuple[str, str, str]]:
+        """Yield the keys of all checkpoints of the thread and namespace of
+        `config`, or of all threads if None, newest first in each namespace."""
         thread_ids = (config["configurable"]["thread_id"],) if config else self.storage
         config_checkpoint_ns = (
             config["configurable"].get("checkpoint_ns") if config else None
         )
-        config_checkpoint_id = get_checkpoint_id(config) if config else None
         for thread_id in thread_ids:
             for checkpoint_ns in self.storage[thread_id].keys():
                 if (
@@ -216,83 +376,64 @@ class MemorySaver(
                     and checkpoint_ns != config_checkpoint_ns
                 ):
                     continue
-
-                for checkpoint_id, (
-                    checkpoint,
-                    metadata_b,
-                    parent_checkpoint_id,
-                ) in sorted(
-                    self.storage[thread_id][checkpoint_ns].items(),
-                    key=lambda x: x[0],
-                    reverse=True,
+                for checkpoint_id in sorted(
+                    self.storage[thread_id][checkpoint_ns], reverse=True
                 ):
-                    # filter by checkpoint ID from config
-                    if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
-                        continue
-
-                    # filter by checkpoint ID from `before` config
-                    if (
-                        before
-                        and (before_checkpoint_id := get_checkpoint_id(before))
-                        and checkpoint_id >= before_checkpoint_id
-                    ):
-                        continue
-
-                    # filter by metadata
-                    metadata = self.serde.loads_typed(metadata_b)
-                    if filter and not all(
-                        query_value == metadata.get(query_key)
-                        for query_key, query_value in filter.items()
-                    ):
-                        continue
-
-                    # limit search results
-                    if limit is not None and limit <= 0:
-                        break
-                    elif limit is not None:
-                        limit -= 1
-
-                    writes = self.writes[
-                        (thread_id, checkpoint_ns, checkpoint_id)
-                    ].values()
+                    yield thread_id, checkpoint_ns, checkpoint_id
+
+    def _search_index(
+        self, config: Optional[RunnableConfig], filter: Dict[str, Any]
+    ) -> Optional[List[tuple[str, str, str]]]:
+        """Return the keys of the checkpoints of the thread and namespace of
+        `config` matching the indexed keys of `filter`, newest first, or None if
+        `filter` has no indexed keys. Its other keys are left to the caller."""
+        candidates: Optional[set[tuple[str, str, str]]] = None
+        for query_key, query_value in filter.items():
+            if query_key not in self.indexed_metadata:
+                continue
+            try:
+                value = _index_value(query_value)
+            except TypeError:
+                continue
+            matches = self.metadata_index.get((query_key, value), set())
+            matches = matches | self.metadata_unindexed.get(query_key, set())
+            candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            return None
+        if config:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            candidates = {
+                k
+                for k in candidates
+                if k[0] == thread_id
+                and (checkpoint_ns is None or k[1] == checkpoint_ns)
+            }
+        return sorted(candidates, key=lambda k: k[2], reverse=True)
+
+    def _index(self, key: tuple[str, str, str], metadata: CheckpointMetadata) -> None:
+        for metadata_key in self.indexed_metadata:
+            try:
+                value = _index_value(metadata.get(metadata_key))
+            except TypeError:
+                self.metadata_unindexed[metadata_key].add(key)
+            else:
+                self.metadata_index[(metadata_key, value)].add(key)
 
-                    if parent_checkpoint_id:
-                        sends = [
-                            w[2]
-                            for w in self.writes[
-                                (thread_id, checkpoint_ns, parent_checkpoint_id)
-                            ].values()
-                            if w[1] == TASKS
-                        ]
-                    else:
-                        sends = []
-
-                    yield CheckpointTuple(
-                        config={
-                            "configurable": {
-                                "thread_id": thread_id,
-                                "checkpoint_ns": checkpoint_ns,
-                                "checkpoint_id": checkpoint_id,
-                            }
-                        },
-                        checkpoint={
-                            **self.serde.loads_typed(checkpoint),
-                            "pending_sends": [self.serde.loads_typed(s) for s in sends],
-                        },
-                        metadata=metadata,
-                        parent_config={
-                            "configurable": {
-                                "thread_id": thread_id,
-                                "checkpoint_ns": checkpoint_ns,
-                                "checkpoint_id": parent_checkpoint_id,
-                            }
-                        }
-                        if parent_checkpoint_id
-                        else None,
-                        pending_writes=[
-                            (id, c, self.serde.loads_typed(v)) for id, c, v in writes
-                        ],
-                    )
+    def _unindex(
+        self, key: tuple[str, str, str], metadata_b: tuple[str, bytes]
+    ) -> None:
+        metadata = self.serde.loads_typed(metadata_b)
+        for metadata_key in self.indexed_metadata:
+            try:
+                value = _index_value(metadata.get(metadata_key))
+            except TypeError:
+                self.metadata_unindexed[metadata_key].discard(key)
+            else:
+                if index := self.metadata_index.get((metadata_key, value)):
+                    index.discard(key)
+                    if not index:
+                        del self.metadata_index[(metadata_key, value)]
 
     def put(
         self,
@@ -317,17 +458,44 @@ class MemorySaver(
         """
         c = checkpoint.copy()
         c.pop("pending_sends")
+        values: dict[str, Any] = c.pop("channel_values")
         thread_id = config["configurable"]["thread_id"]
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
-        self.storage[thread_id][checkpoint_ns].update(
-            {
-                checkpoint["id"]: (
-                    self.serde.dumps_typed(c),
-                    self.serde.dumps_typed(metadata),
-                    config["configurable"].get("checkpoint_id"),  # parent
+        # only serialize the channels updated since the previous checkpoint,
+        # values for other channels are already stored under their version
+        for k, v in new_versions.items():
+            if k not in values:
+                self.blobs[(thread_id, checkpoint_ns, k, v)] = ("empty", b"")
+            elif isinstance(values[k], SegmentLog):
+                for segment_id, items in values[k].segments:
+                    if (thread_id, checkpoint_ns, k, segment_id) not in self.blobs:
+                        self.blobs[(thread_id, checkpoint_ns, k, segment_id)] = (
+                            self.serde.dumps_typed(items)
+                        )
+                self.blobs[(thread_id, checkpoint_ns, k, v)] = (
+                    "segments",
+                    json.dumps([s for s, _ in values[k].segments]).encode(),
                 )
-            }
-        )
+            else:
+                self.blobs[(thread_id, checkpoint_ns, k, v)] = self.serde.dumps_typed(
+                    values[k]
+                )
+        saved = {
+            checkpoint["id"]: (
+                self.serde.dumps_typed(c),
+                self.serde.dumps_typed(metadata),
+                config["configurable"].get("checkpoint_id"),  # parent
+            )
+        }
+        key = (thread_id, checkpoint_ns, checkpoint["id"])
+        if prev := self.storage[thread_id][checkpoint_ns].get(checkpoint["id"]):
+            self._unindex(key, prev[1])
+        if self.shallow:
+            self._delete_previous(thread_id, checkpoint_ns, checkpoint, saved)
+            self.storage[thread_id][checkpoint_ns] = saved
+        else:
+            self.storage[thread_id][checkpoint_ns].update(saved)
+        self._index(key, metadata)
         return {
             "configurable": {
                 "thread_id": thread_id,
@@ -336,6 +504,47 @@ class MemorySaver(
             }
         }
 
+    def _delete_previous(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint: Checkpoint,
+        saved: dict[str, tuple[tuple[str, bytes], tuple[str, bytes], Optional[str]]],
+    ) -> None:
+        """Delete the checkpoints replaced by `checkpoint` in shallow mode, and
+        the writes and channel values only they referenced."""
+        values = checkpoint["channel_values"]
+        versions = checkpoint["channel_versions"]
+        keep_writes = {checkpoint["id"], *(p for _, _, p in saved.values())}
+        for checkpoint_id, (
+            prev_checkpoint,
+            prev_metadata,
+            parent_checkpoint_id,
+        ) in self.storage[thread_id][checkpoint_ns].items():
+            if checkpoint_id != checkpoint["id"]:
+                self._unindex((thread_id, checkpoint_ns, checkpoint_id), prev_metadata)
+            # writes of the parent checkpoint hold the pending sends of the new one
+            for id in (checkpoint_id, parent_checkpoint_id):
+                if id not in keep_writes:
+                    self.writes.pop((thread_id, checkpoint_ns, id), None)
+            for k, v in self.serde.loads_typed(prev_checkpoint)[
+                "channel_versions"
+            ].items():
+                if versions.get(k) == v:
+                    continue
+                prev = self.blobs.pop((thread_id, checkpoint_ns, k, v), None)
+                if prev is not None and prev[0] == "segments":
+                    segment_ids = (
+                        {s for s, _ in values[k].segments}
+                        if isinstance(values.get(k), SegmentLog)
+                        else set()
+                    )
+                    for segment_id in json.loads(prev[1]):
+                        if segment_id not in segment_ids:
+                            self.blobs.pop(
+                                (thread_id, checkpoint_ns, k, segment_id), None
+                            )
+
     def put_writes(
         self,
         config: RunnableConfig,
@@ -469,3 +678,13 @@ class MemorySaver(
         next_v = current_v + 1
         next_h = random.random()
         return f"{next_v:032}.{next_h:016}"
+
+
+def _index_value(value: Any) -> Hashable:
+    """Return the key of a metadata value in the index, raising TypeError if it
+    can't be indexed. Containers are indexed by their JSON, as they compare
+    equal to the lists and dicts they are deserialized as."""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    hash(value)
+    return value
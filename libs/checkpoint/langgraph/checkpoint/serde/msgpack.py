@@ -0,0 +1,253 @@
+import dataclasses
+import decimal
+import importlib
+import pathlib
+import re
+from collections import deque
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from functools import lru_cache
+from ipaddress import (
+    IPv4Address,
+    IPv4Interface,
+    IPv4Network,
+    IPv6Address,
+    IPv6Interface,
+    IPv6Network,
+)
+from typing import Any
+from uuid import UUID
+
+import msgpack
+from langchain_core.load.serializable import Serializable
+from langchain_core.messages import BaseMessage
+from zoneinfo import ZoneInfo
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.types import SendProtocol
+
+# Extension types, the payload of each is a msgpack array of
+# (module, name, *data) identifying the class to reconstruct
+EXT_CONSTRUCTOR_SINGLE_ARG = 0
+"""cls(arg)"""
+EXT_CONSTRUCTOR_POS_ARGS = 1
+"""cls(*args)"""
+EXT_CONSTRUCTOR_KW_ARGS = 2
+"""cls(**kwargs)"""
+EXT_METHOD_SINGLE_ARG = 3
+"""cls.method(arg)"""
+EXT_PYDANTIC_V1 = 4
+"""cls.construct(**fields), without validation, or cls.model_construct for
+pydantic v2 models such as messages"""
+EXT_PYDANTIC_V2 = 5
+"""cls.model_construct(**fields), without validation"""
+EXT_JSON = 6
+"""Embedded JsonPlusSerializer payload, for LangChain serializable objects
+other than messages"""
+
+
+# Map keys of these types are loaded back as equal keys, others are checked
+# when dumping, eg. tuples, which are loaded as (unhashable) lists
+_SCALAR_KEY_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
+
+
+@lru_cache(maxsize=None)
+def _import_class(module: str, name: str) -> Any:
+    return getattr(importlib.import_module(module), name)
+
+
+class MsgpackSerializer(JsonPlusSerializer):
+    """Serializer storing checkpoints as msgpack, with extension types for
+    LangChain messages, pydantic models, dataclasses, sets, datetimes, UUIDs,
+    `Send` and the other types supported by `JsonPlusSerializer`.
+
+    Messages and pydantic models are rebuilt without validation, so decoding
+    a long message history doesn't re-validate every message. Values
+    serialized with `JsonPlusSerializer` can still be loaded, and `dumps` and
+    `loads` (used for checkpoint metadata) still produce JSON.
+    """
+
+    def _packb(self, obj: Any) -> bytes:
+        self._check_map_keys(obj)
+        return msgpack.packb(obj, default=self._default_ext)
+
+    def _check_map_keys(self, obj: Any) -> None:
+        """Raise TypeError if a dict in `obj` has a key that wouldn't be loaded
+        back as an equal, hashable key.
+
+        Only containers msgpack packs natively are walked, the data of other
+        objects is checked when packed by `_ext`.
+        """
+        if isinstance(obj, dict):
+            # checking the set of types of the keys, rather than each of them,
+            # keeps this fast for the usual dicts with str keys
+            if not _SCALAR_KEY_TYPES.issuperset(map(type, obj)):
+                for key in obj:
+                    if type(key) not in _SCALAR_KEY_TYPES:
+                        self._check_map_key(key)
+            values = obj.values()
+        elif isinstance(obj, (list, tuple)):
+            values = obj
+        else:
+            return
+        for value in values:
+            if isinstance(value, (dict, list, tuple)) and value:
+                self._check_map_keys(value)
+
+    def _check_map_key(self, key: Any) -> None:
+        try:
+            loaded = self.loads_typed(("msgpack", self._packb(key)))
+            hash(loaded)
+        except TypeError:
+            loaded = None
+        if loaded != key:
+            raise TypeError(
+                f"Dict key of type {key.__class__.__name__} is not msgpack serializable"
+            )
+
+    def _ext(self, code: int, obj: Any, *data: Any) -> msgpack.ExtType:
+        cls = obj if isinstance(obj, type) else obj.__class__
+        self._check_map_keys(data)
+        return msgpack.ExtType(
+            code,
+            msgpack.packb(
+                (cls.__module__, cls.__name__, *data), default=self._default_ext
+            ),
+        )
+
+    def _default_ext(self, obj: Any) -> Any:
+        if isinstance(obj, BaseMessage):
+            return self._ext(EXT_PYDANTIC_V1, obj, obj.__dict__)
+        elif isinstance(obj, Serializable):
+            return msgpack.ExtType(EXT_JSON, self.dumps(obj))
+        elif hasattr(obj, "model_dump") and callable(obj.model_dump):
+            fields = obj.__dict__
+            if extra := getattr(obj, "__pydantic_extra__", None):
+                fields = {**fields, **extra}
+            return self._ext(EXT_PYDANTIC_V2, obj, fields)
+        elif hasattr(obj, "dict") and callable(obj.dict):
+            return self._ext(EXT_PYDANTIC_V1, obj, obj.__dict__)
+        elif hasattr(obj, "_asdict") and callable(obj._asdict):
+            return self._ext(EXT_CONSTRUCTOR_KW_ARGS, obj, obj._asdict())
+        elif isinstance(obj, pathlib.Path):
+            return self._ext(EXT_CONSTRUCTOR_POS_ARGS, obj, obj.parts)
+        elif isinstance(obj, re.Pattern):
+            return msgpack.ExtType(
+                EXT_CONSTRUCTOR_POS_ARGS,
+                msgpack.packb(("re", "compile", (obj.pattern, obj.flags))),
+            )
+        elif isinstance(obj, UUID):
+            return self._ext(EXT_CONSTRUCTOR_SINGLE_ARG, obj, obj.hex)
+        elif isinstance(obj, decimal.Decimal):
+            return self._ext(EXT_CONSTRUCTOR_SINGLE_ARG, obj, str(obj))
+        elif isinstance(obj, (set, frozenset, deque)):
+            return self._ext(EXT_CONSTRUCTOR_SINGLE_ARG, obj, tuple(obj))
+        elif isinstance(
+            obj,
+            (
+                IPv4Address,
+                IPv4Interface,
+                IPv4Network,
+                IPv6Address,
+                IPv6Interface,
+                IPv6Network,
+            ),
+        ):
+            return self._ext(EXT_CONSTRUCTOR_SINGLE_ARG, obj, str(obj))
+        elif isinstance(obj, datetime):
+            return self._ext(
+                EXT_METHOD_SINGLE_ARG, datetime, obj.isoformat(), "fromisoformat"
+            )
+        elif isinstance(obj, timezone):
+            return self._ext(EXT_CONSTRUCTOR_POS_ARGS, obj, obj.__getinitargs__())
+        elif isinstance(obj, ZoneInfo):
+            return self._ext(EXT_CONSTRUCTOR_SINGLE_ARG, ZoneInfo, obj.key)
+        elif isinstance(obj, timedelta):
+            return self._ext(
+                EXT_CONSTRUCTOR_POS_ARGS,
+                timedelta,
+                (obj.days, obj.seconds, obj.microseconds),
+            )
+        elif isinstance(obj, date):
+            return self._ext(
+                EXT_CONSTRUCTOR_POS_ARGS, date, (obj.year, obj.month, obj.day)
+            )
+        elif isinstance(obj, time):
+            return self._ext(
+                EXT_CONSTRUCTOR_KW_ARGS,
+                time,
+                {
+                    "hour": obj.hour,
+                    "minute": obj.minute,
+                    "second": obj.second,
+                    "microsecond": obj.microsecond,
+                    "tzinfo": obj.tzinfo,
+                    "fold": obj.fold,
+                },
+            )
+        elif dataclasses.is_dataclass(obj):
+            return self._ext(
+                EXT_CONSTRUCTOR_KW_ARGS,
+                obj,
+                {
+                    field.name: getattr(obj, field.name)
+                    for field in dataclasses.fields(obj)
+                },
+            )
+        elif isinstance(obj, Enum):
+            return self._ext(EXT_CONSTRUCTOR_SINGLE_ARG, obj, obj.value)
+        elif isinstance(obj, SendProtocol):
+            return self._ext(
+                EXT_CONSTRUCTOR_KW_ARGS, obj, {"node": obj.node, "arg": obj.arg}
+            )
+        elif isinstance(obj, BaseException):
+            return repr(obj)
+        else:
+            raise TypeError(
+                f"Object of type {obj.__class__.__name__} is not msgpack serializable"
+            )
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_JSON:
+            return self.loads(data)
+        try:
+            module, name, *rest = msgpack.unpackb(
+                data, ext_hook=self._ext_hook, strict_map_key=False
+            )
+            cls = _import_class(module, name)
+            if code == EXT_CONSTRUCTOR_SINGLE_ARG:
+                return cls(rest[0])
+            elif code == EXT_CONSTRUCTOR_POS_ARGS:
+                return cls(*rest[0])
+            elif code == EXT_CONSTRUCTOR_KW_ARGS:
+                return cls(**rest[0])
+            elif code == EXT_METHOD_SINGLE_ARG:
+                return getattr(cls, rest[1])(rest[0])
+            elif code == EXT_PYDANTIC_V1:
+                # construct is deprecated for pydantic v2 models
+                if hasattr(cls, "model_construct"):
+                    return cls.model_construct(**rest[0])
+                return cls.construct(**rest[0])
+            elif code == EXT_PYDANTIC_V2:
+                return cls.model_construct(**rest[0])
+        except Exception:
+            return None
+        return msgpack.ExtType(code, data)
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        if isinstance(obj, (bytes, bytearray)):
+            return super().dumps_typed(obj)
+        try:
+            return "msgpack", self._packb(obj)
+        except (TypeError, OverflowError, UnicodeEncodeError):
+            # eg. ints over 64 bits or strings with lone surrogates, which
+            # JsonPlusSerializer supports, or dict keys msgpack can't load
+            # back, which it rejects
+            return super().dumps_typed(obj)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, data_ = data
+        if type_ == "msgpack":
+            return msgpack.unpackb(data_, ext_hook=self._ext_hook, strict_map_key=False)
+        else:
+            return super().loads_typed(data)
@@ -4,6 +4,7 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import (
     Checkpoint,
     CheckpointMetadata,
+    SegmentLog,
     create_checkpoint,
     empty_checkpoint,
 )
@@ -136,3 +137,201 @@ class TestMemorySaver:
             c async for c in self.memory_saver.alist(None, filter=query_4)
         ]
         assert len(search_results_4) == 0
+
+    def test_put_only_stores_new_versions(self):
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-3", "checkpoint_ns": ""}
+        }
+        chkpnt_1: Checkpoint = {
+            **empty_checkpoint(),
+            "channel_values": {"static": "big", "growing": [1]},
+            "channel_versions": {"static": 1, "growing": 1},
+        }
+        config = self.memory_saver.put(
+            config, chkpnt_1, self.metadata_1, {"static": 1, "growing": 1}
+        )
+        chkpnt_2: Checkpoint = {
+            **create_checkpoint(chkpnt_1, None, 1),
+            "channel_values": {"static": "big", "growing": [1, 2]},
+            "channel_versions": {"static": 1, "growing": 2},
+        }
+        config = self.memory_saver.put(
+            config, chkpnt_2, self.metadata_2, {"growing": 2}
+        )
+
+        # unchanged channel is stored once, updated channel once per version
+        assert sorted(k[2:] for k in self.memory_saver.blobs) == [
+            ("growing", 1),
+            ("growing", 2),
+            ("static", 1),
+        ]
+        # full checkpoints are reassembled from the stored versions
+        assert self.memory_saver.get(config)["channel_values"] == {
+            "static": "big",
+            "growing": [1, 2],
+        }
+        first, second = (
+            t.checkpoint["channel_values"]
+            for t in self.memory_saver.list({"configurable": {"thread_id": "thread-3"}})
+        )
+        assert first == {"static": "big", "growing": [1, 2]}
+        assert second == {"static": "big", "growing": [1]}
+
+    def test_put_stores_segments_once(self):
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-4", "checkpoint_ns": ""}
+        }
+        chkpnt_1: Checkpoint = {
+            **empty_checkpoint(),
+            "channel_values": {"log": SegmentLog([("a", [1, 2])])},
+            "channel_versions": {"log": 1},
+        }
+        config = self.memory_saver.put(config, chkpnt_1, self.metadata_1, {"log": 1})
+        chkpnt_2: Checkpoint = {
+            **create_checkpoint(chkpnt_1, None, 1),
+            "channel_values": {"log": SegmentLog([("a", [1, 2]), ("b", [3])])},
+            "channel_versions": {"log": 2},
+        }
+        config = self.memory_saver.put(config, chkpnt_2, self.metadata_2, {"log": 2})
+
+        # each segment is stored once, versions only refer to them
+        assert {k[2:] for k in self.memory_saver.blobs} == {
+            ("log", 1),
+            ("log", 2),
+            ("log", "a"),
+            ("log", "b"),
+        }
+        assert self.memory_saver.blobs[("thread-4", "", "log", 2)][0] == "segments"
+        assert self.memory_saver.get(config)["channel_values"] == {
+            "log": SegmentLog([("a", [1, 2]), ("b", [3])])
+        }
+
+    def test_shallow(self):
+        memory_saver = MemorySaver(shallow=True)
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-5", "checkpoint_ns": ""}
+        }
+        chkpnt_1: Checkpoint = {
+            **empty_checkpoint(),
+            "channel_values": {"static": "big", "log": SegmentLog([("a", [1])])},
+            "channel_versions": {"static": 1, "log": 1},
+        }
+        config_1 = memory_saver.put(
+            config, chkpnt_1, self.metadata_1, {"static": 1, "log": 1}
+        )
+        memory_saver.put_writes(config_1, [("__pregel_tasks", "send")], "task-1")
+        chkpnt_2: Checkpoint = {
+            **create_checkpoint(chkpnt_1, None, 1),
+            "channel_values": {
+                "static": "big",
+                "log": SegmentLog([("a", [1]), ("b", [2])]),
+            },
+            "channel_versions": {"static": 1, "log": 2},
+        }
+        config_2 = memory_saver.put(config_1, chkpnt_2, self.metadata_2, {"log": 2})
+        memory_saver.put_writes(config_2, [("log", 3)], "task-2")
+        chkpnt_3: Checkpoint = {
+            **create_checkpoint(chkpnt_2, None, 2),
+            "channel_values": {"static": "big", "log": SegmentLog([("c", [1, 2])])},
+            "channel_versions": {"static": 1, "log": 3},
+        }
+        config_3 = memory_saver.put(config_2, chkpnt_3, self.metadata_2, {"log": 3})
+
+        # only the latest checkpoint is kept
+        assert [t.config for t in memory_saver.list(config)] == [config_3]
+        assert memory_saver.get_tuple(config_1) is None
+        # along with the writes of its parent, which hold its pending sends
+        assert [k for k, w in memory_saver.writes.items() if w] == [
+            ("thread-5", "", chkpnt_2["id"])
+        ]
+        # versions and segments it no longer references are deleted
+        assert {k[2:] for k in memory_saver.blobs} == {
+            ("static", 1),
+            ("log", 3),
+            ("log", "c"),
+        }
+        assert memory_saver.get(config)["channel_values"] == {
+            "static": "big",
+            "log": SegmentLog([("c", [1, 2])]),
+        }
+
+    def test_search_indexed_metadata(self):
+        memory_saver = MemorySaver(indexed_metadata=["score"])
+        memory_saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+        memory_saver.put(self.config_2, self.chkpnt_2, self.metadata_2, {})
+        memory_saver.put(self.config_3, self.chkpnt_3, self.metadata_3, {})
+        config_4: RunnableConfig = {
+            "configurable": {"thread_id": "thread-3", "checkpoint_ns": ""}
+        }
+        metadata_4: CheckpointMetadata = {"source": "loop", "step": 3, "score": [1]}
+        memory_saver.put(
+            config_4, create_checkpoint(self.chkpnt_2, {}, 2), metadata_4, {}
+        )
+
+        assert memory_saver.metadata_index[("source", "loop")] == {
+            ("thread-2", "", self.chkpnt_2["id"]),
+            ("thread-3", "", memory_saver.get(config_4)["id"]),
+        }
+        # a search on indexed keys loads only the checkpoints matching them
+        loads = []
+        loads_typed = memory_saver.serde.loads_typed
+        memory_saver.serde.loads_typed = lambda v: loads.append(v) or loads_typed(v)
+        results = list(memory_saver.list(None, filter={"source": "loop", "step": 1}))
+        assert [r.metadata for r in results] == [self.metadata_2]
+        assert len(loads) == 2  # checkpoint and metadata
+        memory_saver.serde.loads_typed = loads_typed
+
+        # newest first
+        assert [
+            r.metadata["step"]
+            for r in memory_saver.list(None, filter={"source": "loop"})
+        ] == [3, 1]
+        # missing keys match None, containers match by value
+        assert [
+            r.metadata for r in memory_saver.list(None, filter={"score": None})
+        ] == [self.metadata_3, self.metadata_2]
+        assert [r.metadata for r in memory_saver.list(None, filter={"score": [1]})] == [
+            metadata_4
+        ]
+        # unindexed keys are filtered after the indexed ones
+        assert [
+            r.metadata
+            for r in memory_saver.list(
+                {"configurable": {"thread_id": "thread-2"}},
+                filter={"step": 1, "writes": {"foo": "bar"}},
+            )
+        ] == [self.metadata_2]
+
+    def test_shallow_indexed_metadata(self):
+        memory_saver = MemorySaver(shallow=True)
+        config_1 = memory_saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+        memory_saver.put(config_1, self.chkpnt_2, self.metadata_2, {})
+
+        # deleted checkpoints are removed from the index
+        assert ("source", "input") not in memory_saver.metadata_index
+        assert list(memory_saver.list(None, filter={"source": "input"})) == []
+        assert len(list(memory_saver.list(None, filter={"source": "loop"}))) == 1
+
+    def test_list_page(self):
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        for step in range(5):
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            config = self.memory_saver.put(config, checkpoint, {"step": step}, {})
+
+        first = self.memory_saver.list_page(None, page_size=2)
+        assert [c.metadata["step"] for c in first.checkpoints] == [4, 3]
+        assert first.next_page == first.checkpoints[-1].config
+        second = self.memory_saver.list_page(None, before=first.next_page, page_size=2)
+        assert [c.metadata["step"] for c in second.checkpoints] == [2, 1]
+        last = self.memory_saver.list_page(None, before=second.next_page, page_size=2)
+        assert [c.metadata["step"] for c in last.checkpoints] == [0]
+        assert last.next_page is None
+
+    async def test_list_page_size(self):
+        with pytest.raises(ValueError, match="page_size must be at least 1"):
+            self.memory_saver.list_page(None, page_size=0)
+        with pytest.raises(ValueError, match="page_size must be at least 1"):
+            await self.memory_saver.alist_page(None, page_size=0)
@@ -0,0 +1,169 @@
+import pathlib
+import re
+import uuid
+import warnings
+from collections import deque
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from ipaddress import IPv4Address
+from typing import Any
+
+import msgpack
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableMap
+from zoneinfo import ZoneInfo
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.msgpack import EXT_PYDANTIC_V1, MsgpackSerializer
+from tests.test_jsonplus import (
+    MyDataclass,
+    MyDataclassWSlots,
+    MyEnum,
+    MyFunnyPydantic,
+    MyPydantic,
+    Person,
+)
+
+
+class MySend:
+    def __init__(self, node: str, arg: Any) -> None:
+        self.node = node
+        self.arg = arg
+
+    def __hash__(self) -> int:
+        return hash((self.node, str(self.arg)))
+
+    def __repr__(self) -> str:
+        return f"MySend(node={self.node!r}, arg={self.arg!r})"
+
+    def __eq__(self, value: object) -> bool:
+        return (
+            isinstance(value, MySend)
+            and self.node == value.node
+            and self.arg == value.arg
+        )
+
+
+def test_serde_msgpack() -> None:
+    to_serialize = {
+        "path": pathlib.Path("foo", "bar"),
+        "re": re.compile(r"foo", re.DOTALL),
+        "decimal": Decimal("1.10101"),
+        "ip4": IPv4Address("192.168.0.1"),
+        "deque": deque([1, 2, 3]),
+        "set": {1, 2, 3},
+        "frozenset": frozenset(["a"]),
+        "tzn": ZoneInfo("America/New_York"),
+        "date": date(2024, 4, 19),
+        "time": time(23, 4, 57, 51022, timezone.max),
+        "timedelta": timedelta(days=1, seconds=2),
+        "uid": uuid.UUID(int=1),
+        "timestamp": datetime(2024, 4, 19, 23, 4, 57, 51022, timezone.max),
+        "my_slotted_class": MyDataclassWSlots("bar", 2),
+        "my_dataclass": MyDataclass("foo", 1),
+        "my_enum": MyEnum.FOO,
+        "my_pydantic": MyPydantic(foo="foo", bar=1),
+        "my_funny_pydantic": MyFunnyPydantic(foo="foo", bar=1),
+        "person": Person(name="foo"),
+        "send": MySend("node", {"uid": uuid.UUID(int=2)}),
+        "messages": [
+            HumanMessage(content="hi", id="1"),
+            AIMessage(
+                content="",
+                id="2",
+                tool_calls=[{"name": "search", "args": {"q": "foo"}, "id": "call"}],
+            ),
+            ToolMessage(content="bar", tool_call_id="call", id="3"),
+        ],
+        "a_bool": True,
+        "a_none": None,
+        "a_str": "foo",
+        "a_str_uc": "foo ⛰️",
+        "an_int": 1,
+        "int_keys": {1: "one"},
+        "a_float": 1.1,
+        "runnable_map": RunnableMap({}),
+        "a_bytes": b"my bytes",
+    }
+
+    serde = MsgpackSerializer()
+
+    dumped = serde.dumps_typed(to_serialize)
+    assert dumped[0] == "msgpack"
+    assert len(dumped[1]) < len(JsonPlusSerializer().dumps_typed(to_serialize)[1])
+    assert serde.loads_typed(dumped) == to_serialize
+
+    for value in to_serialize.values():
+        assert serde.loads_typed(serde.dumps_typed(value)) == value
+
+
+def test_serde_msgpack_no_deprecation() -> None:
+    serde = MsgpackSerializer()
+    value = MyPydantic(foo="foo", bar=1)
+    # messages are stored as pydantic v1 models, even those that are pydantic
+    # v2 models in newer versions of langchain-core
+    dumped = msgpack.packb(serde._ext(EXT_PYDANTIC_V1, value, value.__dict__))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        assert serde.loads_typed(("msgpack", dumped)) == value
+        assert serde.loads_typed(
+            serde.dumps_typed(MyFunnyPydantic(foo="foo", bar=1))
+        ) == MyFunnyPydantic(foo="foo", bar=1)
+
+
+def test_serde_msgpack_fallback() -> None:
+    serde = MsgpackSerializer()
+
+    # bytes are stored as is
+    assert serde.dumps_typed(b"my bytes") == ("bytes", b"my bytes")
+    assert serde.loads_typed(("bytes", b"my bytes")) == b"my bytes"
+    # values msgpack can't represent are stored as json
+    assert serde.dumps_typed({"big": 2**70}) == (
+        "json",
+        b'{"big": 1180591620717411303424}',
+    )
+    assert serde.loads_typed(serde.dumps_typed({"big": 2**70})) == {"big": 2**70}
+    # values stored by JsonPlusSerializer can still be loaded
+    value = {"uid": uuid.UUID(int=1), "messages": [HumanMessage(content="hi")]}
+    assert serde.loads_typed(JsonPlusSerializer().dumps_typed(value)) == value
+    # metadata is still json
+    assert serde.dumps({"step": 1}) == b'{"step": 1}'
+
+
+def test_loads_cannot_find() -> None:
+    serde = MsgpackSerializer()
+
+    dumped = serde.dumps_typed([MyPydantic(foo="foo", bar=1)])
+    dumped = (dumped[0], dumped[1].replace(b"MyPydantic", b"NoPydantic"))
+
+    assert serde.loads_typed(dumped) == [
+        None
+    ], "Should return None if cannot find class"
+
+
+def test_serde_msgpack_map_keys() -> None:
+    serde = MsgpackSerializer()
+
+    # keys loaded back as equal keys are stored as msgpack
+    value = {
+        1: "int",
+        None: "none",
+        uuid.UUID(int=1): "uuid",
+        date(2024, 4, 19): "date",
+        frozenset(["a"]): "frozenset",
+        MyEnum.FOO: "enum",
+    }
+    dumped = serde.dumps_typed(value)
+    assert dumped[0] == "msgpack"
+    assert serde.loads_typed(dumped) == value
+    # tuple keys would be loaded as lists, which can't be keys, so they are
+    # rejected like JsonPlusSerializer does, including in nested values
+    for value in (
+        {(1, 2): "x"},
+        {"nested": [{"key": {(1, 2): "x"}}]},
+        HumanMessage(content="hi", additional_kwargs={"key": {(1, 2): "x"}}),
+    ):
+        with pytest.raises(TypeError):
+            serde.dumps_typed(value)
@@ -5,10 +5,16 @@ from langchain_core.messages import HumanMessage
 from pyperf._runner import Runner
 from uvloop import new_event_loop
 
+from bench.cpu_fanout import cpu_fanout
 from bench.fanout_to_subgraph import fanout_to_subgraph
+from bench.growing_thread import growing_thread
 from bench.react_agent import react_agent
+from bench.sequential import sequential
+from bench.wide_graph import wide_graph
+from bench.wide_schema import wide_schema
 from bench.wide_state import wide_state
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.msgpack import MsgpackSerializer
 from langgraph.pregel import Pregel
 
 
@@ -64,6 +70,30 @@ benchmarks = (
             ]
         },
     ),
+    (
+        "fanout_to_subgraph_500x_checkpoint",
+        fanout_to_subgraph().compile(checkpointer=MemorySaver()),
+        {
+            "subjects": [
+                random.choices("abcdefghijklmnopqrstuvwxyz", k=1000) for _ in range(500)
+            ]
+        },
+    ),
+    (
+        "cpu_fanout_16x_thread",
+        cpu_fanout(process_pool=False).compile(checkpointer=None),
+        {"sizes": [50000] * 16, "counts": []},
+    ),
+    (
+        "cpu_fanout_16x_process",
+        cpu_fanout(process_pool=True).compile(checkpointer=None),
+        {"sizes": [50000] * 16, "counts": []},
+    ),
+    (
+        "growing_thread_1000x_checkpoint",
+        growing_thread(1000).compile(checkpointer=MemorySaver()),
+        {"items": [], "instructions": "do the thing" * 1000, "count": 0},
+    ),
     (
         "react_agent_10x",
         react_agent(10, checkpointer=None),
@@ -84,6 +114,76 @@ benchmarks = (
         react_agent(100, checkpointer=MemorySaver()),
         {"messages": [HumanMessage("hi?")]},
     ),
+    (
+        "react_agent_10x20_tool_calls",
+        react_agent(10, checkpointer=None, tool_calls_per_turn=20),
+        {"messages": [HumanMessage("hi?")]},
+    ),
+    (
+        "react_agent_10x20_tool_calls_checkpoint",
+        react_agent(10, checkpointer=MemorySaver(), tool_calls_per_turn=20),
+        {"messages": [HumanMessage("hi?")]},
+    ),
+    (
+        "react_agent_100x_checkpoint_msgpack",
+        react_agent(100, checkpointer=MemorySaver(serde=MsgpackSerializer())),
+        {"messages": [HumanMessage("hi?")]},
+    ),
+    (
+        "react_agent_100x_messages_channel",
+        react_agent(100, checkpointer=None, messages_channel=True),
+        {"messages": [HumanMessage("hi?")]},
+    ),
+    (
+        "react_agent_100x_messages_channel_checkpoint",
+        react_agent(100, checkpointer=MemorySaver(), messages_channel=True),
+        {"messages": [HumanMessage("hi?")]},
+    ),
+    (
+        "react_agent_10x20_tool_calls_messages_channel_checkpoint",
+        react_agent(
+            10,
+            checkpointer=MemorySaver(),
+            tool_calls_per_turn=20,
+            messages_channel=True,
+        ),
+        {"messages": [HumanMessage("hi?")]},
+    ),
+    (
+        "sequential_3x",
+        sequential(3).compile(checkpointer=None),
+        {"count": 0},
+    ),
+    (
+        "wide_graph_300x100",
+        wide_graph(300, 100).compile(checkpointer=None),
+        {"visited": []},
+    ),
+    (
+        "wide_graph_300x100_checkpoint",
+        wide_graph(300, 100).compile(checkpointer=MemorySaver()),
+        {"visited": []},
+    ),
+    (
+        "wide_graph_1000x100",
+        wide_graph(1000, 100).compile(checkpointer=None),
+        {"visited": []},
+    ),
+    (
+        "wide_schema_300x100",
+        wide_schema(300, 100).compile(checkpointer=None),
+        {"count": 0},
+    ),
+    (
+        "wide_schema_1000x100",
+        wide_schema(1000, 100).compile(checkpointer=None),
+        {"count": 0},
+    ),
+    (
+        "wide_schema_1000x100_narrow_input",
+        wide_schema(1000, 100, narrow_input=True).compile(checkpointer=None),
+        {"count": 0},
+    ),
     (
         "wide_state_25x300",
         wide_state(300).compile(checkpointer=None),
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Annotated, Any, List, Optional, TypedDict
+
+from langgraph.constants import END, START
+from langgraph.graph.state import StateGraph
+from langgraph.managed.shared_value import SharedValue
+from langgraph.store.base import V
+from langgraph.store.batch import AsyncBatchedStore
+from langgraph.store.memory import MemoryStore
+
+
+class SlowStore(MemoryStore):
+    """MemoryStore with a fixed latency per call, like a remote database."""
+
+    def __init__(self, latency: float = 0.001) -> None:
+        super().__init__()
+        self.latency = latency
+        self.calls = 0
+
+    async def alist(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self.list(prefixes)
+
+    async def aput(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self.put(writes)
+
+
+def shared_values(n_keys: int) -> StateGraph:
+    """Graph with `n_keys` shared values, all read when it starts and written
+    by its single node."""
+    State = TypedDict(
+        "State",
+        {
+            "count": int,
+            **{
+                f"shared_{i}": Annotated[
+                    dict[str, dict[str, Any]], SharedValue.on("assistant_id")
+                ]
+                for i in range(n_keys)
+            },
+        },
+    )
+
+    def step(state: dict) -> dict:
+        return {
+            "count": state["count"] + 1,
+            **{
+                f"shared_{i}": {str(state["count"]): {"count": state["count"]}}
+                for i in range(n_keys)
+            },
+        }
+
+    builder = StateGraph(State)
+    builder.add_node("step", step)
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+
+    return builder
+
+
+async def idle_cpu(seconds: float = 1.0) -> float:
+    """Return the CPU time used by the event loop while an idle batched store
+    is open for `seconds`."""
+    async with AsyncBatchedStore(MemoryStore()):
+        start = time.process_time()
+        await asyncio.sleep(seconds)
+        return time.process_time() - start
+
+
+if __name__ == "__main__":
+    import uuid
+
+    print(f"idle store: {asyncio.run(idle_cpu()):.3f}s CPU per second")
+
+    n_keys, n_invocations = 20, 200
+
+    async def run() -> None:
+        store = SlowStore()
+        graph = shared_values(n_keys).compile(store=store)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                graph.ainvoke(
+                    {"count": 0},
+                    {"configurable": {"assistant_id": str(uuid.uuid4())}},
+                )
+                for _ in range(n_invocations)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"{n_invocations} concurrent invocations with {n_keys} shared values: "
+            f"{n_invocations / elapsed:.0f} invocations/s, "
+            f"{store.calls / n_invocations:.0f} store calls per invocation"
+        )
+
+    asyncio.run(run())
@@ -0,0 +1,50 @@
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.constants import START, Send
+from langgraph.graph.state import StateGraph
+
+
+class State(TypedDict):
+    sizes: list[int]
+    counts: Annotated[list[int], operator.add]
+
+
+def count_primes(state: dict) -> dict:
+    # defined at module level, so it can be pickled to run in a worker process
+    n = state["size"]
+    count = sum(all(i % d for d in range(2, int(i**0.5) + 1)) for i in range(2, n))
+    return {"counts": [count]}
+
+
+def cpu_fanout(process_pool: bool) -> StateGraph:
+    def fanout(state: State) -> list[Send]:
+        return [Send("count_primes", {"size": s}) for s in state["sizes"]]
+
+    builder = StateGraph(State)
+    builder.add_node("count_primes", count_primes, process_pool=process_pool)
+    builder.add_conditional_edges(START, fanout)
+
+    return builder
+
+
+if __name__ == "__main__":
+    import asyncio
+    import time
+
+    import uvloop
+
+    input = {"sizes": [50000] * 16, "counts": []}
+
+    async def run(process_pool: bool):
+        graph = cpu_fanout(process_pool).compile()
+        # warm up the process pool
+        await graph.ainvoke({"sizes": [10], "counts": []})
+        start = time.perf_counter()
+        await graph.ainvoke(input)
+        mode = "process" if process_pool else "thread"
+        print(f"{mode}: {time.perf_counter() - start:.2f}s")
+
+    uvloop.install()
+    asyncio.run(run(False))
+    asyncio.run(run(True))
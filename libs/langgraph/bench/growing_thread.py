@@ -0,0 +1,63 @@
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.constants import END, START
+from langgraph.graph.state import StateGraph
+
+
+def growing_thread(n_steps: int) -> StateGraph:
+    class State(TypedDict):
+        items: Annotated[list[str], operator.add]
+        instructions: str
+        count: int
+
+    async def append(state: State) -> dict:
+        return {"items": [f"item {state['count']}" * 10], "count": state["count"] + 1}
+
+    builder = StateGraph(State)
+    builder.add_node("append", append)
+    builder.add_edge(START, "append")
+    builder.add_conditional_edges(
+        "append", lambda state: END if state["count"] >= n_steps else "append"
+    )
+
+    return builder
+
+
+if __name__ == "__main__":
+    import asyncio
+    import time
+    import tracemalloc
+
+    import uvloop
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    class TimedMemorySaver(MemorySaver):
+        put_time = 0.0
+        put_count = 0
+
+        def put(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return super().put(*args, **kwargs)
+            finally:
+                self.put_time += time.perf_counter() - start
+                self.put_count += 1
+
+    checkpointer = TimedMemorySaver()
+    graph = growing_thread(1000).compile(checkpointer=checkpointer)
+    input = {"items": [], "instructions": "do the thing" * 1000, "count": 0}
+    config = {"configurable": {"thread_id": "1"}, "recursion_limit": 20000000000}
+
+    async def run():
+        len([c async for c in graph.astream(input, config=config)])
+
+    uvloop.install()
+    tracemalloc.start()
+    asyncio.run(run())
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"checkpoints: {checkpointer.put_count}")
+    print(f"put latency: {checkpointer.put_time / checkpointer.put_count * 1e6:.1f}us")
+    print(f"memory: {size / 2**20:.1f}MiB (peak {peak / 2**20:.1f}MiB)")
@@ -0,0 +1,123 @@
+import random
+import statistics
+import time
+from typing import Callable, TypedDict
+
+from psycopg import Connection
+
+from bench.postgres_blobs import DEFAULT_POSTGRES_URI, database
+from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.constants import END, START
+from langgraph.graph.state import StateGraph
+
+# columns of the checkpoint tables, but the thread ID they are cloned with
+COLUMNS = {
+    "checkpoints": "checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata",
+    "checkpoint_blobs": "checkpoint_ns, channel, version, type, blob, hash",
+    "checkpoint_writes": "checkpoint_ns, checkpoint_id, task_id, idx, channel, type, blob",
+}
+
+
+def counter_loop(n_steps: int) -> StateGraph:
+    class State(TypedDict):
+        count: int
+        answer: str
+
+    def step(state: State) -> dict:
+        return {"count": state["count"] + 1, "answer": f"answer {state['count']} " * 20}
+
+    builder = StateGraph(State)
+    builder.add_node("step", step)
+    builder.add_edge(START, "step")
+    builder.add_conditional_edges(
+        "step", lambda state: END if state["count"] >= n_steps else "step"
+    )
+    return builder
+
+
+def populate(
+    checkpointer: PostgresSaver, conn_string: str, n_threads: int, n_steps: int
+) -> None:
+    """Save a thread of about `n_steps` checkpoints, and clone it into
+    `n_threads` threads."""
+    graph = counter_loop(n_steps).compile(checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "0"}, "recursion_limit": 20000000000}
+    graph.invoke({"count": 0, "answer": ""}, config)
+    with Connection.connect(conn_string, autocommit=True) as conn:
+        for table, columns in COLUMNS.items():
+            conn.execute(
+                f"INSERT INTO {table} (thread_id, {columns})"
+                f" SELECT t::text, {columns} FROM {table}"
+                " CROSS JOIN generate_series(1, %s) AS t WHERE thread_id = '0'",
+                (n_threads - 1,),
+            )
+        conn.execute("VACUUM ANALYZE")
+
+
+def latency(fn: Callable[[str], object], n_threads: int, n: int = 200) -> float:
+    """Return the median latency, in milliseconds, of `fn` called with the ID
+    of a random thread."""
+    times = []
+    for _ in range(n // 10):
+        fn(str(random.randrange(n_threads)))
+    for _ in range(n):
+        thread_id = str(random.randrange(n_threads))
+        start = time.perf_counter()
+        fn(thread_id)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def postgres_reads(uri: str, n_threads: int, n_steps: int) -> dict[str, float]:
+    """Return the median latencies of reads from a table of `n_threads` threads
+    of `n_steps` checkpoints."""
+    with database(uri) as conn_string, PostgresSaver.from_conn_string(
+        conn_string
+    ) as checkpointer:
+        checkpointer.setup()
+        populate(checkpointer, conn_string, n_threads, n_steps)
+        checkpoint_ids = [
+            c.config["configurable"]["checkpoint_id"]
+            for c in checkpointer.list(
+                {"configurable": {"thread_id": "0", "checkpoint_ns": ""}}
+            )
+        ]
+
+        def config(thread_id: str) -> dict:
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+        def by_id(thread_id: str) -> dict:
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": "",
+                    "checkpoint_id": random.choice(checkpoint_ids),
+                }
+            }
+
+        return {
+            "get_tuple (latest)": latency(
+                lambda t: checkpointer.get_tuple(config(t)), n_threads
+            ),
+            "get_tuple (by id)": latency(
+                lambda t: checkpointer.get_tuple(by_id(t)), n_threads
+            ),
+            "list(limit=100)": latency(
+                lambda t: list(checkpointer.list(config(t), limit=100)), n_threads
+            ),
+            "list_page(page_size=100, values=False)": latency(
+                lambda t: checkpointer.list_page(config(t), values=False), n_threads
+            ),
+            "list(None, limit=100)": latency(
+                lambda t: list(checkpointer.list(None, limit=100)), n_threads, n=20
+            ),
+        }
+
+
+if __name__ == "__main__":
+    import os
+
+    uri = os.environ.get("POSTGRES_URI", DEFAULT_POSTGRES_URI)
+    n_threads, n_steps = 1000, 1000
+    for name, ms in postgres_reads(uri, n_threads, n_steps).items():
+        print(f"{name}: {ms:.2f}ms")
@@ -0,0 +1,58 @@
+import time
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.config import get_callback_manager_for_config
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.constants import Send
+from langgraph.pregel import Pregel
+from langgraph.pregel.algo import prepare_next_tasks
+from langgraph.pregel.manager import ChannelsManager
+
+
+def prepare_tasks(
+    graph: Pregel,
+    node: str,
+    n_sends: int,
+    *,
+    with_tracer: bool = False,
+    n_iterations: int = 10,
+) -> float:
+    """Return the time, in seconds, to prepare one task of a step that sends
+    `n_sends` packets to `node`."""
+    checkpoint = empty_checkpoint()
+    checkpoint["pending_sends"] = [Send(node, {"subject": i}) for i in range(n_sends)]
+    config = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+    manager: Optional[object] = None
+    if with_tracer:
+        config["callbacks"] = [BaseCallbackHandler()]
+        manager = get_callback_manager_for_config(config).on_chain_start(
+            None, {}, name=graph.get_name()
+        )
+    elapsed = 0.0
+    with ChannelsManager(graph.channels, checkpoint, config) as (channels, managed):
+        for _ in range(n_iterations):
+            start = time.perf_counter()
+            tasks = prepare_next_tasks(
+                checkpoint,
+                graph.nodes,
+                channels,
+                managed,
+                config,
+                1,
+                for_execution=True,
+                manager=manager,
+            )
+            elapsed += time.perf_counter() - start
+            assert len(tasks) == n_sends
+    return elapsed / n_iterations / n_sends
+
+
+if __name__ == "__main__":
+    from bench.fanout_to_subgraph import fanout_to_subgraph
+
+    graph = fanout_to_subgraph().compile()
+    for with_tracer in (False, True):
+        per_task = prepare_tasks(graph, "generate_joke", 1000, with_tracer=with_tracer)
+        print(f"tracer={with_tracer}: {per_task * 1e6:.1f}us per task")
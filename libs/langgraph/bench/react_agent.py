@@ -1,20 +1,33 @@
-from typing import Any, Optional
+from typing import Annotated, Any, Optional, TypedDict
 from uuid import uuid4
 
 from langchain_core.callbacks import CallbackManagerForLLMRun
 from langchain_core.language_models.fake_chat_models import (
     FakeMessagesListChatModel,
 )
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.messages import AIMessage, AnyMessage, BaseMessage, HumanMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_core.tools import StructuredTool
 
+from langgraph.channels.messages import MessagesChannel
 from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.managed import IsLastStep
 from langgraph.prebuilt.chat_agent_executor import create_react_agent
 from langgraph.pregel import Pregel
 
 
-def react_agent(n_tools: int, checkpointer: BaseCheckpointSaver) -> Pregel:
+class MessagesChannelState(TypedDict):
+    messages: Annotated[list[AnyMessage], MessagesChannel]
+    is_last_step: IsLastStep
+
+
+def react_agent(
+    n_tools: int,
+    checkpointer: BaseCheckpointSaver,
+    *,
+    tool_calls_per_turn: int = 1,
+    messages_channel: bool = False,
+) -> Pregel:
     class FakeFuntionChatModel(FakeMessagesListChatModel):
         def bind_tools(self, functions: list):
             return self
@@ -50,6 +63,7 @@ def react_agent(n_tools: int, checkpointer: BaseCheckpointSaver) -> Pregel:
                         "name": tool.name,
                         "args": {"query": str(uuid4()) * 100},
                     }
+                    for _ in range(tool_calls_per_turn)
                 ],
                 id=str(uuid4()),
             )
@@ -60,7 +74,12 @@ def react_agent(n_tools: int, checkpointer: BaseCheckpointSaver) -> Pregel:
         ]
     )
 
-    return create_react_agent(model, [tool], checkpointer=checkpointer)
+    return create_react_agent(
+        model,
+        [tool],
+        checkpointer=checkpointer,
+        state_schema=MessagesChannelState if messages_channel else None,
+    )
 
 
 if __name__ == "__main__":
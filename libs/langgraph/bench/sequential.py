@@ -0,0 +1,37 @@
+from typing import TypedDict
+
+from langgraph.constants import END, START
+from langgraph.graph.state import StateGraph
+
+
+def sequential(n_nodes: int) -> StateGraph:
+    class State(TypedDict):
+        count: int
+
+    def step(state: State) -> dict:
+        return {"count": state["count"] + 1}
+
+    builder = StateGraph(State)
+    prev = START
+    for i in range(n_nodes):
+        builder.add_node(f"step_{i}", step)
+        builder.add_edge(prev, f"step_{i}")
+        prev = f"step_{i}"
+    builder.add_edge(prev, END)
+
+    return builder
+
+
+if __name__ == "__main__":
+    import time
+
+    n_invocations = 5000
+
+    for pooled in (False, True):
+        graph = sequential(3).compile(pooled=pooled)
+        graph.invoke({"count": 0})
+        start = time.perf_counter()
+        for _ in range(n_invocations):
+            graph.invoke({"count": 0})
+        elapsed = time.perf_counter() - start
+        print(f"pooled={pooled}: {n_invocations / elapsed:.0f} invocations/s")
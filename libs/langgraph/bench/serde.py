@@ -0,0 +1,50 @@
+import time
+
+from langchain_core.messages import HumanMessage
+
+from bench.react_agent import react_agent
+from langgraph.checkpoint.base import Checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+
+def react_agent_checkpoint(n_tools: int) -> Checkpoint:
+    """Return the last checkpoint of a react agent thread that called
+    `n_tools` tools, ie. one holding a history of 2 * `n_tools` messages."""
+    checkpointer = MemorySaver()
+    graph = react_agent(n_tools, checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "1"}, "recursion_limit": 1000000000}
+    graph.invoke({"messages": [HumanMessage("hi?")]}, config)
+    return checkpointer.get(config)
+
+
+def serde(
+    serde: SerializerProtocol, checkpoint: Checkpoint, n_iterations: int = 10
+) -> tuple[int, float, float]:
+    """Return the size in bytes of the channel values of `checkpoint`, and the
+    time in seconds to encode and to decode them."""
+    values = checkpoint["channel_values"]
+    encode = decode = 0.0
+    for _ in range(n_iterations):
+        start = time.perf_counter()
+        dumped = {k: serde.dumps_typed(v) for k, v in values.items()}
+        encode += time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = {k: serde.loads_typed(v) for k, v in dumped.items()}
+        decode += time.perf_counter() - start
+        assert loaded.keys() == values.keys()
+    size = sum(len(v[1]) for v in dumped.values())
+    return size, encode / n_iterations, decode / n_iterations
+
+
+if __name__ == "__main__":
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.serde.msgpack import MsgpackSerializer
+
+    checkpoint = react_agent_checkpoint(100)
+    for serializer in (JsonPlusSerializer(), MsgpackSerializer()):
+        size, encode, decode = serde(serializer, checkpoint)
+        print(
+            f"{serializer.__class__.__name__}: {size / 1024:.1f}KiB, "
+            f"encode {encode * 1e3:.2f}ms, decode {decode * 1e3:.2f}ms"
+        )
@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    create_checkpoint,
+    empty_checkpoint,
+)
+
+
+def sqlite_writers(
+    checkpointer: BaseCheckpointSaver, n_threads: int = 50, n_checkpoints: int = 20
+) -> float:
+    """Return the time, in seconds, for `n_threads` threads to each save
+    `n_checkpoints` checkpoints, with the writes of a task, to `checkpointer`."""
+
+    def write(thread_id: int) -> None:
+        config = {"configurable": {"thread_id": str(thread_id), "checkpoint_ns": ""}}
+        checkpoint = empty_checkpoint()
+        for step in range(n_checkpoints):
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            checkpoint["channel_values"] = {"messages": [f"message {step}"] * 10}
+            config = checkpointer.put(config, checkpoint, {"step": step}, {})
+            checkpointer.put_writes(config, [("messages", "reply")], "task")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list(executor.map(write, range(n_threads)))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    from langgraph.checkpoint.sqlite.batch import BatchedSqliteSaver
+
+    n_threads, n_checkpoints = 50, 20
+    for cls in (SqliteSaver, BatchedSqliteSaver):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with cls.from_conn_string(f"{tmp_dir}/checkpoints.sqlite") as saver:
+                elapsed = sqlite_writers(saver, n_threads, n_checkpoints)
+        n_writes = 2 * n_threads * n_checkpoints
+        print(
+            f"{cls.__name__}: {elapsed:.2f}s, "
+            f"{n_writes / elapsed:.0f} writes/s with {n_threads} threads"
+        )
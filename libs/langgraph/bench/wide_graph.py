@@ -0,0 +1,56 @@
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.constants import END, START
+from langgraph.graph.state import StateGraph
+
+
+def wide_graph(n_nodes: int, n_steps: int) -> StateGraph:
+    class State(TypedDict):
+        visited: Annotated[list[int], operator.add]
+        hops: int
+
+    async def router(state: State) -> dict:
+        return {"hops": len(state["visited"])}
+
+    # only one of the n_nodes workers is triggered after each router step
+    def route(state: State) -> str:
+        if state["hops"] >= n_steps:
+            return END
+        return f"worker_{state['hops'] * 7 % n_nodes}"
+
+    def make_worker(idx: int):
+        async def worker(state: State) -> dict:
+            return {"visited": [idx]}
+
+        return worker
+
+    builder = StateGraph(State)
+    builder.add_node("router", router)
+    builder.add_edge(START, "router")
+    builder.add_conditional_edges(
+        "router", route, [f"worker_{i}" for i in range(n_nodes)] + [END]
+    )
+    for i in range(n_nodes):
+        builder.add_node(f"worker_{i}", make_worker(i))
+        builder.add_edge(f"worker_{i}", "router")
+
+    return builder
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    import uvloop
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    graph = wide_graph(500, 200).compile(checkpointer=MemorySaver())
+    input = {"visited": []}
+    config = {"configurable": {"thread_id": "1"}, "recursion_limit": 20000000000}
+
+    async def run():
+        len([c async for c in graph.astream(input, config=config)])
+
+    uvloop.install()
+    asyncio.run(run())
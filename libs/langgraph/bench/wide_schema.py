@@ -0,0 +1,63 @@
+import operator
+import time
+from typing import Annotated, Any
+
+from typing_extensions import TypedDict
+
+from langgraph.constants import CONFIG_KEY_SEND, END, START
+from langgraph.graph.state import CompiledStateGraph, StateGraph
+
+
+def wide_schema(n_keys: int, n_steps: int, *, narrow_input: bool = False) -> StateGraph:
+    """Return a graph whose state has `n_keys` keys, running a single node
+    `n_steps` times, which updates only two of them each time. If
+    `narrow_input`, the node declares it only reads one key."""
+    State = TypedDict(
+        "State",
+        {
+            "count": Annotated[int, operator.add],
+            **{f"key_{i}": Any for i in range(n_keys)},
+        },
+    )
+
+    def node(state: State) -> dict:
+        return {"count": 1, f"key_{state['count'] % n_keys}": state["count"]}
+
+    builder = StateGraph(State)
+    builder.add_node("node", node, input_keys=["count"] if narrow_input else None)
+    builder.add_edge(START, "node")
+    builder.add_conditional_edges(
+        "node", lambda state: END if state["count"] >= n_steps else "node"
+    )
+    return builder
+
+
+def write_updates(graph: CompiledStateGraph, n_iterations: int = 10000) -> float:
+    """Return the time, in seconds, for the writers of the node of `graph` to
+    turn an update of two keys into channel writes."""
+    writes: list[tuple[str, Any]] = []
+    config = {"configurable": {CONFIG_KEY_SEND: writes.extend}}
+    # the first writer updates the state, the others are the branch
+    writer = graph.nodes["node"].flat_writers[0]
+    update = {"count": 1, "key_0": 1}
+    start = time.perf_counter()
+    for _ in range(n_iterations):
+        writer.invoke(update, config)
+    elapsed = time.perf_counter() - start
+    assert len(writes) == 3 * n_iterations
+    return elapsed / n_iterations
+
+
+if __name__ == "__main__":
+    n_steps = 1000
+    for narrow_input in (False, True):
+        for n_keys in (10, 100, 300, 1000):
+            graph = wide_schema(n_keys, n_steps, narrow_input=narrow_input).compile()
+            start = time.perf_counter()
+            graph.invoke({"count": 0}, {"recursion_limit": n_steps + 1})
+            elapsed = time.perf_counter() - start
+            print(
+                f"{n_keys} keys, narrow_input={narrow_input}: "
+                f"{elapsed / n_steps * 1e6:.1f}us per node, "
+                f"{write_updates(graph) * 1e6:.1f}us per write"
+            )
@@ -0,0 +1,148 @@
+import uuid
+from typing import Any, Optional, Sequence, Union
+
+from langchain_core.messages import (
+    AnyMessage,
+    MessageLikeRepresentation,
+    RemoveMessage,
+    convert_to_messages,
+    message_chunk_to_message,
+)
+from typing_extensions import Self
+
+from langgraph.channels.base import BaseChannel
+from langgraph.checkpoint.base import SegmentLog
+from langgraph.checkpoint.base.id import uuid6
+
+Messages = Union[list[MessageLikeRepresentation], MessageLikeRepresentation]
+
+
+class MessagesChannel(BaseChannel[list[AnyMessage], Messages, SegmentLog]):
+    """Stores a list of messages, merging each update into it like `add_messages`.
+
+    The channel keeps an index of message IDs across updates, so appending,
+    replacing or removing messages costs O(len(update)) instead of rebuilding
+    the whole list. It is checkpointed as a `SegmentLog`, with one segment for
+    the messages appended between two checkpoints, so that checkpointers only
+    persist the new messages.
+
+    State keys opt in by annotating with the channel instead of `add_messages`:
+
+        messages: Annotated[list[AnyMessage], MessagesChannel]
+
+    Note:
+        Checkpoints of such keys hold a `SegmentLog` instead of a list, which
+        readers of checkpoints saved before this channel existed can't load. Lists
+        saved by keys annotated with `add_messages` are loaded by this channel,
+        and a `SegmentLog` is loaded as a list by other channels.
+    """
+
+    __slots__ = ("segments", "saved", "index", "length", "value")
+
+    def __init__(self, typ: Any = list) -> None:
+        super().__init__(typ)
+        # (segment ID, messages) pairs, segments are never modified once created
+        self.segments: list[tuple[str, list[AnyMessage]]] = []
+        # number of segments already included in a checkpoint
+        self.saved = 0
+        # message ID -> position in the list of messages
+        self.index: dict[str, int] = {}
+        self.length = 0
+        # list of messages, rebuilt from segments on read after an update
+        self.value: Optional[list[AnyMessage]] = []
+
+    def __eq__(self, value: object) -> bool:
+        return isinstance(value, MessagesChannel)
+
+    @property
+    def ValueType(self) -> Any:
+        """The type of the value stored in the channel."""
+        return self.typ
+
+    @property
+    def UpdateType(self) -> Any:
+        """The type of the update received by the channel."""
+        return self.typ
+
+    def checkpoint(self) -> SegmentLog:
+        self.saved = len(self.segments)
+        return SegmentLog(self.segments)
+
+    def from_checkpoint(self, checkpoint: Optional[SegmentLog]) -> Self:
+        empty = self.__class__(self.typ)
+        empty.key = self.key
+        if isinstance(checkpoint, SegmentLog):
+            empty.segments = [
+                (segment_id, messages) for segment_id, messages in checkpoint.segments
+            ]
+            empty.saved = len(empty.segments)
+            empty.value = None
+            for _, messages in empty.segments:
+                for m in messages:
+                    empty.index[m.id] = empty.length
+                    empty.length += 1
+        elif checkpoint is not None:
+            # list of messages saved before this channel was introduced
+            empty.update([checkpoint])
+        return empty
+
+    def update(self, values: Sequence[Messages]) -> bool:
+        if not values:
+            return False
+        for value in values:
+            self._merge(value)
+        return True
+
+    def get(self) -> list[AnyMessage]:
+        if self.value is None:
+            self.value = [m for _, messages in self.segments for m in messages]
+        return self.value
+
+    def _merge(self, right: Messages) -> None:
+        # coerce to list of messages, with ids
+        if not isinstance(right, list):
+            right = [right]
+        right = [message_chunk_to_message(m) for m in convert_to_messages(right)]
+        for m in right:
+            if m.id is None:
+                m.id = str(uuid.uuid4())
+        # merge, looking up existing messages in the index
+        appended: list[AnyMessage] = []
+        replaced: dict[int, AnyMessage] = {}
+        ids_to_remove = set()
+        for m in right:
+            if (existing_idx := self.index.get(m.id)) is not None:
+                if isinstance(m, RemoveMessage):
+                    ids_to_remove.add(m.id)
+                else:
+                    replaced[existing_idx] = m
+            else:
+                if isinstance(m, RemoveMessage):
+                    raise ValueError(
+                        f"Attempting to delete a message with an ID that doesn't exist ('{m.id}')"
+                    )
+
+                appended.append(m)
+        if replaced or ids_to_remove:
+            # existing segments changed, so start a new log with a single segment
+            merged = self.get().copy()
+            for idx, m in replaced.items():
+                merged[idx] = m
+            merged.extend(appended)
+            merged = [m for m in merged if m.id not in ids_to_remove]
+            self.segments = [(str(uuid6()), merged)] if merged else []
+            self.saved = 0
+            self.index = {m.id: i for i, m in enumerate(merged)}
+            self.length = len(merged)
+            self.value = merged
+        elif appended:
+            for m in appended:
+                self.index[m.id] = self.length
+                self.length += 1
+            if len(self.segments) > self.saved:
+                # the last segment wasn't checkpointed yet, so it can be extended
+                segment_id, messages = self.segments[-1]
+                self.segments[-1] = (segment_id, messages + appended)
+            else:
+                self.segments.append((str(uuid6()), appended))
+            self.value = None
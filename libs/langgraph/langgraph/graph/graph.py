@@ -381,6 +381,9 @@ class Graph:
         interrupt_before: Optional[Union[All, Sequence[str]]] = None,
         interrupt_after: Optional[Union[All, Sequence[str]]] = None,
         debug: bool = False,
+        pooled: bool = False,
+        checkpoint_writes_batch_size: int = 100,
+        checkpoint_writes_max_delay: float = 0.0,
     ) -> "CompiledGraph":
         # assign default values
         interrupt_before = interrupt_before or []
@@ -409,6 +412,9 @@ class Graph:
             interrupt_after_nodes=interrupt_after,
             auto_validate=False,
             debug=debug,
+            pooled=pooled,
+            checkpoint_writes_batch_size=checkpoint_writes_batch_size,
+            checkpoint_writes_max_delay=checkpoint_writes_max_delay,
         )
 
         # attach nodes, edges, and branches
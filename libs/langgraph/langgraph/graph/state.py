@@ -42,10 +42,14 @@ from langgraph.managed.base import (
     is_writable_managed_value,
 )
 from langgraph.pregel.read import ChannelRead, PregelNode
-from langgraph.pregel.types import All, RetryPolicy
-from langgraph.pregel.write import SKIP_WRITE, ChannelWrite, ChannelWriteEntry
+from langgraph.pregel.types import All, RetryPolicy, SingleFlightPolicy
+from langgraph.pregel.write import (
+    ChannelWrite,
+    ChannelWriteEntry,
+    ChannelWriteTupleEntry,
+)
 from langgraph.store.base import BaseStore
-from langgraph.utils.fields import get_field_default
+from langgraph.utils.fields import get_cached_annotated_keys, get_field_default
 from langgraph.utils.runnable import coerce_to_runnable
 
 logger = logging.getLogger(__name__)
@@ -68,6 +72,9 @@ class StateNodeSpec(NamedTuple):
     metadata: dict[str, Any]
     input: Type[Any]
     retry_policy: Optional[RetryPolicy]
+    process_pool: bool = False
+    input_keys: Optional[Sequence[str]] = None
+    single_flight: Optional[SingleFlightPolicy] = None
 
 
 class StateGraph(Graph):
@@ -201,7 +208,10 @@ class StateGraph(Graph):
         *,
         metadata: Optional[dict[str, Any]] = None,
         input: Optional[Type[Any]] = None,
+        input_keys: Optional[Sequence[str]] = None,
         retry: Optional[RetryPolicy] = None,
+        single_flight: Optional[SingleFlightPolicy] = None,
+        process_pool: bool = False,
     ) -> None:
         """Adds a new node to the state graph.
         Will take the name of the function/runnable as the node name.
@@ -225,7 +235,10 @@ class StateGraph(Graph):
         *,
         metadata: Optional[dict[str, Any]] = None,
         input: Optional[Type[Any]] = None,
+        input_keys: Optional[Sequence[str]] = None,
         retry: Optional[RetryPolicy] = None,
+        single_flight: Optional[SingleFlightPolicy] = None,
+        process_pool: bool = False,
     ) -> None:
         """Adds a new node to the state graph.
 
@@ -248,7 +261,10 @@ class StateGraph(Graph):
         *,
         metadata: Optional[dict[str, Any]] = None,
         input: Optional[Type[Any]] = None,
+        input_keys: Optional[Sequence[str]] = None,
         retry: Optional[RetryPolicy] = None,
+        single_flight: Optional[SingleFlightPolicy] = None,
+        process_pool: bool = False,
     ) -> None:
         """Adds a new node to the state graph.
 
@@ -259,7 +275,17 @@ class StateGraph(Graph):
             action (Optional[RunnableLike]): The action associated with the node. (default: None)
             metadata (Optional[dict[str, Any]]): The metadata associated with the node. (default: None)
             input (Optional[Type[Any]]): The input schema for the node. (default: the graph's input schema)
+            input_keys (Optional[Sequence[str]]): The keys of the input schema the node reads.
+                Only these keys are read from the state and passed to the node, so building
+                its input doesn't scale with the width of the state. For dataclass or pydantic
+                schemas, the other fields must have defaults. (default: all keys)
             retry (Optional[RetryPolicy]): The policy for retrying the node. (default: None)
+            single_flight (Optional[SingleFlightPolicy]): The policy for sharing one execution
+                of the node between its tasks with the same input fingerprint running at the
+                same time, in this or other runs of the graph. (default: None)
+            process_pool (bool): Whether to run the node in a worker process, for CPU-bound
+                nodes. The node must be a picklable sync function or runnable, and its input
+                and output must be picklable. (default: False)
         Raises:
             ValueError: If the key is already being used as a state key.
 
@@ -338,11 +364,21 @@ class StateGraph(Graph):
             pass
         if input is not None:
             self._add_schema(input)
+        if input_keys is not None:
+            if missing := [
+                k for k in input_keys if k not in self.schemas[input or self.schema]
+            ]:
+                raise ValueError(
+                    f"Input keys {missing} of node `{node}` are not in its input schema"
+                )
         self.nodes[node] = StateNodeSpec(
             coerce_to_runnable(action, name=node, trace=False),
             metadata,
             input=input or self.schema,
             retry_policy=retry,
+            process_pool=process_pool,
+            input_keys=input_keys,
+            single_flight=single_flight,
         )
 
     def add_edge(self, start_key: Union[str, list[str]], end_key: str) -> None:
@@ -388,6 +424,9 @@ class StateGraph(Graph):
         interrupt_before: Optional[Union[All, Sequence[str]]] = None,
         interrupt_after: Optional[Union[All, Sequence[str]]] = None,
         debug: bool = False,
+        pooled: bool = False,
+        checkpoint_writes_batch_size: int = 100,
+        checkpoint_writes_max_delay: float = 0.0,
     ) -> "CompiledStateGraph":
         """Compiles the state graph into a `CompiledGraph` object.
 
@@ -401,6 +440,12 @@ class StateGraph(Graph):
             interrupt_before (Optional[Sequence[str]]): An optional list of node names to interrupt before.
             interrupt_after (Optional[Sequence[str]]): An optional list of node names to interrupt after.
             debug (bool): A flag indicating whether to enable debug mode.
+            pooled (bool): A flag indicating whether to keep the thread pool running
+                tasks alive across invocations.
+            checkpoint_writes_batch_size (int): The maximum number of task writes to
+                save to the checkpointer in one call.
+            checkpoint_writes_max_delay (float): The maximum time to wait for more
+                task writes before saving them to the checkpointer, in seconds.
 
         Returns:
             CompiledStateGraph: The compiled state graph.
@@ -455,6 +500,9 @@ class StateGraph(Graph):
             interrupt_after_nodes=interrupt_after,
             auto_validate=False,
             debug=debug,
+            pooled=pooled,
+            checkpoint_writes_batch_size=checkpoint_writes_batch_size,
+            checkpoint_writes_max_delay=checkpoint_writes_max_delay,
             store=store,
         )
 
@@ -512,25 +560,35 @@ class CompiledStateGraph(CompiledGraph):
                 if is_writable_managed_value(v)
             ]
 
-        def _get_state_key(input: Union[None, dict, Any], *, key: str) -> Any:
+        output_keys_set = frozenset(output_keys)
+        # keys of each output type which are state keys, computed once per type
+        update_keys: dict[type, tuple[str, ...]] = {}
+
+        def _get_updates(
+            input: Union[None, dict, Any],
+        ) -> Optional[list[tuple[str, Any]]]:
             if input is None:
-                return SKIP_WRITE
+                return None
             elif isinstance(input, dict):
-                return input.get(key, SKIP_WRITE)
-            elif get_type_hints(type(input)):
-                value = getattr(input, key, SKIP_WRITE)
-                return value if value is not None else SKIP_WRITE
+                return [(k, v) for k, v in input.items() if k in output_keys_set]
+            elif (t := type(input)) in update_keys or get_cached_annotated_keys(t):
+                if (keys := update_keys.get(t)) is None:
+                    keys = update_keys[t] = tuple(
+                        k for k in get_cached_annotated_keys(t) if k in output_keys_set
+                    )
+                return [
+                    (k, value)
+                    for k in keys
+                    if (value := getattr(input, k, None)) is not None
+                ]
             else:
                 raise InvalidUpdateError(f"Expected dict, got {input}")
 
-        # state updaters
+        # state updaters, writing only the keys present in the node output
         write_entries = (
             [ChannelWriteEntry("__root__", skip_none=True)]
             if output_keys == ["__root__"]
-            else [
-                ChannelWriteEntry(key, mapper=partial(_get_state_key, key=key))
-                for key in output_keys
-            ]
+            else [ChannelWriteTupleEntry(_get_updates)]
         )
 
         # add node and output channel
@@ -549,7 +607,11 @@ class CompiledStateGraph(CompiledGraph):
             )
         else:
             input_schema = node.input if node else self.builder.schema
-            input_values = {k: k for k in self.builder.schemas[input_schema]}
+            input_values = {
+                k: k
+                for k in self.builder.schemas[input_schema]
+                if node is None or node.input_keys is None or k in node.input_keys
+            }
             is_single_input = len(input_values) == 1 and "__root__" in input_values
 
             self.channels[key] = EphemeralValue(Any, guard=False)
@@ -573,6 +635,8 @@ class CompiledStateGraph(CompiledGraph):
                 ],
                 metadata=node.metadata,
                 retry_policy=node.retry_policy,
+                process_pool=node.process_pool,
+                single_flight=node.single_flight,
                 bound=node.runnable,
             )
 
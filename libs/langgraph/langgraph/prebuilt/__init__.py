@@ -1,6 +1,11 @@
 """langgraph.prebuilt exposes a higher-level API for creating and executing agents and tools."""
 
 from langgraph.prebuilt.chat_agent_executor import create_react_agent
+from langgraph.prebuilt.tool_cache import (
+    BaseToolCache,
+    InMemoryToolCache,
+    StoreToolCache,
+)
 from langgraph.prebuilt.tool_executor import ToolExecutor, ToolInvocation
 from langgraph.prebuilt.tool_node import InjectedState, ToolNode, tools_condition
 from langgraph.prebuilt.tool_validator import ValidationNode
@@ -13,4 +18,7 @@ __all__ = [
     "tools_condition",
     "ValidationNode",
     "InjectedState",
+    "BaseToolCache",
+    "InMemoryToolCache",
+    "StoreToolCache",
 ]
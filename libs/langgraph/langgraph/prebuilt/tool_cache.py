@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from langchain_core.messages import ToolMessage, message_to_dict, messages_from_dict
+
+from langgraph.store.base import BaseStore
+
+
+def tool_cache_key(name: str, args: dict[str, Any]) -> str:
+    """Return the cache key of a tool call, a hash of the tool name and of its
+    arguments serialized with sorted keys, so that equal arguments give the
+    same key whatever their order."""
+    payload = json.dumps(
+        [name, args],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class BaseToolCache(ABC):
+    """Cache of the `ToolMessage` results of tool calls, used by `ToolNode`.
+
+    Attributes:
+        hits (int): Number of lookups that found a result.
+        misses (int): Number of lookups that didn't find a result.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[ToolMessage]:
+        """Look up the result stored for a key, or None if missing or expired."""
+        message = self._get(key)
+        self._count(message is not None)
+        return message
+
+    async def aget(self, key: str) -> Optional[ToolMessage]:
+        """Asynchronously look up the result stored for a key, or None if
+        missing or expired."""
+        message = await self._aget(key)
+        self._count(message is not None)
+        return message
+
+    @abstractmethod
+    def put(self, key: str, message: ToolMessage, ttl: Optional[float]) -> None:
+        """Store the result for a key, expiring after `ttl` seconds if not None."""
+
+    async def aput(self, key: str, message: ToolMessage, ttl: Optional[float]) -> None:
+        """Asynchronously store the result for a key, expiring after `ttl`
+        seconds if not None."""
+        self.put(key, message, ttl)
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[ToolMessage]: ...
+
+    async def _aget(self, key: str) -> Optional[ToolMessage]:
+        return self._get(key)
+
+    def _count(self, hit: bool) -> None:
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class InMemoryToolCache(BaseToolCache):
+    """Tool cache held in memory, evicting the least recently used results
+    once it holds `max_entries` of them.
+
+    Args:
+        max_entries (Optional[int]): Maximum number of results to keep.
+            Defaults to 1000, None for no limit.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 1000) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.data: OrderedDict[str, tuple[Optional[float], ToolMessage]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[ToolMessage]:
+        with self.lock:
+            if (entry := self.data.get(key)) is None:
+                return None
+            expires_at, message = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return message
+
+    def put(self, key: str, message: ToolMessage, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self.lock:
+            self.data[key] = (expires_at, message)
+            self.data.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self.data) > self.max_entries:
+                    self.data.popitem(last=False)
+
+
+class StoreToolCache(BaseToolCache):
+    """Tool cache held in a `BaseStore`, so results can be shared by the graphs
+    using the same store. Each result is saved in its own namespace, under
+    `namespace`, with its expiry time. Expired results are overwritten by the
+    next result for the same key, the store is never pruned.
+
+    Args:
+        store (BaseStore): The store to save results in.
+        namespace (str): Prefix of the namespaces of results. Defaults to
+            "tool_cache".
+    """
+
+    def __init__(self, store: BaseStore, *, namespace: str = "tool_cache") -> None:
+        super().__init__()
+        self.store = store
+        self.namespace = namespace
+
+    def _get(self, key: str) -> Optional[ToolMessage]:
+        ns = self._ns(key)
+        return self._load(self.store.list([ns]).get(ns))
+
+    async def _aget(self, key: str) -> Optional[ToolMessage]:
+        ns = self._ns(key)
+        return self._load((await self.store.alist([ns])).get(ns))
+
+    def put(self, key: str, message: ToolMessage, ttl: Optional[float]) -> None:
+        self.store.put([(self._ns(key), "result", self._dump(message, ttl))])
+
+    async def aput(self, key: str, message: ToolMessage, ttl: Optional[float]) -> None:
+        await self.store.aput([(self._ns(key), "result", self._dump(message, ttl))])
+
+    def _ns(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _dump(self, message: ToolMessage, ttl: Optional[float]) -> dict[str, Any]:
+        return {
+            "message": message_to_dict(message),
+            "expires_at": time.time() + ttl if ttl is not None else None,
+        }
+
+    def _load(self, saved: Optional[dict[str, Any]]) -> Optional[ToolMessage]:
+        if not saved or (value := saved.get("result")) is None:
+            return None
+        if value["expires_at"] is not None and value["expires_at"] <= time.time():
+            return None
+        return messages_from_dict([value["message"]])[0]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import asyncio
 import json
+import threading
+from concurrent.futures import Executor
 from copy import copy
 from typing import (
     TYPE_CHECKING,
@@ -10,6 +11,7 @@ from typing import (
     Dict,
     List,
     Literal,
+    Mapping,
     Optional,
     Sequence,
     Tuple,
@@ -25,13 +27,16 @@ from langchain_core.messages import (
 )
 from langchain_core.runnables import RunnableConfig
 from langchain_core.runnables.config import (
+    ContextThreadPoolExecutor,
     get_config_list,
     get_executor_for_config,
 )
+from langchain_core.runnables.utils import gather_with_concurrency
 from langchain_core.tools import BaseTool, InjectedToolArg
 from langchain_core.tools import tool as create_tool
 from typing_extensions import Annotated, get_args, get_origin
 
+from langgraph.prebuilt.tool_cache import BaseToolCache, tool_cache_key
 from langgraph.utils.runnable import RunnableCallable
 
 if TYPE_CHECKING:
@@ -42,6 +47,8 @@ INVALID_TOOL_NAME_ERROR_TEMPLATE = (
 )
 TOOL_CALL_ERROR_TEMPLATE = "Error: {error}\n Please fix your mistakes."
 
+_EXECUTOR_LOCK = threading.Lock()
+
 
 def str_output(output: Any) -> str:
     if isinstance(output, str):
@@ -73,6 +80,18 @@ class ToolNode(RunnableCallable):
         return {"messages": result}
     ```
 
+    Sync tool calls run in a thread pool owned by the node, started on first use
+    and reused by all its invocations. Call `close()`, or use the node as a context
+    manager, to shut it down. If `max_concurrency` is set, at most that many tool
+    calls run at the same time.
+
+    If a `cache` is given, the results of tool calls are cached, keyed on the tool
+    name and arguments, and a repeated call returns the cached `ToolMessage` with
+    its own `tool_call_id`. `cache_ttl` is the time in seconds after which results
+    expire, None to keep them until evicted, or a mapping from tool names to their
+    TTL, in which case only the tools in the mapping are cached. Tools taking
+    `InjectedState` arguments and calls that raised errors are never cached.
+
     Important:
         - The state MUST contain a list of messages.
         - The last message MUST be an `AIMessage`.
@@ -88,14 +107,54 @@ class ToolNode(RunnableCallable):
         name: str = "tools",
         tags: Optional[list[str]] = None,
         handle_tool_errors: Optional[bool] = True,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[BaseToolCache] = None,
+        cache_ttl: Optional[Union[float, Mapping[str, Optional[float]]]] = None,
     ) -> None:
         super().__init__(self._func, self._afunc, name=name, tags=tags, trace=False)
         self.tools_by_name: Dict[str, BaseTool] = {}
+        self.tool_to_state_args: Dict[str, Dict[str, Optional[str]]] = {}
         self.handle_tool_errors = handle_tool_errors
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.tool_to_cache_ttl: Dict[str, Optional[float]] = {}
         for tool_ in tools:
             if not isinstance(tool_, BaseTool):
                 tool_ = create_tool(tool_)
             self.tools_by_name[tool_.name] = tool_
+            self.tool_to_state_args[tool_.name] = _get_state_args(tool_)
+            if cache is None or self.tool_to_state_args[tool_.name]:
+                continue
+            if not isinstance(cache_ttl, Mapping):
+                self.tool_to_cache_ttl[tool_.name] = cache_ttl
+            elif tool_.name in cache_ttl:
+                self.tool_to_cache_ttl[tool_.name] = cache_ttl[tool_.name]
+
+    def _get_executor(self, config: RunnableConfig) -> Optional[Executor]:
+        """Get the thread pool of this node, unless the config sets its own
+        `max_concurrency`."""
+        if config and config.get("max_concurrency") is not None:
+            return None
+        with _EXECUTOR_LOCK:
+            if (executor := self.__dict__.get("_executor")) is None:
+                executor = self._executor = ContextThreadPoolExecutor(
+                    max_workers=self.max_concurrency
+                )
+        return executor
+
+    def close(self) -> None:
+        """Shut down the thread pool of this node, waiting for the tool calls it
+        is running. A later invocation starts a new pool."""
+        with _EXECUTOR_LOCK:
+            executor = self.__dict__.pop("_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> ToolNode:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _func(
         self,
@@ -108,8 +167,13 @@ class ToolNode(RunnableCallable):
     ) -> Any:
         tool_calls, output_type = self._parse_input(input)
         config_list = get_config_list(config, len(tool_calls))
-        with get_executor_for_config(config) as executor:
+        if len(tool_calls) == 1:
+            outputs = [self._run_one(tool_calls[0], config_list[0])]
+        elif executor := self._get_executor(config):
             outputs = [*executor.map(self._run_one, tool_calls, config_list)]
+        else:
+            with get_executor_for_config(config) as executor:
+                outputs = [*executor.map(self._run_one, tool_calls, config_list)]
         # TypedDict, pydantic, dataclass, etc. should all be able to load from dict
         return outputs if output_type == "list" else {"messages": outputs}
 
@@ -123,8 +187,9 @@ class ToolNode(RunnableCallable):
         config: RunnableConfig,
     ) -> Any:
         tool_calls, output_type = self._parse_input(input)
-        outputs = await asyncio.gather(
-            *(self._arun_one(call, config) for call in tool_calls)
+        outputs = await gather_with_concurrency(
+            self.max_concurrency,
+            *(self._arun_one(call, config) for call in tool_calls),
         )
         # TypedDict, pydantic, dataclass, etc. should all be able to load from dict
         return outputs if output_type == "list" else {"messages": outputs}
@@ -132,6 +197,9 @@ class ToolNode(RunnableCallable):
     def _run_one(self, call: ToolCall, config: RunnableConfig) -> ToolMessage:
         if invalid_tool_message := self._validate_tool_call(call):
             return invalid_tool_message
+        if cache_key := self._cache_key(call):
+            if cached := self.cache.get(cache_key):
+                return _from_cache(cached, call)
 
         try:
             input = {**call, **{"type": "tool_call"}}
@@ -140,6 +208,12 @@ class ToolNode(RunnableCallable):
             )
             # TODO: handle this properly in core
             tool_message.content = str_output(tool_message.content)
+            if cache_key and tool_message.status != "error":
+                self.cache.put(
+                    cache_key,
+                    tool_message.copy(),
+                    self.tool_to_cache_ttl[call["name"]],
+                )
             return tool_message
         except Exception as e:
             if not self.handle_tool_errors:
@@ -150,6 +224,9 @@ class ToolNode(RunnableCallable):
     async def _arun_one(self, call: ToolCall, config: RunnableConfig) -> ToolMessage:
         if invalid_tool_message := self._validate_tool_call(call):
             return invalid_tool_message
+        if cache_key := self._cache_key(call):
+            if cached := await self.cache.aget(cache_key):
+                return _from_cache(cached, call)
         try:
             input = {**call, **{"type": "tool_call"}}
             tool_message: ToolMessage = await self.tools_by_name[call["name"]].ainvoke(
@@ -157,6 +234,12 @@ class ToolNode(RunnableCallable):
             )
             # TODO: handle this properly in core
             tool_message.content = str_output(tool_message.content)
+            if cache_key and tool_message.status != "error":
+                await self.cache.aput(
+                    cache_key,
+                    tool_message.copy(),
+                    self.tool_to_cache_ttl[call["name"]],
+                )
             return tool_message
         except Exception as e:
             if not self.handle_tool_errors:
@@ -194,6 +277,11 @@ class ToolNode(RunnableCallable):
         ]
         return tool_calls, output_type
 
+    def _cache_key(self, call: ToolCall) -> Optional[str]:
+        if self.cache is None or call["name"] not in self.tool_to_cache_ttl:
+            return None
+        return tool_cache_key(call["name"], call["args"])
+
     def _validate_tool_call(self, call: ToolCall) -> Optional[ToolMessage]:
         if (requested_tool := call["name"]) not in self.tools_by_name:
             content = INVALID_TOOL_NAME_ERROR_TEMPLATE.format(
@@ -215,7 +303,7 @@ class ToolNode(RunnableCallable):
     ) -> ToolCall:
         if tool_call["name"] not in self.tools_by_name:
             return tool_call
-        state_args = _get_state_args(self.tools_by_name[tool_call["name"]])
+        state_args = self.tool_to_state_args[tool_call["name"]]
         if state_args and isinstance(input, list):
             required_fields = list(state_args.values())
             if (
@@ -253,6 +341,11 @@ class ToolNode(RunnableCallable):
         return tool_call_copy
 
 
+def _from_cache(message: ToolMessage, call: ToolCall) -> ToolMessage:
+    # a new message, so that it gets its own ID in the state
+    return message.copy(update={"tool_call_id": call["id"], "id": None})
+
+
 def tools_condition(
     state: Union[list[AnyMessage], dict[str, Any], BaseModel],
 ) -> Literal["tools", "__end__"]:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 from collections import deque
+from concurrent.futures import Executor
 from functools import partial
 from typing import (
     Any,
@@ -28,6 +30,7 @@ from langchain_core.runnables import (
 )
 from langchain_core.runnables.base import Input, Output
 from langchain_core.runnables.config import (
+    ContextThreadPoolExecutor,
     RunnableConfig,
     get_async_callback_manager_for_config,
     get_callback_manager_for_config,
@@ -95,6 +98,8 @@ from langgraph.utils.runnable import RunnableCallable
 
 WriteValue = Union[Callable[[Input], Output], Any]
 
+_EXECUTOR_LOCK = threading.Lock()
+
 
 class Channel:
     @overload
@@ -171,6 +176,9 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
 
     channels: Mapping[str, Union[BaseChannel, ManagedValueSpec]]
 
+    trigger_to_nodes: Mapping[str, Sequence[str]]
+    """Index of the nodes subscribed to each channel, built when validating."""
+
     stream_mode: StreamMode = "values"
     """Mode to stream output, defaults to 'values'."""
 
@@ -188,6 +196,21 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
     step_timeout: Optional[float] = None
     """Maximum time to wait for a step to complete, in seconds. Defaults to None."""
 
+    checkpoint_writes_batch_size: int = 100
+    """Maximum number of task writes to save to the checkpointer in one call. A full batch
+    is saved without waiting for `checkpoint_writes_max_delay`. Defaults to 100."""
+
+    checkpoint_writes_max_delay: float = 0.0
+    """Maximum time to wait for more task writes before saving them to the checkpointer,
+    in seconds. Defaults to 0, which saves the writes that finished while the previous
+    batch was being saved."""
+
+    pooled: bool = False
+    """Whether to keep the thread pool running tasks of sync invocations alive
+    across invocations, instead of starting a new one for each invocation. Reduces
+    the setup cost of invoking short graphs many times. The pool isn't used when
+    `max_concurrency` is set in the config. Defaults to False."""
+
     debug: bool
     """Whether to print debug information during execution. Defaults to False."""
 
@@ -219,6 +242,9 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         interrupt_before_nodes: Union[All, Sequence[str]] = (),
         input_channels: Union[str, Sequence[str]],
         step_timeout: Optional[float] = None,
+        checkpoint_writes_batch_size: int = 100,
+        checkpoint_writes_max_delay: float = 0.0,
+        pooled: bool = False,
         debug: Optional[bool] = None,
         checkpointer: Optional[BaseCheckpointSaver] = None,
         store: Optional[BaseStore] = None,
@@ -226,9 +252,11 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         config_type: Optional[Type[Any]] = None,
         config: Optional[RunnableConfig] = None,
         name: str = "LangGraph",
+        trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
     ) -> None:
         self.nodes = nodes
         self.channels = channels or {}
+        self.trigger_to_nodes = trigger_to_nodes or {}
         self.stream_mode = stream_mode
         self.output_channels = output_channels
         self.stream_channels = stream_channels
@@ -236,6 +264,9 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         self.interrupt_before_nodes = interrupt_before_nodes
         self.input_channels = input_channels
         self.step_timeout = step_timeout
+        self.checkpoint_writes_batch_size = checkpoint_writes_batch_size
+        self.checkpoint_writes_max_delay = checkpoint_writes_max_delay
+        self.pooled = pooled
         self.debug = debug if debug is not None else get_debug()
         self.checkpointer = checkpointer
         self.store = store
@@ -248,7 +279,21 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
 
     def copy(self, update: dict[str, Any]) -> Self:
         attrs = {**self.__dict__, **update}
-        return self.__class__(**attrs)
+        executor = attrs.pop("_executor", None)
+        copy = self.__class__(**attrs)
+        if executor is not None:
+            # share the thread pool kept alive across invocations
+            copy._executor = executor
+        return copy
+
+    def _get_executor(self, config: RunnableConfig) -> Optional[Executor]:
+        """Get the thread pool kept alive across invocations, if pooled."""
+        if not self.pooled or config.get("max_concurrency") is not None:
+            return None
+        with _EXECUTOR_LOCK:
+            if (executor := self.__dict__.get("_executor")) is None:
+                executor = self._executor = ContextThreadPoolExecutor()
+        return executor
 
     def with_config(self, config: RunnableConfig | None = None, **kwargs: Any) -> Self:
         return self.copy({"config": merge_configs(self.config, config, kwargs)})
@@ -263,6 +308,11 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
             self.interrupt_after_nodes,
             self.interrupt_before_nodes,
         )
+        trigger_to_nodes: dict[str, list[str]] = {}
+        for name, node in self.nodes.items():
+            for trigger in node.triggers:
+                trigger_to_nodes.setdefault(trigger, []).append(name)
+        self.trigger_to_nodes = trigger_to_nodes
         return self
 
     @property
@@ -457,6 +507,18 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
                 tasks_w_writes(next_tasks.values(), saved.pending_writes, task_states),
             )
 
+    def _prepare_history_snapshot(self, saved: CheckpointTuple) -> StateSnapshot:
+        # snapshot without values, next and tasks, which need the channels
+        return StateSnapshot(
+            values=None,
+            next=(),
+            config=patch_checkpoint_map(saved.config, saved.metadata),
+            metadata=saved.metadata,
+            created_at=saved.checkpoint["ts"],
+            parent_config=saved.parent_config,
+            tasks=(),
+        )
+
     async def _aprepare_state_snapshot(
         self,
         config: RunnableConfig,
@@ -610,13 +672,24 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         filter: Optional[Dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        page_size: int = 100,
+        values: bool = True,
     ) -> Iterator[StateSnapshot]:
-        """Get the history of the state of the graph."""
+        """Get the history of the state of the graph, newest first.
+
+        Checkpoints are read from the checkpointer one page of `page_size` at a
+        time, as the history is consumed, so `page_size` must be at least 1. If
+        not `values`, the snapshots only have their config, metadata, creation
+        time and parent config, without restoring the channels: their values are
+        None, next and tasks empty.
+        """
         checkpointer: Optional[BaseCheckpointSaver] = config["configurable"].get(
             CONFIG_KEY_CHECKPOINTER, self.checkpointer
         )
         if not checkpointer:
             raise ValueError("No checkpointer set")
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
 
         if (
             checkpoint_ns := config["configurable"].get("checkpoint_ns", "")
@@ -635,6 +708,8 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
                         filter=filter,
                         before=before,
                         limit=limit,
+                        page_size=page_size,
+                        values=values,
                     )
                     return
             else:
@@ -643,13 +718,27 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         config = merge_configs(
             self.config, config, {"configurable": {"checkpoint_ns": checkpoint_ns}}
         )
-        # eagerly consume list() to avoid holding up the db cursor
-        for checkpoint_tuple in list(
-            checkpointer.list(config, before=before, limit=limit, filter=filter)
-        ):
-            yield self._prepare_state_snapshot(
-                checkpoint_tuple.config, checkpoint_tuple
+        while limit is None or limit > 0:
+            # read a page at a time to avoid holding up the db cursor
+            page = checkpointer.list_page(
+                config,
+                filter=filter,
+                before=before,
+                page_size=page_size if limit is None else min(page_size, limit),
+                values=values,
             )
+            for checkpoint_tuple in page.checkpoints:
+                if values:
+                    yield self._prepare_state_snapshot(
+                        checkpoint_tuple.config, checkpoint_tuple
+                    )
+                else:
+                    yield self._prepare_history_snapshot(checkpoint_tuple)
+            if page.next_page is None:
+                break
+            if limit is not None:
+                limit -= len(page.checkpoints)
+            before = page.next_page
 
     async def aget_state_history(
         self,
@@ -658,13 +747,24 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         filter: Optional[Dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        page_size: int = 100,
+        values: bool = True,
     ) -> AsyncIterator[StateSnapshot]:
-        """Get the history of the state of the graph."""
+        """Get the history of the state of the graph, newest first.
+
+        Checkpoints are read from the checkpointer one page of `page_size` at a
+        time, as the history is consumed, so `page_size` must be at least 1. If
+        not `values`, the snapshots only have their config, metadata, creation
+        time and parent config, without restoring the channels: their values are
+        None, next and tasks empty.
+        """
         checkpointer: Optional[BaseCheckpointSaver] = config["configurable"].get(
             CONFIG_KEY_CHECKPOINTER, self.checkpointer
         )
         if not checkpointer:
             raise ValueError("No checkpointer set")
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
 
         if (
             checkpoint_ns := config["configurable"].get("checkpoint_ns", "")
@@ -683,6 +783,8 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
                         filter=filter,
                         before=before,
                         limit=limit,
+                        page_size=page_size,
+                        values=values,
                     ):
                         yield state
                     return
@@ -692,16 +794,27 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
         config = merge_configs(
             self.config, config, {"configurable": {"checkpoint_ns": checkpoint_ns}}
         )
-        # eagerly consume list() to avoid holding up the db cursor
-        for checkpoint_tuple in [
-            c
-            async for c in checkpointer.alist(
-                config, before=before, limit=limit, filter=filter
-            )
-        ]:
-            yield await self._aprepare_state_snapshot(
-                checkpoint_tuple.config, checkpoint_tuple
+        while limit is None or limit > 0:
+            # read a page at a time to avoid holding up the db cursor
+            page = await checkpointer.alist_page(
+                config,
+                filter=filter,
+                before=before,
+                page_size=page_size if limit is None else min(page_size, limit),
+                values=values,
             )
+            for checkpoint_tuple in page.checkpoints:
+                if values:
+                    yield await self._aprepare_state_snapshot(
+                        checkpoint_tuple.config, checkpoint_tuple
+                    )
+                else:
+                    yield self._prepare_history_snapshot(checkpoint_tuple)
+            if page.next_page is None:
+                break
+            if limit is not None:
+                limit -= len(page.checkpoints)
+            before = page.next_page
 
     def update_state(
         self,
@@ -839,9 +952,10 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
             if saved:
                 checkpointer.put_writes(checkpoint_config, task.writes, task_id)
             # apply to checkpoint and save
-            assert not apply_writes(
+            mv_writes, _ = apply_writes(
                 checkpoint, channels, [task], checkpointer.get_next_version
-            ), "Can't write to SharedValues from update_state"
+            )
+            assert not mv_writes, "Can't write to SharedValues from update_state"
             checkpoint = create_checkpoint(checkpoint, channels, step + 1)
             next_config = checkpointer.put(
                 checkpoint_config,
@@ -997,9 +1111,10 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
             if saved:
                 await checkpointer.aput_writes(checkpoint_config, writes, task_id)
             # apply to checkpoint and save
-            assert not apply_writes(
+            mv_writes, _ = apply_writes(
                 checkpoint, channels, [task], checkpointer.get_next_version
-            ), "Can't write to SharedValues from update_state"
+            )
+            assert not mv_writes, "Can't write to SharedValues from update_state"
             checkpoint = create_checkpoint(checkpoint, channels, step + 1)
             next_config = await checkpointer.aput(
                 checkpoint_config,
@@ -1198,6 +1313,10 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
                 specs=self.channels,
                 output_keys=output_keys,
                 stream_keys=self.stream_channels_asis,
+                trigger_to_nodes=self.trigger_to_nodes,
+                checkpoint_writes_batch_size=self.checkpoint_writes_batch_size,
+                checkpoint_writes_max_delay=self.checkpoint_writes_max_delay,
+                executor=self._get_executor(config),
                 debug=debug,
             ) as loop:
                 # create runner
@@ -1387,6 +1506,9 @@ class Pregel(Runnable[Union[dict[str, Any], Any], Union[dict[str, Any], Any]]):
                 specs=self.channels,
                 output_keys=output_keys,
                 stream_keys=self.stream_channels_asis,
+                trigger_to_nodes=self.trigger_to_nodes,
+                checkpoint_writes_batch_size=self.checkpoint_writes_batch_size,
+                checkpoint_writes_max_delay=self.checkpoint_writes_max_delay,
             ) as loop:
                 # create runner
                 runner = PregelRunner(
@@ -4,6 +4,7 @@ from hashlib import sha1
 from typing import (
     Any,
     Callable,
+    Iterable,
     Iterator,
     Literal,
     Mapping,
@@ -27,12 +28,14 @@ from langgraph.constants import (
     CONFIG_KEY_READ,
     CONFIG_KEY_SEND,
     CONFIG_KEY_TASK_ID,
+    ERROR,
     INTERRUPT,
     NO_WRITES,
     NS_SEP,
     PULL,
     PUSH,
     RESERVED,
+    SCHEDULED,
     TAG_HIDDEN,
     TASKS,
     Send,
@@ -44,7 +47,7 @@ from langgraph.pregel.log import logger
 from langgraph.pregel.manager import ChannelsManager
 from langgraph.pregel.read import PregelNode
 from langgraph.pregel.types import All, PregelExecutableTask, PregelTask
-from langgraph.utils.config import merge_configs, patch_config
+from langgraph.utils.config import merge_configs
 
 EMPTY_SEQ = tuple()
 
@@ -93,6 +96,42 @@ def should_interrupt(
     )
 
 
+def resume_checkpoint(checkpoint: Checkpoint, channels: Iterable[str]) -> None:
+    """Mark the current versions of the channels as seen at an interrupt, to
+    proceed past the checkpoint when resuming from it."""
+    seen = checkpoint["versions_seen"].setdefault(INTERRUPT, {})
+    for k in channels:
+        if k in checkpoint["channel_versions"]:
+            seen[k] = checkpoint["channel_versions"][k]
+
+
+def scheduled_version(checkpoint: Checkpoint) -> Any:
+    """Value of the SCHEDULED writes saved for tasks scheduled since the last
+    interrupt of the checkpoint."""
+    return max(checkpoint["versions_seen"].get(INTERRUPT, {}).values(), default=None)
+
+
+def pending_task_writes(
+    checkpoint: Checkpoint,
+    pending_writes: Iterable[tuple[str, str, Any]],
+) -> tuple[set[str], dict[str, list[tuple[str, Any]]]]:
+    """Split the pending writes of a checkpoint into the IDs of the tasks
+    scheduled since its last interrupt, and the writes of each finished task,
+    in order. Errors and interrupts are skipped, as those tasks run again."""
+    version = scheduled_version(checkpoint)
+    scheduled: set[str] = set()
+    writes: dict[str, list[tuple[str, Any]]] = {}
+    for tid, k, v in pending_writes:
+        if k in (ERROR, INTERRUPT):
+            continue
+        if k == SCHEDULED:
+            if v == version:
+                scheduled.add(tid)
+        else:
+            writes.setdefault(tid, []).append((k, v))
+    return scheduled, writes
+
+
 def local_read(
     step: int,
     checkpoint: Checkpoint,
@@ -163,7 +202,12 @@ def apply_writes(
     channels: Mapping[str, BaseChannel],
     tasks: Sequence[WritesProtocol],
     get_next_version: Optional[Callable[[int, BaseChannel], int]],
-) -> dict[str, list[Any]]:
+) -> tuple[dict[str, list[Any]], set[str]]:
+    """Apply writes from a set of tasks to the checkpoint and channels.
+
+    Returns the writes to managed values, to be applied externally, and the
+    set of channels whose version was bumped, ie. the only channels that can
+    trigger nodes in the next step."""
     # update seen versions
     for task in tasks:
         checkpoint["versions_seen"].setdefault(task.name, {}).update(
@@ -180,6 +224,9 @@ def apply_writes(
     else:
         max_version = None
 
+    # Channels whose version was bumped by this call
+    bumped_channels: set[str] = set()
+
     # Consume all channels that were read
     for chan in {
         chan
@@ -191,6 +238,7 @@ def apply_writes(
             checkpoint["channel_versions"][chan] = get_next_version(
                 max_version, channels[chan]
             )
+            bumped_channels.add(chan)
 
     # clear pending sends
     if checkpoint["pending_sends"]:
@@ -224,6 +272,7 @@ def apply_writes(
                 checkpoint["channel_versions"][chan] = get_next_version(
                     max_version, channels[chan]
                 )
+                bumped_channels.add(chan)
             updated_channels.add(chan)
 
     # Channels that weren't updated in this step are notified of a new step
@@ -233,9 +282,10 @@ def apply_writes(
                 checkpoint["channel_versions"][chan] = get_next_version(
                     max_version, channels[chan]
                 )
+                bumped_channels.add(chan)
 
     # Return managed values writes to be applied externally
-    return pending_writes_by_managed
+    return pending_writes_by_managed, bumped_channels
 
 
 @overload
@@ -250,6 +300,8 @@ def prepare_next_tasks(
     for_execution: Literal[False],
     checkpointer: Literal[None] = None,
     manager: Literal[None] = None,
+    updated_channels: Optional[set[str]] = None,
+    trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
 ) -> dict[str, PregelTask]: ...
 
 
@@ -265,6 +317,8 @@ def prepare_next_tasks(
     for_execution: Literal[True],
     checkpointer: Optional[BaseCheckpointSaver],
     manager: Union[None, ParentRunManager, AsyncParentRunManager],
+    updated_channels: Optional[set[str]] = None,
+    trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
 ) -> dict[str, PregelExecutableTask]: ...
 
 
@@ -279,8 +333,20 @@ def prepare_next_tasks(
     for_execution: bool,
     checkpointer: Optional[BaseCheckpointSaver] = None,
     manager: Union[None, ParentRunManager, AsyncParentRunManager] = None,
+    updated_channels: Optional[set[str]] = None,
+    trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
 ) -> Union[dict[str, PregelTask], dict[str, PregelExecutableTask]]:
+    """Prepare the set of tasks that will make up the next Pregel step.
+
+    When `updated_channels` (as returned by `apply_writes`) and
+    `trigger_to_nodes` (channel -> nodes subscribed to it) are both passed,
+    only nodes subscribed to a channel updated in the previous step are
+    considered, instead of checking the triggers of every node."""
     tasks: Union[dict[str, PregelTask], dict[str, PregelExecutableTask]] = {}
+    # Compute the parts shared by all tasks of this step only once
+    step_context = _prepare_step_context(
+        checkpoint, config, step, for_execution, checkpointer, manager
+    )
     # Consume pending packets
     for idx, _ in enumerate(checkpoint["pending_sends"]):
         if task := prepare_single_task(
@@ -295,11 +361,26 @@ def prepare_next_tasks(
             for_execution=for_execution,
             checkpointer=checkpointer,
             manager=manager,
+            step_context=step_context,
         ):
             tasks[task.id] = task
     # Check if any processes should be run in next step
     # If so, prepare the values to be passed to them
-    for name in processes:
+    if updated_channels is not None and trigger_to_nodes:
+        triggered_nodes: set[str] = set()
+        for chan in updated_channels:
+            if node_names := trigger_to_nodes.get(chan):
+                triggered_nodes.update(node_names)
+        # keep declaration order, as task order determines the order
+        # in which the writes of the step are applied
+        candidate_nodes: Iterable[str] = (
+            [name for name in processes if name in triggered_nodes]
+            if triggered_nodes
+            else EMPTY_SEQ
+        )
+    else:
+        candidate_nodes = processes
+    for name in candidate_nodes:
         if task := prepare_single_task(
             (PULL, name),
             None,
@@ -312,11 +393,90 @@ def prepare_next_tasks(
             for_execution=for_execution,
             checkpointer=checkpointer,
             manager=manager,
+            step_context=step_context,
         ):
             tasks[task.id] = task
     return tasks
 
 
+class _StepContext(NamedTuple):
+    """Parts of the task config that are shared by all tasks of a step."""
+
+    checkpoint_id: bytes
+    parent_ns: str
+    config: RunnableConfig
+    """Config of the step, with callbacks already replaced by the step child
+    manager, if any."""
+    configurable: dict[str, Any]
+    """Configurable keys shared by all tasks of the step."""
+    copy_callbacks: bool
+    """Whether the callbacks of the step config need copying for each task."""
+
+
+def _prepare_step_context(
+    checkpoint: Checkpoint,
+    config: RunnableConfig,
+    step: int,
+    for_execution: bool,
+    checkpointer: Optional[BaseCheckpointSaver],
+    manager: Union[None, ParentRunManager, AsyncParentRunManager],
+) -> _StepContext:
+    configurable = config.get("configurable", {})
+    parent_ns = configurable.get("checkpoint_ns", "")
+    if not for_execution:
+        return _StepContext(UUID(checkpoint["id"]).bytes, parent_ns, config, {}, False)
+    step_config = merge_configs(config)
+    if manager is not None:
+        # If we're replacing callbacks, we need to unset run_name and run_id
+        # As those should apply only to the same run as the original callbacks
+        step_config["callbacks"] = manager.get_child(f"graph:step:{step}")
+        step_config.pop("run_name", None)
+        step_config.pop("run_id", None)
+    return _StepContext(
+        UUID(checkpoint["id"]).bytes,
+        parent_ns,
+        step_config,
+        {
+            **configurable,
+            CONFIG_KEY_CHECKPOINTER: (
+                checkpointer or configurable.get(CONFIG_KEY_CHECKPOINTER)
+            ),
+            CONFIG_KEY_CHECKPOINT_MAP: {
+                **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
+                parent_ns: checkpoint["id"],
+            },
+            "checkpoint_id": None,
+        },
+        # the step child manager is updated in place with each task's tags and
+        # metadata, so it is copied for each task too
+        bool(step_config.get("callbacks")),
+    )
+
+
+def _task_config(
+    step_context: _StepContext,
+    proc: PregelNode,
+    name: str,
+    metadata: dict[str, Any],
+    configurable: dict[str, Any],
+) -> RunnableConfig:
+    """Equivalent to patching the result of merging the step config with the
+    task metadata and tags, without copying the shared parts again."""
+    config = step_context.config.copy()
+    if proc.metadata:
+        metadata.update(proc.metadata)
+    if base_metadata := config.get("metadata"):
+        metadata = {**base_metadata, **metadata}
+    config["metadata"] = metadata
+    if proc.tags:
+        config["tags"] = [*config.get("tags", EMPTY_SEQ), *proc.tags]
+    if step_context.copy_callbacks:
+        config["callbacks"] = config["callbacks"].copy()
+    config["run_name"] = name
+    config["configurable"] = {**step_context.configurable, **configurable}
+    return config
+
+
 def prepare_single_task(
     task_path: tuple[str, Union[int, str]],
     task_id_checksum: Optional[str],
@@ -330,10 +490,14 @@ def prepare_single_task(
     for_execution: bool,
     checkpointer: Optional[BaseCheckpointSaver] = None,
     manager: Union[None, ParentRunManager, AsyncParentRunManager] = None,
+    step_context: Optional[_StepContext] = None,
 ) -> Union[None, PregelTask, PregelExecutableTask]:
-    checkpoint_id = UUID(checkpoint["id"]).bytes
-    configurable = config.get("configurable", {})
-    parent_ns = configurable.get("checkpoint_ns", "")
+    if step_context is None:
+        step_context = _prepare_step_context(
+            checkpoint, config, step, for_execution, checkpointer, manager
+        )
+    checkpoint_id = step_context.checkpoint_id
+    parent_ns = step_context.parent_ns
 
     if task_path[0] == PUSH:
         idx = int(task_path[1])
@@ -350,12 +514,6 @@ def prepare_single_task(
             return
         # create task id
         triggers = [PUSH]
-        metadata = {
-            "langgraph_step": step,
-            "langgraph_node": packet.node,
-            "langgraph_triggers": triggers,
-            "langgraph_path": task_path,
-        }
         checkpoint_ns = (
             f"{parent_ns}{NS_SEP}{packet.node}" if parent_ns else packet.node
         )
@@ -373,24 +531,23 @@ def prepare_single_task(
             proc = processes[packet.node]
             if node := proc.node:
                 managed.replace_runtime_placeholders(step, packet.arg)
-                if proc.metadata:
-                    metadata.update(proc.metadata)
                 writes = deque()
-                task_checkpoint_ns = f"{checkpoint_ns}:{task_id}"
                 return PregelExecutableTask(
                     packet.node,
                     packet.arg,
                     node,
                     writes,
-                    patch_config(
-                        merge_configs(
-                            config, {"metadata": metadata, "tags": proc.tags}
-                        ),
-                        run_name=packet.node,
-                        callbacks=(
-                            manager.get_child(f"graph:step:{step}") if manager else None
-                        ),
-                        configurable={
+                    _task_config(
+                        step_context,
+                        proc,
+                        packet.node,
+                        {
+                            "langgraph_step": step,
+                            "langgraph_node": packet.node,
+                            "langgraph_triggers": triggers,
+                            "langgraph_path": task_path,
+                        },
+                        {
                             CONFIG_KEY_TASK_ID: task_id,
                             # deque.extend is thread-safe
                             CONFIG_KEY_SEND: partial(
@@ -410,16 +567,7 @@ def prepare_single_task(
                                 PregelTaskWrites(packet.node, writes, triggers),
                                 config,
                             ),
-                            CONFIG_KEY_CHECKPOINTER: (
-                                checkpointer
-                                or configurable.get(CONFIG_KEY_CHECKPOINTER)
-                            ),
-                            CONFIG_KEY_CHECKPOINT_MAP: {
-                                **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
-                                parent_ns: checkpoint["id"],
-                            },
-                            "checkpoint_id": None,
-                            "checkpoint_ns": task_checkpoint_ns,
+                            "checkpoint_ns": f"{checkpoint_ns}:{task_id}",
                         },
                     ),
                     triggers,
@@ -427,6 +575,7 @@ def prepare_single_task(
                     None,
                     task_id,
                     task_path,
+                    single_flight=proc.single_flight,
                 )
 
         else:
@@ -442,14 +591,15 @@ def prepare_single_task(
             return
         seen = checkpoint["versions_seen"].get(name, {})
         # If any of the channels read by this process were updated
+        # (comparing versions first, as it's cheaper than reading the channel)
         if triggers := sorted(
             chan
             for chan in proc.triggers
-            if not isinstance(
+            if checkpoint["channel_versions"].get(chan, null_version)
+            > seen.get(chan, null_version)
+            and not isinstance(
                 read_channel(channels, chan, return_exception=True), EmptyChannelError
             )
-            and checkpoint["channel_versions"].get(chan, null_version)
-            > seen.get(chan, null_version)
         ):
             try:
                 val = next(
@@ -461,12 +611,6 @@ def prepare_single_task(
                 return
 
             # create task id
-            metadata = {
-                "langgraph_step": step,
-                "langgraph_node": name,
-                "langgraph_triggers": triggers,
-                "langgraph_path": task_path,
-            }
             checkpoint_ns = f"{parent_ns}{NS_SEP}{name}" if parent_ns else name
             task_id = _uuid5_str(
                 checkpoint_id,
@@ -481,26 +625,23 @@ def prepare_single_task(
 
             if for_execution:
                 if node := proc.node:
-                    if proc.metadata:
-                        metadata.update(proc.metadata)
                     writes = deque()
-                    task_checkpoint_ns = f"{checkpoint_ns}:{task_id}"
                     return PregelExecutableTask(
                         name,
                         val,
                         node,
                         writes,
-                        patch_config(
-                            merge_configs(
-                                config, {"metadata": metadata, "tags": proc.tags}
-                            ),
-                            run_name=name,
-                            callbacks=(
-                                manager.get_child(f"graph:step:{step}")
-                                if manager
-                                else None
-                            ),
-                            configurable={
+                        _task_config(
+                            step_context,
+                            proc,
+                            name,
+                            {
+                                "langgraph_step": step,
+                                "langgraph_node": name,
+                                "langgraph_triggers": triggers,
+                                "langgraph_path": task_path,
+                            },
+                            {
                                 CONFIG_KEY_TASK_ID: task_id,
                                 # deque.extend is thread-safe
                                 CONFIG_KEY_SEND: partial(
@@ -520,16 +661,7 @@ def prepare_single_task(
                                     PregelTaskWrites(name, writes, triggers),
                                     config,
                                 ),
-                                CONFIG_KEY_CHECKPOINTER: (
-                                    checkpointer
-                                    or configurable.get(CONFIG_KEY_CHECKPOINTER)
-                                ),
-                                CONFIG_KEY_CHECKPOINT_MAP: {
-                                    **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
-                                    parent_ns: checkpoint["id"],
-                                },
-                                "checkpoint_id": None,
-                                "checkpoint_ns": task_checkpoint_ns,
+                                "checkpoint_ns": f"{checkpoint_ns}:{task_id}",
                             },
                         ),
                         triggers,
@@ -537,6 +669,7 @@ def prepare_single_task(
                         None,
                         task_id,
                         task_path,
+                        single_flight=proc.single_flight,
                     )
             else:
                 return PregelTask(task_id, name, task_path)
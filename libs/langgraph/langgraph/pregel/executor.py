@@ -1,10 +1,14 @@
 import asyncio
 import concurrent.futures
+import multiprocessing
+import pickle
 import sys
+import threading
 from contextlib import ExitStack
 from contextvars import copy_context
 from types import TracebackType
 from typing import (
+    Any,
     AsyncContextManager,
     Awaitable,
     Callable,
@@ -14,10 +18,11 @@ from typing import (
     TypeVar,
 )
 
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_core.runnables.config import get_executor_for_config
 from typing_extensions import ParamSpec
 
+from langgraph.constants import RESERVED
 from langgraph.errors import GraphInterrupt
 
 P = ParamSpec("P")
@@ -37,9 +42,18 @@ class Submit(Protocol[P, T]):
 
 
 class BackgroundExecutor(ContextManager):
-    def __init__(self, config: RunnableConfig) -> None:
+    def __init__(
+        self,
+        config: RunnableConfig,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
         self.stack = ExitStack()
-        self.executor = self.stack.enter_context(get_executor_for_config(config))
+        # an executor passed in is owned by the caller, and isn't shut down on exit
+        self.executor = (
+            executor
+            if executor is not None
+            else self.stack.enter_context(get_executor_for_config(config))
+        )
         self.tasks: dict[concurrent.futures.Future, tuple[bool, bool]] = {}
 
     def submit(
@@ -162,3 +176,90 @@ class AsyncBackgroundExecutor(AsyncContextManager):
                         raise exc
                 except asyncio.CancelledError:
                     pass
+
+
+_process_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_process_executor_lock = threading.Lock()
+
+
+def get_process_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """Get the process pool shared by all nodes that run in worker processes.
+
+    The pool is created on first use, with one worker per CPU. Workers are
+    started from a fresh interpreter, never forked from the (multi-threaded)
+    parent process."""
+    global _process_executor
+    with _process_executor_lock:
+        if _process_executor is None:
+            _process_executor = concurrent.futures.ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context(
+                    "forkserver"
+                    if "forkserver" in multiprocessing.get_all_start_methods()
+                    else "spawn"
+                )
+            )
+        return _process_executor
+
+
+class RunnableProcess(Runnable):
+    """Run a runnable in a worker process of the shared process pool.
+
+    The input and the runnable itself are pickled and sent to the worker, which
+    returns the output. Only the tags, and the metadata and user-provided
+    configurable values that can be pickled, are sent, so the runnable can't use
+    callbacks, unpicklable values (eg. connections or locks) or the internal
+    configurable keys (eg. to read state or send writes). Writers chained after
+    it still run in the parent process."""
+
+    def __init__(self, bound: Runnable) -> None:
+        self.bound = bound
+        self.name = bound.get_name()
+
+    def invoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        return (
+            get_process_executor()
+            .submit(_invoke_in_process, self.bound, input, _process_config(config))
+            .result()
+        )
+
+    async def ainvoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        return await asyncio.wrap_future(
+            get_process_executor().submit(
+                _invoke_in_process, self.bound, input, _process_config(config)
+            )
+        )
+
+
+def _process_config(config: Optional[RunnableConfig]) -> RunnableConfig:
+    if config is None:
+        return {}
+    return {
+        "tags": config.get("tags", []),
+        "metadata": _picklable(config.get("metadata", {})),
+        "configurable": _picklable(
+            {
+                k: v
+                for k, v in config.get("configurable", {}).items()
+                if k not in RESERVED
+            }
+        ),
+    }
+
+
+def _picklable(values: dict[str, Any]) -> dict[str, Any]:
+    picklable = {}
+    for k, v in values.items():
+        try:
+            pickle.dumps(v)
+        except Exception:
+            continue
+        picklable[k] = v
+    return picklable
+
+
+def _invoke_in_process(bound: Runnable, input: Any, config: RunnableConfig) -> Any:
+    return bound.invoke(input, config)
@@ -1,5 +1,6 @@
 import asyncio
 import concurrent.futures
+import threading
 from collections import deque
 from contextlib import AsyncExitStack, ExitStack
 from types import TracebackType
@@ -67,7 +68,9 @@ from langgraph.pregel.algo import (
     PregelTaskWrites,
     apply_writes,
     increment,
+    pending_task_writes,
     prepare_next_tasks,
+    resume_checkpoint,
     should_interrupt,
 )
 from langgraph.pregel.debug import (
@@ -124,6 +127,7 @@ class PregelLoop:
     store: Optional[BaseStore]
     checkpointer: Optional[BaseCheckpointSaver]
     nodes: Mapping[str, PregelNode]
+    trigger_to_nodes: Optional[Mapping[str, Sequence[str]]]
     specs: Mapping[str, Union[BaseChannel, ManagedValueSpec]]
     output_keys: Union[str, Sequence[str]]
     stream_keys: Union[str, Sequence[str]]
@@ -131,13 +135,17 @@ class PregelLoop:
     skip_done_tasks: bool
     is_nested: bool
 
+    checkpoint_writes_batch_size: int
+    checkpoint_writes_max_delay: float
+
     checkpointer_get_next_version: Callable[[Optional[V]], V]
-    checkpointer_put_writes: Optional[
-        Callable[[RunnableConfig, Sequence[tuple[str, Any]], str], Any]
+    checkpointer_put_writes_many: Optional[
+        Callable[[Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]]], Any]
     ]
     _checkpointer_put_after_previous: Optional[
         Callable[
             [
+                Optional[concurrent.futures.Future],
                 Optional[concurrent.futures.Future],
                 RunnableConfig,
                 Sequence[tuple[str, Any]],
@@ -154,6 +162,7 @@ class PregelLoop:
     checkpoint_metadata: CheckpointMetadata
     checkpoint_pending_writes: List[PendingWrite]
     checkpoint_previous_versions: dict[str, Union[str, float, int]]
+    updated_channels: Optional[set[str]] = None
 
     step: int
     stop: int
@@ -178,6 +187,10 @@ class PregelLoop:
         output_keys: Union[str, Sequence[str]],
         stream_keys: Union[str, Sequence[str]],
         debug: bool = False,
+        trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
+        checkpoint_writes_batch_size: int = 100,
+        checkpoint_writes_max_delay: float = 0.0,
+        checkpoint_tuple: Optional[CheckpointTuple] = None,
     ) -> None:
         self.stream = stream
         self.input = input
@@ -185,6 +198,7 @@ class PregelLoop:
         self.store = store
         self.checkpointer = checkpointer
         self.nodes = nodes
+        self.trigger_to_nodes = trigger_to_nodes
         self.specs = specs
         self.output_keys = output_keys
         self.stream_keys = stream_keys
@@ -194,6 +208,14 @@ class PregelLoop:
             or CONFIG_KEY_DEDUPE_TASKS in config["configurable"]
         )
         self.debug = debug
+        self.checkpoint_writes_batch_size = checkpoint_writes_batch_size
+        self.checkpoint_writes_max_delay = checkpoint_writes_max_delay
+        # latest checkpoint, if already loaded (and checked to be the latest)
+        self.checkpoint_tuple = checkpoint_tuple
+        self._put_writes_queue: list[
+            tuple[RunnableConfig, Sequence[tuple[str, Any]], str]
+        ] = []
+        self._put_writes_flush: Optional[tuple[Any, Any]] = None
         if CONFIG_KEY_STREAM in config["configurable"]:
             self.stream = DuplexStream(
                 self.stream, config["configurable"][CONFIG_KEY_STREAM]
@@ -236,9 +258,10 @@ class PregelLoop:
             self.task_writes_left -= 1
         # save writes
         self.checkpoint_pending_writes.extend((task_id, k, v) for k, v in writes)
-        if self.checkpointer_put_writes is not None:
-            self.submit(
-                self.checkpointer_put_writes,
+        if self.checkpointer_put_writes_many is not None:
+            # queued writes are saved in batches by a background flush,
+            # which the next checkpoint save waits for
+            self._put_writes_batched(
                 {
                     **self.checkpoint_config,
                     "configurable": {
@@ -282,7 +305,7 @@ class PregelLoop:
                     else self.stream_keys,
                 )
             # all tasks have finished
-            mv_writes = apply_writes(
+            mv_writes, self.updated_channels = apply_writes(
                 self.checkpoint,
                 self.channels,
                 self.tasks.values(),
@@ -336,6 +359,8 @@ class PregelLoop:
             for_execution=True,
             manager=manager,
             checkpointer=self.checkpointer,
+            updated_channels=self.updated_channels,
+            trigger_to_nodes=self.trigger_to_nodes,
         )
         # we don't need to save the writes for the last task that completes
         # unless in special conditions handled by self.put_writes()
@@ -376,20 +401,13 @@ class PregelLoop:
 
         # if there are pending writes from a previous loop, apply them
         if self.skip_done_tasks and self.checkpoint_pending_writes:
-            for tid, k, v in self.checkpoint_pending_writes:
-                if k in (ERROR, INTERRUPT):
-                    continue
-                if task := self.tasks.get(tid):
-                    if k == SCHEDULED:
-                        if v == max(
-                            self.checkpoint["versions_seen"]
-                            .get(INTERRUPT, {})
-                            .values(),
-                            default=None,
-                        ):
-                            self.tasks[tid] = task._replace(scheduled=True)
-                    else:
-                        task.writes.append((k, v))
+            scheduled, writes = pending_task_writes(
+                self.checkpoint, self.checkpoint_pending_writes
+            )
+            for tid, task in self.tasks.items():
+                if tid in scheduled:
+                    self.tasks[tid] = task._replace(scheduled=True)
+                task.writes.extend(writes.get(tid, ()))
             # print output for any tasks we applied previous writes to
             for task in self.tasks.values():
                 if task.writes:
@@ -437,11 +455,7 @@ class PregelLoop:
 
         # proceed past previous checkpoint
         if is_resuming:
-            self.checkpoint["versions_seen"].setdefault(INTERRUPT, {})
-            for k in self.channels:
-                if k in self.checkpoint["channel_versions"]:
-                    version = self.checkpoint["channel_versions"][k]
-                    self.checkpoint["versions_seen"][INTERRUPT][k] = version
+            resume_checkpoint(self.checkpoint, self.channels)
             # produce values output
             self._emit(
                 (self.config["configurable"].get("checkpoint_ns", ""), "values", v)
@@ -471,12 +485,13 @@ class PregelLoop:
                 manager=None,
             )
             # apply input writes
-            assert not apply_writes(
+            mv_writes, self.updated_channels = apply_writes(
                 self.checkpoint,
                 self.channels,
                 [*discard_tasks.values(), PregelTaskWrites(INPUT, input_writes, [])],
                 self.checkpointer_get_next_version,
-            ), "Can't write to SharedValues in graph input"
+            )
+            assert not mv_writes, "Can't write to SharedValues in graph input"
             # save input checkpoint
             self._put_checkpoint({"source": "input", "writes": dict(input_writes)})
         elif CONFIG_KEY_RESUMING not in configurable:
@@ -531,6 +546,7 @@ class PregelLoop:
             self._put_checkpoint_fut = self.submit(
                 self._checkpointer_put_after_previous,
                 getattr(self, "_put_checkpoint_fut", None),
+                self._put_writes_flush_now(),
                 self.checkpoint_config,
                 copy_checkpoint(self.checkpoint),
                 self.checkpoint_metadata,
@@ -549,6 +565,27 @@ class PregelLoop:
     def _update_mv(self, key: str, values: Sequence[Any]) -> None:
         raise NotImplementedError
 
+    def _put_writes_batched(
+        self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str
+    ) -> None:
+        raise NotImplementedError
+
+    def _put_writes_next_batch(
+        self,
+    ) -> list[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]]:
+        batch = self._put_writes_queue[: self.checkpoint_writes_batch_size]
+        del self._put_writes_queue[: len(batch)]
+        if not batch:
+            self._put_writes_flush = None
+        return batch
+
+    def _put_writes_flush_now(self) -> Optional[Any]:
+        """Stop waiting for more writes, return the pending flush, if any."""
+        if flush := self._put_writes_flush:
+            event, fut = flush
+            event.set()
+            return fut
+
     def _suppress_interrupt(
         self,
         exc_type: Optional[Type[BaseException]],
@@ -607,6 +644,11 @@ class SyncPregelLoop(PregelLoop, ContextManager):
         output_keys: Union[str, Sequence[str]] = EMPTY_SEQ,
         stream_keys: Union[str, Sequence[str]] = EMPTY_SEQ,
         debug: bool = False,
+        trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
+        checkpoint_writes_batch_size: int = 100,
+        checkpoint_writes_max_delay: float = 0.0,
+        checkpoint_tuple: Optional[CheckpointTuple] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
     ) -> None:
         super().__init__(
             input,
@@ -619,37 +661,79 @@ class SyncPregelLoop(PregelLoop, ContextManager):
             output_keys=output_keys,
             stream_keys=stream_keys,
             debug=debug,
+            trigger_to_nodes=trigger_to_nodes,
+            checkpoint_writes_batch_size=checkpoint_writes_batch_size,
+            checkpoint_writes_max_delay=checkpoint_writes_max_delay,
+            checkpoint_tuple=checkpoint_tuple,
         )
+        self.executor = executor
         self.stack = ExitStack()
+        self._put_writes_lock = threading.Lock()
         if checkpointer:
             self.checkpointer_get_next_version = checkpointer.get_next_version
-            self.checkpointer_put_writes = checkpointer.put_writes
+            self.checkpointer_put_writes_many = checkpointer.put_writes_many
         else:
             self.checkpointer_get_next_version = increment
             self._checkpointer_put_after_previous = None
-            self.checkpointer_put_writes = None
+            self.checkpointer_put_writes_many = None
 
     def _checkpointer_put_after_previous(
         self,
         prev: Optional[concurrent.futures.Future],
+        prev_writes: Optional[concurrent.futures.Future],
         config: RunnableConfig,
         checkpoint: Checkpoint,
         metadata: CheckpointMetadata,
         new_versions: Optional[dict[str, Union[str, float, int]]],
     ) -> RunnableConfig:
+        if prev_writes is not None:
+            concurrent.futures.wait((prev_writes,))
         try:
             if prev is not None:
                 prev.result()
         finally:
             self.checkpointer.put(config, checkpoint, metadata, new_versions)
 
+    def _put_writes_batched(
+        self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str
+    ) -> None:
+        # called from the threads running tasks
+        with self._put_writes_lock:
+            self._put_writes_queue.append((config, writes, task_id))
+            if self._put_writes_flush is None:
+                event = threading.Event()
+                self._put_writes_flush = (
+                    event,
+                    self.submit(self._put_writes_flush_batches, event),
+                )
+            if len(self._put_writes_queue) >= self.checkpoint_writes_batch_size:
+                # a full batch is flushed without waiting for more writes
+                self._put_writes_flush[0].set()
+
+    def _put_writes_flush_batches(self, event: threading.Event) -> None:
+        if self.checkpoint_writes_max_delay:
+            event.wait(self.checkpoint_writes_max_delay)
+        try:
+            while True:
+                with self._put_writes_lock:
+                    batch = self._put_writes_next_batch()
+                if not batch:
+                    return
+                self.checkpointer_put_writes_many(batch)
+        except BaseException:
+            with self._put_writes_lock:
+                self._put_writes_flush = None
+            raise
+
     def _update_mv(self, key: str, values: Sequence[Any]) -> None:
         return self.submit(cast(WritableManagedValue, self.managed[key]).update, values)
 
     # context manager
 
     def __enter__(self) -> Self:
-        if self.config.get("configurable", {}).get(
+        if self.checkpoint_tuple is not None:
+            saved = self.checkpoint_tuple
+        elif self.config.get("configurable", {}).get(
             CONFIG_KEY_ENSURE_LATEST
         ) and self.checkpoint_config["configurable"].get("checkpoint_id"):
             saved = self.checkpointer.get_tuple(
@@ -686,7 +770,10 @@ class SyncPregelLoop(PregelLoop, ContextManager):
             else []
         )
 
-        self.submit = self.stack.enter_context(BackgroundExecutor(self.config))
+        self.submit = self.stack.enter_context(
+            BackgroundExecutor(self.config, self.executor)
+        )
+        self.stack.callback(self._put_writes_flush_now)
         self.channels, self.managed = self.stack.enter_context(
             ChannelsManager(self.specs, self.checkpoint, self.config, self.store)
         )
@@ -722,6 +809,10 @@ class AsyncPregelLoop(PregelLoop, AsyncContextManager):
         output_keys: Union[str, Sequence[str]] = EMPTY_SEQ,
         stream_keys: Union[str, Sequence[str]] = EMPTY_SEQ,
         debug: bool = False,
+        trigger_to_nodes: Optional[Mapping[str, Sequence[str]]] = None,
+        checkpoint_writes_batch_size: int = 100,
+        checkpoint_writes_max_delay: float = 0.0,
+        checkpoint_tuple: Optional[CheckpointTuple] = None,
     ) -> None:
         super().__init__(
             input,
@@ -734,31 +825,65 @@ class AsyncPregelLoop(PregelLoop, AsyncContextManager):
             output_keys=output_keys,
             stream_keys=stream_keys,
             debug=debug,
+            trigger_to_nodes=trigger_to_nodes,
+            checkpoint_writes_batch_size=checkpoint_writes_batch_size,
+            checkpoint_writes_max_delay=checkpoint_writes_max_delay,
+            checkpoint_tuple=checkpoint_tuple,
         )
         self.store = AsyncBatchedStore(self.store) if self.store else None
         self.stack = AsyncExitStack()
         if checkpointer:
             self.checkpointer_get_next_version = checkpointer.get_next_version
-            self.checkpointer_put_writes = checkpointer.aput_writes
+            self.checkpointer_put_writes_many = checkpointer.aput_writes_many
         else:
             self.checkpointer_get_next_version = increment
             self._checkpointer_put_after_previous = None
-            self.checkpointer_put_writes = None
+            self.checkpointer_put_writes_many = None
 
     async def _checkpointer_put_after_previous(
         self,
         prev: Optional[asyncio.Task],
+        prev_writes: Optional[asyncio.Task],
         config: RunnableConfig,
         checkpoint: Checkpoint,
         metadata: CheckpointMetadata,
         new_versions: Optional[dict[str, Union[str, float, int]]],
     ) -> RunnableConfig:
+        if prev_writes is not None:
+            await asyncio.wait((prev_writes,))
         try:
             if prev is not None:
                 await prev
         finally:
             await self.checkpointer.aput(config, checkpoint, metadata, new_versions)
 
+    def _put_writes_batched(
+        self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str
+    ) -> None:
+        self._put_writes_queue.append((config, writes, task_id))
+        if self._put_writes_flush is None:
+            event = asyncio.Event()
+            self._put_writes_flush = (
+                event,
+                self.submit(self._put_writes_flush_batches, event),
+            )
+        if len(self._put_writes_queue) >= self.checkpoint_writes_batch_size:
+            # a full batch is flushed without waiting for more writes
+            self._put_writes_flush[0].set()
+
+    async def _put_writes_flush_batches(self, event: asyncio.Event) -> None:
+        if self.checkpoint_writes_max_delay:
+            try:
+                await asyncio.wait_for(event.wait(), self.checkpoint_writes_max_delay)
+            except asyncio.TimeoutError:
+                pass
+        try:
+            while batch := self._put_writes_next_batch():
+                await self.checkpointer_put_writes_many(batch)
+        except BaseException:
+            self._put_writes_flush = None
+            raise
+
     def _update_mv(self, key: str, values: Sequence[Any]) -> None:
         return self.submit(
             cast(WritableManagedValue, self.managed[key]).aupdate, values
@@ -767,7 +892,9 @@ class AsyncPregelLoop(PregelLoop, AsyncContextManager):
     # context manager
 
     async def __aenter__(self) -> Self:
-        if self.config.get("configurable", {}).get(
+        if self.checkpoint_tuple is not None:
+            saved = self.checkpoint_tuple
+        elif self.config.get("configurable", {}).get(
             CONFIG_KEY_ENSURE_LATEST
         ) and self.checkpoint_config["configurable"].get("checkpoint_id"):
             saved = await self.checkpointer.aget_tuple(
@@ -804,7 +931,11 @@ class AsyncPregelLoop(PregelLoop, AsyncContextManager):
             else []
         )
 
+        if self.store is not None:
+            # closed after the background tasks that may still write to it
+            await self.stack.enter_async_context(self.store)
         self.submit = await self.stack.enter_async_context(AsyncBackgroundExecutor())
+        self.stack.callback(self._put_writes_flush_now)
         self.channels, self.managed = await self.stack.enter_async_context(
             AsyncChannelsManager(self.specs, self.checkpoint, self.config, self.store)
         )
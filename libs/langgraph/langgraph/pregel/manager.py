@@ -1,11 +1,12 @@
 import asyncio
 from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
-from typing import AsyncIterator, Iterator, Mapping, Optional, Union
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional, Union
 
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.channels.base import BaseChannel
-from langgraph.checkpoint.base import Checkpoint
+from langgraph.channels.messages import MessagesChannel
+from langgraph.checkpoint.base import Checkpoint, SegmentLog
 from langgraph.constants import CONFIG_KEY_STORE
 from langgraph.managed.base import (
     ConfiguredManagedValue,
@@ -42,7 +43,9 @@ def ChannelsManager(
     with ExitStack() as stack:
         yield (
             {
-                k: v.from_checkpoint(checkpoint["channel_values"].get(k))
+                k: v.from_checkpoint(
+                    _channel_checkpoint(v, checkpoint["channel_values"].get(k))
+                )
                 for k, v in channel_specs.items()
             },
             ManagedValueMapping(
@@ -98,7 +101,9 @@ async def AsyncChannelsManager(
         yield (
             # channels: enter each channel with checkpoint
             {
-                k: v.from_checkpoint(checkpoint["channel_values"].get(k))
+                k: v.from_checkpoint(
+                    _channel_checkpoint(v, checkpoint["channel_values"].get(k))
+                )
                 for k, v in channel_specs.items()
             },
             # managed: build mapping from spec to result
@@ -106,6 +111,14 @@ async def AsyncChannelsManager(
         )
 
 
+def _channel_checkpoint(channel: BaseChannel, value: Any) -> Any:
+    # a value saved as a segment log, eg. by a graph with a different schema,
+    # is passed to other channels as the list of all items
+    if isinstance(value, SegmentLog) and not isinstance(channel, MessagesChannel):
+        return [item for _, items in value.segments for item in items]
+    return value
+
+
 @contextmanager
 def noop_context() -> Iterator[None]:
     yield None
@@ -22,7 +22,9 @@ from langchain_core.runnables.base import Input, Other, Output, coerce_to_runnab
 from langchain_core.runnables.utils import ConfigurableFieldSpec
 
 from langgraph.constants import CONFIG_KEY_READ
+from langgraph.pregel.executor import RunnableProcess
 from langgraph.pregel.retry import RetryPolicy
+from langgraph.pregel.types import SingleFlightPolicy
 from langgraph.pregel.write import ChannelWrite
 from langgraph.utils.config import merge_configs
 from langgraph.utils.runnable import RunnableCallable, RunnableSeq
@@ -120,6 +122,10 @@ class PregelNode(Runnable):
 
     retry_policy: Optional[RetryPolicy]
 
+    single_flight: Optional[SingleFlightPolicy]
+
+    process_pool: bool
+
     tags: Optional[Sequence[str]]
 
     metadata: Optional[Mapping[str, Any]]
@@ -135,6 +141,8 @@ class PregelNode(Runnable):
         metadata: Optional[Mapping[str, Any]] = None,
         bound: Optional[Runnable[Any, Any]] = None,
         retry_policy: Optional[RetryPolicy] = None,
+        single_flight: Optional[SingleFlightPolicy] = None,
+        process_pool: bool = False,
     ) -> None:
         self.channels = channels
         self.triggers = list(triggers)
@@ -142,6 +150,8 @@ class PregelNode(Runnable):
         self.writers = writers or []
         self.bound = bound if bound is not None else DEFAULT_BOUND
         self.retry_policy = retry_policy
+        self.single_flight = single_flight
+        self.process_pool = process_pool
         self.tags = tags
         self.metadata = metadata
 
@@ -177,10 +187,12 @@ class PregelNode(Runnable):
             return writers[0]
         elif self.bound is DEFAULT_BOUND:
             return RunnableSeq(*writers)
-        elif writers:
-            return RunnableSeq(self.bound, *writers)
+        # run the bound runnable in a worker process, and writers in this one
+        bound = RunnableProcess(self.bound) if self.process_pool else self.bound
+        if writers:
+            return RunnableSeq(bound, *writers)
         else:
-            return self.bound
+            return bound
 
     def join(self, channels: Sequence[str]) -> PregelNode:
         assert isinstance(channels, list) or isinstance(
@@ -2,9 +2,11 @@ import asyncio
 import logging
 import random
 import time
-from typing import Optional
+from copy import deepcopy
+from typing import Any, Hashable, Optional
 
 from langgraph.errors import GraphInterrupt
+from langgraph.pregel.single_flight import SINGLE_FLIGHT
 from langgraph.pregel.types import PregelExecutableTask, RetryPolicy
 
 logger = logging.getLogger(__name__)
@@ -14,7 +16,24 @@ def run_with_retry(
     task: PregelExecutableTask,
     retry_policy: Optional[RetryPolicy],
 ) -> None:
-    """Run a task with retries."""
+    """Run a task with retries, or wait for an identical task to finish
+    running if the task has a single-flight policy."""
+    if task.single_flight is None:
+        return _run_with_retry(task, retry_policy)
+
+    def run() -> list[tuple[str, Any]]:
+        _run_with_retry(task, retry_policy)
+        return list(task.writes)
+
+    writes, shared = SINGLE_FLIGHT.run(_single_flight_key(task), run)
+    if shared:
+        _copy_writes(task, writes)
+
+
+def _run_with_retry(
+    task: PregelExecutableTask,
+    retry_policy: Optional[RetryPolicy],
+) -> None:
     retry_policy = task.retry_policy or retry_policy
     interval = retry_policy.initial_interval if retry_policy else 0
     attempts = 0
@@ -63,7 +82,25 @@ async def arun_with_retry(
     retry_policy: Optional[RetryPolicy],
     stream: bool = False,
 ) -> None:
-    """Run a task asynchronously with retries."""
+    """Run a task asynchronously with retries, or wait for an identical task
+    to finish running if the task has a single-flight policy."""
+    if task.single_flight is None:
+        return await _arun_with_retry(task, retry_policy, stream)
+
+    async def run() -> list[tuple[str, Any]]:
+        await _arun_with_retry(task, retry_policy, stream)
+        return list(task.writes)
+
+    writes, shared = await SINGLE_FLIGHT.arun(_single_flight_key(task), run)
+    if shared:
+        _copy_writes(task, writes)
+
+
+async def _arun_with_retry(
+    task: PregelExecutableTask,
+    retry_policy: Optional[RetryPolicy],
+    stream: bool = False,
+) -> None:
     retry_policy = task.retry_policy or retry_policy
     interval = retry_policy.initial_interval if retry_policy else 0
     attempts = 0
@@ -109,3 +146,15 @@ async def arun_with_retry(
                 f"Retrying task {task.name} after {interval:.2f} seconds (attempt {attempts}) after {exc.__class__.__name__} {exc}",
                 exc_info=exc,
             )
+
+
+def _single_flight_key(task: PregelExecutableTask) -> Hashable:
+    # tasks are identical if they run the same node with equivalent inputs
+    return (id(task.proc), task.single_flight.key_func(task.input))
+
+
+def _copy_writes(task: PregelExecutableTask, writes: list[tuple[str, Any]]) -> None:
+    # each task gets its own copy, so nodes downstream can't see each other's
+    # changes to the values written
+    task.writes.clear()
+    task.writes.extend(deepcopy(writes))
@@ -26,10 +26,14 @@ class PregelRunner:
         submit: Submit,
         put_writes: Callable[[str, Sequence[tuple[str, Any]]], None],
         use_astream: bool = False,
+        on_delegate: Optional[
+            Callable[[PregelExecutableTask, GraphDelegate], None]
+        ] = None,
     ) -> None:
         self.submit = submit
         self.put_writes = put_writes
         self.use_astream = use_astream
+        self.on_delegate = on_delegate
 
     def tick(
         self,
@@ -72,7 +76,10 @@ class PregelRunner:
                         if interrupts := [(INTERRUPT, i) for i in exc.args[0]]:
                             self.put_writes(task.id, interrupts)
                     elif isinstance(exc, GraphDelegate):
-                        raise exc
+                        if self.on_delegate is None:
+                            raise exc
+                        # the task is to be run elsewhere
+                        self.on_delegate(task, exc)
                     else:
                         # save error to checkpointer
                         self.put_writes(task.id, [(ERROR, exc)])
@@ -85,8 +92,9 @@ class PregelRunner:
             else:
                 # remove references to loop vars
                 del fut, task
-            # maybe stop other tasks
-            if _should_stop_others(done):
+            # maybe stop other tasks, unless failures are only saved,
+            # in which case the tasks are independent of each other
+            if reraise and _should_stop_others(done):
                 break
             # give control back to the caller
             yield
@@ -138,7 +146,10 @@ class PregelRunner:
                         if interrupts := [(INTERRUPT, i) for i in exc.args[0]]:
                             self.put_writes(task.id, interrupts)
                     elif isinstance(exc, GraphDelegate):
-                        raise exc
+                        if self.on_delegate is None:
+                            raise exc
+                        # the task is to be run elsewhere
+                        self.on_delegate(task, exc)
                     else:
                         # save error to checkpointer
                         self.put_writes(task.id, [(ERROR, exc)])
@@ -151,8 +162,9 @@ class PregelRunner:
             else:
                 # remove references to loop vars
                 del fut, task
-            # maybe stop other tasks
-            if _should_stop_others(done):
+            # maybe stop other tasks, unless failures are only saved,
+            # in which case the tasks are independent of each other
+            if reraise and _should_stop_others(done):
                 break
             # give control back to the caller
             yield
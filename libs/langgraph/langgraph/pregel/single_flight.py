@@ -0,0 +1,106 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Registry of in-flight executions, shared by all threads and event loops
+    of the process. Calls with the same key made while one is running wait for
+    its result instead of running again.
+
+    Attributes:
+        executions (int): Number of calls that ran.
+        coalesced (int): Number of calls that waited for another one instead of
+            running, counted once per call.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: dict[Hashable, concurrent.futures.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def run(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Run `fn`, unless a call with the same key is in flight, in which case
+        wait for its result. Return the result, and whether it was shared."""
+        waited = False
+        while True:
+            leader, fut = self._join(key, waited)
+            if leader:
+                return self._lead(key, fut, fn), False
+            waited = True
+            try:
+                return fut.result(), True
+            except concurrent.futures.CancelledError:
+                # the call we waited for was cancelled, try again
+                continue
+
+    async def arun(
+        self, key: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Asynchronous version of `run`, for calls made in an event loop."""
+        waited = False
+        while True:
+            leader, fut = self._join(key, waited)
+            if leader:
+                try:
+                    result = await fn()
+                except asyncio.CancelledError:
+                    self._leave(key)
+                    fut.cancel()
+                    raise
+                except BaseException as exc:
+                    self._leave(key)
+                    fut.set_exception(exc)
+                    raise
+                self._leave(key)
+                fut.set_result(result)
+                return result, False
+            waited = True
+            try:
+                # shielded, as cancelling the wrapper when this call is cancelled
+                # would cancel the future shared with the other calls
+                return await asyncio.shield(asyncio.wrap_future(fut)), True
+            except asyncio.CancelledError:
+                if fut.cancelled():
+                    # the call we waited for was cancelled, try again
+                    continue
+                raise
+
+    def _join(
+        self, key: Hashable, waited: bool
+    ) -> tuple[bool, concurrent.futures.Future]:
+        with self.lock:
+            if (fut := self.calls.get(key)) is not None:
+                if not waited:
+                    self.coalesced += 1
+                return False, fut
+            fut = self.calls[key] = concurrent.futures.Future()
+            self.executions += 1
+            return True, fut
+
+    def _leave(self, key: Hashable) -> None:
+        # later calls with the same key run again
+        with self.lock:
+            del self.calls[key]
+
+    def _lead(
+        self, key: Hashable, fut: concurrent.futures.Future, fn: Callable[[], T]
+    ) -> T:
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._leave(key)
+            fut.set_exception(exc)
+            raise
+        self._leave(key)
+        fut.set_result(result)
+        return result
+
+
+SINGLE_FLIGHT = SingleFlight()
+"""Registry of the node executions deduplicated with a `SingleFlightPolicy`,
+shared by all graphs of the process."""
@@ -1,5 +1,5 @@
 from collections import deque
-from typing import Any, Callable, Literal, NamedTuple, Optional, Type, Union
+from typing import Any, Callable, Hashable, Literal, NamedTuple, Optional, Type, Union
 
 from langchain_core.runnables import Runnable, RunnableConfig
 
@@ -57,6 +57,19 @@ class RetryPolicy(NamedTuple):
     """List of exception classes that should trigger a retry, or a callable that returns True for exceptions that should trigger a retry."""
 
 
+class SingleFlightPolicy(NamedTuple):
+    """Configuration for sharing one execution of a node between its tasks with
+    identical inputs running at the same time, in any graph run of the process.
+    Tasks waiting for the execution of another one get a copy of its writes.
+
+    Only suitable for nodes whose writes depend only on their input, and which
+    don't stream output, interrupt or run subgraphs."""
+
+    key_func: Callable[[Any], Hashable]
+    """Function returning the fingerprint of a node input. Tasks of the same node
+    whose inputs have equal fingerprints share one execution."""
+
+
 class CachePolicy(NamedTuple):
     """Configuration for caching nodes."""
 
@@ -84,6 +97,7 @@ class PregelExecutableTask(NamedTuple):
     id: str
     path: tuple[str, ...]
     scheduled: bool = False
+    single_flight: Optional[SingleFlightPolicy] = None
 
 
 class StateSnapshot(NamedTuple):
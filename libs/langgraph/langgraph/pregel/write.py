@@ -33,13 +33,21 @@ class ChannelWriteEntry(NamedTuple):
     mapper: Optional[Callable] = None
 
 
+class ChannelWriteTupleEntry(NamedTuple):
+    mapper: Callable[[Any], Optional[Sequence[tuple[str, Any]]]]
+    """Function returning the (channel, value) pairs to write for a value,
+    only for the channels it updates."""
+    value: Any = PASSTHROUGH
+
+
 class ChannelWrite(RunnableCallable):
-    writes: Sequence[Union[ChannelWriteEntry, Send]]
+    writes: Sequence[Union[ChannelWriteEntry, ChannelWriteTupleEntry, Send]]
     """
     Sequence of write entries, each of which is a tuple of:
     - channel name
     - runnable to map input, or None to use the input, or any other value to use instead
     - whether to skip writing if the mapped value is None
+    or a tuple entry mapping the input to any number of (channel, value) pairs.
     """
     require_at_least_one_of: Optional[Sequence[str]]
     """
@@ -48,7 +56,7 @@ class ChannelWrite(RunnableCallable):
 
     def __init__(
         self,
-        writes: Sequence[Union[ChannelWriteEntry, Send]],
+        writes: Sequence[Union[ChannelWriteEntry, ChannelWriteTupleEntry, Send]],
         *,
         tags: Optional[list[str]] = None,
         require_at_least_one_of: Optional[Sequence[str]] = None,
@@ -61,7 +69,7 @@ class ChannelWrite(RunnableCallable):
         self, suffix: Optional[str] = None, *, name: Optional[str] = None
     ) -> str:
         if not name:
-            name = f"ChannelWrite<{','.join(w.channel if isinstance(w, ChannelWriteEntry) else w.node for w in self.writes)}>"
+            name = f"ChannelWrite<{','.join(w.channel if isinstance(w, ChannelWriteEntry) else '...' if isinstance(w, ChannelWriteTupleEntry) else w.node for w in self.writes)}>"
         return super().get_name(suffix, name=name)
 
     @property
@@ -80,6 +88,8 @@ class ChannelWrite(RunnableCallable):
         writes = [
             ChannelWriteEntry(write.channel, input, write.skip_none, write.mapper)
             if isinstance(write, ChannelWriteEntry) and write.value is PASSTHROUGH
+            else ChannelWriteTupleEntry(write.mapper, input)
+            if isinstance(write, ChannelWriteTupleEntry) and write.value is PASSTHROUGH
             else write
             for write in self.writes
         ]
@@ -94,6 +104,8 @@ class ChannelWrite(RunnableCallable):
         writes = [
             ChannelWriteEntry(write.channel, input, write.skip_none, write.mapper)
             if isinstance(write, ChannelWriteEntry) and write.value is PASSTHROUGH
+            else ChannelWriteTupleEntry(write.mapper, input)
+            if isinstance(write, ChannelWriteTupleEntry) and write.value is PASSTHROUGH
             else write
             for write in self.writes
         ]
@@ -107,7 +119,7 @@ class ChannelWrite(RunnableCallable):
     @staticmethod
     def do_write(
         config: RunnableConfig,
-        writes: Sequence[Union[ChannelWriteEntry, Send]],
+        writes: Sequence[Union[ChannelWriteEntry, ChannelWriteTupleEntry, Send]],
         require_at_least_one_of: Optional[Sequence[str]] = None,
     ) -> None:
         # validate
@@ -119,6 +131,9 @@ class ChannelWrite(RunnableCallable):
                     )
                 if w.value is PASSTHROUGH:
                     raise InvalidUpdateError("PASSTHROUGH value must be replaced")
+            elif isinstance(w, ChannelWriteTupleEntry):
+                if w.value is PASSTHROUGH:
+                    raise InvalidUpdateError("PASSTHROUGH value must be replaced")
         # split packets and entries
         sends = [(TASKS, packet) for packet in writes if isinstance(packet, Send)]
         entries = [write for write in writes if isinstance(write, ChannelWriteEntry)]
@@ -134,6 +149,10 @@ class ChannelWrite(RunnableCallable):
         ]
         # filter out SKIP_WRITE values
         filtered = [(chan, val) for chan, val in values if val is not SKIP_WRITE]
+        # add the writes of tuple entries, which only cover updated channels
+        for w in writes:
+            if isinstance(w, ChannelWriteTupleEntry) and (ww := w.mapper(w.value)):
+                filtered.extend(ww)
         if require_at_least_one_of is not None:
             if not {chan for chan, _ in filtered} & set(require_at_least_one_of):
                 raise InvalidUpdateError(
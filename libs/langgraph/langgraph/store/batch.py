@@ -1,5 +1,8 @@
 import asyncio
-from typing import NamedTuple, Optional, Union
+from collections import deque
+from itertools import groupby
+from types import TracebackType
+from typing import NamedTuple, Optional, Type, Union
 
 from langgraph.store.base import BaseStore, V
 
@@ -13,53 +16,110 @@ class PutOp(NamedTuple):
 
 
 class AsyncBatchedStore(BaseStore):
-    def __init__(self, store: BaseStore) -> None:
-        self.store = store
-        self.aqueue: dict[asyncio.Future, Union[ListOp, PutOp]] = {}
-        self.task = asyncio.create_task(_run(self.aqueue, self.store))
+    """Store that batches the concurrent operations made in an event loop into
+    single calls to the underlying store.
+
+    Operations are queued, and a task started for the first one runs them
+    after waiting `batch_window` seconds for more to arrive, at most
+    `max_batch_size` at a time. Consecutive list operations are merged into
+    one `alist` call for the unique prefixes, and consecutive put operations
+    into one `aput` call with the last write to each (namespace, key).
+    Operations run in the order they were made, and no task runs while the
+    store is idle.
 
-    def __del__(self) -> None:
-        self.task.cancel()
+    Use as an async context manager: on exit, the queued operations are run
+    and further ones are rejected."""
+
+    def __init__(
+        self,
+        store: BaseStore,
+        *,
+        batch_window: float = 0.0,
+        max_batch_size: int = 100,
+    ) -> None:
+        self.store = store
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.aqueue: deque[tuple[asyncio.Future, Union[ListOp, PutOp]]] = deque()
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
 
     async def alist(self, prefixes: list[str]) -> dict[str, dict[str, V]]:
-        fut = asyncio.get_running_loop().create_future()
-        self.aqueue[fut] = ListOp(prefixes)
-        return await fut
+        return await self._submit(ListOp(prefixes))
 
     async def aput(self, writes: list[tuple[str, str, Optional[V]]]) -> None:
+        return await self._submit(PutOp(writes))
+
+    async def __aenter__(self) -> "AsyncBatchedStore":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.closed = True
+        if self.task is not None:
+            await self.task
+
+    def _submit(self, op: Union[ListOp, PutOp]) -> asyncio.Future:
+        if self.closed:
+            raise RuntimeError("Cannot use a closed AsyncBatchedStore")
         fut = asyncio.get_running_loop().create_future()
-        self.aqueue[fut] = PutOp(writes)
-        return await fut
-
-
-async def _run(
-    aqueue: dict[asyncio.Future, Union[ListOp, PutOp]], store: BaseStore
-) -> None:
-    while True:
-        await asyncio.sleep(0)
-        if not aqueue:
-            continue
-        # this could use a lock, if we want thread safety
-        taken = aqueue.copy()
-        aqueue.clear()
-        # action each operation
-        lists = {f: o for f, o in taken.items() if isinstance(o, ListOp)}
-        if lists:
-            try:
-                results = await store.alist(
-                    [p for op in lists.values() for p in op.prefixes]
-                )
-                for fut, op in lists.items():
+        self.aqueue.append((fut, op))
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+        return fut
+
+    async def _run(self) -> None:
+        try:
+            if self.batch_window:
+                await asyncio.sleep(self.batch_window)
+            while self.aqueue:
+                batch = [
+                    self.aqueue.popleft()
+                    for _ in range(min(len(self.aqueue), self.max_batch_size))
+                ]
+                # run consecutive operations of the same kind together
+                for is_list, ops in groupby(
+                    batch, key=lambda item: isinstance(item[1], ListOp)
+                ):
+                    if is_list:
+                        await self._run_lists(list(ops))
+                    else:
+                        await self._run_puts(list(ops))
+        finally:
+            # the next operation starts a new task
+            self.task = None
+
+    async def _run_lists(
+        self, ops: list[tuple[asyncio.Future, Union[ListOp, PutOp]]]
+    ) -> None:
+        prefixes = list(dict.fromkeys(p for _, op in ops for p in op.prefixes))
+        try:
+            results = await self.store.alist(prefixes)
+        except Exception as e:
+            for fut, _ in ops:
+                if not fut.done():
+                    fut.set_exception(e)
+        else:
+            for fut, op in ops:
+                if not fut.done():
                     fut.set_result({k: results.get(k) for k in op.prefixes})
-            except Exception as e:
-                for fut in lists:
+
+    async def _run_puts(
+        self, ops: list[tuple[asyncio.Future, Union[ListOp, PutOp]]]
+    ) -> None:
+        # only the last write to each key is applied
+        writes = {(ns, key): value for _, op in ops for ns, key, value in op.writes}
+        try:
+            await self.store.aput([(ns, key, v) for (ns, key), v in writes.items()])
+        except Exception as e:
+            for fut, _ in ops:
+                if not fut.done():
                     fut.set_exception(e)
-        puts = {f: o for f, o in taken.items() if isinstance(o, PutOp)}
-        if puts:
-            try:
-                await store.aput([w for op in puts.values() for w in op.writes])
-                for fut in puts:
+        else:
+            for fut, _ in ops:
+                if not fut.done():
                     fut.set_result(None)
-            except Exception as e:
-                for fut in puts:
-                    fut.set_exception(e)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
+
+try:
+    from psycopg import Connection, Cursor
+    from psycopg.errors import UndefinedTable
+    from psycopg_pool import ConnectionPool
+except ImportError as e:
+    raise ImportError(
+        "PostgresStore requires the psycopg and psycopg-pool packages.\n"
+        "Install them with:\n`pip install gigagraph[postgres]`"
+    ) from e
+
+from langgraph.store.base import V
+from langgraph.store.postgres.base import BasePostgresStore
+
+
+class PostgresStore(BasePostgresStore):
+    """Store that saves values in a Postgres database.
+
+    Values are saved as JSONB, serialized with `JsonPlusSerializer`.
+
+    Writes of a `put` call are applied in one transaction, with one bulk
+    upsert and one bulk delete. The async methods run the sync ones in the
+    default executor; use `AsyncPostgresStore` with an async connection
+    instead to not use threads.
+
+    Args:
+        conn (Union[Connection, ConnectionPool]): The Postgres connection or
+            pool. A single connection is used by one thread at a time, while
+            a pool serves concurrent calls on separate connections.
+
+    Tip:
+        Requires the psycopg and psycopg-pool packages. Install them with
+        `pip install gigagraph[postgres]`.
+    """
+
+    lock: threading.Lock
+
+    def __init__(self, conn: Union[Connection, ConnectionPool]) -> None:
+        self.conn = conn
+        self.lock = threading.Lock()
+
+    @classmethod
+    @contextmanager
+    def from_conn_string(cls, conn_string: str) -> Iterator["PostgresStore"]:
+        """Create a new PostgresStore instance from a connection string.
+
+        Args:
+            conn_string (str): The Postgres connection info string.
+
+        Returns:
+            PostgresStore: A new PostgresStore instance.
+        """
+        with Connection.connect(
+            conn_string, autocommit=True, prepare_threshold=0
+        ) as conn:
+            yield PostgresStore(conn)
+
+    def setup(self) -> None:
+        """Set up the store database.
+
+        This method creates the necessary tables in the Postgres database if they don't
+        already exist and runs database migrations. It MUST be called directly by the user
+        the first time the store is used.
+        """
+        with self._cursor() as cur:
+            try:
+                version = cur.execute(
+                    "SELECT v FROM store_migrations ORDER BY v DESC LIMIT 1"
+                ).fetchone()[0]
+            except UndefinedTable:
+                version = -1
+            for v, migration in zip(
+                range(version + 1, len(self.MIGRATIONS)),
+                self.MIGRATIONS[version + 1 :],
+            ):
+                cur.execute(migration)
+                cur.execute(f"INSERT INTO store_migrations (v) VALUES ({v})")
+
+    def list(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        with self._cursor() as cur:
+            cur.execute(self.LIST_SQL, (prefixes,))
+            return self._load_list(prefixes, cur.fetchall())
+
+    def put(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        upserts, deletes = self._dump_writes(writes)
+        with self._cursor(transaction=True) as cur:
+            if upserts:
+                cur.execute(self.UPSERT_SQL, upserts)
+            if deletes:
+                cur.execute(self.DELETE_SQL, deletes)
+
+    async def alist(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.list, prefixes
+        )
+
+    async def aput(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        return await asyncio.get_running_loop().run_in_executor(None, self.put, writes)
+
+    @contextmanager
+    def _cursor(self, *, transaction: bool = False) -> Iterator[Cursor]:
+        if isinstance(self.conn, ConnectionPool):
+            # each call gets its own connection from the pool
+            with self.conn.connection() as conn, conn.cursor() as cur:
+                if transaction:
+                    with conn.transaction():
+                        yield cur
+                else:
+                    yield cur
+        elif isinstance(self.conn, Connection):
+            # a single connection can only be used by one thread at a time
+            with self.lock, self.conn.cursor() as cur:
+                if transaction:
+                    with self.conn.transaction():
+                        yield cur
+                else:
+                    yield cur
+        else:
+            raise TypeError(f"Invalid connection type: {type(self.conn)}")
@@ -0,0 +1,126 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Union
+
+try:
+    from psycopg import AsyncConnection, AsyncCursor
+    from psycopg.errors import UndefinedTable
+    from psycopg_pool import AsyncConnectionPool
+except ImportError as e:
+    raise ImportError(
+        "AsyncPostgresStore requires the psycopg and psycopg-pool packages.\n"
+        "Install them with:\n`pip install gigagraph[postgres]`"
+    ) from e
+
+from langgraph.store.base import V
+from langgraph.store.postgres.base import BasePostgresStore
+
+
+class AsyncPostgresStore(BasePostgresStore):
+    """Asynchronous store that saves values in a Postgres database.
+
+    Values are saved as JSONB, serialized with `JsonPlusSerializer`.
+
+    Writes of an `aput` call are applied in one transaction, with one bulk
+    upsert and one bulk delete. The sync methods can be called from other
+    threads than the one running the event loop the store was created in.
+
+    Args:
+        conn (Union[AsyncConnection, AsyncConnectionPool]): The Postgres
+            connection or pool. A single connection is used by one coroutine
+            at a time, while a pool serves concurrent calls on separate
+            connections.
+
+    Tip:
+        Requires the psycopg and psycopg-pool packages. Install them with
+        `pip install gigagraph[postgres]`.
+    """
+
+    lock: asyncio.Lock
+
+    def __init__(self, conn: Union[AsyncConnection, AsyncConnectionPool]) -> None:
+        self.conn = conn
+        self.lock = asyncio.Lock()
+        self.loop = asyncio.get_running_loop()
+
+    @classmethod
+    @asynccontextmanager
+    async def from_conn_string(
+        cls, conn_string: str
+    ) -> AsyncIterator["AsyncPostgresStore"]:
+        """Create a new AsyncPostgresStore instance from a connection string.
+
+        Args:
+            conn_string (str): The Postgres connection info string.
+
+        Returns:
+            AsyncPostgresStore: A new AsyncPostgresStore instance.
+        """
+        async with await AsyncConnection.connect(
+            conn_string, autocommit=True, prepare_threshold=0
+        ) as conn:
+            yield AsyncPostgresStore(conn)
+
+    async def setup(self) -> None:
+        """Set up the store database asynchronously.
+
+        This method creates the necessary tables in the Postgres database if they don't
+        already exist and runs database migrations. It MUST be called directly by the user
+        the first time the store is used.
+        """
+        async with self._cursor() as cur:
+            try:
+                results = await cur.execute(
+                    "SELECT v FROM store_migrations ORDER BY v DESC LIMIT 1"
+                )
+                version = (await results.fetchone())[0]
+            except UndefinedTable:
+                version = -1
+            for v, migration in zip(
+                range(version + 1, len(self.MIGRATIONS)),
+                self.MIGRATIONS[version + 1 :],
+            ):
+                await cur.execute(migration)
+                await cur.execute(f"INSERT INTO store_migrations (v) VALUES ({v})")
+
+    async def alist(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        async with self._cursor() as cur:
+            await cur.execute(self.LIST_SQL, (prefixes,))
+            return self._load_list(prefixes, await cur.fetchall())
+
+    async def aput(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        upserts, deletes = self._dump_writes(writes)
+        async with self._cursor(transaction=True) as cur:
+            if upserts:
+                await cur.execute(self.UPSERT_SQL, upserts)
+            if deletes:
+                await cur.execute(self.DELETE_SQL, deletes)
+
+    def list(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        return asyncio.run_coroutine_threadsafe(
+            self.alist(prefixes), self.loop
+        ).result()
+
+    def put(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        return asyncio.run_coroutine_threadsafe(self.aput(writes), self.loop).result()
+
+    @asynccontextmanager
+    async def _cursor(self, *, transaction: bool = False) -> AsyncIterator[AsyncCursor]:
+        if isinstance(self.conn, AsyncConnectionPool):
+            # each call gets its own connection from the pool
+            async with self.conn.connection() as conn, conn.cursor() as cur:
+                if transaction:
+                    async with conn.transaction():
+                        yield cur
+                else:
+                    yield cur
+        elif isinstance(self.conn, AsyncConnection):
+            # a single connection can only be used by one coroutine at a time
+            async with self.lock, self.conn.cursor() as cur:
+                if transaction:
+                    async with self.conn.transaction():
+                        yield cur
+                else:
+                    yield cur
+        else:
+            raise TypeError(f"Invalid connection type: {type(self.conn)}")
@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.store.base import BaseStore, V
+
+"""
+To add a new migration, add a new string to the MIGRATIONS list.
+The position of the migration in the list is the version number.
+"""
+MIGRATIONS = [
+    """CREATE TABLE IF NOT EXISTS store_migrations (
+    v INTEGER PRIMARY KEY
+);""",
+    # the primary key indexes the keys of each namespace, listed by prefix
+    """CREATE TABLE IF NOT EXISTS store (
+    prefix TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value JSONB NOT NULL,
+    PRIMARY KEY (prefix, key)
+);""",
+]
+
+# values are read and written as text, to be parsed by the serializer
+LIST_SQL = "SELECT prefix, key, value::text FROM store WHERE prefix = ANY(%s)"
+
+UPSERT_SQL = """
+INSERT INTO store (prefix, key, value)
+SELECT prefix, key, value::jsonb
+FROM unnest(%s::text[], %s::text[], %s::text[]) AS t(prefix, key, value)
+ON CONFLICT (prefix, key) DO UPDATE SET value = EXCLUDED.value
+"""
+
+DELETE_SQL = """
+DELETE FROM store
+WHERE (prefix, key) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+"""
+
+
+class BasePostgresStore(BaseStore):
+    MIGRATIONS = MIGRATIONS
+    LIST_SQL = LIST_SQL
+    UPSERT_SQL = UPSERT_SQL
+    DELETE_SQL = DELETE_SQL
+
+    serde = JsonPlusSerializer()
+
+    def _load_list(
+        self, prefixes: List[str], rows: List[tuple[str, str, str]]
+    ) -> dict[str, dict[str, V]]:
+        results: dict[str, dict[str, V]] = {prefix: {} for prefix in prefixes}
+        for prefix, key, value in rows:
+            results[prefix][key] = self.serde.loads(value.encode())
+        return results
+
+    def _dump_writes(
+        self, writes: List[tuple[str, str, Optional[V]]]
+    ) -> tuple[Optional[tuple[list, list, list]], Optional[tuple[list, list]]]:
+        """Return the arguments of the upsert and delete statements for the
+        writes, or None if there are no rows for one of them."""
+        # only the last write to each key is applied, which also keeps
+        # the upsert from affecting the same row twice
+        collapsed = {(ns, key): value for ns, key, value in writes}
+        upserts: tuple[list, list, list] = ([], [], [])
+        deletes: tuple[list, list] = ([], [])
+        for (ns, key), value in collapsed.items():
+            if value is None:
+                deletes[0].append(ns)
+                deletes[1].append(key)
+            else:
+                upserts[0].append(ns)
+                upserts[1].append(key)
+                upserts[2].append(self.serde.dumps(value).decode())
+        return (upserts if upserts[0] else None, deletes if deletes[0] else None)
@@ -0,0 +1,133 @@
+import asyncio
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Optional
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.store.base import BaseStore, V
+
+# the primary key indexes the keys of each namespace, listed by prefix
+SETUP_SQL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS store (
+    prefix TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (prefix, key)
+) WITHOUT ROWID;
+"""
+
+# maximum number of prefixes bound in one query, below SQLite's variable limit
+LIST_CHUNK_SIZE = 500
+
+
+class SqliteStore(BaseStore):
+    """Store that saves values as JSON in a SQLite database.
+
+    Values are serialized with `JsonPlusSerializer`, as checkpoint metadata is,
+    so they can hold the types it supports, such as datetimes, UUIDs and
+    pydantic models, in addition to JSON types.
+
+    Writes of a `put` call are applied in one transaction, as bulk upserts and
+    deletes. The async methods run the sync ones in the default executor.
+
+    Args:
+        conn (sqlite3.Connection): The SQLite connection, which must allow use
+            from multiple threads (`check_same_thread=False`) for the async
+            methods.
+    """
+
+    serde = JsonPlusSerializer()
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.is_setup = False
+        self.lock = threading.Lock()
+
+    @classmethod
+    @contextmanager
+    def from_conn_string(cls, conn_string: str) -> Iterator["SqliteStore"]:
+        """Create a new SqliteStore instance from a connection string.
+
+        Args:
+            conn_string (str): The SQLite connection string.
+
+        Yields:
+            SqliteStore: A new SqliteStore instance.
+        """
+        with closing(
+            sqlite3.connect(
+                conn_string,
+                # https://ricardoanderegg.com/posts/python-sqlite-thread-safety/
+                check_same_thread=False,
+            )
+        ) as conn:
+            yield cls(conn)
+
+    def setup(self) -> None:
+        """Create the store table if it doesn't exist.
+
+        This method is called automatically when needed.
+        """
+        if self.is_setup:
+            return
+        self.conn.executescript(SETUP_SQL)
+        self.is_setup = True
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            except BaseException:
+                if transaction:
+                    self.conn.rollback()
+                raise
+            else:
+                if transaction:
+                    self.conn.commit()
+            finally:
+                cur.close()
+
+    def list(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        results: dict[str, dict[str, V]] = {prefix: {} for prefix in prefixes}
+        unique = list(results)
+        with self.cursor(transaction=False) as cur:
+            for i in range(0, len(unique), LIST_CHUNK_SIZE):
+                chunk = unique[i : i + LIST_CHUNK_SIZE]
+                cur.execute(
+                    "SELECT prefix, key, value FROM store "
+                    f"WHERE prefix IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for prefix, key, value in cur:
+                    results[prefix][key] = self.serde.loads(value.encode())
+        return results
+
+    def put(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        # only the last write to each key is applied
+        collapsed = {(ns, key): value for ns, key, value in writes}
+        with self.cursor() as cur:
+            cur.executemany(
+                "INSERT OR REPLACE INTO store (prefix, key, value) VALUES (?, ?, ?)",
+                [
+                    (ns, key, self.serde.dumps(value).decode())
+                    for (ns, key), value in collapsed.items()
+                    if value is not None
+                ],
+            )
+            cur.executemany(
+                "DELETE FROM store WHERE prefix = ? AND key = ?",
+                [(ns, key) for (ns, key), value in collapsed.items() if value is None],
+            )
+
+    async def alist(self, prefixes: List[str]) -> dict[str, dict[str, V]]:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.list, prefixes
+        )
+
+    async def aput(self, writes: List[tuple[str, str, Optional[V]]]) -> None:
+        return await asyncio.get_running_loop().run_in_executor(None, self.put, writes)
@@ -1,4 +1,6 @@
 import dataclasses
+import types
+import weakref
 from typing import Any, Optional, Type, Union
 
 from typing_extensions import Annotated, NotRequired, ReadOnly, Required, get_origin
@@ -61,6 +63,32 @@ def _is_readonly_type(type_: Any) -> bool:
 
 _DEFAULT_KEYS = frozenset()
 
+ANNOTATED_KEYS_CACHE: weakref.WeakKeyDictionary[Type[Any], tuple[str, ...]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_cached_annotated_keys(obj: Type[Any]) -> tuple[str, ...]:
+    """Return the annotated keys of a class and its bases, cached per class.
+
+    Unlike `get_type_hints()`, this doesn't evaluate the annotations, so it's
+    cheap enough to call on every node output.
+    """
+    try:
+        return ANNOTATED_KEYS_CACHE[obj]
+    except KeyError:
+        pass
+    except TypeError:
+        raise TypeError(f"Expected a type, got {type(obj)}") from None
+    keys: list[str] = []
+    for base in reversed(obj.__mro__):
+        ann = base.__dict__.get("__annotations__")
+        if ann is None or isinstance(ann, types.GetSetDescriptorType):
+            continue
+        keys.extend(k for k in ann if k not in keys)
+    ANNOTATED_KEYS_CACHE[obj] = tuple(keys)
+    return ANNOTATED_KEYS_CACHE[obj]
+
 
 def get_field_default(name: str, type_: Any, schema: Type[Any]) -> Any:
     """Determine the default value for a field in a state schema.
@@ -1,5 +1,15 @@
+from langchain_core.callbacks import BaseCallbackHandler
+
+from langgraph.channels.last_value import LastValue
 from langgraph.checkpoint.base import empty_checkpoint
-from langgraph.pregel.algo import prepare_next_tasks
+from langgraph.constants import CONFIG_KEY_CHECKPOINT_MAP, CONFIG_KEY_TASK_ID, Send
+from langgraph.pregel import Channel, Pregel
+from langgraph.pregel.algo import (
+    PregelTaskWrites,
+    apply_writes,
+    increment,
+    prepare_next_tasks,
+)
 from langgraph.pregel.manager import ChannelsManager
 
 
@@ -23,3 +33,96 @@ def test_prepare_next_tasks() -> None:
         )
 
         # TODO: add more tests
+
+
+def test_prepare_next_tasks_trigger_index() -> None:
+    app = Pregel(
+        nodes={
+            "one": Channel.subscribe_to("a") | Channel.write_to("b"),
+            "two": Channel.subscribe_to("b") | Channel.write_to("c"),
+            "three": Channel.subscribe_to(["a", "c"]) | Channel.write_to("d"),
+        },
+        channels={k: LastValue(int) for k in "abcd"},
+        input_channels="a",
+        output_channels="d",
+    )
+    assert app.trigger_to_nodes == {"a": ["one", "three"], "b": ["two"], "c": ["three"]}
+
+    config = {}
+    checkpoint = empty_checkpoint()
+    with ChannelsManager(app.channels, checkpoint, config) as (channels, managed):
+        _, updated_channels = apply_writes(
+            checkpoint,
+            channels,
+            [PregelTaskWrites("__input__", [("b", 1)], [])],
+            increment,
+        )
+        assert updated_channels == {"b"}
+        # the index only yields nodes subscribed to updated channels,
+        # and matches the result of checking every node
+        indexed = prepare_next_tasks(
+            checkpoint,
+            app.nodes,
+            channels,
+            managed,
+            config,
+            0,
+            for_execution=False,
+            updated_channels=updated_channels,
+            trigger_to_nodes=app.trigger_to_nodes,
+        )
+        assert [t.name for t in indexed.values()] == ["two"]
+        assert indexed == prepare_next_tasks(
+            checkpoint, app.nodes, channels, managed, config, 0, for_execution=False
+        )
+
+
+def test_prepare_next_tasks_config() -> None:
+    app = Pregel(
+        nodes={
+            "one": Channel.subscribe_to("a", tags=["node"]) | Channel.write_to("b"),
+        },
+        channels={k: LastValue(int) for k in "ab"},
+        input_channels="a",
+        output_channels="b",
+    )
+    handler = BaseCallbackHandler()
+    config = {
+        "callbacks": [handler],
+        "tags": ["graph"],
+        "metadata": {"key": "graph", "other": 1},
+        "run_name": "graph",
+        "configurable": {"thread_id": "1", "checkpoint_ns": ""},
+    }
+    checkpoint = empty_checkpoint()
+    checkpoint["pending_sends"] = [Send("one", 1), Send("one", 2)]
+    with ChannelsManager(app.channels, checkpoint, config) as (channels, managed):
+        tasks = list(
+            prepare_next_tasks(
+                checkpoint, app.nodes, channels, managed, config, 3, for_execution=True
+            ).values()
+        )
+    assert len(tasks) == 2
+    for idx, task in enumerate(tasks):
+        assert task.config["run_name"] == "one"
+        assert task.config["tags"] == ["graph", "node"]
+        assert task.config["metadata"] == {
+            "key": "graph",
+            "other": 1,
+            "langgraph_step": 3,
+            "langgraph_node": "one",
+            "langgraph_triggers": ["__pregel_push"],
+            "langgraph_path": ("__pregel_push", idx),
+        }
+        assert task.config["callbacks"] == [handler]
+        assert task.config["configurable"]["thread_id"] == "1"
+        assert task.config["configurable"][CONFIG_KEY_TASK_ID] == task.id
+        assert task.config["configurable"]["checkpoint_ns"] == f"one:{task.id}"
+        assert task.config["configurable"][CONFIG_KEY_CHECKPOINT_MAP] == {
+            "": checkpoint["id"]
+        }
+    # shared parts of the step config are not mutable through another task
+    assert tasks[0].config["callbacks"] is not tasks[1].config["callbacks"]
+    assert tasks[0].config["metadata"] is not tasks[1].config["metadata"]
+    assert config["metadata"] == {"key": "graph", "other": 1}
+    assert config["tags"] == ["graph"]
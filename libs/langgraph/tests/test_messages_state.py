@@ -11,7 +11,11 @@ from langchain_core.messages import (
 )
 from pydantic import BaseModel
 from pydantic.v1 import BaseModel as BaseModelV1
+from typing_extensions import TypedDict
 
+from langgraph.channels.messages import MessagesChannel
+from langgraph.checkpoint.base import SegmentLog
+from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import add_messages
 from langgraph.graph.message import MessagesState
 from langgraph.graph.state import END, START, StateGraph
@@ -145,6 +149,62 @@ def test_delete_all():
     assert result == expected_result
 
 
+def test_messages_channel():
+    channel = MessagesChannel().from_checkpoint(None)
+    updates = [
+        [HumanMessage(content="Hello", id="1"), AIMessage(content="Hi!", id="2")],
+        SystemMessage(content="System message", id="3"),
+        [HumanMessage(content="Updated hello", id="1"), ("user", "Again")],
+        [RemoveMessage(id="2"), AIMessage(content="Bye", id="4")],
+    ]
+    expected = []
+    for update in updates:
+        expected = add_messages(expected, update)
+        channel.update([update])
+        assert channel.get() == [
+            _AnyIdHumanMessage(content=m.content) if m.content == "Again" else m
+            for m in expected
+        ]
+    with pytest.raises(
+        ValueError, match="Attempting to delete a message with an ID that doesn't exist"
+    ):
+        channel.update([RemoveMessage(id="2")])
+
+
+def test_messages_channel_checkpoint():
+    channel = MessagesChannel().from_checkpoint(None)
+    channel.update([[HumanMessage(content="Hello", id="1")]])
+    channel.update([[AIMessage(content="Hi!", id="2")]])
+    # messages appended between two checkpoints are kept in one segment
+    first = channel.checkpoint()
+    assert [m for _, m in first.segments] == [
+        [HumanMessage(content="Hello", id="1"), AIMessage(content="Hi!", id="2")]
+    ]
+    channel.update([[HumanMessage(content="How are you?", id="3")]])
+    second = channel.checkpoint()
+    assert second.segments[0] == first.segments[0]
+    assert [m for _, m in second.segments[1:]] == [
+        [HumanMessage(content="How are you?", id="3")]
+    ]
+    # restored channels keep appending new segments
+    restored = channel.from_checkpoint(second)
+    assert restored.get() == channel.get()
+    restored.update([[AIMessage(content="Fine", id="4")]])
+    third = restored.checkpoint()
+    assert third.segments[:2] == second.segments
+    assert len(third.segments) == 3
+    # replacing a message starts a new log
+    restored.update([[AIMessage(content="Good", id="4")]])
+    fourth = restored.checkpoint()
+    assert len(fourth.segments) == 1
+    assert fourth.segments[0][0] not in {s for s, _ in third.segments}
+    assert restored.get()[-1] == AIMessage(content="Good", id="4")
+    # lists saved by previous versions are restored too
+    legacy = MessagesChannel().from_checkpoint([HumanMessage(content="Hello", id="1")])
+    assert legacy.get() == [HumanMessage(content="Hello", id="1")]
+    assert isinstance(legacy.checkpoint(), SegmentLog)
+
+
 MESSAGES_STATE_SCHEMAS = [MessagesState]
 if IS_LANGCHAIN_CORE_030_OR_GREATER:
 
@@ -178,3 +238,45 @@ def test_messages_state(state_schema):
             _AnyIdHumanMessage(content="foo"),
         ]
     }
+
+
+def test_messages_channel_opt_in():
+    class State(TypedDict):
+        messages: Annotated[list[AnyMessage], add_messages]
+        log: Annotated[list[AnyMessage], MessagesChannel]
+
+    def foo(state):
+        return {"messages": [HumanMessage("foo")], "log": [HumanMessage("foo")]}
+
+    graph = StateGraph(State)
+    graph.add_edge(START, "foo")
+    graph.add_edge("foo", END)
+    graph.add_node(foo)
+
+    checkpointer = MemorySaver()
+    app = graph.compile(checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "1"}}
+
+    assert app.invoke(
+        {"messages": [("user", "meow")], "log": [("user", "meow")]}, config
+    ) == {
+        "messages": [
+            _AnyIdHumanMessage(content="meow"),
+            _AnyIdHumanMessage(content="foo"),
+        ],
+        "log": [
+            _AnyIdHumanMessage(content="meow"),
+            _AnyIdHumanMessage(content="foo"),
+        ],
+    }
+    # keys annotated with add_messages are still checkpointed as lists
+    values = checkpointer.get(config)["channel_values"]
+    assert values["messages"] == [
+        _AnyIdHumanMessage(content="meow"),
+        _AnyIdHumanMessage(content="foo"),
+    ]
+    assert isinstance(values["log"], SegmentLog)
+    assert [m for _, messages in values["log"].segments for m in messages] == [
+        _AnyIdHumanMessage(content="meow"),
+        _AnyIdHumanMessage(content="foo"),
+    ]
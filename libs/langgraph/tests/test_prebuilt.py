@@ -1,5 +1,8 @@
+import asyncio
 import dataclasses
 import json
+import threading
+import time
 from typing import (
     Annotated,
     Any,
@@ -12,6 +15,7 @@ from typing import (
     TypeVar,
     Union,
 )
+from uuid import uuid4
 
 import pytest
 from langchain_core.callbacks import CallbackManagerForLLMRun
@@ -34,8 +38,16 @@ from pydantic.v1 import BaseModel as BaseModelV1
 from typing_extensions import TypedDict
 
 from langgraph.checkpoint.base import BaseCheckpointSaver
-from langgraph.prebuilt import ToolNode, ValidationNode, create_react_agent
+from langgraph.prebuilt import (
+    InMemoryToolCache,
+    StoreToolCache,
+    ToolNode,
+    ValidationNode,
+    create_react_agent,
+)
+from langgraph.prebuilt.tool_cache import tool_cache_key
 from langgraph.prebuilt.tool_node import InjectedState
+from langgraph.store.memory import MemoryStore
 from tests.conftest import (
     ALL_CHECKPOINTERS_ASYNC,
     ALL_CHECKPOINTERS_SYNC,
@@ -584,3 +596,160 @@ def test_tool_node_ensure_utf8() -> None:
         [AIMessage(content="", tool_calls=tool_calls)]
     )
     assert outputs[0].content == json.dumps(data, ensure_ascii=False)
+
+
+async def test_tool_node_max_concurrency() -> None:
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def track() -> None:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    threads: set[threading.Thread] = set()
+
+    @dec_tool
+    def sync_tool(x: int) -> int:
+        """Sync tool."""
+        threads.add(threading.current_thread())
+        track()
+        return x
+
+    @dec_tool
+    async def async_tool(x: int) -> int:
+        """Async tool."""
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return x
+
+    for tool_ in (sync_tool, async_tool):
+        node = ToolNode([tool_], max_concurrency=2)
+        tool_calls = [
+            ToolCall(name=tool_.name, args={"x": i}, id=str(i)) for i in range(6)
+        ]
+        max_running = 0
+        if tool_ is sync_tool:
+            outputs = node.invoke([AIMessage(content="", tool_calls=tool_calls)])
+            first_threads = set(threads)
+            assert len(first_threads) == 2
+            # the thread pool is kept for the next invocations
+            node.invoke([AIMessage(content="", tool_calls=tool_calls)])
+            assert threads == first_threads
+            # until the node is closed
+            node.close()
+            assert not any(t.is_alive() for t in first_threads)
+            with node:
+                node.invoke([AIMessage(content="", tool_calls=tool_calls)])
+            assert len(threads) == 4
+            assert not any(t.is_alive() for t in threads)
+        else:
+            outputs = await node.ainvoke([AIMessage(content="", tool_calls=tool_calls)])
+        assert [m.content for m in outputs] == [str(i) for i in range(6)]
+        assert max_running == 2
+
+
+async def test_tool_node_cache() -> None:
+    calls: list[str] = []
+
+    @dec_tool
+    def search(query: str) -> str:
+        """Search tool."""
+        calls.append(query)
+        return f"result for {query}"
+
+    @dec_tool
+    def lookup(key: str, state: Annotated[dict, InjectedState]) -> str:
+        """Lookup tool."""
+        calls.append(key)
+        return state["foo"]
+
+    def ai_message(*tool_calls: tuple[str, dict]) -> AIMessage:
+        return AIMessage(
+            "",
+            tool_calls=[
+                ToolCall(name=name, args=args, id=str(uuid4()))
+                for name, args in tool_calls
+            ],
+        )
+
+    for cache in (InMemoryToolCache(), StoreToolCache(MemoryStore())):
+        calls.clear()
+        node = ToolNode([search, lookup], cache=cache)
+        message = ai_message(
+            ("search", {"query": "a"}),
+            ("search", {"query": "b"}),
+            ("lookup", {"key": "c"}),
+        )
+        node.invoke({"messages": [message], "foo": "bar"})
+        assert sorted(calls) == ["a", "b", "c"]
+        assert (cache.hits, cache.misses) == (0, 2)
+
+        # repeated calls return cached results, with their own tool call ids
+        message = ai_message(("search", {"query": "a"}), ("lookup", {"key": "c"}))
+        outputs = (await node.ainvoke({"messages": [message], "foo": "bar"}))[
+            "messages"
+        ]
+        assert sorted(calls) == ["a", "b", "c", "c"]
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert outputs[0].content == "result for a"
+        assert outputs[0].tool_call_id == message.tool_calls[0]["id"]
+        assert outputs[0].id is None
+
+
+def test_tool_node_cache_ttl() -> None:
+    calls: list[str] = []
+
+    @dec_tool
+    def search(query: str) -> str:
+        """Search tool."""
+        calls.append(query)
+        return f"result for {query}"
+
+    @dec_tool
+    def fetch(url: str) -> str:
+        """Fetch tool."""
+        calls.append(url)
+        return f"page at {url}"
+
+    cache = InMemoryToolCache()
+    node = ToolNode([search, fetch], cache=cache, cache_ttl={"search": 0.5})
+    message = AIMessage(
+        "",
+        tool_calls=[
+            ToolCall(name="search", args={"query": "a"}, id="1"),
+            ToolCall(name="fetch", args={"url": "b"}, id="2"),
+        ],
+    )
+    node.invoke([message])
+    node.invoke([message])
+    # only the tools with a TTL are cached
+    assert sorted(calls) == ["a", "b", "b"]
+    time.sleep(0.5)
+    node.invoke([message])
+    assert sorted(calls) == ["a", "a", "b", "b", "b"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_in_memory_tool_cache() -> None:
+    cache = InMemoryToolCache(max_entries=2)
+    assert tool_cache_key("search", {"a": 1, "b": 2}) == tool_cache_key(
+        "search", {"b": 2, "a": 1}
+    )
+    assert tool_cache_key("search", {"a": 1}) != tool_cache_key("fetch", {"a": 1})
+
+    for key in ("a", "b"):
+        cache.put(key, ToolMessage(key, tool_call_id=key), None)
+    assert cache.get("a").content == "a"
+    # the least recently used result is evicted
+    cache.put("c", ToolMessage("c", tool_call_id="c"), None)
+    assert cache.get("b") is None
+    assert [k for k in ("a", "b", "c") if cache.get(k)] == ["a", "c"]
@@ -1,6 +1,8 @@
 import json
 import operator
+import os
 import re
+import threading
 import time
 import warnings
 from collections import Counter
@@ -26,6 +28,7 @@ from typing import (
 
 import httpx
 import pytest
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.runnables import (
     RunnableConfig,
     RunnableLambda,
@@ -70,7 +73,8 @@ from langgraph.pregel import (
     StateSnapshot,
 )
 from langgraph.pregel.retry import RetryPolicy
-from langgraph.pregel.types import PregelTask
+from langgraph.pregel.single_flight import SINGLE_FLIGHT, SingleFlight
+from langgraph.pregel.types import PregelTask, SingleFlightPolicy
 from langgraph.store.memory import MemoryStore
 from tests.any_str import AnyDict, AnyStr, AnyVersion, UnsortedSequence
 from tests.conftest import ALL_CHECKPOINTERS_SYNC, SHOULD_CHECK_SNAPSHOTS
@@ -79,6 +83,18 @@ from tests.memory_assert import MemorySaverAssertCheckpointMetadata
 from tests.messages import _AnyIdAIMessage, _AnyIdHumanMessage, _AnyIdToolMessage
 
 
+def count_primes(state: dict) -> dict:
+    # module-level, so that it can be pickled to run in a worker process
+    n = state["n"]
+    count = sum(all(i % d for d in range(2, int(i**0.5) + 1)) for i in range(2, n))
+    return {"counts": [count], "pids": [os.getpid()]}
+
+
+def configurable_keys(state: dict, config: RunnableConfig) -> dict:
+    # module-level, so that it can be pickled to run in a worker process
+    return {"keys": sorted(config["configurable"])}
+
+
 # define these objects to avoid importing langchain_core.agents
 # and therefore avoid relying on core Pydantic version
 class AgentAction(BaseModel):
@@ -306,6 +322,132 @@ def test_checkpoint_errors() -> None:
         graph.invoke("", {"configurable": {"thread_id": "thread-1"}})
 
 
+def test_process_pool_node() -> None:
+    class State(TypedDict):
+        counts: Annotated[list[int], operator.add]
+        pids: Annotated[list[int], operator.add]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("count_primes", {"n": n}) for n in (10, 100, 1000)]
+
+    builder = StateGraph(State)
+    builder.add_node("count_primes", count_primes, process_pool=True)
+    builder.add_conditional_edges(START, fanout)
+    graph = builder.compile()
+
+    result = graph.invoke({"counts": [], "pids": []})
+    assert sorted(result["counts"]) == [4, 25, 168]
+    # ran in worker processes, writes were applied in this one
+    assert os.getpid() not in result["pids"]
+
+
+def test_process_pool_node_unpicklable_config() -> None:
+    class State(TypedDict):
+        keys: list[str]
+
+    builder = StateGraph(State)
+    builder.add_node("read_keys", configurable_keys, process_pool=True)
+    builder.add_edge(START, "read_keys")
+    graph = builder.compile(checkpointer=MemorySaver())
+
+    config = {"configurable": {"thread_id": "1", "user": "a", "lock": threading.Lock()}}
+    # unpicklable values are left out of the config sent to the worker
+    assert graph.invoke({"keys": []}, config) == {
+        "keys": ["checkpoint_id", "checkpoint_ns", "thread_id", "user"]
+    }
+
+
+def test_put_writes_batched() -> None:
+    class BatchingCheckpointer(MemorySaver):
+        def __init__(self) -> None:
+            super().__init__()
+            self.batches: list[int] = []
+
+        def put_writes_many(
+            self,
+            writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+        ) -> None:
+            self.batches.append(len(writes))
+            super().put_writes_many(writes)
+
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("work", {"items": [i]}) for i in range(10)]
+
+    def work(state: State) -> State:
+        return {"items": state["items"]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", work)
+    builder.add_conditional_edges(START, fanout)
+    checkpointer = BatchingCheckpointer()
+    # writes wait for the end of the step, not for the maximum delay
+    graph = builder.compile(
+        checkpointer=checkpointer,
+        checkpoint_writes_batch_size=3,
+        checkpoint_writes_max_delay=60.0,
+    )
+    config = {"configurable": {"thread_id": "1"}}
+
+    start = time.perf_counter()
+    assert graph.invoke({"items": []}, config) == {
+        "items": UnsortedSequence(*range(10))
+    }
+    assert time.perf_counter() - start < 60.0
+    # one batch for the START task, then batches of at most 3 of the 9 tasks
+    # that don't finish the step
+    assert checkpointer.batches[0] == 1
+    assert all(n <= 3 for n in checkpointer.batches)
+    assert sum(checkpointer.batches) == 10
+    # and all of them were saved
+    assert (
+        len({w[0] for writes in checkpointer.writes.values() for w in writes.values()})
+        == 10
+    )
+
+
+def test_put_writes_full_batch() -> None:
+    saved = threading.Event()
+
+    class BatchingCheckpointer(MemorySaver):
+        def put_writes_many(
+            self,
+            writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+        ) -> None:
+            super().put_writes_many(writes)
+            if len(writes) == 3:
+                saved.set()
+
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("work", {"items": [i]}) for i in range(4)]
+
+    def work(state: State) -> State:
+        # the last task waits for the writes of the others to be saved
+        if state["items"] == [3]:
+            assert saved.wait(10)
+        return {"items": state["items"]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", work)
+    builder.add_conditional_edges(START, fanout)
+    # a full batch is saved without waiting for the maximum delay
+    graph = builder.compile(
+        checkpointer=BatchingCheckpointer(),
+        checkpoint_writes_batch_size=3,
+        checkpoint_writes_max_delay=60.0,
+    )
+    config = {"configurable": {"thread_id": "1"}}
+
+    start = time.perf_counter()
+    assert graph.invoke({"items": []}, config) == {"items": UnsortedSequence(*range(4))}
+    assert time.perf_counter() - start < 10.0
+
+
 def test_node_schemas_custom_output() -> None:
     class State(TypedDict):
         hello: str
@@ -613,6 +755,101 @@ def test_invoke_single_process_in_dict_out_dict(mocker: MockerFixture) -> None:
     assert app.invoke({"input": 2}) == {"output": 3}
 
 
+def test_invoke_pooled(mocker: MockerFixture) -> None:
+    pools = set()
+
+    def add_one(x: int) -> int:
+        # thread names are prefixed with the name of their pool
+        pools.add(threading.current_thread().name.rsplit("_", 1)[0])
+        return x + 1
+
+    one = Channel.subscribe_to("input") | add_one | Channel.write_to("inbox")
+    two = Channel.subscribe_to("inbox") | add_one | Channel.write_to("output")
+
+    app = Pregel(
+        nodes={"one": one, "two": two},
+        channels={
+            "inbox": LastValue(int),
+            "output": LastValue(int),
+            "input": LastValue(int),
+        },
+        input_channels="input",
+        output_channels="output",
+        pooled=True,
+    )
+
+    # tasks of all invocations run in the same pool
+    for _ in range(10):
+        assert app.invoke(2) == 4
+    assert len(pools) == 1
+
+    # copies share the pool
+    assert app.with_config(tags=["a"]).invoke(2) == 4
+    assert len(pools) == 1
+
+    # unless concurrency is limited
+    assert app.invoke(2, {"max_concurrency": 1}) == 4
+    assert len(pools) == 2
+
+
+def test_state_graph_compile_pooled() -> None:
+    pools = set()
+
+    class State(TypedDict):
+        count: int
+
+    def step(state: State) -> dict:
+        pools.add(threading.current_thread().name.rsplit("_", 1)[0])
+        return {"count": state["count"] + 1}
+
+    builder = StateGraph(State)
+    builder.add_node("step", step)
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+
+    app = builder.compile(pooled=True)
+    assert app.pooled is True
+    for _ in range(5):
+        assert app.invoke({"count": 0}) == {"count": 1}
+    assert len(pools) == 1
+
+    assert builder.compile().pooled is False
+
+
+def test_parallel_nodes_callback_metadata() -> None:
+    class MetadataHandler(BaseCallbackHandler):
+        def __init__(self) -> None:
+            self.metadata: dict[str, dict] = {}
+
+        def on_chain_start(self, serialized, inputs, *, name=None, **kwargs):
+            if name in ("a", "b", "c"):
+                self.metadata[name] = kwargs["metadata"]
+
+    class State(TypedDict):
+        log: Annotated[list, operator.add]
+
+    builder = StateGraph(State)
+    for node in "abc":
+        builder.add_node(
+            node,
+            lambda state, node=node: {"log": [node]},
+            metadata={"only_a": True} if node == "a" else None,
+        )
+        builder.add_edge(START, node)
+        builder.add_edge(node, END)
+
+    handler = MetadataHandler()
+    assert builder.compile().invoke({"log": []}, {"callbacks": [handler]}) == {
+        "log": ["a", "b", "c"]
+    }
+    # tasks of the same step don't see each other's metadata
+    assert handler.metadata["a"]["only_a"] is True
+    for node in "abc":
+        assert handler.metadata[node]["langgraph_node"] == node
+    assert "only_a" not in handler.metadata["b"]
+    assert "only_a" not in handler.metadata["c"]
+
+
 def test_invoke_two_processes_in_out(mocker: MockerFixture) -> None:
     add_one = mocker.Mock(side_effect=lambda x: x + 1)
     one = Channel.subscribe_to("input") | add_one | Channel.write_to("inbox")
@@ -1686,6 +1923,112 @@ def test_cond_edge_after_send() -> None:
     assert graph.invoke(["0"]) == ["0", "1", "2", "2", "3"]
 
 
+def test_send_interrupt_shallow_checkpointer() -> None:
+    class Node:
+        def __init__(self, name: str):
+            self.name = name
+            setattr(self, "__name__", name)
+
+        def __call__(self, state):
+            return [self.name]
+
+    def send_for_fun(state):
+        return [Send("2", state), Send("2", state)]
+
+    checkpointer = MemorySaver(shallow=True)
+    builder = StateGraph(Annotated[list, operator.add])
+    builder.add_node(Node("1"))
+    builder.add_node(Node("2"))
+    builder.add_node(Node("3"))
+    builder.add_edge(START, "1")
+    builder.add_conditional_edges("1", send_for_fun)
+    builder.add_edge("2", "3")
+    graph = builder.compile(checkpointer=checkpointer, interrupt_before=["2"])
+    config = {"configurable": {"thread_id": "1"}}
+
+    assert graph.invoke(["0"], config) == ["0", "1"]
+    assert len(list(checkpointer.list(config))) == 1
+    # pending sends survive the previous checkpoints being deleted
+    assert graph.invoke(None, config) == ["0", "1", "2", "2", "3"]
+    assert len(list(checkpointer.list(config))) == 1
+
+
+def test_single_flight() -> None:
+    class State(TypedDict):
+        query: str
+        results: list[str]
+
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[str] = []
+
+    def search(state: State) -> dict:
+        calls.append(state["query"])
+        started.set()
+        assert release.wait(10)
+        return {"results": [state["query"].upper()]}
+
+    builder = StateGraph(State)
+    builder.add_node(
+        "search",
+        search,
+        single_flight=SingleFlightPolicy(key_func=lambda state: state["query"]),
+    )
+    builder.add_edge(START, "search")
+    graph = builder.compile()
+
+    coalesced = SINGLE_FLIGHT.coalesced
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(graph.invoke, {"query": "a"}) for _ in range(3)]
+        assert started.wait(10)
+        # wait for the other runs to join the first one
+        deadline = time.monotonic() + 10
+        while SINGLE_FLIGHT.coalesced < coalesced + 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert calls == ["a"]
+    assert results == [{"query": "a", "results": ["A"]}] * 3
+    # each run got its own copy of the writes
+    assert results[0]["results"] is not results[1]["results"]
+    # later runs, and runs with other inputs, execute the node again
+    assert graph.invoke({"query": "a"}) == {"query": "a", "results": ["A"]}
+    assert graph.invoke({"query": "b"}) == {"query": "b", "results": ["B"]}
+    assert calls == ["a", "a", "b"]
+
+
+def test_single_flight_error() -> None:
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail() -> None:
+        started.set()
+        assert release.wait(10)
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor() as executor:
+        leader = executor.submit(single_flight.run, "key", fail)
+        assert started.wait(10)
+        follower = executor.submit(single_flight.run, "key", fail)
+        deadline = time.monotonic() + 10
+        while single_flight.coalesced < 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        release.set()
+        # the error of the shared execution is raised by all callers
+        with pytest.raises(ValueError, match="failed"):
+            leader.result()
+        with pytest.raises(ValueError, match="failed"):
+            follower.result()
+
+    assert single_flight.executions == 1
+    assert single_flight.calls == {}
+    assert single_flight.run("key", lambda: 1) == (1, False)
+
+
 @pytest.mark.parametrize("checkpointer_name", ALL_CHECKPOINTERS_SYNC)
 def test_invoke_checkpoint_three(
     mocker: MockerFixture, request: pytest.FixtureRequest, checkpointer_name: str
@@ -1785,6 +2128,20 @@ def test_invoke_checkpoint_three(
     )
     assert len(cursored) == 1
     assert cursored[0].config == thread_1_history[1].config
+    # history is read in pages of checkpoints
+    assert list(app.get_state_history(thread_1, page_size=2)) == thread_1_history
+    assert (
+        list(app.get_state_history(thread_1, limit=5, page_size=2))
+        == thread_1_history[:5]
+    )
+    # without values, only checkpoint configs and metadata are returned
+    lightweight = list(app.get_state_history(thread_1, values=False, page_size=3))
+    assert [(c.config, c.metadata, c.parent_config) for c in lightweight] == [
+        (c.config, c.metadata, c.parent_config) for c in thread_1_history
+    ]
+    assert all(c.values is None for c in lightweight)
+    with pytest.raises(ValueError, match="page_size must be at least 1"):
+        list(app.get_state_history(thread_1, page_size=0))
     # the last checkpoint
     assert thread_1_history[0].values["total"] == 16
     # the first "loop" checkpoint
@@ -1,7 +1,9 @@
 import asyncio
 import operator
+import os
 import re
 import sys
+import time
 from collections import Counter
 from contextlib import asynccontextmanager, contextmanager
 from typing import (
@@ -14,6 +16,7 @@ from typing import (
     List,
     Literal,
     Optional,
+    Sequence,
     Tuple,
     TypedDict,
     Union,
@@ -67,7 +70,8 @@ from langgraph.pregel import (
     StateSnapshot,
 )
 from langgraph.pregel.retry import RetryPolicy
-from langgraph.pregel.types import PregelTask
+from langgraph.pregel.single_flight import SINGLE_FLIGHT, SingleFlight
+from langgraph.pregel.types import PregelTask, SingleFlightPolicy
 from langgraph.store.memory import MemoryStore
 from tests.any_str import AnyDict, AnyStr, AnyVersion, UnsortedSequence
 from tests.conftest import (
@@ -86,6 +90,13 @@ from tests.messages import _AnyIdAIMessage, _AnyIdHumanMessage, _AnyIdToolMessag
 pytestmark = pytest.mark.anyio
 
 
+def count_primes(state: dict) -> dict:
+    # module-level, so that it can be pickled to run in a worker process
+    n = state["n"]
+    count = sum(all(i % d for d in range(2, int(i**0.5) + 1)) for i in range(2, n))
+    return {"counts": [count], "pids": [os.getpid()]}
+
+
 async def test_checkpoint_errors() -> None:
     class FaultyGetCheckpointer(MemorySaver):
         async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
@@ -170,6 +181,118 @@ async def test_checkpoint_errors() -> None:
             pass
 
 
+async def test_process_pool_node() -> None:
+    class State(TypedDict):
+        counts: Annotated[list[int], operator.add]
+        pids: Annotated[list[int], operator.add]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("count_primes", {"n": n}) for n in (10, 100, 1000)]
+
+    builder = StateGraph(State)
+    builder.add_node("count_primes", count_primes, process_pool=True)
+    builder.add_conditional_edges(START, fanout)
+    graph = builder.compile()
+
+    result = await graph.ainvoke({"counts": [], "pids": []})
+    assert sorted(result["counts"]) == [4, 25, 168]
+    # ran in worker processes, writes were applied in this one
+    assert os.getpid() not in result["pids"]
+
+
+async def test_put_writes_batched() -> None:
+    class BatchingCheckpointer(MemorySaver):
+        def __init__(self) -> None:
+            super().__init__()
+            self.batches: list[int] = []
+
+        async def aput_writes_many(
+            self,
+            writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+        ) -> None:
+            self.batches.append(len(writes))
+            await super().aput_writes_many(writes)
+
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("work", {"items": [i]}) for i in range(10)]
+
+    async def work(state: State) -> State:
+        return {"items": state["items"]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", work)
+    builder.add_conditional_edges(START, fanout)
+    checkpointer = BatchingCheckpointer()
+    # writes wait for the end of the step, not for the maximum delay
+    graph = builder.compile(
+        checkpointer=checkpointer,
+        checkpoint_writes_batch_size=3,
+        checkpoint_writes_max_delay=60.0,
+    )
+    config = {"configurable": {"thread_id": "1"}}
+
+    start = asyncio.get_running_loop().time()
+    assert await graph.ainvoke({"items": []}, config) == {
+        "items": UnsortedSequence(*range(10))
+    }
+    assert asyncio.get_running_loop().time() - start < 60.0
+    # one batch for the START task, then batches of at most 3 of the 9 tasks
+    # that don't finish the step
+    assert checkpointer.batches[0] == 1
+    assert all(n <= 3 for n in checkpointer.batches)
+    assert sum(checkpointer.batches) == 10
+    # and all of them were saved
+    assert (
+        len({w[0] for writes in checkpointer.writes.values() for w in writes.values()})
+        == 10
+    )
+
+
+async def test_put_writes_full_batch() -> None:
+    saved = asyncio.Event()
+
+    class BatchingCheckpointer(MemorySaver):
+        async def aput_writes_many(
+            self,
+            writes: Sequence[tuple[RunnableConfig, Sequence[tuple[str, Any]], str]],
+        ) -> None:
+            await super().aput_writes_many(writes)
+            if len(writes) == 3:
+                saved.set()
+
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("work", {"items": [i]}) for i in range(4)]
+
+    async def work(state: State) -> State:
+        # the last task waits for the writes of the others to be saved
+        if state["items"] == [3]:
+            await asyncio.wait_for(saved.wait(), 10)
+        return {"items": state["items"]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", work)
+    builder.add_conditional_edges(START, fanout)
+    # a full batch is saved without waiting for the maximum delay
+    graph = builder.compile(
+        checkpointer=BatchingCheckpointer(),
+        checkpoint_writes_batch_size=3,
+        checkpoint_writes_max_delay=60.0,
+    )
+    config = {"configurable": {"thread_id": "1"}}
+
+    start = asyncio.get_running_loop().time()
+    assert await graph.ainvoke({"items": []}, config) == {
+        "items": UnsortedSequence(*range(4))
+    }
+    assert asyncio.get_running_loop().time() - start < 10.0
+
+
 async def test_node_cancellation_on_external_cancel() -> None:
     inner_task_cancelled = False
 
@@ -1546,6 +1669,101 @@ async def test_invoke_two_processes_two_in_two_out_valid(mocker: MockerFixture)
     assert await app.ainvoke(2) == [3, 3]
 
 
+async def test_single_flight() -> None:
+    class State(TypedDict):
+        query: str
+        results: list[str]
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def search(state: State) -> dict:
+        calls.append(state["query"])
+        started.set()
+        await asyncio.wait_for(release.wait(), 10)
+        return {"results": [state["query"].upper()]}
+
+    builder = StateGraph(State)
+    builder.add_node(
+        "search",
+        search,
+        single_flight=SingleFlightPolicy(key_func=lambda state: state["query"]),
+    )
+    builder.add_edge(START, "search")
+    graph = builder.compile()
+
+    coalesced = SINGLE_FLIGHT.coalesced
+    runs = [asyncio.create_task(graph.ainvoke({"query": "a"})) for _ in range(3)]
+    await asyncio.wait_for(started.wait(), 10)
+    # wait for the other runs to join the first one
+    deadline = time.monotonic() + 10
+    while SINGLE_FLIGHT.coalesced < coalesced + 2:
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(*runs)
+
+    assert calls == ["a"]
+    assert results == [{"query": "a", "results": ["A"]}] * 3
+    assert results[0]["results"] is not results[1]["results"]
+
+
+async def test_single_flight_cancel() -> None:
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = 0
+
+    async def search() -> str:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.wait_for(release.wait(), 10)
+        return "result"
+
+    async def wait_for_coalesced(n: int) -> None:
+        deadline = time.monotonic() + 10
+        while single_flight.coalesced < n:
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+
+    # a cancelled follower doesn't affect the leader or the other followers
+    leader = asyncio.create_task(single_flight.arun("key", search))
+    await asyncio.wait_for(started.wait(), 10)
+    followers = [
+        asyncio.create_task(single_flight.arun("key", search)) for _ in range(2)
+    ]
+    await wait_for_coalesced(2)
+    followers[0].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await followers[0]
+    release.set()
+    assert await leader == ("result", False)
+    assert await followers[1] == ("result", True)
+    assert calls == 1
+    assert single_flight.executions == 1
+    assert single_flight.coalesced == 2
+    assert single_flight.calls == {}
+
+    # when the leader is cancelled, a follower runs the call instead
+    started.clear()
+    release.clear()
+    leader = asyncio.create_task(single_flight.arun("key", search))
+    await asyncio.wait_for(started.wait(), 10)
+    follower = asyncio.create_task(single_flight.arun("key", search))
+    await wait_for_coalesced(3)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await follower == ("result", False)
+    assert calls == 3
+    assert single_flight.executions == 3
+    assert single_flight.coalesced == 3
+    assert single_flight.calls == {}
+
+
 @pytest.mark.parametrize("checkpointer_name", ALL_CHECKPOINTERS_ASYNC)
 async def test_invoke_checkpoint(mocker: MockerFixture, checkpointer_name: str) -> None:
     add_one = mocker.Mock(side_effect=lambda x: x["total"] + x["input"])
@@ -1984,6 +2202,8 @@ async def test_invoke_checkpoint_three(
         ]
         assert len(cursored) == 1
         assert cursored[0].config == thread_1_history[1].config
+        with pytest.raises(ValueError, match="page_size must be at least 1"):
+            [c async for c in app.aget_state_history(thread_1, page_size=0)]
         # the last checkpoint
         assert thread_1_history[0].values["total"] == 16
         # the first "loop" checkpoint
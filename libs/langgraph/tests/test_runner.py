@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from langgraph.constants import ERROR, PULL
+from langgraph.errors import GraphDelegate
+from langgraph.pregel.executor import AsyncBackgroundExecutor, BackgroundExecutor
+from langgraph.pregel.runner import PregelRunner
+from langgraph.pregel.types import PregelExecutableTask
+
+pytestmark = pytest.mark.anyio
+
+
+def _task(name: str, func: Callable[[deque], Any]) -> PregelExecutableTask:
+    writes: deque[tuple[str, Any]] = deque()
+    if asyncio.iscoroutinefunction(func):
+
+        async def run(input: Any) -> None:
+            await func(writes)
+
+    else:
+
+        def run(input: Any) -> None:
+            func(writes)
+
+    return PregelExecutableTask(
+        name, None, RunnableLambda(run), writes, {}, [], None, None, name, (PULL, name)
+    )
+
+
+def test_tick_failure_doesnt_stop_others() -> None:
+    failed = threading.Event()
+    error = ValueError("failed")
+
+    def fail(writes: deque) -> None:
+        failed.set()
+        raise error
+
+    def slow(writes: deque) -> None:
+        # still running when the other task failed
+        assert failed.wait(10)
+        time.sleep(0.01)
+        writes.append(("out", 1))
+
+    saved: dict[str, list] = {}
+    with BackgroundExecutor({}) as submit:
+        runner = PregelRunner(
+            submit=submit, put_writes=lambda id, w: saved.setdefault(id, list(w))
+        )
+        for _ in runner.tick([_task("fail", fail), _task("slow", slow)], reraise=False):
+            pass
+
+    # each task is saved, and the failure isn't raised
+    assert saved == {"fail": [(ERROR, error)], "slow": [("out", 1)]}
+
+
+def test_tick_delegate() -> None:
+    delegate = GraphDelegate({"config": {}, "input": 1})
+
+    def delegating(writes: deque) -> None:
+        raise delegate
+
+    def other(writes: deque) -> None:
+        writes.append(("out", 1))
+
+    saved: dict[str, list] = {}
+    delegated: dict[str, GraphDelegate] = {}
+    with BackgroundExecutor({}) as submit:
+        runner = PregelRunner(
+            submit=submit,
+            put_writes=lambda id, w: saved.setdefault(id, list(w)),
+            on_delegate=lambda task, exc: delegated.setdefault(task.name, exc),
+        )
+        tasks = [_task("delegating", delegating), _task("other", other)]
+        for _ in runner.tick(tasks, reraise=False):
+            pass
+
+    # delegated tasks are passed to the callback, and not saved
+    assert delegated == {"delegating": delegate}
+    assert saved == {"other": [("out", 1)]}
+
+    # without a callback, delegating fails the tick
+    with pytest.raises(GraphDelegate), BackgroundExecutor({}) as submit:
+        runner = PregelRunner(submit=submit, put_writes=lambda id, w: None)
+        for _ in runner.tick([_task("delegating", delegating)]):
+            pass
+
+
+async def test_atick_failure_doesnt_stop_others() -> None:
+    failed = asyncio.Event()
+    error = ValueError("failed")
+
+    async def fail(writes: deque) -> None:
+        failed.set()
+        raise error
+
+    async def slow(writes: deque) -> None:
+        await asyncio.wait_for(failed.wait(), 10)
+        await asyncio.sleep(0.01)
+        writes.append(("out", 1))
+
+    saved: dict[str, list] = {}
+    async with AsyncBackgroundExecutor() as submit:
+        runner = PregelRunner(
+            submit=submit, put_writes=lambda id, w: saved.setdefault(id, list(w))
+        )
+        tasks = [_task("fail", fail), _task("slow", slow)]
+        async for _ in runner.atick(tasks, reraise=False):
+            pass
+
+    assert saved == {"fail": [(ERROR, error)], "slow": [("out", 1)]}
+
+
+async def test_atick_delegate() -> None:
+    delegate = GraphDelegate({"config": {}, "input": 1})
+
+    async def delegating(writes: deque) -> None:
+        raise delegate
+
+    async def other(writes: deque) -> None:
+        writes.append(("out", 1))
+
+    saved: dict[str, list] = {}
+    delegated: dict[str, GraphDelegate] = {}
+    async with AsyncBackgroundExecutor() as submit:
+        runner = PregelRunner(
+            submit=submit,
+            put_writes=lambda id, w: saved.setdefault(id, list(w)),
+            on_delegate=lambda task, exc: delegated.setdefault(task.name, exc),
+        )
+        tasks = [_task("delegating", delegating), _task("other", other)]
+        async for _ in runner.atick(tasks, reraise=False):
+            pass
+
+    assert delegated == {"delegating": delegate}
+    assert saved == {"other": [("out", 1)]}
@@ -266,3 +266,71 @@ def test_raises_invalid_managed():
             match="Invalid managed channels detected in BadOutputState: some_output_channel. Managed channels are not permitted in Input/Output schema.",
         ):
             StateGraph(_state, input=_inp, output=_outp)
+
+
+def test_node_writes_only_returned_keys():
+    @dataclass
+    class Update:
+        foo: Optional[str] = None
+        bar: Optional[int] = None
+        other: Optional[str] = None
+
+    class State(TypedDict):
+        foo: str
+        bar: int
+        baz: str
+
+    builder = StateGraph(State)
+    builder.add_node("dict", lambda state: {"foo": "a", "unknown": 1})
+    builder.add_node("obj", lambda state: Update(bar=2, other="b"))
+    builder.add_node("none", lambda state: None)
+    builder.add_edge("__start__", "dict")
+    builder.add_edge("dict", "obj")
+    builder.add_edge("obj", "none")
+    graph = builder.compile()
+
+    writes = [
+        c
+        for c in graph.stream({"baz": "c"}, stream_mode="debug")
+        if c["type"] == "task_result"
+    ]
+    assert [(c["payload"]["name"], c["payload"]["result"]) for c in writes] == [
+        ("dict", [("foo", "a")]),
+        # unset attributes are skipped, as are those not in the state
+        ("obj", [("bar", 2)]),
+        ("none", []),
+    ]
+    assert graph.invoke({"baz": "c"}) == {"foo": "a", "bar": 2, "baz": "c"}
+
+
+def test_node_input_keys():
+    class State(TypedDict):
+        foo: str
+        bar: int
+        baz: str
+
+    @dataclass
+    class DataState:
+        foo: str = ""
+        bar: int = 0
+
+    def read_foo(state: State) -> dict:
+        assert state == {"foo": "a"}
+        return {"bar": 1}
+
+    def read_bar(state: DataState) -> dict:
+        assert state == DataState(bar=1)
+        return {"baz": "b"}
+
+    builder = StateGraph(State)
+    builder.add_node("read_foo", read_foo, input_keys=["foo"])
+    builder.add_node("read_bar", read_bar, input_keys=["bar"])
+    builder.add_edge("__start__", "read_foo")
+    builder.add_edge("read_foo", "read_bar")
+    graph = builder.compile()
+
+    assert graph.nodes["read_foo"].channels == {"foo": "foo"}
+    assert graph.invoke({"foo": "a", "baz": "c"}) == {"foo": "a", "bar": 1, "baz": "b"}
+
+    with pytest.raises(ValueError, match="not in its input schema"):
+        builder.add_node("other", read_foo, input_keys=["qux"])
@@ -1,11 +1,18 @@
 import asyncio
+import importlib
+import sys
+from datetime import datetime, timezone
 from typing import Any, Optional
+from uuid import UUID
 
 import pytest
+from pydantic import BaseModel
 from pytest_mock import MockerFixture
 
 from langgraph.store.base import BaseStore
 from langgraph.store.batch import AsyncBatchedStore
+from langgraph.store.sqlite import SqliteStore
+from tests.conftest import ALL_STORES_ASYNC, ALL_STORES_SYNC, awith_store
 
 pytestmark = pytest.mark.anyio
 
@@ -36,3 +43,147 @@ async def test_async_batch_store(mocker: MockerFixture) -> None:
     assert [c.args for c in alist.call_args_list] == [
         (["a", "b", "c", "d"],),
     ]
+
+
+async def test_async_batch_store_dedupe_and_order(mocker: MockerFixture) -> None:
+    alist = mocker.stub()
+    aput = mocker.stub()
+
+    class MockStore(BaseStore):
+        async def alist(self, prefixes: list[str]) -> dict[str, dict[str, Any]]:
+            alist(prefixes)
+            return {prefix: {prefix: 1} for prefix in prefixes}
+
+        async def aput(self, writes: list[tuple[str, str, Optional[Any]]]) -> None:
+            aput(writes)
+
+    async with AsyncBatchedStore(MockStore(), max_batch_size=4) as store:
+        # no task runs while the store is idle
+        assert store.task is None
+        results = await asyncio.gather(
+            store.alist(["a", "b"]),
+            store.alist(["b"]),
+            store.aput([("a", "x", {"v": 1}), ("a", "y", {"v": 1})]),
+            store.aput([("a", "x", {"v": 2})]),
+            store.alist(["a"]),
+        )
+        assert store.task is None
+
+    assert results == [
+        {"a": {"a": 1}, "b": {"b": 1}},
+        {"b": {"b": 1}},
+        None,
+        None,
+        {"a": {"a": 1}},
+    ]
+    # identical prefixes are listed once, the last put to a key wins,
+    # and operations run in order, at most max_batch_size at a time
+    assert [c.args for c in alist.call_args_list] == [(["a", "b"],), (["a"],)]
+    assert [c.args for c in aput.call_args_list] == [
+        ([("a", "x", {"v": 2}), ("a", "y", {"v": 1})],),
+    ]
+
+    # the store is closed on exit
+    with pytest.raises(RuntimeError, match="closed"):
+        await store.alist(["a"])
+
+
+async def test_async_batch_store_window(mocker: MockerFixture) -> None:
+    alist = mocker.stub()
+
+    class MockStore(BaseStore):
+        async def alist(self, prefixes: list[str]) -> dict[str, dict[str, Any]]:
+            alist(prefixes)
+            return {prefix: {} for prefix in prefixes}
+
+    async with AsyncBatchedStore(MockStore(), batch_window=0.1) as store:
+        first = asyncio.ensure_future(store.alist(["a"]))
+        await asyncio.sleep(0)
+        # operations made within the window are batched
+        await asyncio.gather(first, store.alist(["b"]))
+        # queued operations are run on exit
+        last = asyncio.ensure_future(store.alist(["c"]))
+        await asyncio.sleep(0)
+
+    assert last.result() == {"c": {}}
+    assert [c.args for c in alist.call_args_list] == [(["a", "b"],), (["c"],)]
+
+
+@pytest.mark.parametrize("store_name", ALL_STORES_SYNC)
+def test_store(request: pytest.FixtureRequest, store_name: str) -> None:
+    store: BaseStore = request.getfixturevalue(f"store_{store_name}")
+
+    assert store.list(["a", "b"]) == {"a": {}, "b": {}}
+    store.put(
+        [
+            ("a", "x", {"v": 1}),
+            ("a", "y", {"v": 1}),
+            ("b", "x", {"v": 1}),
+            # the last write to a key wins
+            ("a", "x", {"v": 2}),
+        ]
+    )
+    assert store.list(["a", "b", "c"]) == {
+        "a": {"x": {"v": 2}, "y": {"v": 1}},
+        "b": {"x": {"v": 1}},
+        "c": {},
+    }
+    # None deletes a key
+    store.put([("a", "y", None), ("b", "x", {"v": 3}), ("c", "z", None)])
+    assert store.list(["a", "b", "a"]) == {"a": {"x": {"v": 2}}, "b": {"x": {"v": 3}}}
+
+
+class Document(BaseModel):
+    title: str
+    score: float
+
+
+@pytest.mark.parametrize("store_name", ALL_STORES_SYNC)
+def test_store_values(request: pytest.FixtureRequest, store_name: str) -> None:
+    store: BaseStore = request.getfixturevalue(f"store_{store_name}")
+
+    # values aren't limited to JSON types, as in the memory store
+    value = {
+        "at": datetime(2024, 9, 1, 12, 30, tzinfo=timezone.utc),
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+        "doc": Document(title="a", score=0.5),
+        "tags": ["x", 1],
+    }
+    store.put([("a", "x", value)])
+    assert store.list(["a"]) == {"a": {"x": value}}
+
+
+@pytest.mark.parametrize("store_name", ALL_STORES_ASYNC)
+async def test_store_async(store_name: str) -> None:
+    async with awith_store(store_name) as store:
+        assert await store.alist(["a"]) == {"a": {}}
+        await asyncio.gather(
+            *(store.aput([(f"ns{i}", "x", {"v": i})]) for i in range(20))
+        )
+        await store.aput([("ns0", "y", {"v": 0}), ("ns1", "x", None)])
+        results = await store.alist([f"ns{i}" for i in range(20)])
+        assert results["ns0"] == {"x": {"v": 0}, "y": {"v": 0}}
+        assert results["ns1"] == {}
+        assert results["ns19"] == {"x": {"v": 19}}
+        # sync methods can be called from other threads
+        assert await asyncio.to_thread(store.list, ["ns2"]) == {"ns2": {"x": {"v": 2}}}
+
+
+def test_sqlite_store_persists(tmp_path) -> None:
+    path = str(tmp_path / "store.sqlite")
+    with SqliteStore.from_conn_string(path) as store:
+        store.put([("a", "x", {"v": [1, "2"]})])
+    with SqliteStore.from_conn_string(path) as store:
+        assert store.list(["a"]) == {"a": {"x": {"v": [1, "2"]}}}
+
+
+@pytest.mark.parametrize(
+    "module", ["langgraph.store.postgres", "langgraph.store.postgres.aio"]
+)
+def test_postgres_store_requires_psycopg(
+    monkeypatch: pytest.MonkeyPatch, module: str
+) -> None:
+    monkeypatch.setitem(sys.modules, "psycopg_pool", None)
+    monkeypatch.delitem(sys.modules, module, raising=False)
+    with pytest.raises(ImportError, match=r"pip install gigagraph\[postgres\]"):
+        importlib.import_module(module)
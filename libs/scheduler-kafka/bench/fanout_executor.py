@@ -0,0 +1,227 @@
+import asyncio
+import operator
+import time
+from collections import defaultdict
+from typing import Annotated, Any, NamedTuple, Optional, TypedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import END, START, Send
+from langgraph.graph.state import StateGraph
+from langgraph.pregel import Pregel
+from langgraph.scheduler.kafka import serde
+from langgraph.scheduler.kafka.executor import AsyncKafkaExecutor
+from langgraph.scheduler.kafka.orchestrator import AsyncKafkaOrchestrator
+from langgraph.scheduler.kafka.types import MessageToOrchestrator, Topics
+
+
+class Record(NamedTuple):
+    topic: str
+    partition: int
+    offset: int
+    timestamp: int
+    timestamp_type: int
+    key: Optional[bytes]
+    value: Optional[bytes]
+
+
+class FakeBroker:
+    """In-process stand-in for Kafka, with a single partition per topic."""
+
+    def __init__(self) -> None:
+        self.records: dict[str, list[Record]] = defaultdict(list)
+        self.events: dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        self.committed: dict[str, int] = {}
+
+    def consumer(self, topic: str) -> "FakeAsyncConsumer":
+        return FakeAsyncConsumer(self, topic)
+
+    def producer(self) -> "FakeAsyncProducer":
+        return FakeAsyncProducer(self)
+
+
+class FakeAsyncConsumer:
+    def __init__(self, broker: FakeBroker, topic: str) -> None:
+        self.broker = broker
+        self.topic = topic
+        self.position = 0
+
+    async def getmany(
+        self, timeout_ms: int, max_records: int
+    ) -> dict[str, list[Record]]:
+        records = self.broker.records[self.topic]
+        if self.position == len(records):
+            event = self.broker.events[self.topic]
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                return {}
+        batch = records[self.position : self.position + max_records]
+        self.position += len(batch)
+        return {self.topic: batch}
+
+    async def commit(self, offsets: Optional[dict[str, int]] = None) -> None:
+        if offsets is None:
+            offsets = {self.topic: self.position}
+        self.broker.committed.update(offsets)
+
+
+class FakeAsyncProducer:
+    def __init__(self, broker: FakeBroker) -> None:
+        self.broker = broker
+
+    async def send(
+        self,
+        topic: str,
+        *,
+        key: Optional[bytes] = None,
+        value: Optional[bytes] = None,
+    ) -> asyncio.Future:
+        records = self.broker.records[topic]
+        records.append(Record(topic, 0, len(records), 0, 0, key, value))
+        self.broker.events[topic].set()
+        fut = asyncio.get_running_loop().create_future()
+        fut.set_result(None)
+        return fut
+
+
+class CountingSaver(MemorySaver):
+    """MemorySaver counting the checkpoints loaded. Its async methods run the
+    sync ones in the event loop, as the in-memory dicts aren't safe to use
+    from concurrent threads."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+
+    async def aget_tuple(self, config: Any) -> Any:
+        self.loads += 1
+        return self.get_tuple(config)
+
+    async def aput(self, config: Any, *args: Any) -> Any:
+        return self.put(config, *args)
+
+    async def aput_writes(self, config: Any, *args: Any) -> None:
+        return self.put_writes(config, *args)
+
+
+def fanout(n_tasks: int, checkpointer: MemorySaver) -> Pregel:
+    """Graph sending `n_tasks` tasks to a node, all run in the same step."""
+
+    class State(TypedDict):
+        results: Annotated[list[int], operator.add]
+
+    def start(state: State) -> list[Send]:
+        return [Send("work", i) for i in range(n_tasks)]
+
+    async def work(i: int) -> dict:
+        return {"results": [i * 2]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", work)
+    builder.add_conditional_edges(START, start)
+    builder.add_edge("work", END)
+
+    return builder.compile(checkpointer)
+
+
+async def drain_topics(
+    topics: Topics,
+    graph: Pregel,
+    broker: FakeBroker,
+    batch_max_n: int = 1000,
+    **kwargs: Any,
+) -> None:
+    """Run the orchestrator and executor until both are idle, like
+    `tests.drain.drain_topics_async` but against the fake broker. The executor
+    runs at most `batch_max_n` tasks at a time, and `kwargs` are passed to
+    both."""
+    orch_msgs: list[list] = []
+    exec_msgs: list[list] = []
+    done = asyncio.Event()
+
+    def is_done() -> bool:
+        return (
+            any(orch_msgs)
+            and any(exec_msgs)
+            and not orch_msgs[-1]
+            and not exec_msgs[-1]
+            # and no records are left, as a worker can be idle while the other
+            # is about to send more
+            and all(
+                broker.committed.get(topic) == len(broker.records[topic])
+                for topic in (topics.orchestrator, topics.executor)
+            )
+        )
+
+    async def orchestrator() -> None:
+        async with AsyncKafkaOrchestrator(
+            graph,
+            topics,
+            batch_max_ms=20,
+            consumer=broker.consumer(topics.orchestrator),
+            producer=broker.producer(),
+            **kwargs,
+        ) as orch:
+            async for msgs in orch:
+                orch_msgs.append(msgs)
+                if is_done():
+                    done.set()
+
+    async def executor() -> None:
+        async with AsyncKafkaExecutor(
+            graph,
+            topics,
+            batch_max_n=batch_max_n,
+            batch_max_ms=20,
+            consumer=broker.consumer(topics.executor),
+            producer=broker.producer(),
+            **kwargs,
+        ) as exec:
+            async for msgs in exec:
+                exec_msgs.append(msgs)
+                if is_done():
+                    done.set()
+
+    tasks = [asyncio.create_task(orchestrator()), asyncio.create_task(executor())]
+    waiter = asyncio.create_task(done.wait())
+    try:
+        await asyncio.wait(
+            [waiter, *tasks], timeout=60, return_when=asyncio.FIRST_COMPLETED
+        )
+        # raise the error of the orchestrator or executor, if any
+        for task in tasks:
+            if task.done():
+                task.result()
+        assert done.is_set(), "Timed out"
+    finally:
+        for task in (waiter, *tasks):
+            task.cancel()
+    assert not broker.records[topics.error], broker.records[topics.error]
+
+
+async def run(n_tasks: int, batch_max_n: int = 1000) -> None:
+    topics = Topics(orchestrator="orchestrator", executor="executor", error="error")
+    broker = FakeBroker()
+    checkpointer = CountingSaver()
+    graph = fanout(n_tasks, checkpointer)
+    config = {"configurable": {"thread_id": "1"}}
+    await broker.producer().send(
+        topics.orchestrator,
+        value=serde.dumps(MessageToOrchestrator(input={"results": []}, config=config)),
+    )
+    start = time.perf_counter()
+    await drain_topics(topics, graph, broker, batch_max_n)
+    elapsed = time.perf_counter() - start
+    state = await graph.aget_state(config)
+    assert len(state.values["results"]) == n_tasks
+    print(
+        f"{n_tasks} tasks, {min(n_tasks, batch_max_n)} per executor batch: "
+        f"{elapsed:.2f}s, "
+        f"{checkpointer.loads} checkpoint loads by the executor and orchestrator"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(run(200))
+    asyncio.run(run(200, batch_max_n=10))
@@ -0,0 +1,83 @@
+import asyncio
+import operator
+import time
+from typing import Annotated, Any, TypedDict
+
+from bench.fanout_executor import CountingSaver, FakeBroker, drain_topics
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import END, START, Send
+from langgraph.graph.state import StateGraph
+from langgraph.pregel import Pregel
+from langgraph.scheduler.kafka import serde
+from langgraph.scheduler.kafka.types import MessageToOrchestrator, Topics
+
+
+def skewed(
+    n_tasks: int,
+    checkpointer: MemorySaver,
+    slow_every: int = 20,
+    fast: float = 0.001,
+    slow: float = 0.2,
+) -> Pregel:
+    """Graph sending `n_tasks` tasks to a node, one in `slow_every` of which
+    takes `slow` seconds, and the others `fast` seconds."""
+
+    class State(TypedDict):
+        results: Annotated[list[int], operator.add]
+
+    def start(state: State) -> list[Send]:
+        return [Send("work", i) for i in range(n_tasks)]
+
+    async def work(i: int) -> dict:
+        await asyncio.sleep(slow if i % slow_every == 0 else fast)
+        return {"results": [i]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", work)
+    builder.add_conditional_edges(START, start)
+    builder.add_edge("work", END)
+
+    return builder.compile(checkpointer)
+
+
+async def run(n_tasks: int, label: str, **kwargs: Any) -> None:
+    topics = Topics(orchestrator="orchestrator", executor="executor", error="error")
+    broker = FakeBroker()
+    checkpointer = CountingSaver()
+    graph = skewed(n_tasks, checkpointer)
+    config = {"configurable": {"thread_id": "1"}}
+    await broker.producer().send(
+        topics.orchestrator,
+        value=serde.dumps(MessageToOrchestrator(input={"results": []}, config=config)),
+    )
+    start = time.perf_counter()
+    await drain_topics(topics, graph, broker, **kwargs)
+    elapsed = time.perf_counter() - start
+    state = await graph.aget_state(config)
+    assert len(state.values["results"]) == n_tasks
+    print(
+        f"{label}: {n_tasks / elapsed:.0f} tasks/s ({elapsed:.2f}s), "
+        f"{checkpointer.loads} checkpoint loads"
+    )
+
+
+if __name__ == "__main__":
+    n_tasks = 400
+    asyncio.run(run(n_tasks, "batches of 20", batch_max_n=20))
+    asyncio.run(
+        run(
+            n_tasks,
+            "20 in flight",
+            batch_max_n=20,
+            max_in_flight=20,
+        )
+    )
+    asyncio.run(
+        run(
+            n_tasks,
+            "100 in flight, 20 per partition",
+            batch_max_n=20,
+            max_in_flight=100,
+            max_in_flight_per_partition=20,
+        )
+    )
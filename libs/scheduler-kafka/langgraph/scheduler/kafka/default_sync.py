@@ -1,7 +1,8 @@
 import concurrent.futures
-from typing import Optional, Sequence
+from typing import Mapping, Optional, Sequence
 
 from kafka import KafkaConsumer, KafkaProducer
+from kafka.structs import OffsetAndMetadata
 from langgraph.scheduler.kafka.types import ConsumerRecord, TopicPartition
 
 
@@ -11,6 +12,13 @@ class DefaultConsumer(KafkaConsumer):
     ) -> dict[TopicPartition, Sequence[ConsumerRecord]]:
         return self.poll(timeout_ms=timeout_ms, max_records=max_records)
 
+    def commit(self, offsets: Optional[Mapping[TopicPartition, int]] = None) -> None:
+        if offsets is not None:
+            offsets = {
+                tp: OffsetAndMetadata(offset, None) for tp, offset in offsets.items()
+            }
+        return super().commit(offsets)
+
     def __enter__(self):
         return self
 
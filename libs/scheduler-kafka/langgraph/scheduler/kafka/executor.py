@@ -1,5 +1,6 @@
 import asyncio
 import concurrent.futures
+import threading
 from contextlib import (
     AbstractAsyncContextManager,
     AbstractContextManager,
@@ -7,15 +8,18 @@ from contextlib import (
     ExitStack,
 )
 from functools import partial
-from typing import Any, Optional, Sequence
+from typing import Any, Iterator, Mapping, Optional, Sequence
 
 import orjson
 from langchain_core.runnables import RunnableConfig
 from typing_extensions import Self
 
 import langgraph.scheduler.kafka.serde as serde
+from langgraph.channels.base import BaseChannel
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
 from langgraph.constants import CONFIG_KEY_DELEGATE, ERROR, NS_END, NS_SEP
 from langgraph.errors import CheckpointNotLatest, GraphDelegate, TaskNotFound
+from langgraph.managed.base import ManagedValueMapping
 from langgraph.pregel import Pregel
 from langgraph.pregel.algo import prepare_single_task
 from langgraph.pregel.executor import (
@@ -25,12 +29,13 @@ from langgraph.pregel.executor import (
 )
 from langgraph.pregel.manager import AsyncChannelsManager, ChannelsManager
 from langgraph.pregel.runner import PregelRunner
-from langgraph.pregel.types import RetryPolicy
+from langgraph.pregel.types import PregelExecutableTask, RetryPolicy
 from langgraph.scheduler.kafka.retry import aretry, retry
 from langgraph.scheduler.kafka.types import (
     AsyncConsumer,
     AsyncProducer,
     Consumer,
+    ConsumerRecord,
     ErrorMessage,
     MessageToExecutor,
     MessageToOrchestrator,
@@ -38,6 +43,12 @@ from langgraph.scheduler.kafka.types import (
     Sendable,
     Topics,
 )
+from langgraph.scheduler.kafka.window import (
+    AsyncInFlightWindow,
+    AsyncUnit,
+    InFlightWindow,
+    Unit,
+)
 from langgraph.utils.config import patch_configurable
 
 
@@ -53,6 +64,8 @@ class AsyncKafkaExecutor(AbstractAsyncContextManager):
         *,
         batch_max_n: int = 10,
         batch_max_ms: int = 1000,
+        max_in_flight: Optional[int] = None,
+        max_in_flight_per_partition: Optional[int] = None,
         retry_policy: Optional[RetryPolicy] = None,
         consumer: Optional[AsyncConsumer] = None,
         producer: Optional[AsyncProducer] = None,
@@ -66,7 +79,10 @@ class AsyncKafkaExecutor(AbstractAsyncContextManager):
         self.producer = producer
         self.batch_max_n = batch_max_n
         self.batch_max_ms = batch_max_ms
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_partition = max_in_flight_per_partition
         self.retry_policy = retry_policy
+        self.loading: dict[tuple[str, str, str], asyncio.Future] = {}
 
     async def __aenter__(self) -> Self:
         self.subgraphs = {
@@ -92,6 +108,16 @@ class AsyncKafkaExecutor(AbstractAsyncContextManager):
                     **self.kwargs,
                 )
             )
+        if self.max_in_flight is not None:
+            self.window: AsyncInFlightWindow[MessageToExecutor] = AsyncInFlightWindow(
+                self.consumer,
+                self._split,
+                max_in_flight=self.max_in_flight,
+                max_in_flight_per_partition=self.max_in_flight_per_partition,
+                batch_max_n=self.batch_max_n,
+                batch_max_ms=self.batch_max_ms,
+            )
+            self.stack.push_async_callback(self.window.aclose)
         return self
 
     async def __aexit__(self, *args: Any) -> None:
@@ -101,131 +127,113 @@ class AsyncKafkaExecutor(AbstractAsyncContextManager):
         return self
 
     async def __anext__(self) -> Sequence[MessageToExecutor]:
+        if self.max_in_flight is not None:
+            # wait for the next messages to finish, while processing others
+            return await self.window.next()
         # wait for next batch
         recs = await self.consumer.getmany(
             timeout_ms=self.batch_max_ms, max_records=self.batch_max_n
         )
-        msgs: list[MessageToExecutor] = [
-            serde.loads(msg.value) for msgs in recs.values() for msg in msgs
-        ]
-        # process batch
-        await asyncio.gather(*(self.each(msg) for msg in msgs))
+        groups = _group_by_checkpoint([rec for recs in recs.values() for rec in recs])
+        # process batch, loading each checkpoint once for all its tasks
+        await asyncio.gather(*(self.each(msgs) for _, msgs in groups))
         # commit offsets
         await self.consumer.commit()
         # return message
-        return msgs
+        return [msg for _, msgs in groups for msg in msgs]
 
-    async def each(self, msg: MessageToExecutor) -> None:
+    def _split(
+        self, recs: Sequence[ConsumerRecord]
+    ) -> Iterator[AsyncUnit[MessageToExecutor]]:
+        # run each task on its own, so that it doesn't wait for the others,
+        # while tasks started together still share the checkpoint load
+        for rec in recs:
+            msg: MessageToExecutor = serde.loads(rec.value)
+            yield [rec], [msg], self.each([msg])
+
+    async def each(self, msgs: Sequence[MessageToExecutor]) -> None:
         try:
-            await aretry(self.retry_policy, self.attempt, msg)
+            await aretry(self.retry_policy, self.attempt, msgs)
         except CheckpointNotLatest:
             pass
-        except GraphDelegate as exc:
-            for arg in exc.args:
-                fut = await self.producer.send(
-                    self.topics.orchestrator,
-                    value=serde.dumps(
-                        MessageToOrchestrator(
-                            config=arg["config"],
-                            input=orjson.Fragment(
-                                self.graph.checkpointer.serde.dumps(arg["input"])
-                            ),
-                            finally_send=[
-                                Sendable(topic=self.topics.executor, value=msg)
-                            ],
-                        )
-                    ),
-                    # use thread_id, checkpoint_ns as partition key
-                    key=serde.dumps(
-                        (
-                            arg["config"]["configurable"]["thread_id"],
-                            arg["config"]["configurable"].get("checkpoint_ns"),
-                        )
-                    ),
-                )
-                await fut
         except Exception as exc:
-            fut = await self.producer.send(
-                self.topics.error,
-                value=serde.dumps(
-                    ErrorMessage(
-                        topic=self.topics.executor,
-                        msg=msg,
-                        error=repr(exc),
+            futs = await asyncio.gather(
+                *(
+                    self.producer.send(
+                        self.topics.error,
+                        value=serde.dumps(
+                            ErrorMessage(
+                                topic=self.topics.executor,
+                                msg=msg,
+                                error=repr(exc),
+                            )
+                        ),
                     )
-                ),
-            )
-            await fut
-
-    async def attempt(self, msg: MessageToExecutor) -> None:
-        # find graph
-        if checkpoint_ns := msg["config"]["configurable"].get("checkpoint_ns"):
-            # remove task_ids from checkpoint_ns
-            recast_checkpoint_ns = NS_SEP.join(
-                part.split(NS_END)[0] for part in checkpoint_ns.split(NS_SEP)
+                    for msg in msgs
+                )
             )
-            # find the subgraph with the matching name
-            if recast_checkpoint_ns in self.subgraphs:
-                graph = self.subgraphs[recast_checkpoint_ns]
-            else:
-                raise ValueError(f"Subgraph {recast_checkpoint_ns} not found")
-        else:
-            graph = self.graph
-        # process message
-        saved = await self.graph.checkpointer.aget_tuple(
-            patch_configurable(msg["config"], {"checkpoint_id": None})
-        )
+            await asyncio.gather(*futs)
+
+    async def attempt(self, msgs: Sequence[MessageToExecutor]) -> None:
+        # all messages are for tasks of the same checkpoint
+        config = msgs[0]["config"]
+        graph = _find_graph(self.graph, self.subgraphs, config)
+        # process messages
+        saved = await self._aget_latest(config)
         if saved is None:
             raise RuntimeError("Checkpoint not found")
-        if saved.checkpoint["id"] != msg["config"]["configurable"]["checkpoint_id"]:
+        if saved.checkpoint["id"] != config["configurable"]["checkpoint_id"]:
             raise CheckpointNotLatest()
+        delegated: dict[str, GraphDelegate] = {}
         async with AsyncChannelsManager(
-            graph.channels, saved.checkpoint, msg["config"], self.graph.store
+            graph.channels, saved.checkpoint, config, self.graph.store
         ) as (channels, managed), AsyncBackgroundExecutor() as submit:
-            if task := await asyncio.to_thread(
-                prepare_single_task,
-                msg["task"]["path"],
-                msg["task"]["id"],
-                checkpoint=saved.checkpoint,
-                processes=graph.nodes,
-                channels=channels,
-                managed=managed,
-                config=patch_configurable(msg["config"], {CONFIG_KEY_DELEGATE: True}),
-                step=saved.metadata["step"] + 1,
-                for_execution=True,
-                checkpointer=self.graph.checkpointer,
-            ):
-                # execute task, saving writes
+            tasks, not_found = await asyncio.to_thread(
+                _prepare_tasks,
+                msgs,
+                saved,
+                graph,
+                channels,
+                managed,
+                self.graph.checkpointer,
+            )
+            if tasks:
+                # execute tasks, saving writes
                 runner = PregelRunner(
                     submit=submit,
-                    put_writes=partial(self._put_writes, submit, msg["config"]),
+                    put_writes=partial(self._put_writes, submit, config),
+                    on_delegate=lambda task, exc: delegated.setdefault(task.id, exc),
                 )
-                async for _ in runner.atick([task], reraise=False):
+                async for _ in runner.atick(tasks, reraise=False):
                     pass
-            else:
+            for msg in not_found:
                 # task was not found
                 await self.graph.checkpointer.aput_writes(
-                    msg["config"], [(ERROR, TaskNotFound())]
-                )
-        # notify orchestrator
-        fut = await self.producer.send(
-            self.topics.orchestrator,
-            value=serde.dumps(
-                MessageToOrchestrator(
-                    input=None,
-                    config=msg["config"],
-                    finally_send=msg.get("finally_send"),
+                    msg["config"], [(ERROR, TaskNotFound())], msg["task"]["id"]
                 )
-            ),
-            # use thread_id, checkpoint_ns as partition key
-            key=serde.dumps(
-                (
-                    msg["config"]["configurable"]["thread_id"],
-                    msg["config"]["configurable"].get("checkpoint_ns"),
+        # notify orchestrator, or have it run the delegated subgraphs first
+        futs = await asyncio.gather(
+            *(
+                self.producer.send(self.topics.orchestrator, value=value, key=key)
+                for msg in msgs
+                for value, key in _orchestrator_messages(
+                    self.graph, self.topics, msg, delegated.get(msg["task"]["id"])
                 )
-            ),
+            )
         )
-        await fut
+        await asyncio.gather(*futs)
+
+    def _aget_latest(self, config: RunnableConfig) -> asyncio.Future:
+        # concurrent attempts for the same checkpoint share one load
+        key = _checkpoint_key(config)
+        if (fut := self.loading.get(key)) is None:
+            fut = self.loading[key] = asyncio.ensure_future(
+                self.graph.checkpointer.aget_tuple(
+                    patch_configurable(config, {"checkpoint_id": None})
+                )
+            )
+            fut.add_done_callback(lambda _: self.loading.pop(key, None))
+        return asyncio.shield(fut)
 
     def _put_writes(
         self,
@@ -249,6 +257,8 @@ class KafkaExecutor(AbstractContextManager):
         *,
         batch_max_n: int = 10,
         batch_max_ms: int = 1000,
+        max_in_flight: Optional[int] = None,
+        max_in_flight_per_partition: Optional[int] = None,
         retry_policy: Optional[RetryPolicy] = None,
         consumer: Optional[Consumer] = None,
         producer: Optional[Producer] = None,
@@ -262,7 +272,11 @@ class KafkaExecutor(AbstractContextManager):
         self.producer = producer
         self.batch_max_n = batch_max_n
         self.batch_max_ms = batch_max_ms
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_partition = max_in_flight_per_partition
         self.retry_policy = retry_policy
+        self.loading: dict[tuple[str, str, str], concurrent.futures.Future] = {}
+        self.lock = threading.Lock()
 
     def __enter__(self) -> Self:
         self.subgraphs = dict(self.graph.get_subgraphs(recurse=True))
@@ -287,6 +301,17 @@ class KafkaExecutor(AbstractContextManager):
                     **self.kwargs,
                 )
             )
+        if self.max_in_flight is not None:
+            self.window: InFlightWindow[MessageToExecutor] = InFlightWindow(
+                self.consumer,
+                self.submit,
+                self._split,
+                max_in_flight=self.max_in_flight,
+                max_in_flight_per_partition=self.max_in_flight_per_partition,
+                batch_max_n=self.batch_max_n,
+                batch_max_ms=self.batch_max_ms,
+            )
+            self.stack.callback(self.window.close)
         return self
 
     def __exit__(self, *args: Any) -> None:
@@ -296,130 +321,114 @@ class KafkaExecutor(AbstractContextManager):
         return self
 
     def __next__(self) -> Sequence[MessageToExecutor]:
+        if self.max_in_flight is not None:
+            # wait for the next messages to finish, while processing others
+            return self.window.next()
         # wait for next batch
         recs = self.consumer.getmany(
             timeout_ms=self.batch_max_ms, max_records=self.batch_max_n
         )
-        msgs: list[MessageToExecutor] = [
-            serde.loads(msg.value) for msgs in recs.values() for msg in msgs
-        ]
-        # process batch
-        concurrent.futures.wait(self.submit(self.each, msg) for msg in msgs)
+        groups = _group_by_checkpoint([rec for recs in recs.values() for rec in recs])
+        # process batch, loading each checkpoint once for all its tasks
+        concurrent.futures.wait(self.submit(self.each, msgs) for _, msgs in groups)
         # commit offsets
         self.consumer.commit()
         # return message
-        return msgs
+        return [msg for _, msgs in groups for msg in msgs]
+
+    def _split(
+        self, recs: Sequence[ConsumerRecord]
+    ) -> Iterator[Unit[MessageToExecutor]]:
+        # run each task on its own, so that it doesn't wait for the others,
+        # while tasks started together still share the checkpoint load
+        for rec in recs:
+            msg: MessageToExecutor = serde.loads(rec.value)
+            yield [rec], [msg], partial(self.each, [msg])
 
-    def each(self, msg: MessageToExecutor) -> None:
+    def each(self, msgs: Sequence[MessageToExecutor]) -> None:
         try:
-            retry(self.retry_policy, self.attempt, msg)
+            retry(self.retry_policy, self.attempt, msgs)
         except CheckpointNotLatest:
             pass
-        except GraphDelegate as exc:
-            for arg in exc.args:
-                fut = self.producer.send(
-                    self.topics.orchestrator,
+        except Exception as exc:
+            futs = [
+                self.producer.send(
+                    self.topics.error,
                     value=serde.dumps(
-                        MessageToOrchestrator(
-                            config=arg["config"],
-                            input=orjson.Fragment(
-                                self.graph.checkpointer.serde.dumps(arg["input"])
-                            ),
-                            finally_send=[
-                                Sendable(topic=self.topics.executor, value=msg)
-                            ],
-                        )
-                    ),
-                    # use thread_id, checkpoint_ns as partition key
-                    key=serde.dumps(
-                        (
-                            arg["config"]["configurable"]["thread_id"],
-                            arg["config"]["configurable"].get("checkpoint_ns"),
+                        ErrorMessage(
+                            topic=self.topics.executor,
+                            msg=msg,
+                            error=repr(exc),
                         )
                     ),
                 )
+                for msg in msgs
+            ]
+            for fut in futs:
                 fut.result()
-        except Exception as exc:
-            fut = self.producer.send(
-                self.topics.error,
-                value=serde.dumps(
-                    ErrorMessage(
-                        topic=self.topics.executor,
-                        msg=msg,
-                        error=repr(exc),
-                    )
-                ),
-            )
-            fut.result()
 
-    def attempt(self, msg: MessageToExecutor) -> None:
-        # find graph
-        if checkpoint_ns := msg["config"]["configurable"].get("checkpoint_ns"):
-            # remove task_ids from checkpoint_ns
-            recast_checkpoint_ns = NS_SEP.join(
-                part.split(NS_END)[0] for part in checkpoint_ns.split(NS_SEP)
-            )
-            # find the subgraph with the matching name
-            if recast_checkpoint_ns in self.subgraphs:
-                graph = self.subgraphs[recast_checkpoint_ns]
-            else:
-                raise ValueError(f"Subgraph {recast_checkpoint_ns} not found")
-        else:
-            graph = self.graph
-        # process message
-        saved = self.graph.checkpointer.get_tuple(
-            patch_configurable(msg["config"], {"checkpoint_id": None})
-        )
+    def attempt(self, msgs: Sequence[MessageToExecutor]) -> None:
+        # all messages are for tasks of the same checkpoint
+        config = msgs[0]["config"]
+        graph = _find_graph(self.graph, self.subgraphs, config)
+        # process messages
+        saved = self._get_latest(config)
         if saved is None:
             raise RuntimeError("Checkpoint not found")
-        if saved.checkpoint["id"] != msg["config"]["configurable"]["checkpoint_id"]:
+        if saved.checkpoint["id"] != config["configurable"]["checkpoint_id"]:
             raise CheckpointNotLatest()
+        delegated: dict[str, GraphDelegate] = {}
         with ChannelsManager(
-            graph.channels, saved.checkpoint, msg["config"], self.graph.store
+            graph.channels, saved.checkpoint, config, self.graph.store
         ) as (channels, managed), BackgroundExecutor({}) as submit:
-            if task := prepare_single_task(
-                msg["task"]["path"],
-                msg["task"]["id"],
-                checkpoint=saved.checkpoint,
-                processes=graph.nodes,
-                channels=channels,
-                managed=managed,
-                config=patch_configurable(msg["config"], {CONFIG_KEY_DELEGATE: True}),
-                step=saved.metadata["step"] + 1,
-                for_execution=True,
-                checkpointer=self.graph.checkpointer,
-            ):
-                # execute task, saving writes
+            tasks, not_found = _prepare_tasks(
+                msgs, saved, graph, channels, managed, self.graph.checkpointer
+            )
+            if tasks:
+                # execute tasks, saving writes
                 runner = PregelRunner(
                     submit=submit,
-                    put_writes=partial(self._put_writes, submit, msg["config"]),
+                    put_writes=partial(self._put_writes, submit, config),
+                    on_delegate=lambda task, exc: delegated.setdefault(task.id, exc),
                 )
-                for _ in runner.tick([task], reraise=False):
+                for _ in runner.tick(tasks, reraise=False):
                     pass
-            else:
+            for msg in not_found:
                 # task was not found
                 self.graph.checkpointer.put_writes(
-                    msg["config"], [(ERROR, TaskNotFound())]
+                    msg["config"], [(ERROR, TaskNotFound())], msg["task"]["id"]
                 )
-        # notify orchestrator
-        fut = self.producer.send(
-            self.topics.orchestrator,
-            value=serde.dumps(
-                MessageToOrchestrator(
-                    input=None,
-                    config=msg["config"],
-                    finally_send=msg.get("finally_send"),
-                )
-            ),
-            # use thread_id, checkpoint_ns as partition key
-            key=serde.dumps(
-                (
-                    msg["config"]["configurable"]["thread_id"],
-                    msg["config"]["configurable"].get("checkpoint_ns"),
+        # notify orchestrator, or have it run the delegated subgraphs first
+        futs = [
+            self.producer.send(self.topics.orchestrator, value=value, key=key)
+            for msg in msgs
+            for value, key in _orchestrator_messages(
+                self.graph, self.topics, msg, delegated.get(msg["task"]["id"])
+            )
+        ]
+        for fut in futs:
+            fut.result()
+
+    def _get_latest(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        # concurrent attempts for the same checkpoint share one load
+        key = _checkpoint_key(config)
+        with self.lock:
+            if loading := key not in self.loading:
+                self.loading[key] = concurrent.futures.Future()
+            fut = self.loading[key]
+        if loading:
+            try:
+                fut.set_result(
+                    self.graph.checkpointer.get_tuple(
+                        patch_configurable(config, {"checkpoint_id": None})
+                    )
                 )
-            ),
-        )
-        fut.result()
+            except BaseException as exc:
+                fut.set_exception(exc)
+            finally:
+                with self.lock:
+                    del self.loading[key]
+        return fut.result()
 
     def _put_writes(
         self,
@@ -429,3 +438,123 @@ class KafkaExecutor(AbstractContextManager):
         writes: list[tuple[str, Any]],
     ) -> None:
         return submit(self.graph.checkpointer.put_writes, config, writes, task_id)
+
+
+def _group_by_checkpoint(
+    recs: Sequence[ConsumerRecord],
+) -> list[tuple[list[ConsumerRecord], list[MessageToExecutor]]]:
+    """Group records and their messages by the checkpoint their tasks belong
+    to, in order."""
+    groups: dict[
+        tuple[str, str, str], tuple[list[ConsumerRecord], list[MessageToExecutor]]
+    ] = {}
+    for rec in recs:
+        msg: MessageToExecutor = serde.loads(rec.value)
+        group, msgs = groups.setdefault(_checkpoint_key(msg["config"]), ([], []))
+        group.append(rec)
+        msgs.append(msg)
+    return list(groups.values())
+
+
+def _checkpoint_key(config: RunnableConfig) -> tuple[str, str, str]:
+    configurable = config["configurable"]
+    return (
+        configurable["thread_id"],
+        configurable.get("checkpoint_ns", ""),
+        configurable["checkpoint_id"],
+    )
+
+
+def _find_graph(
+    graph: Pregel, subgraphs: dict[str, Pregel], config: RunnableConfig
+) -> Pregel:
+    if checkpoint_ns := config["configurable"].get("checkpoint_ns"):
+        # remove task_ids from checkpoint_ns
+        recast_checkpoint_ns = NS_SEP.join(
+            part.split(NS_END)[0] for part in checkpoint_ns.split(NS_SEP)
+        )
+        # find the subgraph with the matching name
+        if recast_checkpoint_ns in subgraphs:
+            return subgraphs[recast_checkpoint_ns]
+        else:
+            raise ValueError(f"Subgraph {recast_checkpoint_ns} not found")
+    else:
+        return graph
+
+
+def _prepare_tasks(
+    msgs: Sequence[MessageToExecutor],
+    saved: CheckpointTuple,
+    graph: Pregel,
+    channels: Mapping[str, BaseChannel],
+    managed: ManagedValueMapping,
+    checkpointer: BaseCheckpointSaver,
+) -> tuple[list[PregelExecutableTask], list[MessageToExecutor]]:
+    """Prepare the tasks of the messages for execution, from the checkpoint
+    and channels they share. Return the tasks, and the messages whose task was
+    not found."""
+    tasks: dict[str, PregelExecutableTask] = {}
+    not_found: list[MessageToExecutor] = []
+    for msg in msgs:
+        if msg["task"]["id"] in tasks:
+            # the same task is only run once
+            continue
+        if task := prepare_single_task(
+            msg["task"]["path"],
+            msg["task"]["id"],
+            checkpoint=saved.checkpoint,
+            processes=graph.nodes,
+            channels=channels,
+            managed=managed,
+            config=patch_configurable(msg["config"], {CONFIG_KEY_DELEGATE: True}),
+            step=saved.metadata["step"] + 1,
+            for_execution=True,
+            checkpointer=checkpointer,
+        ):
+            tasks[task.id] = task
+        else:
+            not_found.append(msg)
+    return list(tasks.values()), not_found
+
+
+def _orchestrator_messages(
+    graph: Pregel,
+    topics: Topics,
+    msg: MessageToExecutor,
+    delegate: Optional[GraphDelegate],
+) -> list[tuple[bytes, bytes]]:
+    """Return the values and keys of the messages to send to the orchestrator
+    once the task of the message ran. If the task delegated subgraphs, the
+    orchestrator runs them first, and then sends the message back to the
+    executor."""
+    if delegate is None:
+        # notify orchestrator
+        msgs = [
+            MessageToOrchestrator(
+                input=None,
+                config=msg["config"],
+                finally_send=msg.get("finally_send"),
+            )
+        ]
+    else:
+        msgs = [
+            MessageToOrchestrator(
+                config=arg["config"],
+                input=orjson.Fragment(graph.checkpointer.serde.dumps(arg["input"])),
+                finally_send=[Sendable(topic=topics.executor, value=msg)],
+            )
+            for arg in delegate.args
+        ]
+    return [
+        (
+            serde.dumps(m),
+            # use thread_id, checkpoint_ns as partition key
+            serde.dumps(
+                (
+                    m["config"]["configurable"]["thread_id"],
+                    m["config"]["configurable"].get("checkpoint_ns"),
+                )
+            ),
+        )
+        for m in msgs
+    ]
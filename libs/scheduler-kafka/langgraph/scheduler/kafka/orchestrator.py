@@ -6,22 +6,28 @@ from contextlib import (
     AsyncExitStack,
     ExitStack,
 )
-from typing import Any, Optional
+from functools import partial
+from typing import Any, Iterator, Optional, Sequence
 
-from langchain_core.runnables import ensure_config
+from langchain_core.runnables import RunnableConfig, ensure_config
 from typing_extensions import Self
 
 import langgraph.scheduler.kafka.serde as serde
+from langgraph.checkpoint.base import CheckpointTuple, copy_checkpoint
 from langgraph.constants import (
     CONFIG_KEY_DEDUPE_TASKS,
     CONFIG_KEY_ENSURE_LATEST,
-    INTERRUPT,
     NS_END,
     NS_SEP,
     SCHEDULED,
 )
 from langgraph.errors import CheckpointNotLatest, GraphInterrupt
 from langgraph.pregel import Pregel
+from langgraph.pregel.algo import (
+    pending_task_writes,
+    resume_checkpoint,
+    scheduled_version,
+)
 from langgraph.pregel.executor import BackgroundExecutor, Submit
 from langgraph.pregel.loop import AsyncPregelLoop, SyncPregelLoop
 from langgraph.pregel.types import RetryPolicy
@@ -30,13 +36,21 @@ from langgraph.scheduler.kafka.types import (
     AsyncConsumer,
     AsyncProducer,
     Consumer,
+    ConsumerRecord,
     ErrorMessage,
     ExecutorTask,
     MessageToExecutor,
     MessageToOrchestrator,
     Producer,
+    Sendable,
     Topics,
 )
+from langgraph.scheduler.kafka.window import (
+    AsyncInFlightWindow,
+    AsyncUnit,
+    InFlightWindow,
+    Unit,
+)
 from langgraph.utils.config import patch_configurable
 
 
@@ -51,6 +65,8 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
         topics: Topics,
         batch_max_n: int = 10,
         batch_max_ms: int = 1000,
+        max_in_flight: Optional[int] = None,
+        max_in_flight_per_partition: Optional[int] = None,
         retry_policy: Optional[RetryPolicy] = None,
         consumer: Optional[AsyncConsumer] = None,
         producer: Optional[AsyncProducer] = None,
@@ -64,7 +80,12 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
         self.producer = producer
         self.batch_max_n = batch_max_n
         self.batch_max_ms = batch_max_ms
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_partition = max_in_flight_per_partition
         self.retry_policy = retry_policy
+        # messages of the records fetched by the window, deserialized once
+        # to find their thread, until they are started
+        self.loaded: dict[tuple[str, int, int], MessageToOrchestrator] = {}
 
     async def __aenter__(self) -> Self:
         self.subgraphs = {
@@ -90,6 +111,19 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
                     **self.kwargs,
                 )
             )
+        if self.max_in_flight is not None:
+            self.window: AsyncInFlightWindow[MessageToOrchestrator] = (
+                AsyncInFlightWindow(
+                    self.consumer,
+                    self._split,
+                    max_in_flight=self.max_in_flight,
+                    max_in_flight_per_partition=self.max_in_flight_per_partition,
+                    batch_max_n=self.batch_max_n,
+                    batch_max_ms=self.batch_max_ms,
+                    key=self._record_thread_key,
+                )
+            )
+            self.stack.push_async_callback(self.window.aclose)
         return self
 
     async def __aexit__(self, *args: Any) -> None:
@@ -99,19 +133,39 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
         return self
 
     async def __anext__(self) -> list[MessageToOrchestrator]:
+        if self.max_in_flight is not None:
+            # wait for the next messages to finish, while processing others
+            return await self.window.next()
         # wait for next batch
         recs = await self.consumer.getmany(
             timeout_ms=self.batch_max_ms, max_records=self.batch_max_n
         )
         # dedupe messages, eg. if multiple nodes finish around same time
-        uniq = set(msg.value for msgs in recs.values() for msg in msgs)
-        msgs: list[MessageToOrchestrator] = [serde.loads(msg) for msg in uniq]
-        # process batch
-        await asyncio.gather(*(self.each(msg) for msg in msgs))
+        groups = _group_by_thread([rec for recs in recs.values() for rec in recs])
+        # process batch, ticking each thread once for the tasks that finished
+        await asyncio.gather(*(self.each(_merge(msgs)) for _, msgs in groups))
         # commit offsets
         await self.consumer.commit()
         # return message
-        return msgs
+        return [msg for _, msgs in groups for msg in msgs]
+
+    def _record_thread_key(self, rec: ConsumerRecord) -> tuple[str, Optional[str]]:
+        msg: MessageToOrchestrator = serde.loads(rec.value)
+        self.loaded[(rec.topic, rec.partition, rec.offset)] = msg
+        return _thread_key(msg)
+
+    def _split(
+        self, recs: Sequence[ConsumerRecord]
+    ) -> Iterator[AsyncUnit[MessageToOrchestrator]]:
+        # tick each thread once for the tasks that finished, the messages of a
+        # thread being processed in order by a single unit, as the window
+        # starts no other for the thread until it's done
+        for group, msgs, merged in _group_units_by_thread(recs, self.loaded):
+            yield group, msgs, self._each_in_order(merged)
+
+    async def _each_in_order(self, msgs: list[MessageToOrchestrator]) -> None:
+        for msg in msgs:
+            await self.each(msg)
 
     async def each(self, msg: MessageToOrchestrator) -> None:
         try:
@@ -147,6 +201,20 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
                 raise ValueError(f"Subgraph {recast_checkpoint_ns} not found")
         else:
             graph = self.graph
+        # a finished task only resumes the graph once no others are running
+        saved: Optional[CheckpointTuple] = None
+        if msg.get("input") is None and _ensures_latest(msg["config"]):
+            saved = await self.graph.checkpointer.aget_tuple(
+                patch_configurable(msg["config"], {"checkpoint_id": None})
+            )
+            if (
+                saved is None
+                or saved.checkpoint["id"]
+                != msg["config"]["configurable"]["checkpoint_id"]
+            ):
+                raise CheckpointNotLatest()
+            if _tasks_in_flight(saved, graph):
+                return
         # process message
         async with AsyncPregelLoop(
             msg["input"],
@@ -158,6 +226,8 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
             specs=graph.channels,
             output_keys=graph.output_channels,
             stream_keys=graph.stream_channels,
+            trigger_to_nodes=graph.trigger_to_nodes,
+            checkpoint_tuple=saved,
         ) as loop:
             if loop.tick(
                 input_keys=graph.input_channels,
@@ -203,12 +273,7 @@ class AsyncKafkaOrchestrator(AbstractAsyncContextManager):
                             [
                                 (
                                     SCHEDULED,
-                                    max(
-                                        loop.checkpoint["versions_seen"]
-                                        .get(INTERRUPT, {})
-                                        .values(),
-                                        default=None,
-                                    ),
+                                    scheduled_version(loop.checkpoint),
                                 )
                             ],
                         )
@@ -241,6 +306,8 @@ class KafkaOrchestrator(AbstractContextManager):
         topics: Topics,
         batch_max_n: int = 10,
         batch_max_ms: int = 1000,
+        max_in_flight: Optional[int] = None,
+        max_in_flight_per_partition: Optional[int] = None,
         retry_policy: Optional[RetryPolicy] = None,
         consumer: Optional[Consumer] = None,
         producer: Optional[Producer] = None,
@@ -254,7 +321,12 @@ class KafkaOrchestrator(AbstractContextManager):
         self.producer = producer
         self.batch_max_n = batch_max_n
         self.batch_max_ms = batch_max_ms
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_partition = max_in_flight_per_partition
         self.retry_policy = retry_policy
+        # messages of the records fetched by the window, deserialized once
+        # to find their thread, until they are started
+        self.loaded: dict[tuple[str, int, int], MessageToOrchestrator] = {}
 
     def __enter__(self) -> Self:
         self.subgraphs = dict(self.graph.get_subgraphs(recurse=True))
@@ -279,6 +351,18 @@ class KafkaOrchestrator(AbstractContextManager):
                     **self.kwargs,
                 )
             )
+        if self.max_in_flight is not None:
+            self.window: InFlightWindow[MessageToOrchestrator] = InFlightWindow(
+                self.consumer,
+                self.submit,
+                self._split,
+                max_in_flight=self.max_in_flight,
+                max_in_flight_per_partition=self.max_in_flight_per_partition,
+                batch_max_n=self.batch_max_n,
+                batch_max_ms=self.batch_max_ms,
+                key=self._record_thread_key,
+            )
+            self.stack.callback(self.window.close)
         return self
 
     def __exit__(self, *args: Any) -> None:
@@ -288,19 +372,41 @@ class KafkaOrchestrator(AbstractContextManager):
         return self
 
     def __next__(self) -> list[MessageToOrchestrator]:
+        if self.max_in_flight is not None:
+            # wait for the next messages to finish, while processing others
+            return self.window.next()
         # wait for next batch
         recs = self.consumer.getmany(
             timeout_ms=self.batch_max_ms, max_records=self.batch_max_n
         )
         # dedupe messages, eg. if multiple nodes finish around same time
-        uniq = set(msg.value for msgs in recs.values() for msg in msgs)
-        msgs: list[MessageToOrchestrator] = [serde.loads(msg) for msg in uniq]
-        # process batch
-        concurrent.futures.wait(self.submit(self.each, msg) for msg in msgs)
+        groups = _group_by_thread([rec for recs in recs.values() for rec in recs])
+        # process batch, ticking each thread once for the tasks that finished
+        concurrent.futures.wait(
+            self.submit(self.each, _merge(msgs)) for _, msgs in groups
+        )
         # commit offsets
         self.consumer.commit()
         # return message
-        return msgs
+        return [msg for _, msgs in groups for msg in msgs]
+
+    def _record_thread_key(self, rec: ConsumerRecord) -> tuple[str, Optional[str]]:
+        msg: MessageToOrchestrator = serde.loads(rec.value)
+        self.loaded[(rec.topic, rec.partition, rec.offset)] = msg
+        return _thread_key(msg)
+
+    def _split(
+        self, recs: Sequence[ConsumerRecord]
+    ) -> Iterator[Unit[MessageToOrchestrator]]:
+        # tick each thread once for the tasks that finished, the messages of a
+        # thread being processed in order by a single unit, as the window
+        # starts no other for the thread until it's done
+        for group, msgs, merged in _group_units_by_thread(recs, self.loaded):
+            yield group, msgs, partial(self._each_in_order, merged)
+
+    def _each_in_order(self, msgs: list[MessageToOrchestrator]) -> None:
+        for msg in msgs:
+            self.each(msg)
 
     def each(self, msg: MessageToOrchestrator) -> None:
         try:
@@ -336,6 +442,20 @@ class KafkaOrchestrator(AbstractContextManager):
                 raise ValueError(f"Subgraph {recast_checkpoint_ns} not found")
         else:
             graph = self.graph
+        # a finished task only resumes the graph once no others are running
+        saved: Optional[CheckpointTuple] = None
+        if msg.get("input") is None and _ensures_latest(msg["config"]):
+            saved = self.graph.checkpointer.get_tuple(
+                patch_configurable(msg["config"], {"checkpoint_id": None})
+            )
+            if (
+                saved is None
+                or saved.checkpoint["id"]
+                != msg["config"]["configurable"]["checkpoint_id"]
+            ):
+                raise CheckpointNotLatest()
+            if _tasks_in_flight(saved, graph):
+                return
         # process message
         with SyncPregelLoop(
             msg["input"],
@@ -347,6 +467,8 @@ class KafkaOrchestrator(AbstractContextManager):
             specs=graph.channels,
             output_keys=graph.output_channels,
             stream_keys=graph.stream_channels,
+            trigger_to_nodes=graph.trigger_to_nodes,
+            checkpoint_tuple=saved,
         ) as loop:
             if loop.tick(
                 input_keys=graph.input_channels,
@@ -388,12 +510,7 @@ class KafkaOrchestrator(AbstractContextManager):
                             [
                                 (
                                     SCHEDULED,
-                                    max(
-                                        loop.checkpoint["versions_seen"]
-                                        .get(INTERRUPT, {})
-                                        .values(),
-                                        default=None,
-                                    ),
+                                    scheduled_version(loop.checkpoint),
                                 )
                             ],
                         )
@@ -409,3 +526,99 @@ class KafkaOrchestrator(AbstractContextManager):
                 ]
                 # wait for messages to be sent
                 concurrent.futures.wait(futs)
+
+
+def _group_by_thread(
+    recs: Sequence[ConsumerRecord],
+    loaded: Optional[dict[tuple[str, int, int], MessageToOrchestrator]] = None,
+) -> list[tuple[list[ConsumerRecord], list[MessageToOrchestrator]]]:
+    """Group records and their unique messages, in order. Messages for tasks
+    that finished in the same thread and namespace are grouped together, and
+    messages with input are grouped with their duplicates. Messages already
+    deserialized are taken from `loaded`, by (topic, partition, offset)."""
+    groups: dict[
+        Any, tuple[list[ConsumerRecord], dict[bytes, MessageToOrchestrator]]
+    ] = {}
+    if loaded is None:
+        loaded = {}
+    for rec in recs:
+        msg = loaded.pop((rec.topic, rec.partition, rec.offset), None)
+        if msg is None:
+            msg = serde.loads(rec.value)
+        if msg.get("input") is None:
+            key = _thread_key(msg)
+        else:
+            key = rec.value
+        group, msgs = groups.setdefault(key, ([], {}))
+        group.append(rec)
+        msgs.setdefault(rec.value, msg)
+    return [(group, list(msgs.values())) for group, msgs in groups.values()]
+
+
+def _group_units_by_thread(
+    recs: Sequence[ConsumerRecord],
+    loaded: Optional[dict[tuple[str, int, int], MessageToOrchestrator]] = None,
+) -> list[
+    tuple[
+        list[ConsumerRecord], list[MessageToOrchestrator], list[MessageToOrchestrator]
+    ]
+]:
+    """Group the records of each thread and namespace, in order, with their
+    unique messages, and the merged message of each of their groups, to be
+    processed one after another."""
+    units: dict[
+        Any,
+        tuple[
+            list[ConsumerRecord],
+            list[MessageToOrchestrator],
+            list[MessageToOrchestrator],
+        ],
+    ] = {}
+    for group, msgs in _group_by_thread(recs, loaded):
+        unit_recs, unit_msgs, merged = units.setdefault(
+            _thread_key(msgs[0]), ([], [], [])
+        )
+        unit_recs.extend(group)
+        unit_msgs.extend(msgs)
+        merged.append(_merge(msgs))
+    return list(units.values())
+
+
+def _thread_key(msg: MessageToOrchestrator) -> tuple[str, Optional[str]]:
+    configurable = msg["config"]["configurable"]
+    return configurable["thread_id"], configurable.get("checkpoint_ns")
+
+
+def _merge(msgs: list[MessageToOrchestrator]) -> MessageToOrchestrator:
+    """Merge the messages of a group into one, for the newest checkpoint, which
+    sends the finally_send messages of all."""
+    if len(msgs) == 1:
+        return msgs[0]
+    finally_send: list[Sendable] = []
+    for msg in msgs:
+        for m in msg.get("finally_send") or ():
+            if m not in finally_send:
+                finally_send.append(m)
+    newest = max(
+        msgs, key=lambda m: m["config"]["configurable"].get("checkpoint_id") or ""
+    )
+    return MessageToOrchestrator(
+        input=None, config=newest["config"], finally_send=finally_send or None
+    )
+
+
+def _ensures_latest(config: RunnableConfig) -> bool:
+    return bool(
+        config["configurable"].get(CONFIG_KEY_ENSURE_LATEST)
+        and config["configurable"].get("checkpoint_id")
+    )
+
+
+def _tasks_in_flight(saved: CheckpointTuple, graph: Pregel) -> bool:
+    """Whether some tasks scheduled for the checkpoint haven't saved their
+    writes yet, in which case the graph would have nothing to do."""
+    # tasks are scheduled at the versions seen once the checkpoint is resumed
+    checkpoint = copy_checkpoint(saved.checkpoint)
+    resume_checkpoint(checkpoint, graph.channels)
+    scheduled, writes = pending_task_writes(checkpoint, saved.pending_writes or ())
+    return not scheduled <= writes.keys()
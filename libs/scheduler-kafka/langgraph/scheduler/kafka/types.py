@@ -1,6 +1,15 @@
 import asyncio
 import concurrent.futures
-from typing import Any, NamedTuple, Optional, Protocol, Sequence, TypedDict, Union
+from typing import (
+    Any,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    TypedDict,
+    Union,
+)
 
 from langchain_core.runnables import RunnableConfig
 
@@ -67,7 +76,9 @@ class Consumer(Protocol):
         self, timeout_ms: int, max_records: int
     ) -> dict[TopicPartition, Sequence[ConsumerRecord]]: ...
 
-    def commit(self) -> None: ...
+    def commit(self, offsets: Optional[Mapping[TopicPartition, int]] = None) -> None:
+        """Commit the given offsets, or those of all records fetched."""
+        ...
 
 
 class AsyncConsumer(Protocol):
@@ -75,7 +86,11 @@ class AsyncConsumer(Protocol):
         self, timeout_ms: int, max_records: int
     ) -> dict[TopicPartition, Sequence[ConsumerRecord]]: ...
 
-    async def commit(self) -> None: ...
+    async def commit(
+        self, offsets: Optional[Mapping[TopicPartition, int]] = None
+    ) -> None:
+        """Commit the given offsets, or those of all records fetched."""
+        ...
 
 
 class Producer(Protocol):
@@ -0,0 +1,264 @@
+import asyncio
+import concurrent.futures
+from collections import Counter, defaultdict, deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from langgraph.pregel.executor import Submit
+from langgraph.scheduler.kafka.types import (
+    AsyncConsumer,
+    Consumer,
+    ConsumerRecord,
+    TopicPartition,
+)
+
+T = TypeVar("T")
+
+# records processed together, the messages they hold, and the work to run
+AsyncUnit = tuple[Sequence[ConsumerRecord], Sequence[T], Awaitable[Any]]
+Unit = tuple[Sequence[ConsumerRecord], Sequence[T], Callable[[], Any]]
+
+
+class BaseInFlightWindow(Generic[T]):
+    """Bounds the records a worker processes concurrently, and tracks the
+    offsets it can commit.
+
+    Records are fetched while fewer than `max_in_flight` are waiting or
+    running, and started while their partition has fewer than
+    `max_in_flight_per_partition` running. The offset committed for a
+    partition only moves past a record once it and all the records before it
+    are done, so a slow record holds back the commits of its partition, but
+    not the processing of the records after it.
+
+    If `key` is given, it's called once for each record fetched, and a record
+    whose key has records still running from an earlier start is held back,
+    along with the later records of that key, until those finish. Records of
+    a key started together can then be processed as one unit, with one unit
+    per key running at a time."""
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int,
+        max_in_flight_per_partition: Optional[int] = None,
+        batch_max_n: int,
+        batch_max_ms: int,
+        key: Optional[Callable[[ConsumerRecord], Hashable]] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_partition = max_in_flight_per_partition
+        self.batch_max_n = batch_max_n
+        self.batch_max_ms = batch_max_ms
+        self.key = key
+        self.partitions: dict[tuple[str, int], TopicPartition] = {}
+        self.waiting: dict[TopicPartition, deque[ConsumerRecord]] = defaultdict(deque)
+        self.running: Counter[TopicPartition] = Counter()
+        # keys of the records, computed once when added, and the number of
+        # records running for each key
+        self.keys: dict[tuple[str, int, int], Hashable] = {}
+        self.running_keys: Counter[Hashable] = Counter()
+        # offsets not yet committed, in order, and those of them done
+        self.offsets: dict[TopicPartition, deque[int]] = defaultdict(deque)
+        self.done: dict[TopicPartition, set[int]] = defaultdict(set)
+        self.size = 0
+
+    @property
+    def room(self) -> int:
+        """Number of records that can be fetched."""
+        return max(self.max_in_flight - self.size, 0)
+
+    def add(self, recs: Mapping[TopicPartition, Sequence[ConsumerRecord]]) -> None:
+        """Add fetched records, to be started in order."""
+        for tp, batch in recs.items():
+            for rec in batch:
+                self.partitions[(rec.topic, rec.partition)] = tp
+                self.waiting[tp].append(rec)
+                self.offsets[tp].append(rec.offset)
+                if self.key is not None:
+                    self.keys[(rec.topic, rec.partition, rec.offset)] = self.key(rec)
+                self.size += 1
+
+    def start(self) -> list[ConsumerRecord]:
+        """Take the waiting records that can start."""
+        started: list[ConsumerRecord] = []
+        # keys started now, whose records can join them, and keys held back
+        starting: set[Hashable] = set()
+        holding: set[Hashable] = set()
+        for tp, waiting in self.waiting.items():
+            held: deque[ConsumerRecord] = deque()
+            while waiting and (
+                self.max_in_flight_per_partition is None
+                or self.running[tp] < self.max_in_flight_per_partition
+            ):
+                rec = waiting.popleft()
+                if self.key is not None:
+                    key = self.keys[(rec.topic, rec.partition, rec.offset)]
+                    if key in holding or (
+                        key not in starting and self.running_keys[key]
+                    ):
+                        holding.add(key)
+                        held.append(rec)
+                        continue
+                    starting.add(key)
+                    self.running_keys[key] += 1
+                started.append(rec)
+                self.running[tp] += 1
+            waiting.extendleft(reversed(held))
+        return started
+
+    def finish(self, recs: Iterable[ConsumerRecord]) -> dict[TopicPartition, int]:
+        """Mark started records as done, returning the offsets to commit for
+        the partitions whose committed offset moved."""
+        touched: set[TopicPartition] = set()
+        for rec in recs:
+            tp = self.partitions[(rec.topic, rec.partition)]
+            self.running[tp] -= 1
+            if self.key is not None:
+                key = self.keys.pop((rec.topic, rec.partition, rec.offset))
+                self.running_keys[key] -= 1
+                if not self.running_keys[key]:
+                    del self.running_keys[key]
+            self.done[tp].add(rec.offset)
+            self.size -= 1
+            touched.add(tp)
+        commits: dict[TopicPartition, int] = {}
+        for tp in touched:
+            offsets, done = self.offsets[tp], self.done[tp]
+            while offsets and offsets[0] in done:
+                done.remove(offsets[0])
+                # the committed offset is that of the next record to read
+                commits[tp] = offsets.popleft() + 1
+        return commits
+
+
+class AsyncInFlightWindow(BaseInFlightWindow[T]):
+    """Window of records processed concurrently in the event loop, fetching
+    records while others are processed.
+
+    `split` groups the started records into units of work."""
+
+    def __init__(
+        self,
+        consumer: AsyncConsumer,
+        split: Callable[[Sequence[ConsumerRecord]], Iterable[AsyncUnit[T]]],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.consumer = consumer
+        self.split = split
+        self.poll: Optional[asyncio.Future] = None
+        self.tasks: dict[
+            asyncio.Future, tuple[Sequence[ConsumerRecord], Sequence[T]]
+        ] = {}
+
+    async def next(self) -> list[T]:
+        """Wait for units of work to finish, and commit their offsets.
+
+        Returns the messages of the finished units, or an empty list once no
+        records are in flight and none were fetched within `batch_max_ms`."""
+        while True:
+            for recs, msgs, aw in self.split(self.start()):
+                self.tasks[asyncio.ensure_future(aw)] = (recs, msgs)
+            # fetch more records, unless the window is full
+            if self.poll is None and self.room:
+                self.poll = asyncio.ensure_future(
+                    self.consumer.getmany(
+                        timeout_ms=self.batch_max_ms,
+                        max_records=min(self.room, self.batch_max_n),
+                    )
+                )
+            waiting = [*self.tasks, self.poll] if self.poll else [*self.tasks]
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            idle = False
+            if self.poll in done:
+                recs = self.poll.result()
+                self.poll = None
+                self.add(recs)
+                idle = not self.size
+            if finished := [self.tasks.pop(t) for t in done if t in self.tasks]:
+                for task in done:
+                    task.result()
+                if offsets := self.finish(r for recs, _ in finished for r in recs):
+                    await self.consumer.commit(offsets)
+                return [m for _, msgs in finished for m in msgs]
+            if idle:
+                return []
+
+    async def aclose(self) -> None:
+        """Stop fetching and cancel the units of work in flight, whose records
+        will be consumed again, as their offsets weren't committed."""
+        futs = [*self.tasks, self.poll] if self.poll else [*self.tasks]
+        for fut in futs:
+            fut.cancel()
+        await asyncio.gather(*futs, return_exceptions=True)
+
+
+class InFlightWindow(BaseInFlightWindow[T]):
+    """Window of records processed concurrently in a thread pool.
+
+    `split` groups the started records into units of work, run with `submit`.
+    Records are fetched while units run, and units are waited for at most
+    `batch_max_ms` when no records were fetched."""
+
+    def __init__(
+        self,
+        consumer: Consumer,
+        submit: Submit,
+        split: Callable[[Sequence[ConsumerRecord]], Iterable[Unit[T]]],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.consumer = consumer
+        self.submit = submit
+        self.split = split
+        self.futures: dict[
+            concurrent.futures.Future, tuple[Sequence[ConsumerRecord], Sequence[T]]
+        ] = {}
+
+    def next(self) -> list[T]:
+        """Wait for units of work to finish, and commit their offsets.
+
+        Returns the messages of the finished units, or an empty list once no
+        records are in flight and none were fetched within `batch_max_ms`."""
+        while True:
+            # fetch more records, unless the window is full
+            fetched = False
+            if self.room:
+                recs = self.consumer.getmany(
+                    timeout_ms=0 if self.size else self.batch_max_ms,
+                    max_records=min(self.room, self.batch_max_n),
+                )
+                self.add(recs)
+                fetched = any(recs.values())
+            for recs, msgs, fn in self.split(self.start()):
+                self.futures[self.submit(fn)] = (recs, msgs)
+            if not self.futures:
+                return []
+            done, _ = concurrent.futures.wait(
+                self.futures,
+                timeout=0 if fetched else self.batch_max_ms / 1000,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            if done:
+                finished = [self.futures.pop(f) for f in done]
+                for fut in done:
+                    fut.result()
+                if offsets := self.finish(r for recs, _ in finished for r in recs):
+                    self.consumer.commit(offsets)
+                return [m for _, msgs in finished for m in msgs]
+
+    def close(self) -> None:
+        """Cancel the units of work not started yet, whose records will be
+        consumed again, as their offsets weren't committed."""
+        for fut in self.futures:
+            fut.cancel()
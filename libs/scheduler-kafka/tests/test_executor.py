@@ -0,0 +1,220 @@
+import concurrent.futures
+import operator
+from typing import Annotated, Any, NamedTuple, Optional, TypedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import CONFIG_KEY_DELEGATE, END, ERROR, PULL, START
+from langgraph.errors import GraphDelegate
+from langgraph.graph.state import StateGraph
+from langgraph.pregel import Pregel
+from langgraph.pregel.manager import ChannelsManager
+from langgraph.scheduler.kafka import serde
+from langgraph.scheduler.kafka.executor import (
+    KafkaExecutor,
+    _group_by_checkpoint,
+    _orchestrator_messages,
+    _prepare_tasks,
+)
+from langgraph.scheduler.kafka.types import MessageToExecutor, Topics
+
+TOPICS = Topics(orchestrator="o", executor="e", error="z")
+
+
+class Record(NamedTuple):
+    topic: str
+    partition: int
+    offset: int
+    timestamp: int = 0
+    timestamp_type: int = 0
+    key: Optional[bytes] = None
+    value: Optional[bytes] = None
+
+
+class FakeProducer:
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, Any, Any]] = []
+
+    def send(
+        self, topic: str, *, key: Optional[bytes] = None, value: Optional[bytes] = None
+    ) -> concurrent.futures.Future:
+        self.sent.append((topic, serde.loads(value), serde.loads(key)))
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        fut.set_result(None)
+        return fut
+
+
+class State(TypedDict):
+    log: Annotated[list[str], operator.add]
+
+
+def mk_graph(calls: Optional[list[str]] = None) -> Pregel:
+    """Graph whose first step runs nodes a and sub, sub being a subgraph,
+    interrupted before that step, to be run by the executor. Runs of a are
+    appended to `calls`."""
+
+    def a(state: State) -> dict:
+        if calls is not None:
+            calls.append("a")
+        return {"log": ["a"]}
+
+    sub_builder = StateGraph(State)
+    sub_builder.add_node("inner", lambda state: {"log": ["inner"]})
+    sub_builder.add_edge(START, "inner")
+
+    builder = StateGraph(State)
+    builder.add_node("a", a)
+    builder.add_node("sub", sub_builder.compile())
+    builder.add_edge(START, "a")
+    builder.add_edge(START, "sub")
+    builder.add_edge(["a", "sub"], END)
+    return builder.compile(checkpointer=MemorySaver(), interrupt_before=["a", "sub"])
+
+
+def mk_messages(graph: Pregel) -> tuple[dict, dict[str, MessageToExecutor]]:
+    """Run the graph until the interrupt, returning its config, and a message
+    for each task of the next step, keyed by node name."""
+    config = {"configurable": {"thread_id": "1"}}
+    graph.invoke({"log": []}, config)
+    state = graph.get_state(config)
+    return state.config, {
+        task.name: MessageToExecutor(
+            config=state.config,
+            task={"id": task.id, "path": task.path},
+            finally_send=None,
+        )
+        for task in state.tasks
+    }
+
+
+def msg_for(thread_id: str, checkpoint_id: str, task_id: str) -> MessageToExecutor:
+    return MessageToExecutor(
+        config={
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": "",
+                "checkpoint_id": checkpoint_id,
+            }
+        },
+        task={"id": task_id, "path": [PULL, "a"]},
+        finally_send=None,
+    )
+
+
+def test_group_by_checkpoint() -> None:
+    msgs = [
+        msg_for("1", "c1", "t1"),
+        msg_for("2", "c1", "t2"),
+        msg_for("1", "c1", "t3"),
+        msg_for("1", "c2", "t4"),
+    ]
+    recs = [Record("e", 0, i, value=serde.dumps(m)) for i, m in enumerate(msgs)]
+
+    # grouped by thread and checkpoint, in order of first appearance
+    assert _group_by_checkpoint(recs) == [
+        ([recs[0], recs[2]], [serde.loads(recs[0].value), serde.loads(recs[2].value)]),
+        ([recs[1]], [serde.loads(recs[1].value)]),
+        ([recs[3]], [serde.loads(recs[3].value)]),
+    ]
+    assert _group_by_checkpoint([]) == []
+
+
+def test_prepare_tasks() -> None:
+    graph = mk_graph()
+    config, msgs = mk_messages(graph)
+    not_found = MessageToExecutor(
+        config=config,
+        task={"id": "missing", "path": [PULL, "missing"]},
+        finally_send=None,
+    )
+    saved = graph.checkpointer.get_tuple(config)
+
+    with ChannelsManager(graph.channels, saved.checkpoint, config) as (
+        channels,
+        managed,
+    ):
+        tasks, missing = _prepare_tasks(
+            [msgs["a"], msgs["sub"], msgs["a"], not_found],
+            saved,
+            graph,
+            channels,
+            managed,
+            graph.checkpointer,
+        )
+
+    # repeated tasks are prepared once, and tasks not found are returned
+    assert [t.name for t in tasks] == ["a", "sub"]
+    assert [t.id for t in tasks] == [msgs["a"]["task"]["id"], msgs["sub"]["task"]["id"]]
+    assert missing == [not_found]
+    # tasks run with delegation of subgraphs enabled
+    assert all(t.config["configurable"][CONFIG_KEY_DELEGATE] for t in tasks)
+
+
+def test_orchestrator_messages() -> None:
+    graph = mk_graph()
+    config, msgs = mk_messages(graph)
+    key = ["1", ""]
+
+    # a finished task notifies the orchestrator
+    assert [
+        (serde.loads(v), serde.loads(k))
+        for v, k in _orchestrator_messages(graph, TOPICS, msgs["a"], None)
+    ] == [({"input": None, "config": config, "finally_send": None}, key)]
+
+    # a delegated subgraph is run by the orchestrator first, which then sends
+    # the message back to the executor
+    sub_config = {"configurable": {"thread_id": "1", "checkpoint_ns": "sub:1"}}
+    delegate = GraphDelegate({"config": sub_config, "input": {"log": []}})
+    assert [
+        (serde.loads(v), serde.loads(k))
+        for v, k in _orchestrator_messages(graph, TOPICS, msgs["sub"], delegate)
+    ] == [
+        (
+            {
+                "input": {"log": []},
+                "config": sub_config,
+                "finally_send": [
+                    {"topic": "e", "value": serde.loads(serde.dumps(msgs["sub"]))}
+                ],
+            },
+            ["1", "sub:1"],
+        )
+    ]
+
+
+def test_attempt() -> None:
+    calls: list[str] = []
+    graph = mk_graph(calls)
+    config, msgs = mk_messages(graph)
+    not_found = MessageToExecutor(
+        config=config,
+        task={"id": "missing", "path": [PULL, "missing"]},
+        finally_send=None,
+    )
+    producer = FakeProducer()
+
+    with KafkaExecutor(graph, TOPICS, consumer=object(), producer=producer) as ex:
+        ex.attempt([msgs["a"], msgs["sub"], msgs["a"], not_found])
+
+    # the task of a repeated message runs once, the delegating task saves no
+    # writes, and the missing task gets an error
+    assert calls == ["a"]
+    writes = graph.checkpointer.get_tuple(config).pending_writes
+    a_id = msgs["a"]["task"]["id"]
+    assert sorted((id, channel) for id, channel, _ in writes) == sorted(
+        [(a_id, "a"), (a_id, "log"), ("missing", ERROR)]
+    )
+    # each message is acknowledged in order, except for the delegating task,
+    # routed to the orchestrator to run its subgraph first
+    done = {"input": None, "config": config, "finally_send": None}
+    assert [(topic, key) for topic, _, key in producer.sent] == [
+        ("o", ["1", ""]),
+        ("o", ["1", f"sub:{msgs['sub']['task']['id']}"]),
+        ("o", ["1", ""]),
+        ("o", ["1", ""]),
+    ]
+    assert [producer.sent[i][1] for i in (0, 2, 3)] == [done] * 3
+    delegated = producer.sent[1][1]
+    assert delegated["input"] == {"log": []}
+    assert delegated["finally_send"] == [
+        {"topic": "e", "value": serde.loads(serde.dumps(msgs["sub"]))}
+    ]
@@ -0,0 +1,250 @@
+import asyncio
+import operator
+from collections import deque
+from typing import Annotated, Any, Optional, TypedDict
+
+import orjson
+import pytest
+from langchain_core.runnables import ensure_config
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.constants import (
+    CONFIG_KEY_DEDUPE_TASKS,
+    CONFIG_KEY_RESUMING,
+    END,
+    ERROR,
+    SCHEDULED,
+    START,
+)
+from langgraph.graph.state import StateGraph
+from langgraph.pregel.algo import scheduled_version
+from langgraph.pregel.loop import SyncPregelLoop
+from langgraph.scheduler.kafka import serde
+from langgraph.scheduler.kafka.orchestrator import (
+    AsyncKafkaOrchestrator,
+    _group_by_thread,
+    _merge,
+    _tasks_in_flight,
+)
+from langgraph.scheduler.kafka.types import (
+    MessageToOrchestrator,
+    Sendable,
+    Topics,
+)
+from langgraph.utils.config import patch_configurable
+from tests.test_executor import Record, mk_graph
+
+
+def msg_for(
+    thread_id: str,
+    checkpoint_id: Optional[str],
+    finally_send: Optional[list[Sendable]] = None,
+    input: Optional[dict] = None,
+) -> MessageToOrchestrator:
+    return MessageToOrchestrator(
+        input=input,
+        config={
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": "",
+                "checkpoint_id": checkpoint_id,
+            }
+        },
+        finally_send=finally_send,
+    )
+
+
+def test_group_by_thread() -> None:
+    msgs = [
+        msg_for("1", "c1"),
+        msg_for("2", "c1"),
+        msg_for("1", "c2"),
+        msg_for("1", "c1"),
+        msg_for("3", None, input={"x": 1}),
+        msg_for("3", None, input={"x": 1}),
+        msg_for("3", None, input={"x": 2}),
+    ]
+    recs = [Record("o", 0, i, value=serde.dumps(m)) for i, m in enumerate(msgs)]
+
+    # finished tasks are grouped by thread, and messages with input with their
+    # duplicates, each group keeping its unique messages in order
+    assert _group_by_thread(recs) == [
+        ([recs[0], recs[2], recs[3]], [msgs[0], msgs[2]]),
+        ([recs[1]], [msgs[1]]),
+        ([recs[4], recs[5]], [msgs[4]]),
+        ([recs[6]], [msgs[6]]),
+    ]
+    assert _group_by_thread([]) == []
+
+
+def test_merge() -> None:
+    one = {"topic": "e", "value": {"n": 1}}
+    two = {"topic": "e", "value": {"n": 2}}
+    three = {"topic": "o", "value": {"n": 3}, "key": "k"}
+
+    # a single message is kept as is
+    msg = msg_for("1", "c1", input={"x": 1}, finally_send=[one])
+    assert _merge([msg]) is msg
+
+    # finally_send messages of all are sent once, in order, from the newest
+    # checkpoint
+    assert _merge(
+        [
+            msg_for("1", "c2", finally_send=[one, two]),
+            msg_for("1", "c3"),
+            msg_for("1", "c1", finally_send=[two, three, one]),
+        ]
+    ) == msg_for("1", "c3", finally_send=[one, two, three])
+
+    # messages without a checkpoint ID are the oldest
+    assert _merge([msg_for("1", None), msg_for("1", "c1")]) == msg_for("1", "c1")
+    assert _merge([msg_for("1", "c1"), msg_for("1", "c1")]) == msg_for("1", "c1")
+
+
+class State(TypedDict):
+    log: Annotated[list[str], operator.add]
+
+
+def test_tasks_in_flight() -> None:
+    builder = StateGraph(State)
+    builder.add_node("a", lambda state: {"log": ["a"]})
+    builder.add_node("b", lambda state: {"log": ["b"]})
+    builder.add_edge(START, "a")
+    builder.add_edge(START, "b")
+    builder.add_edge(["a", "b"], END)
+    graph = builder.compile(checkpointer=MemorySaver(), interrupt_before=["a", "b"])
+    config = {"configurable": {"thread_id": "1"}}
+    graph.invoke({"log": []}, config)
+    state = graph.get_state(config)
+    a, b = sorted(state.tasks, key=lambda t: t.name)
+    saved = graph.checkpointer.get_tuple(state.config)
+    config = ensure_config(
+        patch_configurable(
+            state.config, {CONFIG_KEY_DEDUPE_TASKS: True, CONFIG_KEY_RESUMING: True}
+        )
+    )
+
+    def loop(checkpointer: MemorySaver) -> SyncPregelLoop:
+        return SyncPregelLoop(
+            None,
+            config=config,
+            stream=None,
+            store=None,
+            checkpointer=checkpointer,
+            nodes=graph.nodes,
+            specs=graph.channels,
+            output_keys=graph.output_channels,
+            stream_keys=graph.stream_channels,
+        )
+
+    # the version the orchestrator schedules tasks at
+    with loop(graph.checkpointer) as resumed:
+        resumed.tick(input_keys=graph.input_channels)
+        version = scheduled_version(resumed.checkpoint)
+    assert version is not None
+
+    def in_flight(*writes: tuple[str, str, object]) -> bool:
+        """Whether tasks are in flight after the writes, checking the loop
+        resuming from the checkpoint agrees."""
+        checkpointer = MemorySaver()
+        checkpointer.put(
+            patch_configurable(state.config, {"checkpoint_id": None}),
+            saved.checkpoint,
+            saved.metadata,
+            saved.checkpoint["channel_versions"],
+        )
+        for tid, k, v in writes:
+            checkpointer.put_writes(state.config, [(k, v)], tid)
+        result = _tasks_in_flight(checkpointer.get_tuple(state.config), graph)
+        with loop(checkpointer) as resumed:
+            resumed.tick(input_keys=graph.input_channels)
+            assert result == any(
+                t.scheduled and not t.writes for t in resumed.tasks.values()
+            )
+        return result
+
+    assert not in_flight()
+    assert in_flight((a.id, SCHEDULED, version), (b.id, SCHEDULED, version))
+    # a task is done once it saved its writes
+    assert in_flight(
+        (a.id, SCHEDULED, version), (b.id, SCHEDULED, version), (a.id, "log", ["a"])
+    )
+    assert not in_flight(
+        (a.id, SCHEDULED, version),
+        (b.id, SCHEDULED, version),
+        (a.id, "log", ["a"]),
+        (b.id, "log", ["b"]),
+    )
+    # a failed task runs again
+    assert in_flight(
+        (a.id, SCHEDULED, version),
+        (b.id, SCHEDULED, version),
+        (a.id, "log", ["a"]),
+        (b.id, ERROR, "failed"),
+    )
+    # tasks scheduled before the checkpoint was last resumed aren't in flight
+    stale = scheduled_version(saved.checkpoint)
+    assert stale != version
+    assert not in_flight((a.id, SCHEDULED, stale), (b.id, SCHEDULED, stale))
+
+
+class FakeAsyncConsumer:
+    def __init__(self, *fetches: dict[str, list[Record]]) -> None:
+        self.fetches = deque(fetches)
+
+    async def getmany(self, *, timeout_ms: int, max_records: int) -> dict:
+        if self.fetches:
+            return self.fetches.popleft()
+        await asyncio.sleep(timeout_ms / 1000)
+        return {}
+
+    async def commit(self, offsets: Any = None) -> None:
+        pass
+
+
+@pytest.mark.anyio
+async def test_stream_one_unit_per_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    msgs = [msg_for("1", "c1"), msg_for("1", "c2"), msg_for("2", "c1")]
+    recs = [Record("o", 0, i, value=serde.dumps(m)) for i, m in enumerate(msgs)]
+    loaded: list[bytes] = []
+
+    def loads(v: bytes) -> Any:
+        loaded.append(v)
+        return orjson.loads(v)
+
+    monkeypatch.setattr(serde, "loads", loads)
+    # the same thread is delivered in two consecutive fetches
+    consumer = FakeAsyncConsumer({"o0": recs[:1]}, {"o0": recs[1:]})
+    release = asyncio.Event()
+    running: set[str] = set()
+    started: list[tuple[str, str]] = []
+
+    async def each(msg: MessageToOrchestrator) -> None:
+        configurable = msg["config"]["configurable"]
+        thread_id = configurable["thread_id"]
+        assert thread_id not in running
+        running.add(thread_id)
+        started.append((thread_id, configurable["checkpoint_id"]))
+        if configurable["checkpoint_id"] == "c1" and thread_id == "1":
+            await release.wait()
+        running.remove(thread_id)
+
+    async with AsyncKafkaOrchestrator(
+        mk_graph(),
+        Topics(orchestrator="o", executor="e", error="z"),
+        batch_max_ms=10,
+        max_in_flight=10,
+        consumer=consumer,
+        producer=object(),
+    ) as orch:
+        orch.each = each
+        # other threads proceed, while the thread of a running unit waits
+        assert await orch.__anext__() == [msgs[2]]
+        assert started == [("1", "c1"), ("2", "c1")]
+        release.set()
+        assert await orch.__anext__() == [msgs[0]]
+        assert await orch.__anext__() == [msgs[1]]
+        assert started == [("1", "c1"), ("2", "c1"), ("1", "c2")]
+        # each record is deserialized once, even when held back
+        assert sorted(loaded) == sorted(r.value for r in recs)
+        assert orch.loaded == {}
@@ -0,0 +1,87 @@
+from typing import NamedTuple, Optional
+
+from langgraph.scheduler.kafka.window import BaseInFlightWindow
+
+
+class Record(NamedTuple):
+    topic: str
+    partition: int
+    offset: int
+    timestamp: int = 0
+    timestamp_type: int = 0
+    key: Optional[bytes] = None
+    value: Optional[bytes] = None
+
+
+def test_window_commits_contiguous_offsets() -> None:
+    window = BaseInFlightWindow(max_in_flight=5, batch_max_n=10, batch_max_ms=10)
+    assert window.room == 5
+
+    recs = [Record("t", 0, offset) for offset in range(4)]
+    window.add({"t0": recs})
+    assert window.room == 1
+    assert window.start() == recs
+
+    # later records finishing first don't move the committed offset
+    assert window.finish([recs[1], recs[2]]) == {}
+    assert window.room == 3
+    # until the records before them finish
+    assert window.finish([recs[0]]) == {"t0": 3}
+    assert window.finish([recs[3]]) == {"t0": 4}
+    assert window.room == 5
+
+
+def test_window_limits_running_per_partition() -> None:
+    window = BaseInFlightWindow(
+        max_in_flight=10,
+        max_in_flight_per_partition=2,
+        batch_max_n=10,
+        batch_max_ms=10,
+    )
+    p0 = [Record("t", 0, offset) for offset in range(3)]
+    p1 = [Record("t", 1, offset) for offset in range(10, 13)]
+    window.add({"t0": p0, "t1": p1})
+    assert window.start() == [*p0[:2], *p1[:2]]
+    assert window.start() == []
+
+    # partitions are committed separately
+    assert window.finish([p1[0]]) == {"t1": 11}
+    assert window.start() == [p1[2]]
+    assert window.finish([p0[1]]) == {}
+    assert window.start() == [p0[2]]
+    assert window.finish([p0[0], p0[2], p1[1], p1[2]]) == {"t0": 3, "t1": 13}
+    assert window.room == 10
+
+
+def test_window_holds_back_running_keys() -> None:
+    keyed: list[int] = []
+
+    def key(rec: Record) -> Optional[bytes]:
+        keyed.append(rec.offset)
+        return rec.key
+
+    window = BaseInFlightWindow(
+        max_in_flight=10, batch_max_n=10, batch_max_ms=10, key=key
+    )
+    first = [Record("t", 0, 0, key=b"a"), Record("t", 0, 1, key=b"a")]
+    window.add({"t0": first})
+    # records of a key started together
+    assert window.start() == first
+
+    # records of a running key fetched later wait for it, and the records of
+    # that key after them too, but not those of other keys
+    second = [
+        Record("t", 0, 2, key=b"a"),
+        Record("t", 0, 3, key=b"b"),
+        Record("t", 0, 4, key=b"a"),
+    ]
+    window.add({"t0": second})
+    assert window.start() == [second[1]]
+    assert window.finish([first[0]]) == {"t0": 1}
+    assert window.start() == []
+    assert window.finish([first[1]]) == {"t0": 2}
+    assert window.start() == [second[0], second[2]]
+    assert window.finish([*second]) == {"t0": 5}
+    assert window.room == 10
+    # the key of each record is computed once, however often it's held back
+    assert keyed == [0, 1, 2, 3, 4]